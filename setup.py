@@ -57,6 +57,7 @@ def setup_package():
             "scripts/rq_custom_worker",
             "scripts/rq_starter",
             "scripts/webhook-server",
+            "scripts/webhook-dispatcher",
             "scripts/actinia-server",
         ],
     )
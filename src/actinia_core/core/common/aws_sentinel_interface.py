@@ -24,9 +24,17 @@
 """
 Storage base class
 """
-from urllib.request import urlopen
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import requests
 from flask.json import loads as json_loads
 from flask.json import dumps as json_dumps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert, Anika Weinmann"
@@ -35,6 +43,11 @@ __copyright__ = (
 )
 __maintainer__ = "mundialis"
 
+# The number of retries of a failed metadata request
+METADATA_REQUEST_RETRIES = 3
+# The timeout of a metadata request in seconds
+METADATA_REQUEST_TIMEOUT = 60
+
 
 def get_sentinel_date(product_id):
     """
@@ -64,6 +77,50 @@ def get_sentinel_date(product_id):
     return year, month, day
 
 
+class SentinelMetadataCache(object):
+    """On-disk cache of the metadata files of Sentinel-2 scenes
+
+    The productInfo.json and tileInfo.json files of a scene never change,
+    hence the entries do not expire. The cache directory can be shared by
+    all actinia processes, the files are written atomically.
+    """
+
+    def __init__(self, directory):
+        """Constructor
+
+        Args:
+            directory (str): The cache directory
+        """
+        self.directory = directory
+
+    def get_path(self, url):
+        """Return the cache file path of a metadata url, that is named by
+        the product id or the tile path in the url"""
+        name = urlparse(url).path.strip("/").replace("/", "_")
+        return os.path.join(self.directory, name)
+
+    def get(self, url):
+        """Return the cached content of a metadata url or None"""
+        try:
+            with open(self.get_path(url), "rb") as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def put(self, url, content):
+        """Store the content of a metadata url"""
+        path = self.get_path(url)
+        temp_path = "%s.%s.tmp" % (path, uuid4().hex)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(content)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
 class AWSSentinel2AInterface(object):
     """Query interface to the Sentinel2 and Landsat public geo-data
     available in the google cloud storage
@@ -81,6 +138,13 @@ class AWSSentinel2AInterface(object):
             "http://sentinel-s2-l1c.s3-website.eu-central-1.amazonaws.com"
         )
         self.config = config
+        self.session = None
+        self.session_lock = threading.Lock()
+        self.metadata_cache = None
+        if config.SENTINEL_METADATA_CACHE_DIR:
+            self.metadata_cache = SentinelMetadataCache(
+                config.SENTINEL_METADATA_CACHE_DIR
+            )
 
         self.sentinel_bands = [
             "B01",
@@ -98,10 +162,87 @@ class AWSSentinel2AInterface(object):
             "B12",
         ]
 
+    def _get_session(self):
+        """Return the HTTP session with a connection pool for the concurrent
+        metadata requests, failed requests are retried with backoff"""
+        with self.session_lock:
+            if self.session is None:
+                pool_size = max(self.config.SENTINEL_METADATA_WORKERS, 1)
+                retries = Retry(
+                    total=METADATA_REQUEST_RETRIES,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                    max_retries=retries,
+                )
+                self.session = requests.Session()
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+            return self.session
+
+    def _read_metadata(self, url):
+        """Read a metadata json file from the metadata cache or download it
+
+        Args:
+            url (str): The url of the json file
+
+        Returns:
+            dict: The content of the json file
+        """
+        content = None
+        if self.metadata_cache is not None:
+            content = self.metadata_cache.get(url)
+        from_cache = content is not None
+        if content is None:
+            response = self._get_session().get(
+                url, timeout=METADATA_REQUEST_TIMEOUT
+            )
+            content = response.content
+            if response.status_code != 200:
+                raise Exception(
+                    "Unable to download the json file from URL: %s. "
+                    "HTTP status code: %i" % (url, response.status_code)
+                )
+
+        try:
+            info = json_loads(content)
+        except Exception:
+            raise Exception(
+                "Unable to read the json file from URL: %s. Error: %s"
+                % (url, content)
+            )
+
+        if from_cache is False and self.metadata_cache is not None:
+            self.metadata_cache.put(url, content)
+        return info
+
+    def _get_product_info(self, product_id):
+        """Read the productInfo.json file of a Sentinel-2 product"""
+        year, month, day = get_sentinel_date(product_id)
+        json_url = (
+            "%(base)s/products/%(year)s/%(month)s/%(day)s/%(id)s/"
+            "productInfo.json"
+            % {
+                "base": self.aws_sentinel_base_url,
+                "year": year,
+                "month": month,
+                "day": day,
+                "id": product_id,
+            }
+        )
+        return self._read_metadata(json_url)
+
     def get_sentinel_urls(self, product_ids, bands=None):
         """Receive the download urls and time stamps for a list of Sentinel2
         product ids from AWS service
 
+        The productInfo.json files are read concurrently by
+        SENTINEL_METADATA_WORKERS threads and cached in the
+        SENTINEL_METADATA_CACHE_DIR directory.
+
         1. Transform the Sentinel ID into the path of the productInfo.json url
            that is required to get the tile urls
         2. Parse the productInfo.json file and extract the tile urls
@@ -187,37 +328,18 @@ class AWSSentinel2AInterface(object):
                 if band not in self.sentinel_bands:
                     raise Exception("Unknown Sentinel-2 band name <%s>" % band)
 
-            result = []
-
-            for product_id in product_ids:
-                product_id = product_id.replace(".SAFE", "")
-
-                year, month, day = get_sentinel_date(product_id)
-
-                # Get the product info JSON file
-                json_url = (
-                    "%(base)s/products/%(year)s/%(month)s/%(day)s/%(id)s/"
-                    "productInfo.json"
-                    % {
-                        "base": self.aws_sentinel_base_url,
-                        "year": year,
-                        "month": month,
-                        "day": day,
-                        "id": product_id,
-                    }
-                )
-
-                response = urlopen(json_url)
-                product_info = response.read()
-
-                try:
-                    info = json_loads(product_info)
-                except Exception:
-                    raise Exception(
-                        "Unable to read the productInfo.json file from URL: "
-                        "%s. Error: %s" % (json_url, product_info)
-                    )
+            product_ids = [
+                product_id.replace(".SAFE", "") for product_id in product_ids
+            ]
+            num_workers = min(
+                max(self.config.SENTINEL_METADATA_WORKERS, 1),
+                max(len(product_ids), 1),
+            )
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                infos = list(executor.map(self._get_product_info, product_ids))
 
+            result = []
+            for product_id, info in zip(product_ids, infos):
                 if info:
                     scene_entry = self._parse_scene_info(
                         bands, product_id, info
@@ -338,14 +460,5 @@ class AWSSentinel2AInterface(object):
 
         """
         # Get the tile info url that contains the tile footprint geojson
-        response = urlopen(tile_entry["info"])
-        tile_info = response.read()
-
-        try:
-            info = json_loads(tile_info)
-        except Exception:
-            raise Exception(
-                "Unable to read the info json file from URL: %s. Error: %s"
-                % (tile_entry["info"], tile_info)
-            )
+        info = self._read_metadata(tile_entry["info"])
         return json_dumps(info["tileDataGeometry"])
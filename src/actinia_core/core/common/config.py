@@ -384,6 +384,14 @@ class Configuration(object):
         # Separate configuration for queue_type for synchronous requests which
         # might not want to be queued.
         self.QUEUE_TYPE_OVERWRITE = "local"
+        # The maximum number of job queue objects that are kept per process,
+        # the least recently used queue is dropped if the limit is reached
+        self.QUEUE_REGISTRY_SIZE = 1024
+        # The selection of the worker queue of a job for QUEUE_TYPE = redis.
+        # "least_loaded": The queue with the fewest waiting and running jobs,
+        #           that is listened to by a worker
+        # "round_robin": The queues are used in turn
+        self.QUEUE_ROUTING = "least_loaded"
 
         """
         MISC
@@ -399,6 +407,92 @@ class Configuration(object):
         self.DOWNLOAD_CACHE_QUOTA = 100
         # If True the interim results (temporary mapset) are saved
         self.SAVE_INTERIM_RESULTS = False
+        # The maximum number of bytes of stdout and stderr of each executable
+        # that are stored in the process log (head and tail). The complete
+        # output is spooled to disk and can be downloaded as resource.
+        self.PROCESS_OUTPUT_BUFFER_SIZE = 1048576
+        # The stdout size in bytes from which on parsed table, columns and
+        # list outputs are exported as resource instead of being part of the
+        # response document
+        self.STDOUT_PARSER_RESULT_LIMIT = 10485760
+        # Read the metadata of raster layers directly from the GRASS GIS
+        # database files in the API process instead of running r.info in a
+        # worker
+        self.NATIVE_METADATA_READER = True
+        # The maximum number of map layer metadata entries that are cached
+        # in each API process
+        self.METADATA_CACHE_SIZE = 1024
+        # The time in seconds that map layer, STRDS and mapset listings are
+        # cached in each API process. Changes of the listed directories
+        # invalidate the cache entries earlier.
+        self.LISTING_CACHE_TTL = 10
+        # The directory of the rendered tile cache, that must be accessible by
+        # the API processes and the actinia workers
+        self.TILE_CACHE_DIR = "/tmp/actinia_tile_cache"
+        # The maximum size of the tile cache in Megabyte
+        self.TILE_CACHE_MAX_SIZE = 1024
+        # The time in seconds that clients may cache rendered tiles
+        self.TILE_CACHE_MAX_AGE = 3600
+        # The number of tiles per row and column that are rendered at once
+        self.METATILE_SIZE = 8
+        # The maximum zoom level of rendered tiles
+        self.TILE_MAX_ZOOM = 22
+        # The maximum number of map layers that can be rendered in a single
+        # batch render request
+        self.RENDER_BATCH_LIMIT = 100
+        # The default compression level of rendered PNG images from 0
+        # (fastest) to 9 (smallest image)
+        self.RENDER_PNG_COMPRESSION = 6
+        # The expiration time in seconds of the mapset locks of running jobs,
+        # the locks are renewed by a heartbeat every third of this time
+        self.MAPSET_LOCK_TTL = 60
+        # The maximum time in seconds a job waits in the queue for a locked
+        # mapset, 0 to fail immediately
+        self.MAPSET_LOCK_WAIT_TIMEOUT = 0
+        # The maximum time in seconds a job waits for the readers of a mapset
+        # before it merges its results into the mapset
+        self.MAPSET_MERGE_WAIT_TIMEOUT = 3600
+        # The maximum time in seconds a job waits for the merge into a mapset
+        # to finish before it reads the mapset
+        self.MAPSET_READ_WAIT_TIMEOUT = 300
+        # The number of threads that stage the directories of a mapset in
+        # parallel before it is merged
+        self.MAPSET_MERGE_WORKERS = 4
+        # The directory that caches the metadata files of Sentinel-2 scenes,
+        # an empty string disables the cache
+        self.SENTINEL_METADATA_CACHE_DIR = "/tmp/actinia_sentinel_metadata"
+        # The number of threads that request the metadata files of
+        # Sentinel-2 scenes concurrently
+        self.SENTINEL_METADATA_WORKERS = 8
+        # The maximum number of independent processes of a job that run in
+        # parallel, e.g. the band imports of Sentinel-2 scenes
+        self.PARALLEL_PROCESS_WORKERS = 4
+        # The directory that caches the results of STAC searches, an empty
+        # string disables the cache
+        self.STAC_SEARCH_CACHE_DIR = "/tmp/actinia_stac_search_cache"
+        # The time in seconds that the results of STAC searches are cached
+        self.STAC_SEARCH_CACHE_TTL = 3600
+        # The interval in seconds in which the storage usage counters of the
+        # download cache and the resource storage are reconciled with the
+        # size of the directories
+        self.STORAGE_USAGE_RECONCILE_INTERVAL = 3600
+        # If True the results of ephemeral process chains are cached and
+        # returned for identical process chains as long as the referenced
+        # mapsets are unchanged
+        self.PROCESS_RESULT_CACHE = False
+        # The time in seconds that process chain results are cached, results
+        # with resources in S3 or GCS are cached for at most half of the
+        # lifetime of the resource urls
+        self.PROCESS_RESULT_CACHE_TTL = 3600
+        # The maximum number of cached process chain results
+        self.PROCESS_RESULT_CACHE_SIZE = 1000
+        # The maximum number of process chains that can be submitted in a
+        # single batch processing request
+        self.PROCESSING_BATCH_LIMIT = 1000
+        # The expiration time in seconds of the configurations and user
+        # credentials that are stored in redis by their hash when jobs are
+        # enqueued. Jobs that wait longer in a queue fail.
+        self.JOB_PAYLOAD_TTL = 864000
 
         """
         LOGGING
@@ -454,6 +548,18 @@ class Configuration(object):
         # Webhook finished retry
         self.WEBHOOK_RETRIES = 6
         self.WEBHOOK_SLEEP = 10
+        # Deliver the webhooks out-of-band by a webhook dispatcher
+        # (scripts/webhook-dispatcher) instead of the job process
+        self.WEBHOOK_DISPATCHER = False
+        # The number of concurrent requests of a webhook dispatcher
+        self.WEBHOOK_DISPATCHER_WORKERS = 8
+        # The number of concurrent requests to the same webhook host
+        self.WEBHOOK_MAX_CONNECTIONS_PER_TARGET = 2
+        # The maximum waiting time in seconds of the exponential backoff,
+        # starting with WEBHOOK_SLEEP
+        self.WEBHOOK_BACKOFF_MAX = 600
+        # The timeout in seconds of a webhook request
+        self.WEBHOOK_TIMEOUT = 10
 
     def __str__(self):
         string = ""
@@ -545,6 +651,10 @@ class Configuration(object):
         )
         config.set("QUEUE", "QUEUE_TYPE", self.QUEUE_TYPE)
         config.set("QUEUE", "QUEUE_TYPE_OVERWRITE", self.QUEUE_TYPE_OVERWRITE)
+        config.set(
+            "QUEUE", "QUEUE_REGISTRY_SIZE", str(self.QUEUE_REGISTRY_SIZE)
+        )
+        config.set("QUEUE", "QUEUE_ROUTING", self.QUEUE_ROUTING)
 
         config.add_section("MISC")
         config.set("MISC", "DOWNLOAD_CACHE", self.DOWNLOAD_CACHE)
@@ -556,6 +666,94 @@ class Configuration(object):
         config.set(
             "MISC", "SAVE_INTERIM_RESULTS", str(self.SAVE_INTERIM_RESULTS)
         )
+        config.set(
+            "MISC",
+            "PROCESS_OUTPUT_BUFFER_SIZE",
+            str(self.PROCESS_OUTPUT_BUFFER_SIZE),
+        )
+        config.set(
+            "MISC",
+            "STDOUT_PARSER_RESULT_LIMIT",
+            str(self.STDOUT_PARSER_RESULT_LIMIT),
+        )
+        config.set(
+            "MISC", "NATIVE_METADATA_READER", str(self.NATIVE_METADATA_READER)
+        )
+        config.set(
+            "MISC", "METADATA_CACHE_SIZE", str(self.METADATA_CACHE_SIZE)
+        )
+        config.set("MISC", "LISTING_CACHE_TTL", str(self.LISTING_CACHE_TTL))
+        config.set("MISC", "TILE_CACHE_DIR", self.TILE_CACHE_DIR)
+        config.set(
+            "MISC", "TILE_CACHE_MAX_SIZE", str(self.TILE_CACHE_MAX_SIZE)
+        )
+        config.set("MISC", "TILE_CACHE_MAX_AGE", str(self.TILE_CACHE_MAX_AGE))
+        config.set("MISC", "METATILE_SIZE", str(self.METATILE_SIZE))
+        config.set("MISC", "TILE_MAX_ZOOM", str(self.TILE_MAX_ZOOM))
+        config.set("MISC", "RENDER_BATCH_LIMIT", str(self.RENDER_BATCH_LIMIT))
+        config.set(
+            "MISC", "RENDER_PNG_COMPRESSION", str(self.RENDER_PNG_COMPRESSION)
+        )
+        config.set("MISC", "MAPSET_LOCK_TTL", str(self.MAPSET_LOCK_TTL))
+        config.set(
+            "MISC",
+            "MAPSET_LOCK_WAIT_TIMEOUT",
+            str(self.MAPSET_LOCK_WAIT_TIMEOUT),
+        )
+        config.set(
+            "MISC",
+            "MAPSET_MERGE_WAIT_TIMEOUT",
+            str(self.MAPSET_MERGE_WAIT_TIMEOUT),
+        )
+        config.set(
+            "MISC",
+            "MAPSET_READ_WAIT_TIMEOUT",
+            str(self.MAPSET_READ_WAIT_TIMEOUT),
+        )
+        config.set(
+            "MISC", "MAPSET_MERGE_WORKERS", str(self.MAPSET_MERGE_WORKERS)
+        )
+        config.set(
+            "MISC",
+            "SENTINEL_METADATA_CACHE_DIR",
+            self.SENTINEL_METADATA_CACHE_DIR,
+        )
+        config.set(
+            "MISC",
+            "SENTINEL_METADATA_WORKERS",
+            str(self.SENTINEL_METADATA_WORKERS),
+        )
+        config.set(
+            "MISC",
+            "PARALLEL_PROCESS_WORKERS",
+            str(self.PARALLEL_PROCESS_WORKERS),
+        )
+        config.set("MISC", "STAC_SEARCH_CACHE_DIR", self.STAC_SEARCH_CACHE_DIR)
+        config.set(
+            "MISC", "STAC_SEARCH_CACHE_TTL", str(self.STAC_SEARCH_CACHE_TTL)
+        )
+        config.set(
+            "MISC",
+            "STORAGE_USAGE_RECONCILE_INTERVAL",
+            str(self.STORAGE_USAGE_RECONCILE_INTERVAL),
+        )
+        config.set(
+            "MISC", "PROCESS_RESULT_CACHE", str(self.PROCESS_RESULT_CACHE)
+        )
+        config.set(
+            "MISC",
+            "PROCESS_RESULT_CACHE_TTL",
+            str(self.PROCESS_RESULT_CACHE_TTL),
+        )
+        config.set(
+            "MISC",
+            "PROCESS_RESULT_CACHE_SIZE",
+            str(self.PROCESS_RESULT_CACHE_SIZE),
+        )
+        config.set(
+            "MISC", "PROCESSING_BATCH_LIMIT", str(self.PROCESSING_BATCH_LIMIT)
+        )
+        config.set("MISC", "JOB_PAYLOAD_TTL", str(self.JOB_PAYLOAD_TTL))
 
         config.add_section("LOGGING")
         config.set("LOGGING", "LOG_INTERFACE", self.LOG_INTERFACE)
@@ -596,6 +794,23 @@ class Configuration(object):
         config.add_section("WEBHOOK")
         config.set("WEBHOOK", "WEBHOOK_RETRIES", str(self.WEBHOOK_RETRIES))
         config.set("WEBHOOK", "WEBHOOK_SLEEP", str(self.WEBHOOK_SLEEP))
+        config.set(
+            "WEBHOOK", "WEBHOOK_DISPATCHER", str(self.WEBHOOK_DISPATCHER)
+        )
+        config.set(
+            "WEBHOOK",
+            "WEBHOOK_DISPATCHER_WORKERS",
+            str(self.WEBHOOK_DISPATCHER_WORKERS),
+        )
+        config.set(
+            "WEBHOOK",
+            "WEBHOOK_MAX_CONNECTIONS_PER_TARGET",
+            str(self.WEBHOOK_MAX_CONNECTIONS_PER_TARGET),
+        )
+        config.set(
+            "WEBHOOK", "WEBHOOK_BACKOFF_MAX", str(self.WEBHOOK_BACKOFF_MAX)
+        )
+        config.set("WEBHOOK", "WEBHOOK_TIMEOUT", str(self.WEBHOOK_TIMEOUT))
 
         with open(path, "w") as configfile:
             config.write(configfile)
@@ -759,6 +974,12 @@ class Configuration(object):
                     self.QUEUE_TYPE_OVERWRITE = config.get(
                         "QUEUE", "QUEUE_TYPE_OVERWRITE"
                     )
+                if config.has_option("QUEUE", "QUEUE_REGISTRY_SIZE"):
+                    self.QUEUE_REGISTRY_SIZE = config.getint(
+                        "QUEUE", "QUEUE_REGISTRY_SIZE"
+                    )
+                if config.has_option("QUEUE", "QUEUE_ROUTING"):
+                    self.QUEUE_ROUTING = config.get("QUEUE", "QUEUE_ROUTING")
 
             if config.has_section("MISC"):
                 if config.has_option("MISC", "DOWNLOAD_CACHE"):
@@ -777,6 +998,114 @@ class Configuration(object):
                     self.SAVE_INTERIM_RESULTS = config.getboolean(
                         "MISC", "SAVE_INTERIM_RESULTS"
                     )
+                if config.has_option("MISC", "PROCESS_OUTPUT_BUFFER_SIZE"):
+                    self.PROCESS_OUTPUT_BUFFER_SIZE = config.getint(
+                        "MISC", "PROCESS_OUTPUT_BUFFER_SIZE"
+                    )
+                if config.has_option("MISC", "STDOUT_PARSER_RESULT_LIMIT"):
+                    self.STDOUT_PARSER_RESULT_LIMIT = config.getint(
+                        "MISC", "STDOUT_PARSER_RESULT_LIMIT"
+                    )
+                if config.has_option("MISC", "NATIVE_METADATA_READER"):
+                    self.NATIVE_METADATA_READER = config.getboolean(
+                        "MISC", "NATIVE_METADATA_READER"
+                    )
+                if config.has_option("MISC", "METADATA_CACHE_SIZE"):
+                    self.METADATA_CACHE_SIZE = config.getint(
+                        "MISC", "METADATA_CACHE_SIZE"
+                    )
+                if config.has_option("MISC", "LISTING_CACHE_TTL"):
+                    self.LISTING_CACHE_TTL = config.getfloat(
+                        "MISC", "LISTING_CACHE_TTL"
+                    )
+                if config.has_option("MISC", "TILE_CACHE_DIR"):
+                    self.TILE_CACHE_DIR = config.get("MISC", "TILE_CACHE_DIR")
+                if config.has_option("MISC", "TILE_CACHE_MAX_SIZE"):
+                    self.TILE_CACHE_MAX_SIZE = config.getint(
+                        "MISC", "TILE_CACHE_MAX_SIZE"
+                    )
+                if config.has_option("MISC", "TILE_CACHE_MAX_AGE"):
+                    self.TILE_CACHE_MAX_AGE = config.getint(
+                        "MISC", "TILE_CACHE_MAX_AGE"
+                    )
+                if config.has_option("MISC", "METATILE_SIZE"):
+                    self.METATILE_SIZE = config.getint("MISC", "METATILE_SIZE")
+                if config.has_option("MISC", "TILE_MAX_ZOOM"):
+                    self.TILE_MAX_ZOOM = config.getint("MISC", "TILE_MAX_ZOOM")
+                if config.has_option("MISC", "RENDER_BATCH_LIMIT"):
+                    self.RENDER_BATCH_LIMIT = config.getint(
+                        "MISC", "RENDER_BATCH_LIMIT"
+                    )
+                if config.has_option("MISC", "RENDER_PNG_COMPRESSION"):
+                    self.RENDER_PNG_COMPRESSION = config.getint(
+                        "MISC", "RENDER_PNG_COMPRESSION"
+                    )
+                if config.has_option("MISC", "MAPSET_LOCK_TTL"):
+                    self.MAPSET_LOCK_TTL = config.getint(
+                        "MISC", "MAPSET_LOCK_TTL"
+                    )
+                if config.has_option("MISC", "MAPSET_LOCK_WAIT_TIMEOUT"):
+                    self.MAPSET_LOCK_WAIT_TIMEOUT = config.getfloat(
+                        "MISC", "MAPSET_LOCK_WAIT_TIMEOUT"
+                    )
+                if config.has_option("MISC", "MAPSET_MERGE_WAIT_TIMEOUT"):
+                    self.MAPSET_MERGE_WAIT_TIMEOUT = config.getfloat(
+                        "MISC", "MAPSET_MERGE_WAIT_TIMEOUT"
+                    )
+                if config.has_option("MISC", "MAPSET_READ_WAIT_TIMEOUT"):
+                    self.MAPSET_READ_WAIT_TIMEOUT = config.getfloat(
+                        "MISC", "MAPSET_READ_WAIT_TIMEOUT"
+                    )
+                if config.has_option("MISC", "MAPSET_MERGE_WORKERS"):
+                    self.MAPSET_MERGE_WORKERS = config.getint(
+                        "MISC", "MAPSET_MERGE_WORKERS"
+                    )
+                if config.has_option("MISC", "SENTINEL_METADATA_CACHE_DIR"):
+                    self.SENTINEL_METADATA_CACHE_DIR = config.get(
+                        "MISC", "SENTINEL_METADATA_CACHE_DIR"
+                    )
+                if config.has_option("MISC", "SENTINEL_METADATA_WORKERS"):
+                    self.SENTINEL_METADATA_WORKERS = config.getint(
+                        "MISC", "SENTINEL_METADATA_WORKERS"
+                    )
+                if config.has_option("MISC", "PARALLEL_PROCESS_WORKERS"):
+                    self.PARALLEL_PROCESS_WORKERS = config.getint(
+                        "MISC", "PARALLEL_PROCESS_WORKERS"
+                    )
+                if config.has_option("MISC", "STAC_SEARCH_CACHE_DIR"):
+                    self.STAC_SEARCH_CACHE_DIR = config.get(
+                        "MISC", "STAC_SEARCH_CACHE_DIR"
+                    )
+                if config.has_option("MISC", "STAC_SEARCH_CACHE_TTL"):
+                    self.STAC_SEARCH_CACHE_TTL = config.getfloat(
+                        "MISC", "STAC_SEARCH_CACHE_TTL"
+                    )
+                if config.has_option(
+                    "MISC", "STORAGE_USAGE_RECONCILE_INTERVAL"
+                ):
+                    self.STORAGE_USAGE_RECONCILE_INTERVAL = config.getint(
+                        "MISC", "STORAGE_USAGE_RECONCILE_INTERVAL"
+                    )
+                if config.has_option("MISC", "PROCESS_RESULT_CACHE"):
+                    self.PROCESS_RESULT_CACHE = config.getboolean(
+                        "MISC", "PROCESS_RESULT_CACHE"
+                    )
+                if config.has_option("MISC", "PROCESS_RESULT_CACHE_TTL"):
+                    self.PROCESS_RESULT_CACHE_TTL = config.getint(
+                        "MISC", "PROCESS_RESULT_CACHE_TTL"
+                    )
+                if config.has_option("MISC", "PROCESS_RESULT_CACHE_SIZE"):
+                    self.PROCESS_RESULT_CACHE_SIZE = config.getint(
+                        "MISC", "PROCESS_RESULT_CACHE_SIZE"
+                    )
+                if config.has_option("MISC", "PROCESSING_BATCH_LIMIT"):
+                    self.PROCESSING_BATCH_LIMIT = config.getint(
+                        "MISC", "PROCESSING_BATCH_LIMIT"
+                    )
+                if config.has_option("MISC", "JOB_PAYLOAD_TTL"):
+                    self.JOB_PAYLOAD_TTL = config.getint(
+                        "MISC", "JOB_PAYLOAD_TTL"
+                    )
 
             if config.has_section("LOGGING"):
                 if config.has_option("LOGGING", "LOG_INTERFACE"):
@@ -853,6 +1182,28 @@ class Configuration(object):
                     )
                 if config.has_option("WEBHOOK", "WEBHOOK_SLEEP"):
                     self.WEBHOOK_SLEEP = config.get("WEBHOOK", "WEBHOOK_SLEEP")
+                if config.has_option("WEBHOOK", "WEBHOOK_DISPATCHER"):
+                    self.WEBHOOK_DISPATCHER = config.getboolean(
+                        "WEBHOOK", "WEBHOOK_DISPATCHER"
+                    )
+                if config.has_option("WEBHOOK", "WEBHOOK_DISPATCHER_WORKERS"):
+                    self.WEBHOOK_DISPATCHER_WORKERS = config.getint(
+                        "WEBHOOK", "WEBHOOK_DISPATCHER_WORKERS"
+                    )
+                if config.has_option(
+                    "WEBHOOK", "WEBHOOK_MAX_CONNECTIONS_PER_TARGET"
+                ):
+                    self.WEBHOOK_MAX_CONNECTIONS_PER_TARGET = config.getint(
+                        "WEBHOOK", "WEBHOOK_MAX_CONNECTIONS_PER_TARGET"
+                    )
+                if config.has_option("WEBHOOK", "WEBHOOK_BACKOFF_MAX"):
+                    self.WEBHOOK_BACKOFF_MAX = config.getint(
+                        "WEBHOOK", "WEBHOOK_BACKOFF_MAX"
+                    )
+                if config.has_option("WEBHOOK", "WEBHOOK_TIMEOUT"):
+                    self.WEBHOOK_TIMEOUT = config.getint(
+                        "WEBHOOK", "WEBHOOK_TIMEOUT"
+                    )
 
         def print_warning(cfg_section, cfg_key, file_val=None, env_val=None):
             if env_val is None:
@@ -25,6 +25,7 @@
 Process chain
 """
 import os
+import re
 import requests
 
 from actinia_core.core.stac_importer_interface import STACImporter as STAC
@@ -367,8 +368,11 @@ class ProcessChainConverter(object):
     def _get_sentinel_import_commands(self, entries):
         """Method to get the Sentinel download and import commands using GCS
         without login
+
+        The scenes are downloaded and imported in parallel, each scene by its
+        own process list.
         """
-        sentinel_commands = []
+        scene_process_lists = []
         scenes_bands = self._collect_sentinel_scenes_bands(entries)
         for scene in scenes_bands:
             scene_id = scene["scene_id"]
@@ -404,8 +408,18 @@ class ProcessChainConverter(object):
                     ],
                 )
                 scene_commands.append(p)
-            sentinel_commands.extend(scene_commands)
-        return sentinel_commands
+            scene_process_lists.append(scene_commands)
+
+        if len(scene_process_lists) == 1:
+            return scene_process_lists[0]
+        p = Process(
+            exec_type="parallel",
+            executable="parallel",
+            executable_params=scene_process_lists,
+            id="sentinel_import",
+            skip_permission_check=True,
+        )
+        return [p]
 
     def _get_postgis_import_command(self, entry):
         """Helper method to get the import command for postgis.
@@ -863,7 +877,8 @@ class ProcessChainConverter(object):
             elif entry["import_descr"]["type"].lower() == "stac":
                 stac = STAC()
                 stac_commands = stac.get_stac_import_download_commands(
-                    stac_entry=entry
+                    stac_entry=entry,
+                    temp_file_path=self.generate_temp_file_path(),
                 )
 
                 downimp_list.extend(stac_commands)
@@ -1590,6 +1605,59 @@ def check_required_keys_for_download_process_chain(entry):
         )
 
 
+# The placeholders {{name}} of the parameters of process chain templates
+TEMPLATE_PARAMETER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def render_process_chain_template(template, parameters):
+    """Create a process chain from a process chain template by replacing
+    the placeholders {{name}} in all strings of the template with the
+    values of the parameters
+
+    A string that consists of a single placeholder is replaced by the value
+    of the parameter with its type, otherwise the value is inserted as
+    string.
+
+    Args:
+        template: The process chain template or a part of it
+        parameters (dict): The values of the parameters by name
+
+    Returns:
+        The process chain
+
+    Raises:
+        If a parameter of the template is missing an AsyncProcessError is
+        raised
+    """
+    if isinstance(template, dict):
+        return {
+            key: render_process_chain_template(value, parameters)
+            for key, value in template.items()
+        }
+    if isinstance(template, list):
+        return [
+            render_process_chain_template(value, parameters)
+            for value in template
+        ]
+    if not isinstance(template, str) or "{{" not in template:
+        return template
+
+    def get_value(match):
+        if match.group(1) not in parameters:
+            raise AsyncProcessError(
+                "Missing parameter <%s> of the process chain template"
+                % match.group(1)
+            )
+        return parameters[match.group(1)]
+
+    match = TEMPLATE_PARAMETER.fullmatch(template)
+    if match is not None:
+        return get_value(match)
+    return TEMPLATE_PARAMETER.sub(
+        lambda match: str(get_value(match)), template
+    )
+
+
 def test_process_chain():
     from pprint import pprint
 
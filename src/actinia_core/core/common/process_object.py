@@ -47,11 +47,16 @@ class Process(object):
         stdin_source=None,
         skip_permission_check=False,
         id=None,
+        env=None,
+        download_cache=False,
     ):
         """
 
         Args:
-            exec_type (str): The executable type, can be "grass" or "exec"
+            exec_type (str): The executable type, can be "grass", "exec" or
+                             "parallel". The executable_params of a
+                             "parallel" process are lists of processes, that
+                             are executed concurrently.
             executable (str): The name and path of the executable, eg:
                               g.version
             or /bin/cp executable_params (list): A list of parameters (strings)
@@ -66,6 +71,12 @@ class Process(object):
                                             contain module he has no
                                             permissions to use.
             id (str): The unique id of the process
+            env (dict): Additional environment variables of the process
+            download_cache (boolean): The process moves the file given as
+                                      first parameter into the download
+                                      cache of the user, its size is
+                                      counted against the download cache
+                                      quota
         """
 
         self.exec_type = exec_type
@@ -79,6 +90,8 @@ class Process(object):
         self.stderr = None
         self.skip_permission_check = skip_permission_check
         self.id = id
+        self.env = env
+        self.download_cache = download_cache
 
     def set_stdouts(self, stdout, stderr):
         """Set the content of stdout and stderr of this process
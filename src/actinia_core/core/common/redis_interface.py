@@ -24,11 +24,31 @@
 """
 Redis connection interface
 """
+import threading
+import time
+from collections import OrderedDict
+
 import rq
-from redis import Redis
+from redis import ConnectionPool, Redis
+from rq.registry import StartedJobRegistry
+from rq.worker_registration import WORKERS_BY_QUEUE_KEY
 from actinia_core.core.redis_user import redis_user_interface
 from actinia_core.core.redis_api_log import redis_api_log_interface
+from actinia_core.core.redis_job_payload import (
+    pack_job_args,
+    redis_job_payload_interface,
+)
+from actinia_core.core.redis_mapset_generation import (
+    redis_mapset_generation_interface,
+)
+from actinia_core.core.redis_process_result_cache import (
+    redis_process_result_cache_interface,
+)
+from actinia_core.core.redis_storage_usage import (
+    redis_storage_usage_interface,
+)
 from actinia_core.core.logging_interface import log
+from actinia_core.processing.common.utils import start_job_from_payload
 from .config import global_config
 from .process_queue import enqueue_job as enqueue_job_local
 
@@ -39,8 +59,166 @@ __copyright__ = (
 )
 __maintainer__ = "mundialis"
 
-job_queues = []
-redis_conn = None
+# Select the least loaded worker queue for each of several jobs atomically.
+# The load of a queue is the number of its waiting jobs and of its running
+# jobs in the started job registry, that are not yet expired. Queues that
+# are not listened to by any worker are only used if no queue has a worker.
+# Each selected queue is charged with its new job, so that the jobs of a
+# batch are distributed. Ties are broken round robin by the counter, hence
+# concurrent selections on idle queues do not all pick the first queue.
+#
+# KEYS: the job list, the started job registry and the worker set of each
+#       queue, followed by the round robin counter
+# ARGV[1]: the number of queues
+# ARGV[2]: the number of jobs
+# ARGV[3]: the current unix time in seconds
+lua_select_worker_queues = """
+local num_queues = tonumber(ARGV[1])
+local num_jobs = tonumber(ARGV[2])
+local offset = redis.call('INCRBY', KEYS[3 * num_queues + 1], num_jobs)
+local loads = {}
+local listened = {}
+local any_listened = false
+for i = 1, num_queues do
+    local base = 3 * (i - 1)
+    loads[i] = redis.call('LLEN', KEYS[base + 1])
+        + redis.call('ZCOUNT', KEYS[base + 2], ARGV[3], '+inf')
+    listened[i] = redis.call('SCARD', KEYS[base + 3]) > 0
+    any_listened = any_listened or listened[i]
+end
+local selected = {}
+for job = 1, num_jobs do
+    local best = nil
+    for j = 0, num_queues - 1 do
+        local i = (offset + job + j) % num_queues + 1
+        if (listened[i] or not any_listened)
+            and (best == nil or loads[i] < loads[best]) then
+            best = i
+        end
+    end
+    loads[best] = loads[best] + 1
+    selected[job] = best - 1
+end
+return selected
+"""
+
+
+class QueueRegistry(object):
+    """Registry of the rq job queues by name
+
+    All queues share a single pooled connection to the redis queue server.
+    The registry keeps at most QUEUE_REGISTRY_SIZE queues and drops the
+    least recently used queue, so that the queues of the per job queue type
+    do not accumulate in long running processes. A dropped queue is created
+    again on its next use, the jobs of a queue are stored in redis.
+    """
+
+    def __init__(self):
+        self.queues = OrderedDict()
+        self.connection = None
+        self.select_worker_queues_script = None
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        """Return the pooled connection to the redis queue server, that is
+        created on first use"""
+        with self.lock:
+            if self.connection is None:
+                kwargs = dict()
+                kwargs["host"] = global_config.REDIS_QUEUE_SERVER_URL
+                kwargs["port"] = global_config.REDIS_QUEUE_SERVER_PORT
+                password = global_config.REDIS_QUEUE_SERVER_PASSWORD
+                if password and password is not None:
+                    kwargs["password"] = password
+                self.connection = Redis(
+                    connection_pool=ConnectionPool(**kwargs)
+                )
+            return self.connection
+
+    def select_worker_queues(self, count):
+        """Select the worker queues of several jobs of the redis queue type
+
+        Args:
+            count (int): The number of jobs
+
+        Returns:
+            list: The names of the selected queues, one for each job
+        """
+        num_queues = max(global_config.NUMBER_OF_WORKERS, 1)
+        queue_names = [
+            "%s_%i" % (global_config.WORKER_QUEUE_PREFIX, i)
+            for i in range(num_queues)
+        ]
+        connection = self.get_connection()
+
+        if global_config.QUEUE_ROUTING == "round_robin":
+            num = connection.incr("actinia_worker_count", count)
+            return [
+                queue_names[(num - count + 1 + i) % num_queues]
+                for i in range(count)
+            ]
+
+        with self.lock:
+            if self.select_worker_queues_script is None:
+                self.select_worker_queues_script = connection.register_script(
+                    lua_select_worker_queues
+                )
+            script = self.select_worker_queues_script
+        keys = []
+        for queue_name in queue_names:
+            keys.append(rq.Queue(queue_name, connection=connection).key)
+            keys.append(
+                StartedJobRegistry(queue_name, connection=connection).key
+            )
+            keys.append(WORKERS_BY_QUEUE_KEY % queue_name)
+        keys.append("actinia_worker_count")
+        selected = script(
+            keys=keys, args=[num_queues, count, int(time.time())]
+        )
+        return [queue_names[int(index)] for index in selected]
+
+    def get_queue(self, queue_name):
+        """Return the job queue with the provided name
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            rq.Queue: The job queue
+        """
+        with self.lock:
+            queue = self.queues.get(queue_name)
+            if queue is not None:
+                self.queues.move_to_end(queue_name)
+                return queue
+        connection = self.get_connection()
+        log.info(
+            "Create queue %s with server %s:%s"
+            % (
+                queue_name,
+                global_config.REDIS_QUEUE_SERVER_URL,
+                global_config.REDIS_QUEUE_SERVER_PORT,
+            )
+        )
+        queue = rq.Queue(queue_name, connection=connection)
+        with self.lock:
+            queue = self.queues.setdefault(queue_name, queue)
+            self.queues.move_to_end(queue_name)
+            while len(self.queues) > max(global_config.QUEUE_REGISTRY_SIZE, 1):
+                self.queues.popitem(last=False)
+        return queue
+
+    def clear(self):
+        """Remove all queues and disconnect the pooled connection"""
+        with self.lock:
+            self.queues.clear()
+            if self.connection is not None:
+                self.connection.connection_pool.disconnect()
+                self.connection = None
+                self.select_worker_queues_script = None
+
+
+queue_registry = QueueRegistry()
 
 
 def connect(host, port, pw=None):
@@ -58,39 +236,20 @@ def connect(host, port, pw=None):
     """
     redis_user_interface.connect(host, port, pw)
     redis_api_log_interface.connect(host, port, pw)
+    redis_storage_usage_interface.connect(host, port, pw)
+    redis_process_result_cache_interface.connect(host, port, pw)
+    redis_mapset_generation_interface.connect(host, port, pw)
+    redis_job_payload_interface.connect(host, port, pw)
 
 
 def disconnect():
     """Disconnect all required redis interfaces"""
     redis_user_interface.disconnect()
     redis_api_log_interface.disconnect()
-
-
-def __create_job_queue(queue_name):
-    """Create a single job queue for asynchronous processing
-
-    Args:
-        queue_name: The name of the queue
-
-    """
-    # Redis work queue and connection
-    global job_queues, redis_conn
-
-    host = global_config.REDIS_QUEUE_SERVER_URL
-    port = global_config.REDIS_QUEUE_SERVER_PORT
-    password = global_config.REDIS_QUEUE_SERVER_PASSWORD
-
-    kwargs = dict()
-    kwargs["host"] = host
-    kwargs["port"] = port
-    if password and password is not None:
-        kwargs["password"] = password
-    redis_conn = Redis(**kwargs)
-
-    string = "Create queue %s with server %s:%s" % (queue_name, host, port)
-    log.info(string)
-    queue = rq.Queue(queue_name, connection=redis_conn)
-    job_queues.append(queue)
+    redis_storage_usage_interface.disconnect()
+    redis_process_result_cache_interface.disconnect()
+    redis_mapset_generation_interface.disconnect()
+    redis_job_payload_interface.disconnect()
 
 
 def __enqueue_job_redis(queue, timeout, func, *args):
@@ -116,41 +275,50 @@ def __enqueue_job_redis(queue, timeout, func, *args):
     log.info(ret)
 
 
+def __get_queue_type(queue_type_overwrite):
+    if queue_type_overwrite:
+        return global_config.QUEUE_TYPE_OVERWRITE
+    return global_config.QUEUE_TYPE
+
+
+def __get_job_queues(queue_type, rdcs):
+    """Return the redis job queues of several jobs and set their names in
+    the resource data containers"""
+    if queue_type == "per_job":
+        queue_names = [
+            "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, rdc.resource_id)
+            for rdc in rdcs
+        ]
+    else:
+        # The sorted queue names assign consecutive jobs to the same queue
+        queue_names = sorted(queue_registry.select_worker_queues(len(rdcs)))
+    queues = []
+    for rdc, queue_name in zip(rdcs, queue_names):
+        rdc.set_queue_name(queue_name)
+        queues.append(queue_registry.get_queue(queue_name))
+    return queues
+
+
 def enqueue_job(timeout, func, *args, queue_type_overwrite=None):
     """Write the provided function in a queue
 
+    The configuration and the user credentials of the jobs in the redis
+    queue types are stored in redis by their hash, see pack_job_args().
+
     Args:
         timeout: The timeout of the process
         func: The function to call from the subprocess/worker
         *args: The function arguments
     """
-    global job_queues, redis_conn
-    num_queues = global_config.NUMBER_OF_WORKERS
-    queue_type = global_config.QUEUE_TYPE
     queue_name = "local"
-    if queue_type_overwrite:
-        queue_type = global_config.QUEUE_TYPE_OVERWRITE
+    queue_type = __get_queue_type(queue_type_overwrite)
 
-    if queue_type == "per_job":
-        resource_id = args[0].resource_id
-        queue_name = "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, resource_id)
-        __create_job_queue(queue_name)
-        for i in job_queues:
-            if i.name == queue_name:
-                args[0].set_queue_name(queue_name)
-                __enqueue_job_redis(i, timeout, func, *args)
-
-    elif queue_type == "redis":
-        if job_queues == []:
-            for i in range(num_queues):
-                queue_name = "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, i)
-                __create_job_queue(queue_name)
-        # The redis incr approach is used here
-        # to chose for each job a different queue
-        num = redis_conn.incr("actinia_worker_count", 1)
-        current_queue = num % num_queues
-        args[0].set_queue_name(job_queues[current_queue].name)
-        __enqueue_job_redis(job_queues[current_queue], timeout, func, *args)
+    if queue_type in ("per_job", "redis"):
+        queue = __get_job_queues(queue_type, [args[0]])[0]
+        args = pack_job_args([args], global_config)[0]
+        __enqueue_job_redis(
+            queue, timeout, start_job_from_payload, func, *args
+        )
 
     elif queue_type == "local":
         # __enqueue_job_local(timeout, func, *args)
@@ -163,3 +331,52 @@ def enqueue_job(timeout, func, *args, queue_type_overwrite=None):
 
         p = Process(target=func, args=args)
         p.start()
+
+
+def enqueue_jobs(timeout, func, args_list, queue_type_overwrite=None):
+    """Write several jobs of the provided function in the queues at once
+
+    The jobs of the redis queue types are enqueued with a single pipeline,
+    hence with a single round trip to the redis queue server. The jobs are
+    grouped by their location, so that the jobs of a location are assigned
+    to as few worker queues as the load balancing allows and each worker
+    processes consecutive jobs in the same location. The configurations and
+    user credentials of the jobs are stored in redis with a single request,
+    see pack_job_args().
+
+    Args:
+        timeout: The timeout of the processes
+        func: The function to call from the subprocess/worker
+        args_list: A list with the function arguments of each job, the first
+                   argument must be the resource data container
+    """
+    queue_type = __get_queue_type(queue_type_overwrite)
+
+    if queue_type not in ("per_job", "redis"):
+        for args in args_list:
+            enqueue_job(
+                timeout, func, *args, queue_type_overwrite=queue_type_overwrite
+            )
+        return
+
+    args_list = sorted(args_list, key=lambda args: str(args[0].location_name))
+    job_datas = OrderedDict()
+    queues = __get_job_queues(queue_type, [args[0] for args in args_list])
+    args_list = pack_job_args(args_list, global_config)
+    for queue, args in zip(queues, args_list):
+        job_data = rq.Queue.prepare_data(
+            start_job_from_payload,
+            args=(func,) + tuple(args),
+            ttl=global_config.REDIS_QUEUE_JOB_TTL,
+            result_ttl=global_config.REDIS_QUEUE_JOB_TTL,
+        )
+        job_datas.setdefault(queue.name, (queue, []))[1].append(job_data)
+
+    with queue_registry.get_connection().pipeline() as pipeline:
+        for queue, queue_job_datas in job_datas.values():
+            log.info(
+                "Enqueue %i jobs in queue %s"
+                % (len(queue_job_datas), queue.name)
+            )
+            queue.enqueue_many(queue_job_datas, pipeline=pipeline)
+        pipeline.execute()
@@ -432,6 +432,10 @@ class Sentinel2Processing(object):
     def get_sentinel2_download_process_list_without_query(self):
         """Create the process list to download sentinel2 scenes
         from the Google Cloud Storage.
+
+        i.sentinel.download writes directly into the download cache, hence
+        these downloads are not quota-checked beforehand. They are counted
+        when the download cache usage is reconciled with the file system.
         """
         download_commands = []
 
@@ -534,6 +538,7 @@ class Sentinel2Processing(object):
                     executable_params=copy_params,
                     id=f"mv_{os.path.basename(dest)}",
                     skip_permission_check=True,
+                    download_cache=True,
                 )
                 download_commands.append(p)
 
@@ -544,18 +549,12 @@ class Sentinel2Processing(object):
 
         1. Import footprint with v.import
         2. Set the timestamp of the footprint with v.timestamp
+        3. Import and crop the bands in parallel
+        4. Set the region to the footprint, aligned to the last band
 
-        For each band:
-
-            0. Use gdaltrans to select the footprint bbox
-               that should be imported from the raster layer
-            1. Import band with r.import
-            2. Use g.region to set the region to footprint
-            3. Create a mask with r.mask
-            4. Compute the cropped version of the band with r.mapcalc
-            5. Set the timestamp with r.timestamp
-            6. Remove uncropped version with g.remove
-            7. Remove the mask with r.mask
+        The bands are imported by independent process lists, that neither
+        change the region nor the mask of the mapset and hence can run in
+        parallel.
 
         Returns:
             list[Process]:
@@ -594,58 +593,34 @@ class Sentinel2Processing(object):
         )
         import_commands.append(p)
 
-        # Import and update
+        band_process_lists = []
+        map_name = None
         for key in self.import_file_info:
             if key == "footprint":
                 continue
             input_file, map_name = self.import_file_info[key]
-            temp_map_name = map_name + "_uncropped"
-            cropped_input_file = input_file + ".vrt"
-
-            # Create a boundingbox around the footprint to avoid
-            # the projection of the scene with unused values
-            gdal_translate = "/usr/bin/gdal_translate"
-            gdal_translate_params = list()
-            # -projwin ulx uly lrx lry
-            gdal_translate_params.append("-projwin")
-            gdal_translate_params.append("%f" % self.bbox[0])
-            gdal_translate_params.append("%f" % self.bbox[1])
-            gdal_translate_params.append("%f" % self.bbox[2])
-            gdal_translate_params.append("%f" % self.bbox[3])
-            gdal_translate_params.append("-of")
-            gdal_translate_params.append("vrt")
-            gdal_translate_params.append("-projwin_srs")
-            gdal_translate_params.append("EPSG:4326")
-            gdal_translate_params.append(input_file)
-            gdal_translate_params.append(cropped_input_file)
-
-            p = Process(
-                exec_type="exec",
-                executable=gdal_translate,
-                executable_params=gdal_translate_params,
-                id=f"gdal_translate_{self.product_id}",
-                skip_permission_check=True,
+            band_process_lists.append(
+                self._get_band_import_process_list(
+                    input_file, map_name, timestamp
+                )
             )
-            import_commands.append(p)
 
+        if band_process_lists:
             p = Process(
-                exec_type="grass",
-                executable="r.import",
-                executable_params=[
-                    "input=%s" % cropped_input_file,
-                    "output=%s" % temp_map_name,
-                    "--q",
-                ],
-                id=f"r_import_{self.product_id}",
+                exec_type="parallel",
+                executable="parallel",
+                executable_params=band_process_lists,
+                id=f"import_bands_{self.product_id}",
                 skip_permission_check=True,
             )
             import_commands.append(p)
 
+            # The following processes expect the region of the footprint
             p = Process(
                 exec_type="grass",
                 executable="g.region",
                 executable_params=[
-                    "align=%s" % temp_map_name,
+                    "align=%s" % map_name,
                     "vector=%s" % self.product_id,
                     "-g",
                 ],
@@ -654,56 +629,154 @@ class Sentinel2Processing(object):
             )
             import_commands.append(p)
 
-            p = Process(
-                exec_type="grass",
-                executable="r.mask",
-                executable_params=["vector=%s" % self.product_id],
-                id=f"r_mask_{self.product_id}",
-                skip_permission_check=True,
-            )
-            import_commands.append(p)
+        return import_commands
 
-            p = Process(
-                exec_type="grass",
-                executable="r.mapcalc",
-                executable_params=[
-                    "expression=%s = float(%s)" % (map_name, temp_map_name)
-                ],
-                id=f"create_float_rastermap_{self.product_id}",
-                skip_permission_check=True,
-            )
-            import_commands.append(p)
+    def _get_band_import_process_list(self, input_file, map_name, timestamp):
+        """Generate the import and preprocessing process list of a band
 
-            p = Process(
-                exec_type="grass",
-                executable="r.timestamp",
-                executable_params=["map=%s" % map_name, "date=%s" % timestamp],
-                id=f"r_timestamp_{self.product_id}",
-                skip_permission_check=True,
-            )
-            import_commands.append(p)
+        The band is cropped to the footprint by an explicit mask expression
+        in a named region, that is set by the WIND_OVERRIDE environment
+        variable, instead of the global mask and region of the mapset.
 
-            p = Process(
-                exec_type="grass",
-                executable="g.remove",
-                executable_params=[
-                    "type=raster",
-                    "name=%s" % temp_map_name,
-                    "-f",
-                ],
-                id=f"remove_tmp_map_{self.product_id}",
-                skip_permission_check=True,
-            )
-            import_commands.append(p)
+        0. Use gdaltrans to select the footprint bbox
+           that should be imported from the raster layer
+        1. Import band with r.import
+        2. Save the region of the footprint aligned to the band with g.region
+        3. Rasterize the footprint in this region with v.to.rast
+        4. Compute the cropped version of the band with r.mapcalc
+        5. Set the timestamp with r.timestamp
+        6. Remove uncropped version and footprint with g.remove
+        7. Remove the region with g.remove
 
-            p = Process(
-                exec_type="grass",
-                executable="r.mask",
-                executable_params=["-r"],
-                id=f"remove_mask_{self.product_id}",
-                skip_permission_check=True,
-            )
-            import_commands.append(p)
+        Args:
+            input_file (str): The path of the band file
+            map_name (str): The name of the raster map of the band
+            timestamp (str): The GRASS GIS timestamp of the scene
+
+        Returns:
+            list[Process]:
+            The list of import commands
+
+        """
+        import_commands = []
+        temp_map_name = map_name + "_uncropped"
+        footprint_map_name = map_name + "_footprint"
+        region_name = map_name + "_region"
+        region_env = {"WIND_OVERRIDE": region_name}
+        cropped_input_file = input_file + ".vrt"
+
+        # Create a boundingbox around the footprint to avoid
+        # the projection of the scene with unused values
+        gdal_translate = "/usr/bin/gdal_translate"
+        gdal_translate_params = list()
+        # -projwin ulx uly lrx lry
+        gdal_translate_params.append("-projwin")
+        gdal_translate_params.append("%f" % self.bbox[0])
+        gdal_translate_params.append("%f" % self.bbox[1])
+        gdal_translate_params.append("%f" % self.bbox[2])
+        gdal_translate_params.append("%f" % self.bbox[3])
+        gdal_translate_params.append("-of")
+        gdal_translate_params.append("vrt")
+        gdal_translate_params.append("-projwin_srs")
+        gdal_translate_params.append("EPSG:4326")
+        gdal_translate_params.append(input_file)
+        gdal_translate_params.append(cropped_input_file)
+
+        p = Process(
+            exec_type="exec",
+            executable=gdal_translate,
+            executable_params=gdal_translate_params,
+            id=f"gdal_translate_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="r.import",
+            executable_params=[
+                "input=%s" % cropped_input_file,
+                "output=%s" % temp_map_name,
+                "--q",
+            ],
+            id=f"r_import_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="g.region",
+            executable_params=[
+                "align=%s" % temp_map_name,
+                "vector=%s" % self.product_id,
+                "save=%s" % region_name,
+                "-u",
+            ],
+            id=f"save_g_region_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="v.to.rast",
+            executable_params=[
+                "input=%s" % self.product_id,
+                "output=%s" % footprint_map_name,
+                "type=area",
+                "use=val",
+                "--q",
+            ],
+            id=f"rasterize_footprint_{map_name}",
+            skip_permission_check=True,
+            env=region_env,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="r.mapcalc",
+            executable_params=[
+                "expression=%s = if(isnull(%s), null(), float(%s))"
+                % (map_name, footprint_map_name, temp_map_name)
+            ],
+            id=f"create_float_rastermap_{map_name}",
+            skip_permission_check=True,
+            env=region_env,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="r.timestamp",
+            executable_params=["map=%s" % map_name, "date=%s" % timestamp],
+            id=f"r_timestamp_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="g.remove",
+            executable_params=[
+                "type=raster",
+                "name=%s,%s" % (temp_map_name, footprint_map_name),
+                "-f",
+            ],
+            id=f"remove_tmp_map_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
+
+        p = Process(
+            exec_type="grass",
+            executable="g.remove",
+            executable_params=["type=region", "name=%s" % region_name, "-f"],
+            id=f"remove_region_{map_name}",
+            skip_permission_check=True,
+        )
+        import_commands.append(p)
 
         return import_commands
 
@@ -308,6 +308,7 @@ class GrassModuleRunner(ProcessLogging):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         stdin=subprocess.PIPE,
+        env=None,
     ):
         """This function runs a process and logs its stdout and stderr output.
         It either returns the subprocess or its error id, stderr and stdout
@@ -320,6 +321,8 @@ class GrassModuleRunner(ProcessLogging):
                            subprocess.PIPE
             stderr (file): A file object that receives stderr, default
                            subprocess.PIPE
+            env (dict): The environment of the process, default the
+                        environment of this process
 
         Returns:
             subprocess:
@@ -329,7 +332,11 @@ class GrassModuleRunner(ProcessLogging):
         try:
             self.log_info("Run process: " + str(inputlist))
             proc = subprocess.Popen(
-                args=inputlist, stdout=stdout, stderr=stderr, stdin=stdin
+                args=inputlist,
+                stdout=stdout,
+                stderr=stderr,
+                stdin=stdin,
+                env=env,
             )
             self.runPID = proc.pid
             self.log_debug("Process pid: " + str(self.runPID))
@@ -412,6 +419,7 @@ class GrassModuleRunner(ProcessLogging):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         stdin=subprocess.PIPE,
+        env=None,
     ):
         """Set all input and output options and start the module
 
@@ -433,6 +441,8 @@ class GrassModuleRunner(ProcessLogging):
                            subprocess.PIPE
             stdin (file): A file object that provides stdin, default
                           subprocess.PIPE
+            env (dict): The environment of the module, default the
+                        environment of this process
 
         Returns:
             subprocess:
@@ -450,7 +460,12 @@ class GrassModuleRunner(ProcessLogging):
             errorid, stdout_buff, stderr_buff = self._run_process(parameter)
         else:
             return self._run_process(
-                parameter, raw=raw, stdout=stdout, stderr=stderr, stdin=stdin
+                parameter,
+                raw=raw,
+                stdout=stdout,
+                stderr=stderr,
+                stdin=stdin,
+                env=env,
             )
 
         if errorid != 0:
@@ -538,6 +553,7 @@ class GrassInitializer(ProcessLogging):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         stdin=subprocess.PIPE,
+        env=None,
     ):
         """Run a grass module
 
@@ -551,6 +567,8 @@ class GrassInitializer(ProcessLogging):
                            subprocess.PIPE
             stderr (file): A file object that receives stderr, default
                            subprocess.PIPE
+            env (dict): The environment of the module, default the
+                        environment of this process
 
         Raises:
             This method raises a GrassInitError Exception in case
@@ -570,6 +588,7 @@ class GrassInitializer(ProcessLogging):
             stdout=stdout,
             stderr=stderr,
             stdin=stdin,
+            env=env,
         )
 
     def clean_up(self):
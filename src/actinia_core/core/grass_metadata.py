@@ -0,0 +1,902 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Read the metadata of GRASS GIS map layers directly from the files of the
+GRASS GIS database, without starting a GRASS GIS session
+
+The raster metadata is read from the cellhd/, cell_misc/, hist/ and cats/
+files of a mapset and is returned in the same key/value form as
+"r.info -gre". Maps that can not be read reliably (reclassified maps, maps
+linked by r.external) result in None, so that the caller can fall back to
+r.info.
+
+The map layer, STRDS and mapset listings are created by scanning the
+directories of the mapsets and reading the temporal SQLite database, like
+g.list, t.list and g.mapsets would report them.
+"""
+
+import hashlib
+import os
+import re
+import struct
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# Coordinates in latitude-longitude locations are stored as dd:mm:ss.sssN
+DMS_PATTERN = re.compile(
+    r"^(\d+)(?::(\d+)(?::(\d+(?:\.\d*)?))?)?([NSEWnsew])?$"
+)
+
+# The files of a raster map that contribute to its metadata, relative to
+# the mapset directory
+RASTER_METADATA_FILES = (
+    "cellhd",
+    "hist",
+    "cats",
+    "cell_misc/%s/range",
+    "cell_misc/%s/f_range",
+    "cell_misc/%s/f_format",
+    "cell_misc/%s/timestamp",
+    "cell_misc/%s/units",
+    "cell_misc/%s/vertical_datum",
+    "cell_misc/%s/semantic_label",
+    "cell_misc/%s/gdal",
+)
+
+# The files and element directories of a mapset that determine the content
+# of its map layers, space time datasets and regions
+MAPSET_FILES = ("WIND", "DEFAULT_WIND", "PROJ_INFO", "PROJ_UNITS", "VAR")
+MAPSET_ELEMENTS = (
+    "cellhd",
+    "cell",
+    "fcell",
+    "cell_misc",
+    "colr",
+    "cats",
+    "hist",
+    "grid3",
+    "vector",
+    "group",
+    "windows",
+    "tgis",
+)
+
+
+class MetadataCache(object):
+    """Thread safe least recently used cache of map layer metadata
+
+    The cache keys must contain the modification times of the files the
+    metadata was read from, so that modified maps are read again and the
+    outdated entries are evicted by newer ones. Optionally the entries
+    expire after a time to live.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """Constructor
+
+        Args:
+            maxsize (int): The maximum number of entries
+            ttl (float): The time to live of an entry in seconds, None for
+                         entries that only expire by eviction
+
+        """
+        self.maxsize = int(maxsize)
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value of a key or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expiration, value = entry
+            if expiration is not None and expiration < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store a value and evict the least recently used entries"""
+        if self.maxsize <= 0:
+            return
+        expiration = None
+        if self.ttl is not None:
+            expiration = time.monotonic() + self.ttl
+        with self.lock:
+            self.entries[key] = (expiration, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_metadata_cache = None
+_listing_cache = None
+
+
+def get_metadata_cache(config):
+    """Return the metadata cache of this process, that is created on first
+    use with the size from the configuration
+
+    Args:
+        config (Configuration): The actinia configuration
+
+    Returns:
+        MetadataCache: The process wide metadata cache
+    """
+    global _metadata_cache
+    if _metadata_cache is None:
+        _metadata_cache = MetadataCache(maxsize=config.METADATA_CACHE_SIZE)
+    return _metadata_cache
+
+
+def get_listing_cache(config):
+    """Return the map layer and mapset listing cache of this process, that
+    is created on first use with the size and the time to live from the
+    configuration
+
+    Args:
+        config (Configuration): The actinia configuration
+
+    Returns:
+        MetadataCache: The process wide listing cache
+    """
+    global _listing_cache
+    if _listing_cache is None:
+        _listing_cache = MetadataCache(
+            maxsize=config.METADATA_CACHE_SIZE, ttl=config.LISTING_CACHE_TTL
+        )
+    return _listing_cache
+
+
+def find_mapset_path(config, user_group, location_name, mapset_name):
+    """Return the path of a mapset like it is visible in a processing job:
+    mapsets of the persistent database are preferred over mapsets of the
+    user group database
+
+    Args:
+        config (Configuration): The actinia configuration
+        user_group (str): The user group
+        location_name (str): The name of the location
+        mapset_name (str): The name of the mapset
+
+    Returns:
+        str: The path of the mapset or None if it does not exist
+    """
+    for grass_data_base in (
+        config.GRASS_DATABASE,
+        os.path.join(config.GRASS_USER_DATABASE, user_group),
+    ):
+        mapset_path = os.path.join(grass_data_base, location_name, mapset_name)
+        if os.path.isdir(mapset_path):
+            return mapset_path
+    return None
+
+
+def scan_coordinate(value):
+    """Convert a coordinate or resolution of a region header into a float
+
+    Args:
+        value (str): A decimal number or a dd:mm:ss.sss[NSEW] string
+
+    Returns:
+        float: The value in map units or decimal degrees
+
+    Raises:
+        ValueError: If the value can not be converted
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = DMS_PATTERN.match(value.strip())
+    if match is None:
+        raise ValueError("Invalid coordinate <%s>" % value)
+    degrees, minutes, seconds, hemisphere = match.groups()
+    result = (
+        float(degrees)
+        + float(minutes or 0) / 60.0
+        + float(seconds or 0) / 3600.0
+    )
+    if hemisphere and hemisphere.upper() in ("S", "W"):
+        result = -result
+    return result
+
+
+def format_double(value, precision=15):
+    """Format a number like GRASS GIS modules do with "%.<precision>g" """
+    return "%.*g" % (precision, value)
+
+
+def _read_text(path, default=None):
+    try:
+        with open(path, "r", errors="replace") as text_file:
+            return text_file.read()
+    except FileNotFoundError:
+        return default
+
+
+def read_header_file(path):
+    """Read a GRASS GIS "key: value" file like cellhd or f_format
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        dict: The stripped values by lower case key, None if the file does
+              not exist
+    """
+    text = _read_text(path)
+    if text is None:
+        return None
+    header = dict()
+    for line in text.splitlines():
+        if ":" in line:
+            key, value = line.split(":", 1)
+            header[key.strip().lower()] = value.strip()
+    return header
+
+
+def read_history_file(path):
+    """Read the history file of a raster map
+
+    Args:
+        path (str): The path of the hist/ file
+
+    Returns:
+        dict: The history entries, None if the file does not exist
+    """
+    text = _read_text(path)
+    if text is None:
+        return None
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    lines += [""] * (8 - len(lines))
+    return {
+        "date": lines[0].strip(),
+        "title": lines[1].strip(),
+        "mapset": lines[2].strip(),
+        "creator": lines[3].strip(),
+        "maptype": lines[4].strip(),
+        "source1": lines[5].strip(),
+        "source2": lines[6].strip(),
+        "description": lines[7].strip(),
+        "comments": "".join(line.strip() for line in lines[8:]),
+    }
+
+
+def read_cats_file(path):
+    """Read the number of categories and the title of a raster map
+
+    Args:
+        path (str): The path of the cats/ file
+
+    Returns:
+        tuple: (number of categories, title)
+    """
+    text = _read_text(path, default="")
+    lines = text.split("\n")
+    ncats = 0
+    match = re.match(r"#\s*(\d+)", lines[0])
+    if match is not None:
+        ncats = int(match.group(1))
+    title = lines[1].strip() if len(lines) > 1 else ""
+    return ncats, title
+
+
+def read_range(mapset_path, raster_name, datatype):
+    """Read the range of a raster map
+
+    Args:
+        mapset_path (str): The path of the mapset
+        raster_name (str): The name of the raster map
+        datatype (str): CELL, FCELL or DCELL
+
+    Returns:
+        tuple: (min, max) as formatted strings, "NULL" for maps that contain
+               only no data, or None if the range file does not exist
+    """
+    misc_path = os.path.join(mapset_path, "cell_misc", raster_name)
+    if datatype == "CELL":
+        text = _read_text(os.path.join(misc_path, "range"))
+        if text is None:
+            return None
+        values = [int(value) for value in text.split()]
+        if not values:
+            return "NULL", "NULL"
+        return str(min(values)), str(max(values))
+
+    try:
+        with open(os.path.join(misc_path, "f_range"), "rb") as range_file:
+            data = range_file.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < 16:
+        return "NULL", "NULL"
+    # The range is stored as two doubles in XDR (big endian) byte order
+    zmin, zmax = struct.unpack(">dd", data[:16])
+    precision = 7 if datatype == "FCELL" else 15
+    return format_double(zmin, precision), format_double(zmax, precision)
+
+
+def get_raster_cache_key(mapset_path, raster_name):
+    """Create the cache key of a raster map from the modification times of
+    all files that contribute to its metadata
+
+    Args:
+        mapset_path (str): The path of the mapset
+        raster_name (str): The name of the raster map
+
+    Returns:
+        tuple: The cache key
+    """
+    mtimes = []
+    for file_name in RASTER_METADATA_FILES:
+        if "%s" in file_name:
+            path = os.path.join(mapset_path, file_name % raster_name)
+        else:
+            path = os.path.join(mapset_path, file_name, raster_name)
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return ("raster", mapset_path, raster_name, tuple(mtimes))
+
+
+def read_raster_info(mapset_path, raster_name, cache=None):
+    """Read the metadata of a raster map as "r.info -gre" would report it
+
+    Args:
+        mapset_path (str): The path of the mapset
+        raster_name (str): The name of the raster map
+        cache (MetadataCache): The optional metadata cache
+
+    Returns:
+        dict: The raster metadata or None if the map does not exist or can
+              not be read without r.info
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = get_raster_cache_key(mapset_path, raster_name)
+        # The region header is required
+        if cache_key[-1][0] is None:
+            return None
+        raster_info = cache.get(cache_key)
+        if raster_info is not None:
+            return dict(raster_info)
+
+    try:
+        raster_info = _read_raster_info(mapset_path, raster_name)
+    except (ValueError, OSError, struct.error):
+        return None
+
+    if raster_info is not None and cache is not None:
+        cache.put(cache_key, raster_info)
+        raster_info = dict(raster_info)
+    return raster_info
+
+
+def _read_raster_info(mapset_path, raster_name):
+    cellhd_path = os.path.join(mapset_path, "cellhd", raster_name)
+    misc_path = os.path.join(mapset_path, "cell_misc", raster_name)
+
+    text = _read_text(cellhd_path)
+    # Reclassified maps are resolved by the GRASS GIS library
+    if text is None or text.lstrip().lower().startswith("reclass"):
+        return None
+    # Maps linked by r.external are read by GDAL
+    if os.path.exists(os.path.join(misc_path, "gdal")):
+        return None
+    cellhd = read_header_file(cellhd_path)
+
+    history = read_history_file(os.path.join(mapset_path, "hist", raster_name))
+    if history is None:
+        return None
+
+    f_format = read_header_file(os.path.join(misc_path, "f_format"))
+    if f_format is None:
+        datatype = "CELL"
+    elif f_format.get("type") == "double":
+        datatype = "DCELL"
+    else:
+        datatype = "FCELL"
+
+    value_range = read_range(mapset_path, raster_name, datatype)
+    if value_range is None:
+        return None
+
+    ncats, title = read_cats_file(
+        os.path.join(mapset_path, "cats", raster_name)
+    )
+
+    def read_misc(file_name):
+        value = _read_text(os.path.join(misc_path, file_name), "").strip()
+        return value if value else "none"
+
+    rows = int(cellhd["rows"])
+    cols = int(cellhd["cols"])
+    location_path = os.path.dirname(os.path.normpath(mapset_path))
+
+    raster_info = dict()
+    # r.info -g
+    for key in ("north", "south", "east", "west"):
+        raster_info[key] = format_double(scan_coordinate(cellhd[key]))
+    raster_info["nsres"] = format_double(scan_coordinate(cellhd["n-s resol"]))
+    raster_info["ewres"] = format_double(scan_coordinate(cellhd["e-w resol"]))
+    raster_info["rows"] = str(rows)
+    raster_info["cols"] = str(cols)
+    raster_info["cells"] = str(rows * cols)
+    raster_info["datatype"] = datatype
+    raster_info["ncats"] = str(ncats)
+    # r.info -r
+    raster_info["min"], raster_info["max"] = value_range
+    # r.info -e
+    raster_info["map"] = raster_name
+    raster_info["maptype"] = history["maptype"]
+    raster_info["mapset"] = os.path.basename(os.path.normpath(mapset_path))
+    raster_info["location"] = os.path.basename(location_path)
+    raster_info["database"] = os.path.dirname(location_path)
+    raster_info["date"] = '"%s"' % history["date"]
+    raster_info["creator"] = '"%s"' % history["creator"]
+    raster_info["title"] = '"%s"' % title
+    raster_info["timestamp"] = '"%s"' % read_misc("timestamp")
+    raster_info["units"] = '"%s"' % read_misc("units")
+    raster_info["vdatum"] = '"%s"' % read_misc("vertical_datum")
+    raster_info["semantic_label"] = '"%s"' % read_misc("semantic_label")
+    raster_info["source1"] = '"%s"' % history["source1"]
+    raster_info["source2"] = '"%s"' % history["source2"]
+    raster_info["description"] = '"%s"' % history["description"]
+    if history["comments"]:
+        raster_info["comments"] = '"%s"' % history["comments"]
+    return raster_info
+
+
+def glob_to_regex(pattern):
+    """Convert a g.list wildcard pattern into a regular expression
+
+    Like g.list, the wildcards *, ? and [...] as well as alternatives in
+    braces {a,b} are supported and the whole map name must match.
+
+    Args:
+        pattern (str): The wildcard pattern
+
+    Returns:
+        str: The regular expression
+    """
+    regex = ""
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "*":
+            regex += ".*"
+        elif char == "?":
+            regex += "."
+        elif char == "[":
+            end = pattern.find("]", index + 1) + 1
+            if end == 0:
+                regex += re.escape(char)
+            else:
+                regex += pattern[index:end]
+                index = end - 1
+        elif char == "{":
+            regex += "("
+            depth += 1
+        elif char == "}" and depth > 0:
+            regex += ")"
+            depth -= 1
+        elif char == "," and depth > 0:
+            regex += "|"
+        else:
+            regex += re.escape(char)
+        index += 1
+    return "^%s$" % regex
+
+
+def compile_name_pattern(pattern=None, regex=False):
+    """Compile the name pattern of a map layer listing
+
+    Args:
+        pattern (str): A g.list wildcard pattern or a regular expression,
+                       None or empty to match all names
+        regex (bool): True if the pattern is a regular expression
+
+    Returns:
+        re.Pattern: The compiled pattern or None to match all names
+
+    Raises:
+        ValueError: If the pattern is not valid
+    """
+    if not pattern:
+        return None
+    try:
+        if regex is True:
+            return re.compile(pattern)
+        return re.compile(glob_to_regex(pattern))
+    except re.error as e:
+        raise ValueError("Invalid pattern <%s>: %s" % (pattern, str(e)))
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cached(cache, key, read):
+    if cache is not None:
+        value = cache.get(key)
+        if value is not None:
+            return list(value)
+    value = read()
+    if value is not None and cache is not None:
+        cache.put(key, value)
+        value = list(value)
+    return value
+
+
+def list_map_layers(
+    mapset_path, layer_type, pattern=None, regex=False, cache=None
+):
+    """List the raster or vector map layers of a mapset like g.list
+
+    Raster maps are identified by their cellhd/ file, vector maps by their
+    vector/<name>/head file.
+
+    Args:
+        mapset_path (str): The path of the mapset
+        layer_type (str): raster or vector
+        pattern (str): The optional name pattern
+        regex (bool): True if the pattern is a regular expression
+        cache (MetadataCache): The optional listing cache
+
+    Returns:
+        list: The sorted names of the map layers or None if the layer type
+              is not supported
+
+    Raises:
+        ValueError: If the pattern is not valid
+    """
+    if layer_type == "raster":
+        element_path = os.path.join(mapset_path, "cellhd")
+    elif layer_type == "vector":
+        element_path = os.path.join(mapset_path, "vector")
+    else:
+        return None
+    compiled_pattern = compile_name_pattern(pattern, regex)
+
+    def read():
+        try:
+            names = os.listdir(element_path)
+        except FileNotFoundError:
+            return []
+        if layer_type == "raster":
+            names = [
+                name
+                for name in names
+                if os.path.isfile(os.path.join(element_path, name))
+            ]
+        else:
+            names = [
+                name
+                for name in names
+                if os.path.isfile(os.path.join(element_path, name, "head"))
+            ]
+        if compiled_pattern is not None:
+            names = [name for name in names if compiled_pattern.search(name)]
+        return sorted(names)
+
+    # Adding, removing or renaming map layers changes the element
+    # directory, which invalidates the cache entry
+    key = (
+        "layers",
+        element_path,
+        pattern,
+        regex,
+        _get_mtime(element_path),
+    )
+    return _cached(cache, key, read)
+
+
+def _get_entry_state(path, entry):
+    try:
+        stat = entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def get_mapset_fingerprint(mapset_path):
+    """Compute the fingerprint of the content of a mapset from the
+    modification times and sizes of its files
+
+    The entries of the element directories are scanned, the directories of
+    the cell_misc/ and vector/ elements one level deeper. Creating,
+    removing and rewriting map layers changes the fingerprint.
+
+    Args:
+        mapset_path (str): The path of the mapset
+
+    Returns:
+        str: The hexadecimal fingerprint or None if the mapset does not
+             exist
+    """
+    if not os.path.isdir(mapset_path):
+        return None
+    state = []
+    for file_name in MAPSET_FILES:
+        try:
+            stat = os.stat(os.path.join(mapset_path, file_name))
+            state.append((file_name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+    for element in MAPSET_ELEMENTS:
+        try:
+            entries = sorted(
+                os.scandir(os.path.join(mapset_path, element)),
+                key=lambda entry: entry.name,
+            )
+        except OSError:
+            continue
+        for entry in entries:
+            path = os.path.join(element, entry.name)
+            state.append(_get_entry_state(path, entry))
+            if element in ("cell_misc", "vector") and entry.is_dir(
+                follow_symlinks=False
+            ):
+                try:
+                    files = sorted(
+                        os.scandir(entry.path), key=lambda file: file.name
+                    )
+                except OSError:
+                    continue
+                for file in files:
+                    state.append(
+                        _get_entry_state(os.path.join(path, file.name), file)
+                    )
+    key = repr((os.path.abspath(mapset_path), state))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_tgis_db_path(mapset_path):
+    """Return the path of the default temporal SQLite database of a mapset
+
+    Args:
+        mapset_path (str): The path of the mapset
+
+    Returns:
+        str: The path of the database, that may not exist yet, or None if
+             the mapset uses another temporal database that was set with
+             t.connect
+    """
+    var = read_header_file(os.path.join(mapset_path, "VAR")) or {}
+    driver = var.get("tgisdb_driver", "sqlite")
+    database = var.get("tgisdb_database", "")
+    if driver != "sqlite" or (
+        database
+        and "$GISDBASE/$LOCATION_NAME/$MAPSET/tgis/sqlite.db" != database
+    ):
+        return None
+    return os.path.join(mapset_path, "tgis", "sqlite.db")
+
+
+def list_strds(mapset_path, cache=None):
+    """List the space time raster datasets of a mapset like
+    "t.list type=strds column=name where=mapset='<mapset>'"
+
+    The datasets are read from the default temporal SQLite database of the
+    mapset.
+
+    Args:
+        mapset_path (str): The path of the mapset
+        cache (MetadataCache): The optional listing cache
+
+    Returns:
+        list: The names of the STRDS ordered by id or None if the mapset
+              uses another temporal database
+    """
+    mapset_name = os.path.basename(os.path.normpath(mapset_path))
+    db_path = os.path.join(mapset_path, "tgis", "sqlite.db")
+    var_path = os.path.join(mapset_path, "VAR")
+
+    def read():
+        if get_tgis_db_path(mapset_path) is None:
+            return None
+        if not os.path.isfile(db_path):
+            return []
+        try:
+            connection = sqlite3.connect("file:%s?mode=ro" % db_path, uri=True)
+            try:
+                rows = connection.execute(
+                    "SELECT name FROM strds_base WHERE mapset = ? "
+                    "ORDER BY id",
+                    (mapset_name,),
+                ).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return None
+        return [row[0] for row in rows]
+
+    key = ("strds", db_path, _get_mtime(db_path), _get_mtime(var_path))
+    return _cached(cache, key, read)
+
+
+def list_mapsets(location_path, cache=None):
+    """List the mapsets of a location like "g.mapsets -l"
+
+    Args:
+        location_path (str): The path of the location
+        cache (MetadataCache): The optional listing cache
+
+    Returns:
+        list: The sorted names of the mapsets or None if the location does
+              not exist or contains a directory that is not a valid mapset
+    """
+
+    def read():
+        try:
+            names = os.listdir(location_path)
+        except FileNotFoundError:
+            return None
+        mapsets = []
+        for name in names:
+            mapset_path = os.path.join(location_path, name)
+            if not os.path.isdir(mapset_path):
+                continue
+            # Check if a WIND file exists to be sure it is a mapset
+            if not os.path.isfile(os.path.join(mapset_path, "WIND")):
+                return None
+            mapsets.append(name)
+        return sorted(mapsets)
+
+    key = ("mapsets", location_path, _get_mtime(location_path))
+    return _cached(cache, key, read)
+
+
+def list_strds_raster_maps(
+    mapset_path,
+    strds_name,
+    start_time=None,
+    end_time=None,
+    n=None,
+    s=None,
+    e=None,
+    w=None,
+):
+    """List the raster map layers of a STRDS with their spatial extent like
+    "t.rast.list input=<strds> columns=id,north,south,east,west" with
+    a where statement from the time and bounding box constraints
+
+    The maps are read from the default temporal SQLite database of the
+    mapset of the STRDS.
+
+    Args:
+        mapset_path (str): The path of the mapset of the STRDS
+        strds_name (str): The name of the STRDS
+        start_time (str): Select maps that start at or after this time
+        end_time (str): Select maps that end at or before this time
+        n (float): Select maps whose southern border is below this value
+        s (float): Select maps whose northern border is above this value
+        e (float): Select maps whose western border is left of this value
+        w (float): Select maps whose eastern border is right of this value
+
+    Returns:
+        list: The (id, north, south, east, west) tuples of the maps ordered
+              by start time or None if the maps can not be read from the
+              default temporal database
+    """
+    mapset_name = os.path.basename(os.path.normpath(mapset_path))
+    db_path = get_tgis_db_path(mapset_path)
+    if db_path is None or not os.path.isfile(db_path):
+        return None
+
+    where_list = []
+    parameters = []
+    for column, operator, value in (
+        ("start_time", ">=", start_time),
+        ("end_time", "<=", end_time),
+        ("south", "<=", n),
+        ("north", ">=", s),
+        ("west", "<=", e),
+        ("east", ">=", w),
+    ):
+        if value is not None:
+            where_list.append("%s %s ?" % (column, operator))
+            parameters.append(value)
+
+    try:
+        connection = sqlite3.connect("file:%s?mode=ro" % db_path, uri=True)
+        try:
+            row = connection.execute(
+                "SELECT strds_base.temporal_type, "
+                "strds_metadata.raster_register FROM strds_base "
+                "JOIN strds_metadata ON strds_base.id = strds_metadata.id "
+                "WHERE strds_base.id = ?",
+                ("%s@%s" % (strds_name, mapset_name),),
+            ).fetchone()
+            if row is None:
+                return None
+            temporal_type, register_table = row
+            # Empty STRDS have no register table
+            if register_table is None:
+                return []
+            if re.match(r"^[A-Za-z0-9_]+$", register_table) is None:
+                return None
+            view = (
+                "raster_view_rel_time"
+                if temporal_type == "relative"
+                else "raster_view_abs_time"
+            )
+            sql = (
+                "SELECT id, north, south, east, west FROM %s "
+                "WHERE id IN (SELECT id FROM %s)" % (view, register_table)
+            )
+            if where_list:
+                sql += " AND " + " AND ".join(where_list)
+            sql += " ORDER BY start_time"
+            rows = connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return None
+    return rows
+
+
+def get_union_extent(extents):
+    """Compute the union of spatial extents
+
+    Args:
+        extents: An iterable of (north, south, east, west) tuples
+
+    Returns:
+        dict: The n, s, e and w bounds of the union, None if there are no
+              extents
+    """
+    union = None
+    for north, south, east, west in extents:
+        if union is None:
+            union = {"n": north, "s": south, "e": east, "w": west}
+        else:
+            union["n"] = max(union["n"], north)
+            union["s"] = min(union["s"], south)
+            union["e"] = max(union["e"], east)
+            union["w"] = min(union["w"], west)
+    return union
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Merge engine that moves, links or copies the content of GRASS GIS mapsets
+"""
+
+import errno
+import fcntl
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# Raster, vector, group and space time data set directories/files that are
+# merged into a target mapset
+MAPSET_ELEMENTS = (
+    "cell",
+    "misc",
+    "fcell",
+    "cats",
+    "cellhd",
+    "cell_misc",
+    "colr",
+    "colr2",
+    "hist",
+    "vector",
+    "group",
+    "tgis",
+    "VAR",
+)
+
+# The elements whose entries are directories of a single map, that replace
+# the map directory in the target mapset as a whole
+MAP_DIRECTORY_ELEMENTS = ("cell_misc", "vector", "group")
+
+# The elements that store a raster map in a file or directory of its name
+RASTER_ELEMENTS = (
+    "cell",
+    "fcell",
+    "cats",
+    "cellhd",
+    "cell_misc",
+    "colr",
+    "hist",
+)
+
+# The elements that are modified in the staged mapset before merging, they
+# are always copied to not modify the source mapset through a hardlink
+MODIFIED_ELEMENTS = ("group", "tgis", "VAR")
+
+# The ioctl request to clone a file on copy on write file systems
+FICLONE = 0x40049409
+
+# The name of the directory in the staging mapset that receives the replaced
+# entries of the target mapset
+REPLACED_DIRECTORY = ".replaced"
+
+
+class IncompleteMergeError(OSError):
+    """The merge into a target mapset failed and could not be rolled back
+
+    Attributes:
+        replaced_path (str): The directory that keeps the replaced and stale
+                             entries of the target mapset, that were not
+                             restored
+    """
+
+    def __init__(self, message, replaced_path):
+        OSError.__init__(self, message)
+        self.replaced_path = replaced_path
+
+
+class MergeReport(object):
+    """The number of files and bytes that were moved, hardlinked, cloned
+    and copied while a mapset was staged"""
+
+    methods = ("moved", "linked", "cloned", "copied")
+
+    def __init__(self):
+        self.files = dict((method, 0) for method in self.methods)
+        self.bytes = dict((method, 0) for method in self.methods)
+
+    def add(self, method, files, size):
+        self.files[method] += files
+        self.bytes[method] += size
+
+    def update(self, report):
+        for method in self.methods:
+            self.add(method, report.files[method], report.bytes[method])
+
+    def to_dict(self):
+        return dict(
+            (
+                method,
+                {"files": self.files[method], "bytes": self.bytes[method]},
+            )
+            for method in self.methods
+        )
+
+    def __str__(self):
+        return (
+            ", ".join(
+                "%i files with %i bytes %s"
+                % (self.files[method], self.bytes[method], method)
+                for method in self.methods
+                if self.files[method] > 0
+            )
+            or "no files"
+        )
+
+
+class MergePlan(object):
+    """The entries of a staged mapset that are renamed into a target mapset
+
+    Attributes:
+        entries (list): The paths relative to the mapset of the files and map
+                        directories that are renamed into the target mapset
+        replaced (list): The entries that replace existing entries of the
+                         target mapset
+        stale (list): The entries of the target mapset that belong to a
+                      replaced raster map, but not to its new version
+        conflicts (list): The entries that can not be merged, because a file
+                          would replace a directory or vice versa
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.replaced = []
+        self.stale = []
+        self.conflicts = []
+
+
+def get_tree_size(path):
+    """Return the number of files and their total size of a file or a
+    directory tree"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        files = 0
+        size = 0
+        for root, dirs, file_names in os.walk(path):
+            for file_name in file_names:
+                files += 1
+                size += os.lstat(os.path.join(root, file_name)).st_size
+        return files, size
+    return 1, os.lstat(path).st_size
+
+
+class MapsetStager(object):
+    """Stage the content of a source mapset in a directory next to the
+    target mapset
+
+    The staging directory must be on the file system of the target mapset,
+    so that the staged entries can be renamed into the target mapset. Files
+    are moved if the source is on the same file system and can be consumed,
+    hardlinked if the source must be kept, and cloned or copied from other
+    file systems. The top level entries are staged in parallel.
+    """
+
+    def __init__(self, source_path, staging_path, keep_source, workers=4):
+        """Constructor
+
+        Args:
+            source_path (str): The path of the source mapset
+            staging_path (str): The path of the staging directory, that must
+                                not exist
+            keep_source (bool): Keep the source mapset, otherwise its entries
+                                are moved if possible
+            workers (int): The number of parallel staging threads
+        """
+        self.source_path = source_path
+        self.staging_path = staging_path
+        self.keep_source = keep_source
+        self.workers = max(int(workers), 1)
+        self.clone = True
+
+        staging_device = os.stat(os.path.dirname(staging_path)).st_dev
+        if os.stat(source_path).st_dev != staging_device:
+            self.method = "clone"
+        elif keep_source is True:
+            self.method = "link"
+        else:
+            self.method = "move"
+
+    def stage(self, elements=None):
+        """Stage the mapset
+
+        Args:
+            elements (list): The elements of the mapset to stage, None to
+                             stage the complete mapset
+
+        Returns:
+            MergeReport: The files and bytes per staging method
+        """
+        os.mkdir(self.staging_path)
+        if elements is None:
+            names = os.listdir(self.source_path)
+        else:
+            names = [
+                element
+                for element in elements
+                if os.path.lexists(os.path.join(self.source_path, element))
+            ]
+
+        report = MergeReport()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            reports = executor.map(self._stage_entry, names)
+            for entry_report in reports:
+                report.update(entry_report)
+        shutil.copystat(self.source_path, self.staging_path)
+        return report
+
+    def _stage_entry(self, name):
+        report = MergeReport()
+        source = os.path.join(self.source_path, name)
+        target = os.path.join(self.staging_path, name)
+        if name in MODIFIED_ELEMENTS and self.method == "link":
+            self._copy_tree(source, target, report, "copy")
+        else:
+            self._copy_tree(source, target, report, self.method)
+        return report
+
+    def _copy_tree(self, source, target, report, method):
+        if method == "move":
+            files, size = get_tree_size(source)
+            os.rename(source, target)
+            report.add("moved", files, size)
+        elif os.path.islink(source):
+            os.symlink(os.readlink(source), target)
+        elif os.path.isdir(source):
+            os.mkdir(target)
+            for entry in os.listdir(source):
+                self._copy_tree(
+                    os.path.join(source, entry),
+                    os.path.join(target, entry),
+                    report,
+                    method,
+                )
+            shutil.copystat(source, target)
+        elif method == "link":
+            os.link(source, target)
+            report.add("linked", 1, os.lstat(source).st_size)
+        else:
+            size = os.lstat(source).st_size
+            if method == "clone" and self.clone is True and size > 0:
+                if self._clone_file(source, target) is True:
+                    shutil.copystat(source, target)
+                    report.add("cloned", 1, size)
+                    return
+            shutil.copy2(source, target)
+            report.add("copied", 1, size)
+
+    def _clone_file(self, source, target):
+        """Clone a file on a copy on write file system, the cloning is
+        disabled after the first failure"""
+        try:
+            with open(source, "rb") as source_file:
+                with open(target, "wb") as target_file:
+                    fcntl.ioctl(
+                        target_file.fileno(), FICLONE, source_file.fileno()
+                    )
+            return True
+        except OSError as e:
+            if e.errno in (
+                errno.EBADF,
+                errno.EINVAL,
+                errno.ENOTTY,
+                errno.EOPNOTSUPP,
+                errno.EXDEV,
+            ):
+                self.clone = False
+            return False
+
+
+def _list_entries(mapset_path, element):
+    """List the files and map directories of an element relative to the
+    mapset"""
+    element_path = os.path.join(mapset_path, element)
+    if not os.path.isdir(element_path) or os.path.islink(element_path):
+        return [element]
+    if element in MAP_DIRECTORY_ELEMENTS:
+        return [
+            os.path.join(element, name) for name in os.listdir(element_path)
+        ]
+    entries = []
+    for root, dirs, files in os.walk(element_path):
+        for name in files:
+            entries.append(
+                os.path.relpath(os.path.join(root, name), mapset_path)
+            )
+    return entries
+
+
+def plan_merge(staging_path, target_path, elements=MAPSET_ELEMENTS):
+    """Plan the merge of a staged mapset into a target mapset and detect the
+    name collisions before the target mapset is modified
+
+    Args:
+        staging_path (str): The path of the staged mapset
+        target_path (str): The path of the target mapset
+        elements (list): The elements to merge
+
+    Returns:
+        MergePlan: The merge plan
+    """
+    plan = MergePlan()
+    for element in elements:
+        if not os.path.lexists(os.path.join(staging_path, element)):
+            continue
+        for entry in _list_entries(staging_path, element):
+            target = os.path.join(target_path, entry)
+            # A file of the target mapset may block a directory of the entry
+            parent = os.path.dirname(entry)
+            while parent:
+                parent_path = os.path.join(target_path, parent)
+                if os.path.lexists(parent_path) and not os.path.isdir(
+                    parent_path
+                ):
+                    plan.conflicts.append(entry)
+                    break
+                parent = os.path.dirname(parent)
+            else:
+                if os.path.lexists(target):
+                    if os.path.isdir(
+                        os.path.join(staging_path, entry)
+                    ) != os.path.isdir(target):
+                        plan.conflicts.append(entry)
+                        continue
+                    plan.replaced.append(entry)
+                plan.entries.append(entry)
+
+    # The files of a replaced raster map that its new version does not have,
+    # for example the cell file of an integer map that was replaced by a
+    # floating point map
+    cellhd = os.path.join(staging_path, "cellhd")
+    if os.path.isdir(cellhd):
+        for raster_name in os.listdir(cellhd):
+            for element in RASTER_ELEMENTS:
+                entry = os.path.join(element, raster_name)
+                if os.path.lexists(
+                    os.path.join(target_path, entry)
+                ) and not os.path.lexists(os.path.join(staging_path, entry)):
+                    plan.stale.append(entry)
+    return plan
+
+
+def _missing_directories(path):
+    """Return the directories of a path that do not exist, the deepest
+    last"""
+    missing = []
+    while path and not os.path.isdir(path):
+        missing.append(path)
+        path = os.path.dirname(path)
+    return list(reversed(missing))
+
+
+def commit_merge(staging_path, target_path, plan):
+    """Rename the planned entries of a staged mapset into the target mapset
+
+    This is the only step that modifies the target mapset. The replaced and
+    stale entries of the target mapset are moved into the staging directory
+    and removed together with it. If a rename fails, the renames that were
+    done are reverted, so that the target mapset is left unchanged.
+
+    Args:
+        staging_path (str): The path of the staged mapset
+        target_path (str): The path of the target mapset
+        plan (MergePlan): The merge plan from plan_merge()
+
+    Raises:
+        OSError: If the merge failed and the target mapset was restored
+        IncompleteMergeError: If the target mapset could not be restored
+    """
+    replaced_path = os.path.join(staging_path, REPLACED_DIRECTORY)
+    os.makedirs(replaced_path, exist_ok=True)
+    # The done renames and the created directories, in this order
+    renames = []
+    created_directories = []
+    try:
+        for number, entry in enumerate(plan.stale + plan.replaced):
+            source = os.path.join(target_path, entry)
+            dest = os.path.join(replaced_path, str(number))
+            os.rename(source, dest)
+            renames.append((source, dest))
+        for entry in plan.entries:
+            source = os.path.join(staging_path, entry)
+            target = os.path.join(target_path, entry)
+            created_directories.extend(
+                _missing_directories(os.path.dirname(target))
+            )
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(source, target)
+            renames.append((source, target))
+    except OSError as e:
+        try:
+            for source, dest in reversed(renames):
+                os.rename(dest, source)
+        except OSError as rollback_error:
+            raise IncompleteMergeError(
+                "%s, the target mapset <%s> could not be restored: %s"
+                % (str(e), target_path, str(rollback_error)),
+                replaced_path,
+            )
+        for directory in reversed(created_directories):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+        raise
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Bounded capture of stdout and stderr streams of executables
+"""
+
+import os
+import threading
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class OutputCapture(object):
+    """This class reads the output stream of a process in a background thread
+    and keeps only the head and the tail of the stream in memory.
+
+    The complete stream is spooled into a file, so that the full output
+    can be parsed or downloaded after the process finished. If the stream
+    fits into the memory buffer, the spool file is not required and will be
+    removed when calling finish().
+    """
+
+    def __init__(self, spool_path=None, buffer_size=1048576, chunk_size=65536):
+        """Constructor
+
+        Args:
+            spool_path (str): The path of the file that receives the complete
+                              stream. If None, the stream is not spooled.
+            buffer_size (int): The maximum number of bytes that are kept in
+                               memory, half of it for the head and half of it
+                               for the tail of the stream
+            chunk_size (int): The number of bytes read from the pipe at once
+
+        """
+        self.spool_path = spool_path
+        self.head_size = max(int(buffer_size) // 2, 1)
+        self.tail_size = max(int(buffer_size) - self.head_size, 1)
+        self.chunk_size = chunk_size
+
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+        self.truncated = False
+        self.thread = None
+
+    def _consume(self, stream):
+        """Read the stream chunk by chunk until EOF, update the ring buffer
+        and write the chunks into the spool file
+
+        Args:
+            stream: A binary file object, e.g. the stdout pipe of a process
+
+        """
+        spool_file = None
+        if self.spool_path is not None:
+            spool_file = open(self.spool_path, "wb")
+        try:
+            for chunk in iter(lambda: stream.read(self.chunk_size), b""):
+                self.total_bytes += len(chunk)
+                if spool_file is not None:
+                    spool_file.write(chunk)
+
+                free = self.head_size - len(self.head)
+                if free > 0:
+                    self.head.extend(chunk[:free])
+                    chunk = chunk[free:]
+                if chunk:
+                    self.tail.extend(chunk)
+                    overflow = len(self.tail) - self.tail_size
+                    if overflow > 0:
+                        del self.tail[:overflow]
+                        self.truncated = True
+        finally:
+            if spool_file is not None:
+                spool_file.close()
+            stream.close()
+
+    def start(self, stream):
+        """Start reading the stream in a background thread
+
+        Args:
+            stream: A binary file object, e.g. the stdout pipe of a process
+
+        """
+        self.thread = threading.Thread(target=self._consume, args=(stream,))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def finish(self):
+        """Wait until the stream was completely consumed
+
+        The spool file is removed if the complete stream is available in
+        memory.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if (
+            self.truncated is False
+            and self.spool_path is not None
+            and os.path.isfile(self.spool_path)
+        ):
+            os.remove(self.spool_path)
+            self.spool_path = None
+
+    def get_string(self):
+        """Return the captured output as string
+
+        If the output was truncated, the head and the tail of the output are
+        returned, separated by a line that reports the number of omitted bytes.
+
+        Returns:
+            str: The decoded output
+        """
+        if self.truncated is False:
+            return (bytes(self.head) + bytes(self.tail)).decode(
+                errors="replace"
+            )
+
+        omitted = self.total_bytes - len(self.head) - len(self.tail)
+        return "%s\n[... %i bytes omitted ...]\n%s" % (
+            bytes(self.head).decode(errors="replace"),
+            omitted,
+            bytes(self.tail).decode(errors="replace"),
+        )
+
+
+def iter_stripped_rows(lines):
+    """Iterate over the rows of a text like text.strip().split("\\n") does,
+    without loading the whole text into memory
+
+    Leading and trailing rows that contain only whitespace are skipped,
+    all other rows are returned without the line break. An empty text
+    yields a single empty row.
+
+    Args:
+        lines: An iterable of text lines, e.g. a file object in text mode
+
+    Yields:
+        str: The rows of the text
+    """
+    pending = []
+    started = False
+    for line in lines:
+        row = line.rstrip("\n")
+        if not row.strip():
+            if started is True:
+                pending.append(row)
+            continue
+        if started is False:
+            row = row.lstrip()
+            started = True
+        for pending_row in pending:
+            yield pending_row
+        pending = []
+        yield row
+
+    if started is False:
+        yield ""
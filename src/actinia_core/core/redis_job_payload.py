@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Redis server interface and process wide cache of shared job payloads
+"""
+
+import copy
+import hashlib
+import pickle
+import threading
+from actinia_core.core.common.redis_base import RedisBaseInterface
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class RedisJobPayloadInterface(RedisBaseInterface):
+    """
+    The Redis job payload database interface
+
+    Large parts of the job payload, like the actinia configuration and the
+    user credentials, are the same for many jobs. They are stored by the
+    hash of their content and the jobs only carry the hash.
+    """
+
+    job_payload_prefix = "JOB-PAYLOAD::"
+
+    def __init__(self):
+        RedisBaseInterface.__init__(self)
+
+    def store_many(self, payloads, expiration):
+        """Store several pickled payloads by their hash with a single request
+
+        Args:
+            payloads (dict): The pickled payloads by their hash
+            expiration (int): The expiration time in seconds
+
+        Returns:
+            bool:
+            True for success, False otherwise
+
+        """
+        pipe = self.redis_server.pipeline()
+        for payload_hash, data in payloads.items():
+            pipe.set(
+                self.job_payload_prefix + payload_hash, data, ex=expiration
+            )
+        return all(pipe.execute())
+
+    def load(self, payload_hash):
+        """Load a pickled payload by its hash
+
+        Args:
+            payload_hash (str): The hash of the pickled payload
+
+        Returns:
+            bytes:
+            The pickled payload, None if it does not exist
+
+        """
+        return self.redis_server.get(self.job_payload_prefix + payload_hash)
+
+
+class JobPayloadCache(object):
+    """Process wide cache of the job payloads by their hash
+
+    The process that enqueues jobs references their payloads by hash and
+    stores the payloads in redis on every call, so that they exist for the
+    expiration time after the jobs were enqueued. The process that runs a
+    job resolves the hashes from its cache and loads payloads that are not
+    cached from redis.
+    """
+
+    def __init__(self, interface, max_size=64):
+        """Constructor
+
+        Args:
+            interface (RedisJobPayloadInterface): The connected interface
+            max_size (int): The maximum number of cached payloads
+        """
+        self.interface = interface
+        self.max_size = max_size
+        self.payloads = {}
+        self.lock = threading.Lock()
+
+    def reference_many(self, payloads, expiration):
+        """Return the hashes of several payloads and store the payloads in
+        redis with a single request
+
+        Payloads that are the same object are pickled and stored only once.
+
+        Args:
+            payloads (list): The payloads that must be pickleable
+            expiration (int): The expiration time in seconds of the stored
+                              payloads
+
+        Returns:
+            list: The hashes of the payloads
+        """
+        hashes = []
+        datas = {}
+        object_hashes = {}
+        for payload in payloads:
+            payload_hash = object_hashes.get(id(payload))
+            if payload_hash is None:
+                data = pickle.dumps(payload)
+                payload_hash = hashlib.sha256(data).hexdigest()
+                object_hashes[id(payload)] = payload_hash
+                datas[payload_hash] = data
+            hashes.append(payload_hash)
+        if datas:
+            self.interface.store_many(datas, expiration)
+        return hashes
+
+    def resolve(self, payload_hash):
+        """Return the payload of a hash
+
+        Args:
+            payload_hash (str): The hash of the payload
+
+        Returns:
+            The payload
+
+        Raises:
+            KeyError: If the payload is neither cached nor stored in redis
+        """
+        with self.lock:
+            if payload_hash in self.payloads:
+                return self.payloads[payload_hash]
+        data = self.interface.load(payload_hash)
+        if data is None:
+            raise KeyError(
+                "The job payload <%s> does not exist, it may be expired"
+                % payload_hash
+            )
+        payload = pickle.loads(data)
+        with self.lock:
+            if len(self.payloads) >= self.max_size:
+                self.payloads.clear()
+            self.payloads[payload_hash] = payload
+        return payload
+
+
+# Create the Redis interface instance
+redis_job_payload_interface = RedisJobPayloadInterface()
+
+_job_payload_cache = None
+
+
+def get_job_payload_cache(config):
+    """Return the job payload cache of this process, that is created on
+    first use
+
+    The redis interface is connected with the redis server of the
+    configuration, if it was not connected before.
+
+    Args:
+        config (Configuration): The actinia configuration
+
+    Returns:
+        JobPayloadCache: The process wide job payload cache
+    """
+    global _job_payload_cache
+    if _job_payload_cache is None:
+        if redis_job_payload_interface.redis_server is None:
+            redis_job_payload_interface.connect(
+                config.REDIS_SERVER_URL,
+                config.REDIS_SERVER_PORT,
+                config.REDIS_SERVER_PW,
+            )
+        _job_payload_cache = JobPayloadCache(redis_job_payload_interface)
+    return _job_payload_cache
+
+
+def pack_job_args(args_list, config):
+    """Replace the configuration and the user credentials in the resource
+    data containers of several jobs by the hashes of their payloads
+
+    The payloads are stored in redis with a single request, so that they
+    exist for JOB_PAYLOAD_TTL seconds after the jobs were enqueued.
+
+    Args:
+        args_list (list): A list with the function arguments of each job,
+                          the first argument must be the resource data
+                          container
+        config (Configuration): The actinia configuration
+
+    Returns:
+        list: The function arguments of each job with a packed copy of the
+              resource data container
+    """
+    payloads = []
+    for args in args_list:
+        payloads.extend((args[0].config, args[0].user_credentials))
+    hashes = iter(
+        get_job_payload_cache(config).reference_many(
+            payloads, config.JOB_PAYLOAD_TTL
+        )
+    )
+    packed_args_list = []
+    for args in args_list:
+        rdc = copy.copy(args[0])
+        rdc.config = next(hashes)
+        rdc.user_credentials = next(hashes)
+        packed_args_list.append((rdc,) + tuple(args[1:]))
+    return packed_args_list
+
+
+def unpack_job_args(rdc, config):
+    """Resolve the configuration and the user credentials of a resource data
+    container that was packed by pack_job_args()
+
+    Args:
+        rdc (ResourceDataContainer): The packed resource data container
+        config (Configuration): The actinia configuration of this process
+
+    Raises:
+        KeyError: If a payload does not exist, it may be expired
+    """
+    job_payload_cache = get_job_payload_cache(config)
+    rdc.config = job_payload_cache.resolve(rdc.config)
+    rdc.user_credentials = job_payload_cache.resolve(rdc.user_credentials)
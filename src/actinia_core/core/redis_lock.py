@@ -25,6 +25,8 @@
 Redis server lock interface
 """
 
+import threading
+import time
 import redis
 
 __license__ = "GPLv3"
@@ -87,9 +89,157 @@ class RedisLockingInterface(object):
     end
     """
 
+    # LUA script to fairly lock a resource for an owner
+    # Four keys must be provided: the lock, the queue of waiting owners
+    # sorted by arrival time, the waiter deadlines and the fencing token
+    # counter. The arguments are the owner, the expiration time in seconds,
+    # the current time and the time to live of a waiter entry, 0 to not
+    # queue the owner.
+    # The lock is granted if it is free and no other owner waits longer.
+    # Waiters that did not renew their entry are removed from the queue.
+    # The lock value is "<fencing token>:<owner>".
+    # Return the fencing token for success, 0 otherwise
+    lua_fair_lock_resource = """
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[3])
+    for _, waiter in ipairs(expired) do
+      redis.call('ZREM', KEYS[2], waiter)
+      redis.call('ZREM', KEYS[3], waiter)
+    end
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+      local head = redis.call('ZRANGE', KEYS[2], 0, 0)
+      if head[1] == nil or head[1] == ARGV[1] then
+        redis.call('ZREM', KEYS[2], ARGV[1])
+        redis.call('ZREM', KEYS[3], ARGV[1])
+        local token = redis.call('INCR', KEYS[4])
+        redis.call('SETEX', KEYS[1], ARGV[2], token .. ':' .. ARGV[1])
+        return token
+      end
+    end
+    local waiter_ttl = tonumber(ARGV[4])
+    if waiter_ttl > 0 then
+      if redis.call('ZSCORE', KEYS[2], ARGV[1]) == false then
+        redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+      end
+      redis.call('ZADD', KEYS[3], tonumber(ARGV[3]) + waiter_ttl, ARGV[1])
+      local key_ttl = math.ceil(waiter_ttl) + 1
+      redis.call('EXPIRE', KEYS[2], key_ttl)
+      redis.call('EXPIRE', KEYS[3], key_ttl)
+    end
+    return 0
+    """
+
+    # LUA script to extend or unlock a resource only if it is locked by
+    # the owner provided as first argument
+    # The second argument is the expiration time in seconds, 0 to unlock
+    # Return 1 for success, 0 if the resource is not locked by the owner
+    lua_owned_resource_lock = """
+    local value = redis.call('GET', KEYS[1])
+    if value == false then
+      return 0
+    end
+    local separator = string.find(value, ':')
+    if separator == nil or string.sub(value, separator + 1) ~= ARGV[1] then
+      return 0
+    end
+    if tonumber(ARGV[2]) > 0 then
+      redis.call('EXPIRE', KEYS[1], ARGV[2])
+    else
+      redis.call('DEL', KEYS[1])
+    end
+    return 1
+    """
+
+    # LUA script to acquire shared read locks of several resources at once
+    # The keys are pairs of the readers of a resource, a sorted set scored by
+    # the deadline of each reader, and the merge lock of the resource.
+    # The arguments are the owner, the current time, the deadline of the read
+    # locks and their expiration time in seconds.
+    # The read locks are not granted while a merge lock is set by another
+    # owner, that either merges or waits for the readers to finish.
+    # Return 1 for success, 0 if a resource is merged
+    lua_lock_shared_resources = """
+    for i = 1, #KEYS, 2 do
+      local holder = redis.call('GET', KEYS[i + 1])
+      if holder ~= false and holder ~= ARGV[1] then
+        return 0
+      end
+    end
+    for i = 1, #KEYS, 2 do
+      redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', ARGV[2])
+      redis.call('ZADD', KEYS[i], ARGV[3], ARGV[1])
+      redis.call('EXPIRE', KEYS[i], ARGV[4])
+    end
+    return 1
+    """
+
+    # LUA script to extend or release the shared read lock of an owner
+    # Two keys must be provided, the readers of the resource and the merge
+    # lock that is unused. The arguments are the owner, the new deadline, 0 to
+    # release the lock, and the expiration time in seconds.
+    # Return 1 for success, 0 if the owner does not hold a read lock
+    lua_extend_shared_resource_lock = """
+    if redis.call('ZSCORE', KEYS[1], ARGV[1]) == false then
+      return 0
+    end
+    if tonumber(ARGV[2]) > 0 then
+      redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+      redis.call('EXPIRE', KEYS[1], ARGV[3])
+    else
+      redis.call('ZREM', KEYS[1], ARGV[1])
+    end
+    return 1
+    """
+
+    # LUA script to set the merge lock of a resource
+    # Two keys must be provided, the readers of the resource and the merge
+    # lock. The arguments are the owner, the current time and the expiration
+    # time of the merge lock in seconds.
+    # The merge lock blocks new readers as soon as it is set, the owner can
+    # merge once all other readers released their read locks.
+    # Return the number of other readers, -1 if another owner holds the merge
+    # lock
+    lua_lock_exclusive_resource = """
+    local holder = redis.call('GET', KEYS[2])
+    if holder ~= false and holder ~= ARGV[1] then
+      return -1
+    end
+    redis.call('SETEX', KEYS[2], ARGV[3], ARGV[1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+    local readers = redis.call('ZCARD', KEYS[1])
+    if redis.call('ZSCORE', KEYS[1], ARGV[1]) ~= false then
+      readers = readers - 1
+    end
+    return readers
+    """
+
+    # LUA script to extend or release the merge lock of an owner
+    # The arguments are the owner and the expiration time in seconds, 0 to
+    # release the merge lock
+    # Return 1 for success, 0 if the merge lock is not held by the owner
+    lua_extend_exclusive_resource_lock = """
+    if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+      return 0
+    end
+    if tonumber(ARGV[2]) > 0 then
+      redis.call('EXPIRE', KEYS[1], ARGV[2])
+    else
+      redis.call('DEL', KEYS[1])
+    end
+    return 1
+    """
+
     # Locks are Key-Value pairs in the Redis database using SET and DEl for
     # management
     lock_prefix = "RESOURCE-LOCK::"
+    # The owners that wait for a lock are stored in sorted sets
+    queue_prefix = "RESOURCE-LOCK-QUEUE::"
+    waiter_prefix = "RESOURCE-LOCK-WAITER::"
+    # The monotonic fencing token counter of each resource
+    token_prefix = "RESOURCE-LOCK-TOKEN::"
+    # The owners of shared read locks are stored in sorted sets, the merge
+    # lock that excludes readers is a Key-Value pair
+    read_lock_prefix = "RESOURCE-READ-LOCK::"
+    merge_lock_prefix = "RESOURCE-MERGE-LOCK::"
 
     def __init__(self):
         self.connection_pool = None
@@ -97,6 +247,12 @@ class RedisLockingInterface(object):
         self.call_lock_resource = None
         self.call_extend_resource_lock = None
         self.call_unlock_resource = None
+        self.call_fair_lock_resource = None
+        self.call_owned_resource_lock = None
+        self.call_lock_shared_resources = None
+        self.call_extend_shared_resource_lock = None
+        self.call_lock_exclusive_resource = None
+        self.call_extend_exclusive_resource_lock = None
 
     def connect(self, host, port, password=None):
         """Connect to a specific redis server
@@ -128,6 +284,28 @@ class RedisLockingInterface(object):
         self.call_unlock_resource = self.redis_server.register_script(
             self.lua_unlock_resource
         )
+        self.call_fair_lock_resource = self.redis_server.register_script(
+            self.lua_fair_lock_resource
+        )
+        self.call_owned_resource_lock = self.redis_server.register_script(
+            self.lua_owned_resource_lock
+        )
+        self.call_lock_shared_resources = self.redis_server.register_script(
+            self.lua_lock_shared_resources
+        )
+        self.call_extend_shared_resource_lock = (
+            self.redis_server.register_script(
+                self.lua_extend_shared_resource_lock
+            )
+        )
+        self.call_lock_exclusive_resource = self.redis_server.register_script(
+            self.lua_lock_exclusive_resource
+        )
+        self.call_extend_exclusive_resource_lock = (
+            self.redis_server.register_script(
+                self.lua_extend_exclusive_resource_lock
+            )
+        )
 
     def disconnect(self):
         self.connection_pool.disconnect()
@@ -159,7 +337,14 @@ class RedisLockingInterface(object):
         """
         return bool(self.redis_server.get(self.lock_prefix + str(resource_id)))
 
-    def lock(self, resource_id, expiration=30):
+    def lock(
+        self,
+        resource_id,
+        expiration=30,
+        owner=None,
+        timeout=0,
+        poll_interval=0.5,
+    ):
         """Lock a resource for a specific time frame
 
         The lock is acquired for the provided time
@@ -168,23 +353,279 @@ class RedisLockingInterface(object):
         to avoid key conflicts with other resources that are logged
         in the Redis database.
 
+        If an owner is provided, the lock is fair: The owner waits up to
+        timeout seconds in a first in, first out queue of owners for the
+        lock, and a monotonic fencing token is returned. Only the owner can
+        extend or unlock the lock with extend() or unlock() then.
+
         Args:
             resource_id (str): Name of the resource to lock, for example
                                "location/mapset"
             expiration (int): The time in seconds for which the lock is
                               acquired
+            owner (str): The unique id of the lock owner, for example the
+                         resource id of a job
+            timeout (float): The maximum time in seconds the owner waits
+                             for the lock, 0 to not wait
+            poll_interval (float): The time in seconds between two lock
+                                   attempts of a waiting owner
 
         Returns:
              int:
-             1 for success and 0 if unable to acquire lock because
-             resource-lock already exists
+             1 or the fencing token for success and 0 if unable to acquire
+             lock because resource-lock already exists
 
         """
+        if owner is None:
+            keys = [self.lock_prefix + str(resource_id), expiration]
+            return self.call_lock_resource(keys=keys)
 
-        keys = [self.lock_prefix + str(resource_id), expiration]
-        return self.call_lock_resource(keys=keys)
+        keys = [
+            self.lock_prefix + str(resource_id),
+            self.queue_prefix + str(resource_id),
+            self.waiter_prefix + str(resource_id),
+            self.token_prefix + str(resource_id),
+        ]
+        # Waiters that did not renew their queue entry for several poll
+        # intervals are removed from the queue
+        waiter_ttl = max(poll_interval * 4, 2) if timeout > 0 else 0
+        deadline = time.monotonic() + timeout
+        while True:
+            token = self.call_fair_lock_resource(
+                keys=keys,
+                args=[owner, int(expiration), time.time(), waiter_ttl],
+            )
+            if token:
+                return int(token)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if timeout > 0:
+                    self.leave_queue(resource_id, owner)
+                return 0
+            time.sleep(min(poll_interval, remaining))
+
+    def leave_queue(self, resource_id, owner):
+        """Remove an owner from the queue of owners that wait for a lock
+
+        Args:
+            resource_id (str): Name of the locked resource
+            owner (str): The unique id of the waiting owner
+        """
+        pipeline = self.redis_server.pipeline()
+        pipeline.zrem(self.queue_prefix + str(resource_id), owner)
+        pipeline.zrem(self.waiter_prefix + str(resource_id), owner)
+        pipeline.execute()
+
+    def lock_shared(
+        self, resource_ids, expiration, owner, timeout=0, poll_interval=0.5
+    ):
+        """Acquire shared read locks of several resources at once
+
+        Any number of owners can hold a read lock of a resource at the same
+        time. Read locks are not granted while the resource is merged or an
+        owner waits to merge it, see lock_exclusive(). Read locks do not
+        interfere with the exclusive locks of lock().
+
+        Args:
+            resource_ids (list): The names of the resources to lock
+            expiration (int): The time in seconds for which the read locks
+                              are acquired
+            owner (str): The unique id of the lock owner
+            timeout (float): The maximum time in seconds to wait for running
+                             merges, 0 to not wait
+            poll_interval (float): The time in seconds between two attempts
+
+        Returns:
+            int:
+            1 for success and 0 if a resource is merged
+
+        """
+        keys = []
+        for resource_id in resource_ids:
+            keys.append(self.read_lock_prefix + str(resource_id))
+            keys.append(self.merge_lock_prefix + str(resource_id))
+        if not keys:
+            return 1
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.time()
+            ret = self.call_lock_shared_resources(
+                keys=keys, args=[owner, now, now + expiration, int(expiration)]
+            )
+            remaining = deadline - time.monotonic()
+            if ret == 1 or remaining <= 0:
+                return ret
+            time.sleep(min(poll_interval, remaining))
+
+    def extend_shared(self, resource_id, expiration=30, owner=None):
+        """Extend the shared read lock of an owner
+
+        Args:
+            resource_id (str): Name of the locked resource
+            expiration (int): The time in seconds for which the read lock is
+                              extended
+            owner (str): The owner of the read lock
+
+        Returns:
+            int:
+            1 for success and 0 if the owner does not hold a read lock
+
+        """
+        keys = [
+            self.read_lock_prefix + str(resource_id),
+            self.merge_lock_prefix + str(resource_id),
+        ]
+        return self.call_extend_shared_resource_lock(
+            keys=keys,
+            args=[owner, time.time() + expiration, max(int(expiration), 1)],
+        )
+
+    def unlock_shared(self, resource_id, owner):
+        """Release the shared read lock of an owner
+
+        Args:
+            resource_id (str): Name of the locked resource
+            owner (str): The owner of the read lock
+
+        Returns:
+            int:
+            1 for success and 0 if the owner does not hold a read lock
+
+        """
+        keys = [
+            self.read_lock_prefix + str(resource_id),
+            self.merge_lock_prefix + str(resource_id),
+        ]
+        return self.call_extend_shared_resource_lock(
+            keys=keys, args=[owner, 0, 0]
+        )
 
-    def extend(self, resource_id, expiration=30):
+    def lock_exclusive(
+        self, resource_id, expiration, owner, timeout=0, poll_interval=0.5
+    ):
+        """Acquire the merge lock of a resource, that excludes all readers
+
+        New read locks are refused as soon as the owner starts waiting, so
+        that a steady stream of readers can not starve the merge. The read
+        lock of the owner itself is ignored.
+
+        Args:
+            resource_id (str): Name of the resource to lock
+            expiration (int): The time in seconds for which the merge lock
+                              is acquired
+            owner (str): The unique id of the lock owner
+            timeout (float): The maximum time in seconds to wait for the
+                             readers to finish, 0 to not wait
+            poll_interval (float): The time in seconds between two attempts
+
+        Returns:
+            int:
+            1 for success and 0 if readers or another merge did not finish
+            in time
+
+        """
+        keys = [
+            self.read_lock_prefix + str(resource_id),
+            self.merge_lock_prefix + str(resource_id),
+        ]
+        deadline = time.monotonic() + timeout
+        while True:
+            readers = self.call_lock_exclusive_resource(
+                keys=keys, args=[owner, time.time(), int(expiration)]
+            )
+            if readers == 0:
+                return 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if readers > 0:
+                    self.unlock_exclusive(resource_id, owner)
+                return 0
+            time.sleep(min(poll_interval, remaining))
+
+    def extend_exclusive(self, resource_id, expiration=30, owner=None):
+        """Extend the merge lock of an owner
+
+        Args:
+            resource_id (str): Name of the locked resource
+            expiration (int): The time in seconds for which the merge lock is
+                              extended
+            owner (str): The owner of the merge lock
+
+        Returns:
+            int:
+            1 for success and 0 if the owner does not hold the merge lock
+
+        """
+        return self.call_extend_exclusive_resource_lock(
+            keys=[self.merge_lock_prefix + str(resource_id)],
+            args=[owner, max(int(expiration), 1)],
+        )
+
+    def unlock_exclusive(self, resource_id, owner):
+        """Release the merge lock of an owner
+
+        Args:
+            resource_id (str): Name of the locked resource
+            owner (str): The owner of the merge lock
+
+        Returns:
+            int:
+            1 for success and 0 if the owner does not hold the merge lock
+
+        """
+        return self.call_extend_exclusive_resource_lock(
+            keys=[self.merge_lock_prefix + str(resource_id)], args=[owner, 0]
+        )
+
+    def get_readers(self, resource_id):
+        """Get the owners that hold a shared read lock of a resource
+
+        Args:
+            resource_id (str): Name of the locked resource
+
+        Returns:
+            list: The ids of the reading owners
+        """
+        readers = self.redis_server.zrangebyscore(
+            self.read_lock_prefix + str(resource_id), time.time(), "+inf"
+        )
+        return [reader.decode() for reader in readers]
+
+    def get_waiters(self, resource_id):
+        """Get the owners that wait for a lock in the order of their arrival
+
+        Args:
+            resource_id (str): Name of the locked resource
+
+        Returns:
+            list: The ids of the waiting owners
+        """
+        pipeline = self.redis_server.pipeline()
+        pipeline.zrange(self.queue_prefix + str(resource_id), 0, -1)
+        pipeline.zrangebyscore(
+            self.waiter_prefix + str(resource_id), time.time(), "+inf"
+        )
+        waiters, alive = pipeline.execute()
+        alive = set(alive)
+        return [waiter.decode() for waiter in waiters if waiter in alive]
+
+    def get_token(self, resource_id):
+        """Get the fencing token and the owner of a fair lock
+
+        Args:
+            resource_id (str): Name of the locked resource
+
+        Returns:
+            tuple: (fencing token, owner) or None if the resource is not
+                   locked by an owner
+        """
+        value = self.redis_server.get(self.lock_prefix + str(resource_id))
+        if value is None or b":" not in value:
+            return None
+        token, owner = value.decode().split(":", 1)
+        return int(token), owner
+
+    def extend(self, resource_id, expiration=30, owner=None):
         """Extent the expiration of a resource lock for a specific time frame
 
         This function will put a prefix before the resource name
@@ -196,6 +637,8 @@ class RedisLockingInterface(object):
                                example "location/mapset"
             expiration (int): The time in seconds for which the lock is
                               acquired
+            owner (str): The owner of a fair lock, the lock is only extended
+                         if it is still held by this owner
 
         Returns:
             int:
@@ -203,12 +646,17 @@ class RedisLockingInterface(object):
             does not exists
 
         """
+        if owner is not None:
+            return self.call_owned_resource_lock(
+                keys=[self.lock_prefix + str(resource_id)],
+                args=[owner, max(int(expiration), 1)],
+            )
         keys = [self.lock_prefix + str(resource_id), expiration]
         # print("Extend Lock", expiration, self.lock_prefix + str(resource_id),
         # str(self))
         return self.call_extend_resource_lock(keys=keys)
 
-    def unlock(self, resource_id):
+    def unlock(self, resource_id, owner=None):
         """Unlock a resource
 
         This function will put a prefix before the resource name
@@ -218,12 +666,18 @@ class RedisLockingInterface(object):
         Args:
             resource_id (str): Name of the resource to remove the lock, for
                                example "location/mapset"
+            owner (str): The owner of a fair lock, the lock is only removed
+                         if it is still held by this owner
 
         Returns:
             int:
             1 for success and 0 if unable to unlock
 
         """
+        if owner is not None:
+            return self.call_owned_resource_lock(
+                keys=[self.lock_prefix + str(resource_id)], args=[owner, 0]
+            )
         keys = [
             self.lock_prefix + str(resource_id),
         ]
@@ -231,6 +685,89 @@ class RedisLockingInterface(object):
         return self.call_unlock_resource(keys=keys)
 
 
+class LockHeartbeat(object):
+    """Renew fair resource locks in a background thread
+
+    The locks are acquired with a short expiration time and renewed
+    periodically, so that the locks of crashed processes expire soon.
+    Locks that could not be renewed, because they expired or were removed,
+    are reported in the lost attribute.
+    """
+
+    def __init__(self, lock_interface, expiration, interval=None):
+        """Constructor
+
+        Args:
+            lock_interface (RedisLockingInterface): The connected lock
+                                                    interface
+            expiration (int): The expiration time in seconds of the locks
+            interval (float): The time in seconds between two renewals, by
+                              default a third of the expiration time
+        """
+        self.lock_interface = lock_interface
+        self.expiration = expiration
+        self.interval = interval if interval else expiration / 3.0
+        self.locks = {}
+        self.lost = []
+        self.mutex = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, resource_id, owner, extend=None):
+        """Renew the lock of a resource from now on
+
+        Args:
+            resource_id (str): Name of the locked resource
+            owner (str): The owner of the lock
+            extend (function): The method of the lock interface that extends
+                               the lock, by default the exclusive lock of
+                               RedisLockingInterface.lock() is extended
+        """
+        if extend is None:
+            extend = self.lock_interface.extend
+        with self.mutex:
+            self.locks[resource_id] = (owner, extend)
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._run, name="lock-heartbeat", daemon=True
+            )
+            self.thread.start()
+
+    def remove(self, resource_id):
+        """Stop renewing the lock of a resource"""
+        with self.mutex:
+            self.locks.pop(resource_id, None)
+
+    def renew(self):
+        """Renew all locks once"""
+        with self.mutex:
+            locks = list(self.locks.items())
+        for resource_id, (owner, extend) in locks:
+            try:
+                ret = extend(
+                    resource_id, expiration=self.expiration, owner=owner
+                )
+            except redis.RedisError:
+                # A failed renewal is repeated in the next interval, the
+                # lock expires if the connection does not recover
+                continue
+            if ret == 0:
+                with self.mutex:
+                    if self.locks.pop(resource_id, None) is not None:
+                        self.lost.append(resource_id)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.renew()
+
+    def stop(self):
+        """Stop the heartbeat thread"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
 # Create the Redis interface instance
 # redis_lock_interface = RedisLockingInterface()
 
@@ -265,6 +802,49 @@ def test_locking(r):
     ret = r.unlock(resource)
     if ret != 1:
         raise Exception("unlock_resource does not work")
+
+    ret = r.lock(resource, 5, owner="job_1")
+    if ret == 0:
+        raise Exception("fair lock_resource does not work")
+    token = ret
+    ret = r.lock(resource, 5, owner="job_2", timeout=1, poll_interval=0.1)
+    if ret != 0:
+        raise Exception("fair lock_resource does not work")
+    ret = r.extend(resource, 5, owner="job_2")
+    if ret != 0:
+        raise Exception("owned extend_resource_lock does not work")
+    ret = r.unlock(resource, owner="job_1")
+    if ret != 1:
+        raise Exception("owned unlock_resource does not work")
+    ret = r.lock(resource, 5, owner="job_2")
+    if ret <= token:
+        raise Exception("fencing token does not increase")
+    ret = r.unlock(resource)
+    if ret != 1:
+        raise Exception("unlock_resource does not work")
+
+    ret = r.lock_shared([resource], 5, owner="job_1")
+    if ret != 1:
+        raise Exception("lock_shared does not work")
+    ret = r.lock_exclusive(resource, 5, owner="job_2")
+    if ret != 0:
+        raise Exception("lock_exclusive does not work")
+    ret = r.lock_exclusive(resource, 5, owner="job_2", timeout=1)
+    if ret != 0:
+        raise Exception("lock_exclusive does not work")
+    ret = r.unlock_shared(resource, owner="job_1")
+    if ret != 1:
+        raise Exception("unlock_shared does not work")
+    ret = r.lock_exclusive(resource, 5, owner="job_2")
+    if ret != 1:
+        raise Exception("lock_exclusive does not work")
+    ret = r.lock_shared([resource], 5, owner="job_1")
+    if ret != 0:
+        raise Exception("lock_shared does not work")
+    ret = r.unlock_exclusive(resource, owner="job_2")
+    if ret != 1:
+        raise Exception("unlock_exclusive does not work")
+
     ret = r.unlock(resource)
     if ret != 0:
         raise Exception("unlock_resource does not work")
@@ -276,7 +856,6 @@ def test_locking(r):
 if __name__ == "__main__":
     import os
     import signal
-    import time
 
     pid = os.spawnl(
         os.P_NOWAIT, "/usr/bin/redis-server", "./redis.conf", "--port 7000"
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Redis server interface of the mapset generation counters
+"""
+
+from actinia_core.core.common.redis_base import RedisBaseInterface
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class RedisMapsetGenerationInterface(RedisBaseInterface):
+    """
+    The Redis mapset generation database interface
+
+    Each persistent modification of a mapset increments the generation
+    counter of the mapset. Caches of mapset content store the generation of
+    the mapset together with the cached data and are valid as long as the
+    generation is unchanged, which can be checked for many mapsets with a
+    single request.
+
+    Locations are user group specific, hence the generations are counted
+    per user group like the mapset locks.
+    """
+
+    mapset_generation_prefix = "MAPSET-GENERATION::"
+
+    def __init__(self):
+        RedisBaseInterface.__init__(self)
+
+    def _get_key(self, user_group, location_name, mapset_name):
+        return "%s%s/%s/%s" % (
+            self.mapset_generation_prefix,
+            user_group,
+            location_name,
+            mapset_name,
+        )
+
+    def bump(self, user_group, location_name, mapset_name):
+        """Increment the generation of a mapset after it was modified
+
+        Args:
+            user_group (str): The user group of the location
+            location_name (str): The name of the location
+            mapset_name (str): The name of the mapset
+
+        Returns:
+            int:
+            The new generation of the mapset
+
+        """
+        return self.redis_server.incr(
+            self._get_key(user_group, location_name, mapset_name)
+        )
+
+    def get(self, user_group, location_name, mapset_name):
+        """Return the generation of a mapset
+
+        Args:
+            user_group (str): The user group of the location
+            location_name (str): The name of the location
+            mapset_name (str): The name of the mapset
+
+        Returns:
+            int:
+            The generation of the mapset, 0 if it was never modified
+
+        """
+        return self.get_many([(user_group, location_name, mapset_name)])[0]
+
+    def get_many(self, mapsets):
+        """Return the generations of several mapsets with a single request
+
+        Args:
+            mapsets (list): A list of (user group, location name, mapset
+                            name) tuples
+
+        Returns:
+            list:
+            The generations of the mapsets, 0 for mapsets that were never
+            modified
+
+        """
+        if not mapsets:
+            return []
+        generations = self.redis_server.mget(
+            [self._get_key(*mapset) for mapset in mapsets]
+        )
+        return [int(generation or 0) for generation in generations]
+
+
+# Create the Redis interface instance
+redis_mapset_generation_interface = RedisMapsetGenerationInterface()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Redis server interface of the process chain result cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from actinia_core.core.common.redis_base import RedisBaseInterface
+from actinia_core.core.grass_metadata import (
+    find_mapset_path,
+    get_mapset_fingerprint,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+def get_process_chain_hash(process_chain, *context):
+    """Compute the canonical hash of a process chain
+
+    Args:
+        process_chain (dict): The process chain
+        *context (str): Additional values that identify the request, like
+                        the user id and the request path
+
+    Returns:
+        str: The hexadecimal hash
+    """
+    canonical = json.dumps(
+        [process_chain, list(context)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_mapset_fingerprints(config, user_group, location_name, mapsets):
+    """Compute the fingerprints of the mapsets that are referenced by a
+    process chain
+
+    Args:
+        config (Configuration): The actinia configuration
+        user_group (str): The user group
+        location_name (str): The name of the location
+        mapsets (list): The names of the mapsets
+
+    Returns:
+        dict: The fingerprint of each mapset, None if a mapset does not
+              exist
+    """
+    fingerprints = {}
+    for mapset in mapsets:
+        mapset_path = find_mapset_path(
+            config, user_group, location_name, mapset
+        )
+        if mapset_path is None:
+            return None
+        fingerprints[mapset] = get_mapset_fingerprint(mapset_path)
+    return fingerprints
+
+
+class RedisProcessResultCacheInterface(RedisBaseInterface):
+    """
+    The Redis process chain result cache interface
+
+    The results of a process chain are stored by the canonical hash of the
+    process chain together with the fingerprints of the referenced mapsets
+    when the processing started. A cached result is only valid as long as
+    the fingerprints of the mapsets are unchanged and the resources that
+    were stored on the local disk exist.
+
+    The cache entries expire after their time to live, the oldest entries
+    are removed if the maximum number of entries is exceeded.
+    """
+
+    result_cache_prefix = "PROCESS-RESULT-CACHE::"
+    result_cache_index = "PROCESS-RESULT-CACHE-INDEX"
+
+    def __init__(self):
+        RedisBaseInterface.__init__(self)
+
+    def get(self, chain_hash):
+        """Return a cached process chain result
+
+        Args:
+            chain_hash (str): The hash of the process chain
+
+        Returns:
+            dict:
+            The cached entry with the mapset fingerprints, the process
+            results, the resource urls and paths and the finish message or
+            None
+
+        """
+        entry = self.redis_server.get(self.result_cache_prefix + chain_hash)
+        if entry is None:
+            return None
+        return pickle.loads(entry)
+
+    def set(self, chain_hash, entry, ttl, max_size):
+        """Store a process chain result and remove expired and the oldest
+        entries
+
+        Args:
+            chain_hash (str): The hash of the process chain
+            entry (dict): The entry with the mapset fingerprints, the process
+                          results, the resource urls and paths and the
+                          finish message
+            ttl (int): The time to live of the entry in seconds
+            max_size (int): The maximum number of entries
+
+        """
+        now = time.time()
+        pipe = self.redis_server.pipeline()
+        pipe.setex(
+            self.result_cache_prefix + chain_hash,
+            max(int(ttl), 1),
+            pickle.dumps(entry),
+        )
+        pipe.zadd(self.result_cache_index, {chain_hash: now})
+        pipe.zremrangebyscore(self.result_cache_index, "-inf", now - ttl)
+        pipe.zcard(self.result_cache_index)
+        size = pipe.execute()[-1]
+
+        if size > max_size:
+            oldest = self.redis_server.zrange(
+                self.result_cache_index, 0, size - max_size - 1
+            )
+            pipe = self.redis_server.pipeline()
+            for old_hash in oldest:
+                if isinstance(old_hash, bytes):
+                    old_hash = old_hash.decode()
+                pipe.delete(self.result_cache_prefix + old_hash)
+                pipe.zrem(self.result_cache_index, old_hash)
+            pipe.execute()
+
+    def lookup(self, chain_hash, config, user_group, location_name):
+        """Return a cached process chain result if the referenced mapsets
+        are unchanged and the stored resources were not deleted
+
+        Args:
+            chain_hash (str): The hash of the process chain
+            config (Configuration): The actinia configuration
+            user_group (str): The user group
+            location_name (str): The name of the location
+
+        Returns:
+            dict:
+            The valid cached entry or None
+
+        """
+        entry = self.get(chain_hash)
+        if entry is None:
+            return None
+        fingerprints = get_mapset_fingerprints(
+            config, user_group, location_name, list(entry["mapsets"])
+        )
+        if fingerprints is None or fingerprints != entry["mapsets"]:
+            return None
+        for path in entry.get("resource_paths", []):
+            if not os.path.isfile(path):
+                return None
+        return entry
+
+
+# Create the Redis interface instance
+redis_process_result_cache_interface = RedisProcessResultCacheInterface()
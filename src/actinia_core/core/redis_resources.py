@@ -135,6 +135,25 @@ class RedisResourceInterface(RedisBaseInterface):
             self.resource_id_prefix + resource_id, expiration, resource_entry
         )
 
+    def set_many(self, resource_entries, expiration=864000):
+        """Set or update several resource entries with a single request
+
+        Args:
+            resource_entries (list): A list of (resource id, resource entry)
+                                     tuples
+            expiration (int): The time in seconds when the resources should
+                              expire
+
+        """
+        pipeline = self.redis_server.pipeline(transaction=False)
+        for resource_id, resource_entry in resource_entries:
+            pipeline.setex(
+                self.resource_id_prefix + resource_id,
+                expiration,
+                resource_entry,
+            )
+        return pipeline.execute()
+
     def set_termination(self, resource_id, expiration=3600):
         """Set or update a resource termination entry
 
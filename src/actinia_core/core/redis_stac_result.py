@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Redis bulk interface of the STAC items and catalogs of the actinia STAC plugin
+"""
+
+import pickle
+from pystac import read_dict
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class RedisSTACResultInterface(object):
+    """
+    Bulk access to the STAC items and catalogs that are stored by the redis
+    interface of the actinia STAC plugin
+
+    The plugin interface stores each STAC object as a hash with its id and
+    its pickled dictionary and registers the id in its id database. The
+    plugin interface only creates and updates single objects, hence the
+    items of a job are written here in a single transaction with the same
+    layout. This is the only place in actinia core that relies on it.
+    """
+
+    def __init__(self, interface):
+        """Constructor
+
+        Args:
+            interface: The connected redis interface of the STAC plugin
+        """
+        self.interface = interface
+
+    def _get_key(self, name):
+        return self.interface.actinia_template_id_hash_prefix + name
+
+    def save_items(self, items, catalog_name):
+        """Write STAC items and add the items that did not exist to a
+        catalog in a single transaction
+
+        The existence of the items is checked within the transaction, that
+        watches the catalog and the items. The transaction is repeated if
+        one of them was modified concurrently, so that an item is added to
+        the catalog only once.
+
+        Args:
+            items (list): The pystac items
+            catalog_name (str): The name of the catalog
+
+        Returns:
+            list:
+            The ids of the items that were added to the catalog
+
+        """
+        redis_server = self.interface.redis_server
+        id_db = self.interface.actinia_template_id_db
+        catalog_key = self._get_key(catalog_name)
+        items = dict((item.id, item) for item in items)
+        item_keys = [self._get_key(item_name) for item_name in items]
+
+        def write_items(pipe):
+            with redis_server.pipeline(transaction=False) as check:
+                for item_key in item_keys:
+                    check.exists(item_key)
+                exists = check.execute()
+            new_items = [
+                item
+                for item, item_exists in zip(items.values(), exists)
+                if not item_exists
+            ]
+            catalog = None
+            if new_items:
+                catalog = read_dict(
+                    pickle.loads(pipe.hget(catalog_key, "actinia_template"))
+                )
+                for item in new_items:
+                    catalog.add_item(item)
+
+            pipe.multi()
+            for item_name, item in items.items():
+                pipe.hset(id_db, item_name, item_name)
+                pipe.hset(
+                    self._get_key(item_name),
+                    mapping={
+                        "actinia_template_id": item_name,
+                        "actinia_template": pickle.dumps(item.to_dict()),
+                    },
+                )
+            if catalog is not None:
+                pipe.hset(
+                    catalog_key,
+                    "actinia_template",
+                    pickle.dumps(catalog.to_dict()),
+                )
+            return [item.id for item in new_items]
+
+        return redis_server.transaction(
+            write_items, catalog_key, *item_keys, value_from_callable=True
+        )
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Redis server interface of the storage usage counters
+"""
+
+import os
+import threading
+from actinia_core.core.common.redis_base import RedisBaseInterface
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# The user specific storages whose usage is counted
+DOWNLOAD_CACHE = "download_cache"
+RESOURCE_STORAGE = "resource_storage"
+
+
+def get_path_size(path):
+    """Return the size of a file or the size of all files in a directory
+
+    Args:
+        path (str): The path of the file or directory
+
+    Returns:
+        int: The size in bytes, 0 if the path does not exist
+    """
+    try:
+        if os.path.islink(path) or not os.path.isdir(path):
+            return os.lstat(path).st_size
+    except OSError:
+        return 0
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for file_name in files:
+            try:
+                size += os.lstat(os.path.join(root, file_name)).st_size
+            except OSError:
+                pass
+    return size
+
+
+class RedisStorageUsageInterface(RedisBaseInterface):
+    """
+    The Redis storage usage database interface
+
+    The usage of the download cache and the resource storage of each user
+    is counted in bytes when files are written and removed, so that the
+    usage is known without scanning the directories. The counters are
+    reconciled with the size of the directories once per interval when they
+    are read or written, to correct the drift of files that are written or
+    removed without being counted.
+    """
+
+    storage_usage_prefix = "STORAGE-USAGE::"
+    reconciliation_prefix = "STORAGE-USAGE-RECONCILIATION::"
+
+    def __init__(self):
+        RedisBaseInterface.__init__(self)
+
+    def _get_key(self, storage, user_id):
+        return "%s%s::%s" % (self.storage_usage_prefix, storage, user_id)
+
+    def _add(self, storage, user_id, size):
+        return self.redis_server.incrby(
+            self._get_key(storage, user_id), int(size)
+        )
+
+    def add(self, storage, user_id, size, path, interval):
+        """Add the size of written files to the usage of a storage, negative
+        sizes are subtracted for removed files
+
+        The counter is initialized from the size of the storage directory if
+        it was never counted and reconciled once per interval. Hence the size
+        must be added before the files are written to or removed from the
+        directory.
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+            size (int): The size in bytes
+            path (str): The directory of the storage
+            interval (int): The reconciliation interval in seconds
+
+        Returns:
+            int:
+            The new usage of the storage in bytes
+
+        """
+        self.get_usage(storage, user_id, path, interval)
+        return self._add(storage, user_id, size)
+
+    def add_within_quota(self, storage, user_id, size, quota, path, interval):
+        """Add the size of a file that should be written to the usage of a
+        storage, if the quota of the storage is not exceeded
+
+        The size must be added before the file is written to the directory
+        of the storage, see add().
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+            size (int): The size in bytes
+            quota (int): The quota of the storage in bytes
+            path (str): The directory of the storage
+            interval (int): The reconciliation interval in seconds
+
+        Returns:
+            bool:
+            True if the size was added, False if the quota would be exceeded
+
+        """
+        if (
+            self.add(storage, user_id, size, path, interval) > quota
+            and size > 0
+        ):
+            self._add(storage, user_id, -size)
+            return False
+        return True
+
+    def get(self, storage, user_id):
+        """Return the usage of a storage
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+
+        Returns:
+            int:
+            The usage in bytes, None if the usage was never counted
+
+        """
+        usage = self.redis_server.get(self._get_key(storage, user_id))
+        if usage is None:
+            return None
+        return max(int(usage), 0)
+
+    def reset(self, storage, user_id):
+        """Reset the usage of a storage after its directory was emptied
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+
+        """
+        self.redis_server.set(self._get_key(storage, user_id), 0)
+
+    def start_reconciliation(self, storage, user_id, interval):
+        """Check if a storage must be reconciled, at most one process
+        reconciles a storage per interval
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+            interval (int): The reconciliation interval in seconds
+
+        Returns:
+            bool:
+            True if the storage must be reconciled by the caller
+
+        """
+        key = "%s%s::%s" % (self.reconciliation_prefix, storage, user_id)
+        return bool(
+            self.redis_server.set(key, 1, nx=True, ex=max(int(interval), 1))
+        )
+
+    def reconcile(self, storage, user_id, path):
+        """Correct the usage of a storage by the size of its directory
+
+        The difference between the directory size and the usage before the
+        scan is added, so that files that are counted while the directory is
+        scanned are kept.
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+            path (str): The directory of the storage
+
+        Returns:
+            int:
+            The reconciled usage in bytes
+
+        """
+        usage = self.get(storage, user_id)
+        size = get_path_size(path)
+        return max(self._add(storage, user_id, size - (usage or 0)), 0)
+
+    def get_usage(self, storage, user_id, path, interval):
+        """Return the usage of a storage from its counter
+
+        The usage is computed from the directory if it was never counted.
+        Otherwise the counter is reconciled in a background thread once per
+        interval.
+
+        Args:
+            storage (str): The storage, DOWNLOAD_CACHE or RESOURCE_STORAGE
+            user_id (str): The user id
+            path (str): The directory of the storage
+            interval (int): The reconciliation interval in seconds
+
+        Returns:
+            int:
+            The usage in bytes
+
+        """
+        usage = self.get(storage, user_id)
+        reconcile = self.start_reconciliation(storage, user_id, interval)
+        if usage is None:
+            # Only the first process initializes the counter
+            size = get_path_size(path)
+            key = self._get_key(storage, user_id)
+            if self.redis_server.set(key, size, nx=True):
+                return size
+            return self.get(storage, user_id)
+        if reconcile is True:
+            threading.Thread(
+                target=self.reconcile,
+                args=(storage, user_id, path),
+                daemon=True,
+            ).start()
+        return usage
+
+
+# Create the Redis interface instance
+redis_storage_usage_interface = RedisStorageUsageInterface()
@@ -113,6 +113,9 @@ class ResourceDataContainer(object):
         self.user_data = None
         self.storage_model = "file"
         self.queue = None
+        # The hash of the process chain to store its result in the process
+        # result cache
+        self.result_cache_key = None
 
     # def __str__(self):
     #    return str(self.__dict__)
@@ -133,6 +136,9 @@ class ResourceDataContainer(object):
     def set_queue_name(self, queue_name):
         self.queue = queue_name
 
+    def set_result_cache_key(self, result_cache_key):
+        self.result_cache_key = result_cache_key
+
     def set_storage_model_to_file(self):
         self.storage_model = "file"
 
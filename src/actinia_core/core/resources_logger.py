@@ -115,6 +115,40 @@ class ResourceLogger(RedisFluentLoggerBase):
         self.send_to_logger("RESOURCE_LOG", data)
         return redis_return
 
+    def commit_many(self, user_id, documents, expiration=8640000):
+        """Commit several resource entries of a user to the database with
+        a single request
+
+        Args:
+            user_id (str): The user id
+            documents (list): A list of (resource id, iteration, pickled
+                              document) tuples
+            expiration (int): Number of seconds of expiration time, default
+                              8640000s hence 100 days
+
+        Returns:
+            bool:
+            True for success, False otherwise
+
+        """
+        redis_return = self.db.set_many(
+            [
+                (
+                    self._generate_db_resource_id(
+                        user_id, resource_id, iteration
+                    ),
+                    document,
+                )
+                for resource_id, iteration, document in documents
+            ],
+            expiration,
+        )
+        for resource_id, iteration, document in documents:
+            http_code, data = pickle.loads(document)
+            data["logger"] = "resources_logger"
+            self.send_to_logger("RESOURCE_LOG", data)
+        return all(redis_return)
+
     def commit_termination(
         self, user_id, resource_id, iteration=None, expiration=3600
     ):
@@ -34,6 +34,7 @@ __maintainer__ = "__mundialis__"
 __email__ = "info@mundialis.de"
 
 from datetime import datetime
+from functools import lru_cache
 import numpy as np
 import pyproj
 from pystac import Item, read_dict, Catalog, Asset
@@ -44,6 +45,7 @@ from shapely.geometry import Polygon, mapping
 
 from actinia_core.core.common.exceptions import AsyncProcessTermination
 from actinia_core.core.common.app import API_VERSION
+from actinia_core.core.redis_stac_result import RedisSTACResultInterface
 from actinia_core.version import G_VERSION
 
 try:
@@ -60,7 +62,34 @@ except Exception:
     has_plugin = False
 
 
+@lru_cache(maxsize=64)
+def get_wgs84_transformer(epsg):
+    """Return the cached transformation function of coordinates from a
+    coordinate reference system to WGS 84
+
+    Args:
+        epsg (int): The EPSG code of the coordinate reference system
+
+    Returns:
+        function: The transform function of a pyproj.Transformer
+    """
+    return pyproj.Transformer.from_crs(
+        pyproj.CRS("EPSG:" + str(epsg)),
+        pyproj.CRS("EPSG:4326"),
+        always_xy=True,
+    ).transform
+
+
 class STACExporter:
+    """Build the STAC items of the exported resources of a job
+
+    The items are collected and written together with the updated result
+    catalog by save() in a single redis transaction.
+    """
+
+    def __init__(self):
+        self.items = []
+
     def stac_builder(self, resource_url: str, filename: str, output_type: str):
         """
         This function build the STAC ITEM and implement the following
@@ -75,12 +104,12 @@ class STACExporter:
 
         output_path = self._get_source_file(resource_url)
 
-        self._stac_collection_initializer()
-
         if output_type == "raster":
 
-            # Get parameters for STAC item
-            extra_values = self._get_raster_parameters(output_path)
+            # Get parameters for STAC item and the raster extension
+            extra_values, raster_values = self._get_raster_parameters(
+                output_path
+            )
 
             # Checking if the input has WGS 84 CRS
             geom, bbox_raster = self._get_wgs84_parameters(extra_values)
@@ -112,28 +141,13 @@ class STACExporter:
             )
 
             # Adding the Raster Extension
-            item = self._set_raster_extention(output_path, item)
+            item = self._set_raster_extention(raster_values, item)
 
             # Adding the Processing Extension
             item = self._set_processing_extention(item)
 
-            # Read catalog from REDIS
-            catalog_dict = redis_actinia_interface.read("result-catalog")
-
-            # Create Catalog Object
-            catalog = read_dict(catalog_dict)
-
-            redis_items = self._save_items_redis(item, item_name)
-
-            if redis_items:
-
-                # Add item to Catalog
-                catalog.add_item(item)
-
-                # Update redis catalog
-                self._update_catalog_redis(catalog)
-
-                return item.to_dict()
+            # The item is saved with the other items of the job
+            self.items.append(item)
 
         # TODO
         elif output_type == "vector":
@@ -149,8 +163,23 @@ class STACExporter:
 
         return source_file
 
+    def save(self):
+        """Save the collected items and add the new items to the result
+        catalog in a single redis transaction
+        """
+        if not self.items:
+            return
+
+        connectRedis()
+        self._stac_collection_initializer(connect=False)
+
+        RedisSTACResultInterface(redis_actinia_interface).save_items(
+            self.items, "result-catalog"
+        )
+        self.items = []
+
     @staticmethod
-    def _stac_collection_initializer():
+    def _stac_collection_initializer(connect=True):
         """
         Initialize the STAC Catalog for the different outputs in actinia
         Catalog allows to have versability on the spatio-temporal spectrum,
@@ -158,7 +187,8 @@ class STACExporter:
 
         Code uses pystac as base for the creation of stac catalogs
         """
-        connectRedis()
+        if connect is True:
+            connectRedis()
 
         result_catalog_validation = redis_actinia_interface.exists(
             "result-catalog"
@@ -176,25 +206,6 @@ class STACExporter:
         else:
             return "result-catalog is already created"
 
-    @staticmethod
-    def _save_items_redis(item, item_name):
-        try:
-            connectRedis()
-
-            exist = redis_actinia_interface.exists(item_name)
-
-            if exist:
-                redis_actinia_interface.update(item_name, item.to_dict())
-                return False
-
-            redis_actinia_interface.create(
-                item_name,
-                item.to_dict(),
-            )
-            return True
-        except AssertionError:
-            raise AssertionError("Something went wrong")
-
     @staticmethod
     def _get_raster_parameters(raster_path):
         with rasterio.open(raster_path) as raster:
@@ -211,6 +222,13 @@ class STACExporter:
             )
             crs = raster.crs.to_epsg()
 
+            band = raster.read(1)
+            raster_values = {
+                "raster:nodata": np.count_nonzero(np.isnan(band)),
+                "raster:spatial_resolution": raster.res[0],
+                "raster:data_type": str(band.dtype),
+            }
+
             extra_values = {
                 "gds": gds[0],
                 "crs": crs,
@@ -221,16 +239,12 @@ class STACExporter:
                 "datetime": "2021-12-09T16:41:39.985257Z",
             }
 
-            return extra_values
+            return extra_values, raster_values
 
     @staticmethod
     def _get_wgs84_parameters(extra_values):
         if extra_values["crs"] != 4326:
-            wgs84 = pyproj.CRS("EPSG:4326")
-            raster_proj = pyproj.CRS("EPSG:" + str(extra_values["crs"]))
-            project = pyproj.Transformer.from_crs(
-                raster_proj, wgs84, always_xy=True
-            ).transform
+            project = get_wgs84_transformer(extra_values["crs"])
             geojson = Polygon(
                 [tuple(i) for i in extra_values["geometry"]["coordinates"][0]]
             )
@@ -252,12 +266,6 @@ class STACExporter:
 
         return geom, bbox_raster
 
-    @staticmethod
-    def _update_catalog_redis(catalog):
-
-        new_catalog = catalog.to_dict()
-        redis_actinia_interface.update("result-catalog", new_catalog)
-
     @staticmethod
     def _set_processing_extention(item):
         input_item = item.to_dict()
@@ -277,25 +285,15 @@ class STACExporter:
         return proc_ext_item
 
     @staticmethod
-    def _set_raster_extention(raster_path, item):
-        with rasterio.open(raster_path) as raster:
-            band = raster.read(1)
-            pixelSizeX, pixelSizeY = raster.res
-
-            nodata = np.count_nonzero(np.isnan(band))
-            spatial_resolution = pixelSizeX
-            data_type = str(band.dtype)
-
-            input_item = item.to_dict()
-            asset = input_item["assets"]["source"]
-            asset["raster:nodata"] = nodata
-            asset["raster:spatial_resolution"] = spatial_resolution
-            asset["raster:data_type"] = data_type
-            proc_schema = (
-                "https://stac-extensions.github.io/raster/v1.1.0/schema.json"
-            )
-            input_item["stac_extensions"].append(proc_schema)
+    def _set_raster_extention(raster_values, item):
+        input_item = item.to_dict()
+        asset = input_item["assets"]["source"]
+        asset.update(raster_values)
+        proc_schema = (
+            "https://stac-extensions.github.io/raster/v1.1.0/schema.json"
+        )
+        input_item["stac_extensions"].append(proc_schema)
 
-            ras_ext_item = read_dict(input_item)
+        ras_ext_item = read_dict(input_item)
 
         return ras_ext_item
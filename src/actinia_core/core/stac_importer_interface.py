@@ -37,9 +37,14 @@ __maintainer__ = "__mundialis__"
 __email__ = "info@mundialis.de"
 
 
+import hashlib
 import requests
 import os
 import json
+import tempfile
+import time
+from uuid import uuid4
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.exceptions import AsyncProcessError
 from actinia_core.core.common.process_object import Process
 
@@ -51,6 +56,22 @@ except Exception:
     has_plugin = False
 
 
+# GDAL options for the concurrent import of cloud optimized GeoTIFFs: read
+# only the requested file without listing its directory, merge and
+# multiplex the HTTP range requests over a HTTP/2 connection, cache the
+# read blocks and retry failed requests
+GDAL_COG_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_HTTP_VERSION": "2",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MAX_RETRY": "3",
+    "GDAL_HTTP_RETRY_DELAY": "1",
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": "67108864",
+}
+
+
 class STACImporter:
     @staticmethod
     def _get_search_root(stac_collection_id):
@@ -76,8 +97,66 @@ class STACImporter:
         return stac_root_search
 
     @staticmethod
-    def _apply_filter(stac_root_search, stac_name, interval, bbox, filter):
+    def _search_pages(stac_root_search, search_body):
+        """Search a STAC API and yield the features page by page
+
+        The next pages are requested by following the next links of the
+        pages, that may use GET or POST requests.
 
+        Args:
+            stac_root_search (str): The url of the search endpoint
+            search_body (dict): The search parameters
+
+        Yields:
+            list: The features of a page
+        """
+        with requests.Session() as session:
+            page = session.post(stac_root_search, json=search_body).json()
+            if not page.get("features"):
+                page = session.get(stac_root_search, json=search_body).json()
+            if not page.get("features"):
+                raise AsyncProcessError("Not matched found")
+
+            while True:
+                yield page.get("features", [])
+
+                next_links = [
+                    link
+                    for link in page.get("links", [])
+                    if link.get("rel") == "next"
+                ]
+                if not next_links or not page.get("features"):
+                    return
+                next_link = next_links[0]
+                if next_link.get("method", "GET").upper() == "POST":
+                    body = next_link.get("body", {})
+                    if next_link.get("merge") is True:
+                        body = dict(search_body, **body)
+                    response = session.post(next_link["href"], json=body)
+                else:
+                    response = session.get(next_link["href"])
+                page = response.json()
+
+    def _search_features(
+        self, stac_root_search, stac_name, interval, bbox, filter
+    ):
+        """Search the items of a STAC collection and yield them one by one
+
+        The search results are cached in the STAC_SEARCH_CACHE_DIR directory
+        for STAC_SEARCH_CACHE_TTL seconds. The features are written to the
+        cache while they are consumed, a search is only cached if all its
+        pages were consumed.
+
+        Args:
+            stac_root_search (str): The url of the search endpoint
+            stac_name (str): The name of the STAC collection
+            interval (list): The temporal interval of the search
+            bbox (list): The bounding box of the search
+            filter (dict): The query of the search
+
+        Yields:
+            dict: The features of the search result
+        """
         search_body = {
             "collections": [stac_name],
         }
@@ -87,33 +166,60 @@ class STACImporter:
 
         search_body["interval"] = interval
 
-        stac_search = requests.post(stac_root_search, json=search_body)
-
-        full_filtered_result = stac_search.json()
-
-        if (
-            "features" in full_filtered_result
-            and len(full_filtered_result["features"]) > 0
-        ):
-            return full_filtered_result
-        else:
-            stac_search = requests.get(stac_root_search, json=search_body)
-            full_filtered_result = stac_search.json()
-
-            if (
-                "features" in full_filtered_result
-                and len(full_filtered_result["features"]) > 0
-            ):
+        cache_dir = global_config.STAC_SEARCH_CACHE_DIR
+        if not cache_dir:
+            for features in self._search_pages(stac_root_search, search_body):
+                for feature in features:
+                    yield feature
+            return
 
-                return full_filtered_result
-            else:
-                raise AsyncProcessError("Not matched found")
+        key = json.dumps([stac_root_search, search_body], sort_keys=True)
+        cache_path = os.path.join(
+            cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()
+        )
+        try:
+            age = time.time() - os.path.getmtime(cache_path)
+            cache_file = None
+            if age < global_config.STAC_SEARCH_CACHE_TTL:
+                cache_file = open(cache_path, "r")
+        except OSError:
+            cache_file = None
+        if cache_file is not None:
+            with cache_file:
+                for line in cache_file:
+                    yield json.loads(line)
+            return
+
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = "%s.%s.tmp" % (cache_path, uuid4().hex)
+        try:
+            with open(temp_path, "w") as temp_file:
+                for features in self._search_pages(
+                    stac_root_search, search_body
+                ):
+                    for feature in features:
+                        temp_file.write(json.dumps(feature) + "\n")
+                        yield feature
+            os.replace(temp_path, cache_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     @staticmethod
-    def _get_filtered_bands(stac_items, semantic_label):
-        band_roots = {}
+    def _iter_filtered_bands(features, semantic_label):
+        """Yield the band assets of STAC items, that match the semantic
+        labels
 
-        for feature in stac_items["features"]:
+        Args:
+            features (iterable): The STAC items
+            semantic_label (list): The common names or names of the bands,
+                                   all bands if empty
+
+        Yields:
+            tuple: The band name and a dict with the item id, the asset url
+                   and the datetime of the item
+        """
+        for feature in features:
             item_date = feature["properties"]["datetime"]
             for key, value in feature["assets"].items():
                 if "eo:bands" in value:
@@ -125,14 +231,11 @@ class STACImporter:
                             or semantic_label == []
                         ):
                             band_name = value["eo:bands"][0]["name"]
-                            if band_name not in band_roots:
-                                band_roots[band_name] = {}
-                            feature_id = feature["id"]
-                            item_link = feature["assets"][band_name]["href"]
-                            band_roots[band_name]["name_id"] = feature_id
-                            band_roots[band_name]["url"] = item_link
-                            band_roots[band_name]["datetime"] = item_date
-        return band_roots
+                            yield band_name, {
+                                "name_id": feature["id"],
+                                "url": value["href"],
+                                "datetime": item_date,
+                            }
 
     def _stac_import(
         self,
@@ -142,7 +245,31 @@ class STACImporter:
         bbox=None,
         filter=None,
         strd_name=None,
+        registration_file=None,
     ):
+        """Create the processes to import the filtered items of a STAC
+        collection into a new STRDS
+
+        The items are imported in parallel, each item by its own process
+        list that imports the raster map and sets its semantic label. The
+        process log contains the run time of each import. All maps are
+        registered in the STRDS by a single t.register call with a
+        registration file.
+
+        Args:
+            stac_collection_id (str): The id of the STAC collection
+            semantic_label (list): The semantic labels of the bands
+            interval (list): The temporal interval of the search
+            bbox (list): The bounding box of the search
+            filter (dict): The query of the search
+            strd_name (str): The name of the STRDS
+            registration_file (str): The path of the registration file, a
+                                     temporary file is created if None
+
+        Returns:
+            list[Process]:
+            The list of import commands
+        """
 
         if has_plugin:
             try:
@@ -154,12 +281,12 @@ class STACImporter:
 
             stac_root = self._get_search_root(stac_collection_id)
 
-            stac_filtered = self._apply_filter(
+            stac_features = self._search_features(
                 stac_root, stac_name, interval, bbox, filter
             )
 
-            stac_result = self._get_filtered_bands(
-                stac_filtered, semantic_label
+            stac_result = self._iter_filtered_bands(
+                stac_features, semantic_label
             )
 
             stac_processes = []
@@ -186,7 +313,9 @@ class STACImporter:
 
             stac_processes.append(p)
 
-            for key, value in stac_result.items():
+            import_process_lists = []
+            registration_lines = []
+            for key, value in stac_result:
                 item_id = value["name_id"]
                 output_name = f"{strd_name}_{item_id}_{key}"
 
@@ -208,10 +337,9 @@ class STACImporter:
                     executable_params=exec_params,
                     id=f"r_import_{output_name}",
                     skip_permission_check=True,
+                    env=GDAL_COG_OPTIONS,
                 )
 
-                stac_processes.append(import_raster)
-
                 # Setting the Semantic Label
                 exec_params_sl = [
                     "map=%s" % output_name,
@@ -226,21 +354,41 @@ class STACImporter:
                     skip_permission_check=True,
                 )
 
-                stac_processes.append(sem_lab)
+                import_process_lists.append([import_raster, sem_lab])
+                registration_lines.append(
+                    "%s|%s\n" % (output_name, value["datetime"])
+                )
+
+            if import_process_lists:
+                import_rasters = Process(
+                    exec_type="parallel",
+                    executable="parallel",
+                    executable_params=import_process_lists,
+                    id=f"r_import_{strd_name}",
+                    skip_permission_check=True,
+                )
+                stac_processes.append(import_rasters)
+
+                # Register all rasters in the STRDS at once
+                if registration_file is None:
+                    file_descriptor, registration_file = tempfile.mkstemp(
+                        suffix=".txt"
+                    )
+                    os.close(file_descriptor)
+                with open(registration_file, "w") as reg_file:
+                    reg_file.writelines(registration_lines)
 
-                # Register the raster to the STDR
                 exec_params_stdr = [
                     "input=%s" % strd_name,
                     "type=raster",
-                    "maps=%s" % output_name,
-                    "start=%s" % value["datetime"],
+                    "file=%s" % registration_file,
                 ]
 
                 registration = Process(
                     exec_type="grass",
                     executable="t.register",
                     executable_params=exec_params_stdr,
-                    id=f"t_register_{output_name}",
+                    id=f"t_register_{strd_name}",
                     skip_permission_check=True,
                 )
 
@@ -262,6 +410,8 @@ class STACImporter:
         """Helper method to get the stac import and download commands.
         Args:
             stac_entry (dict): stac_entry of the import description list
+            temp_file_path (str): The path of the temporary registration file
+                                  of the imported maps
         Returns:
             stac_commands: The stac download and import commands
         """
@@ -306,5 +456,6 @@ class STACImporter:
             bbox=stac_extent,
             filter=stac_filter,
             strd_name=stac_name,
+            registration_file=temp_file_path,
         )
         return stac_command
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Streaming parsers for the stdout output of executables
+"""
+
+import csv
+from itertools import zip_longest
+
+from actinia_core.core.common.exceptions import AsyncProcessError
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# Values that GRASS GIS modules use to represent no data
+NULL_VALUES = ("", "*")
+
+# The maximum size of a value in a row, that fits into a C long
+MAX_FIELD_SIZE = 2**31 - 1
+
+# The values of the parsed rows are not limited in size. The limit of the
+# csv module is global for the process, hence it is raised once on import
+# and not while rows are parsed.
+if csv.field_size_limit() < MAX_FIELD_SIZE:
+    csv.field_size_limit(MAX_FIELD_SIZE)
+
+# The file suffixes of the supported export formats
+EXPORT_FORMAT_SUFFIXES = {
+    "CSV": ".csv",
+    "Parquet": ".parquet",
+    "Arrow": ".arrow",
+}
+
+
+def split_rows(rows, delimiter):
+    """Split rows of text into lists of stripped values
+
+    Each row is stripped before it is split. The C implemented csv reader
+    is used for single character delimiters, without any quoting so that
+    the result is identical to row.strip().split(delimiter).
+
+    Args:
+        rows: An iterable of text rows
+        delimiter (str): The delimiter of the values in a row
+
+    Yields:
+        list: The stripped values of a row
+    """
+    if len(delimiter) == 1:
+        reader = csv.reader(
+            (row.strip() for row in rows),
+            delimiter=delimiter,
+            quoting=csv.QUOTE_NONE,
+            strict=False,
+        )
+        for values in reader:
+            yield [value.strip() for value in values] if values else [""]
+    else:
+        for row in rows:
+            yield [value.strip() for value in row.strip().split(delimiter)]
+
+
+def convert_column(values):
+    """Convert the string values of a column into the narrowest type that
+    fits all values: int, float or str
+
+    The GRASS GIS no data values "" and "*" are converted into None for
+    numerical columns.
+
+    Args:
+        values (list): The string values of a column
+
+    Returns:
+        tuple: (type name, list of converted values)
+    """
+    for type_name, convert in (("int", int), ("float", float)):
+        try:
+            return type_name, [
+                None if value in NULL_VALUES else convert(value)
+                for value in values
+            ]
+        except ValueError:
+            continue
+    return "str", list(values)
+
+
+def rows_to_columns(value_rows, header=False):
+    """Transpose rows of values into typed columns
+
+    Args:
+        value_rows: An iterable of value lists, e.g. from split_rows()
+        header (bool): If True the first row contains the column names,
+                       otherwise the columns are named by their index
+
+    Returns:
+        tuple: (list of column names, list of column types,
+                list of column value lists)
+    """
+    value_rows = iter(value_rows)
+    names = None
+    if header is True:
+        names = next(value_rows, [])
+
+    raw_columns = list(zip_longest(*value_rows, fillvalue=""))
+    if names is None:
+        names = [str(index) for index in range(len(raw_columns))]
+    # Columns that only exist in the header are empty
+    while len(raw_columns) < len(names):
+        raw_columns.append(())
+    # Columns without header name are named by their index
+    names = list(names) + [
+        str(index) for index in range(len(names), len(raw_columns))
+    ]
+
+    types = []
+    columns = []
+    for raw_column in raw_columns:
+        type_name, column = convert_column(raw_column)
+        types.append(type_name)
+        columns.append(column)
+
+    return names, types, columns
+
+
+def write_csv(value_rows, file_path, delimiter=","):
+    """Stream rows of values into a CSV file
+
+    Args:
+        value_rows: An iterable of value lists, e.g. from split_rows()
+        file_path (str): The path of the CSV file
+        delimiter (str): The delimiter of the CSV file
+
+    Returns:
+        int: The number of written rows
+    """
+    count = 0
+    with open(file_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file, delimiter=delimiter)
+        for values in value_rows:
+            writer.writerow(values)
+            count += 1
+    return count
+
+
+def write_columns(names, columns, file_path, format="Parquet"):
+    """Write typed columns into a Parquet or Arrow IPC file
+
+    This requires the optional pyarrow package.
+
+    Args:
+        names (list): The column names
+        columns (list): The lists of column values
+        file_path (str): The path of the output file
+        format (str): Parquet or Arrow
+
+    Raises:
+        AsyncProcessError: If pyarrow is not available or the format is
+                           not supported
+
+    Returns:
+        int: The number of written rows
+    """
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise AsyncProcessError(
+            "The export format <%s> of the stdout parser requires the python "
+            "package pyarrow" % format
+        )
+
+    table = pyarrow.table(
+        {name: column for name, column in zip(names, columns)}
+    )
+    if format == "Parquet":
+        pyarrow.parquet.write_table(table, file_path)
+    elif format == "Arrow":
+        pyarrow.feather.write_feather(table, file_path)
+    else:
+        raise AsyncProcessError(
+            "Unsupported export format <%s> of the stdout parser" % format
+        )
+    return table.num_rows
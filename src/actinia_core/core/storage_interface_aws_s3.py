@@ -40,6 +40,8 @@ __email__ = "soerengebbert@googlemail.com"
 class ResourceStorageS3(ResourceStorageBase):
     """Storage class of generated resources to be put in a AWS S3 bucket"""
 
+    url_lifetime = 3600
+
     def __init__(self, user_id, resource_id, config):
         """Storage class of generated resources to be put in a AWS S3 bucket
 
@@ -95,6 +97,7 @@ class ResourceStorageS3(ResourceStorageBase):
         url = self.s3_client.generate_presigned_url(
             ClientMethod="get_object",
             Params={"Bucket": self.bucket_name, "Key": object_path},
+            ExpiresIn=self.url_lifetime,
         )
 
         self.resource_file_list.append(object_path)
@@ -40,6 +40,10 @@ class ResourceStorageBase(object):
 
     __metaclass__ = ABCMeta
 
+    # The time in seconds that the resource urls are valid, None if they do
+    # not expire
+    url_lifetime = None
+
     def __init__(self, user_id, resource_id, config):
         """Abstract storage base class of generated resources
 
@@ -54,6 +58,9 @@ class ResourceStorageBase(object):
         self.config = config
         self.resource_url_list = []
         self.resource_file_list = []
+        # The RedisStorageUsageInterface to count the size of stored
+        # resources
+        self.storage_usage_interface = None
 
     @abstractmethod
     def setup(self):
@@ -70,6 +77,17 @@ class ResourceStorageBase(object):
         """
         return self.resource_url_list
 
+    def get_local_resource_paths(self):
+        """Return the paths of the stored resources on the local disk, that
+        must exist to reuse their urls
+
+        Returns:
+            (list): A list of paths, empty if the resources are not stored
+                    on the local disk
+
+        """
+        return []
+
     @abstractmethod
     def store_resource(self, file_path):
         """Store a resource (file) at the user resource storage and return an URL
@@ -27,6 +27,8 @@ Storage base class
 import os
 import shutil
 from .storage_interface_base import ResourceStorageBase
+from .common.exceptions import AsyncProcessError
+from .redis_storage_usage import RESOURCE_STORAGE, get_path_size
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -139,6 +141,19 @@ class ResourceStorageFilesystem(ResourceStorageBase):
         """
         return self.resource_url_list
 
+    def get_local_resource_paths(self):
+        """Return the paths of the stored resources in the resource
+        directory
+
+        Returns:
+            (list): A list of paths
+
+        """
+        return [
+            os.path.join(self.resource_export_path, os.path.basename(path))
+            for path in self.resource_file_list
+        ]
+
     def store_resource(self, file_path):
         """Store a resource (file) at the user resource storage and return an
         URL to the resource accessible via HTTP
@@ -148,6 +163,7 @@ class ResourceStorageFilesystem(ResourceStorageBase):
 
         Raises:
             IOError: If the resource path is not accessible.
+            AsyncProcessError: If the resource storage quota is exceeded
 
         Returns:
             (str): the resource url that points to the stored resource
@@ -155,6 +171,23 @@ class ResourceStorageFilesystem(ResourceStorageBase):
         """
         file_name = os.path.basename(file_path)
         export_path = os.path.join(self.resource_export_path, file_name)
+        if self.storage_usage_interface is not None:
+            quota = self.config.GRASS_RESOURCE_QUOTA
+            if (
+                self.storage_usage_interface.add_within_quota(
+                    RESOURCE_STORAGE,
+                    self.user_id,
+                    get_path_size(file_path),
+                    int(quota * 1024 * 1024 * 1024),
+                    self.user_export_path,
+                    self.config.STORAGE_USAGE_RECONCILE_INTERVAL,
+                )
+                is False
+            ):
+                raise AsyncProcessError(
+                    "Unable to store resource <%s>, the resource storage "
+                    "quota of %i GB is exceeded" % (file_name, quota)
+                )
         shutil.move(file_path, export_path)
         url = self.resource_url_base.replace("__None__", file_name)
 
@@ -168,4 +201,12 @@ class ResourceStorageFilesystem(ResourceStorageBase):
         if os.path.exists(self.resource_export_path) and os.path.isdir(
             self.resource_export_path
         ):
+            if self.storage_usage_interface is not None:
+                self.storage_usage_interface.add(
+                    RESOURCE_STORAGE,
+                    self.user_id,
+                    -get_path_size(self.resource_export_path),
+                    self.user_export_path,
+                    self.config.STORAGE_USAGE_RECONCILE_INTERVAL,
+                )
             shutil.rmtree(self.resource_export_path, ignore_errors=True)
@@ -44,6 +44,8 @@ class ResourceStorageGCS(ResourceStorageBase):
     bucket
     """
 
+    url_lifetime = 10 * 24 * 3600
+
     def __init__(self, user_id, resource_id, config):
         """
         Storage class of generated resources to be put in a Google Cloud
@@ -101,7 +103,7 @@ class ResourceStorageGCS(ResourceStorageBase):
         # Generate a persistent URL from the Bucket
         url = blob.generate_signed_url(
             # This URL is valid for 10 days
-            expiration=datetime.timedelta(days=10),
+            expiration=datetime.timedelta(seconds=self.url_lifetime),
             # Allow GET requests using this URL.
             method="GET",
         )
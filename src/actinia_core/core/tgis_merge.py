@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Merge of the temporal databases (tgis) of GRASS GIS mapsets
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+def get_schema(con, database="main"):
+    """Return the tables, indexes and views of a database
+
+    Args:
+        con (sqlite3.Connection): The database connection
+        database (str): The name of the database, for example the name of an
+                        attached database
+
+    Returns:
+        dict: The type and the SQL statement of each schema object by name
+    """
+    rows = con.execute(
+        'SELECT type, name, tbl_name, sql FROM "%s".sqlite_master '
+        "WHERE name NOT LIKE 'sqlite_%%'" % database
+    )
+    return dict(
+        (name, (object_type, table, sql))
+        for object_type, name, table, sql in rows
+    )
+
+
+def get_columns(con, table, database="main"):
+    """Return the column names of a table"""
+    return [
+        row[1]
+        for row in con.execute(
+            'PRAGMA "%s".table_info("%s")' % (database, table)
+        )
+    ]
+
+
+# The columns that contain comma separated lists of dataset ids, for
+# example the space time datasets in which a map is registered
+DATASET_ID_LIST_COLUMNS = ("registered_stds",)
+
+
+def rename_dataset_ids(dataset_ids, source_suffix, target_suffix):
+    """Rename the mapset of the ids in a comma separated list of dataset
+    ids, that end with the source suffix "@<mapset>"
+
+    Args:
+        dataset_ids (str): The comma separated list of dataset ids
+        source_suffix (str): The suffix of the source mapset
+        target_suffix (str): The suffix of the target mapset
+
+    Returns:
+        str: The list of dataset ids in the target mapset
+    """
+    if dataset_ids is None:
+        return None
+    return ",".join(
+        dataset_id[: -len(source_suffix)] + target_suffix
+        if dataset_id.endswith(source_suffix)
+        else dataset_id
+        for dataset_id in dataset_ids.split(",")
+    )
+
+
+def rename_mapset(con, source_mapset, target_mapset):
+    """Rename the mapset of all datasets in a temporal database
+
+    Only the id columns "<name>@<mapset>", the lists of dataset ids in the
+    DATASET_ID_LIST_COLUMNS and the mapset columns of the datasets in the
+    source mapset are rewritten. Datasets of other mapsets, for example
+    maps of the PERMANENT mapset that are registered in a space time
+    dataset, are not modified.
+
+    Args:
+        con (sqlite3.Connection): The database connection
+        source_mapset (str): The name of the source mapset
+        target_mapset (str): The name of the target mapset
+    """
+    source_suffix = "@" + source_mapset
+    target_suffix = "@" + target_mapset
+    con.create_function("rename_dataset_ids", 3, rename_dataset_ids)
+    for name, (object_type, table, sql) in get_schema(con).items():
+        if object_type != "table":
+            continue
+        columns = get_columns(con, name)
+        if "id" in columns:
+            update = (
+                'UPDATE %s "%s" SET id = substr(id, 1, length(id) - ?) || ? '
+                "WHERE substr(id, -?) = ?"
+            )
+            args = (
+                len(source_suffix),
+                target_suffix,
+                len(source_suffix),
+                source_suffix,
+            )
+            # The conflict resolution slows down the update of the primary
+            # key, hence it is only used if a dataset of the target mapset
+            # with the same name exists, which is replaced then
+            con.execute("SAVEPOINT rename_mapset")
+            try:
+                con.execute(update % ("", name), args)
+            except sqlite3.IntegrityError:
+                con.execute("ROLLBACK TO rename_mapset")
+                con.execute(update % ("OR REPLACE", name), args)
+            con.execute("RELEASE rename_mapset")
+        for column in DATASET_ID_LIST_COLUMNS:
+            if column in columns:
+                con.execute(
+                    'UPDATE "%s" SET "%s" = rename_dataset_ids("%s", ?, ?) '
+                    'WHERE instr("%s", ?) > 0'
+                    % (name, column, column, column),
+                    (source_suffix, target_suffix, source_suffix),
+                )
+        if "mapset" in columns:
+            con.execute(
+                'UPDATE "%s" SET mapset = ? WHERE mapset = ?' % name,
+                (target_mapset, source_mapset),
+            )
+
+
+def _merge_attached_database(con, database):
+    """Insert the datasets of an attached database that are not in the
+    main database
+
+    Returns:
+        bool: True if the schema of the main database changed
+    """
+    schema = get_schema(con)
+    attached_schema = get_schema(con, database)
+    schema_changed = False
+
+    for name, (object_type, table, sql) in attached_schema.items():
+        if object_type != "table":
+            continue
+        if name not in schema:
+            # For example the map register tables of space time datasets
+            con.execute(sql)
+            schema_changed = True
+        elif name == "tgis_metadata":
+            con.execute('DELETE FROM "%s"' % name)
+
+        columns = set(get_columns(con, name))
+        columns = ", ".join(
+            '"%s"' % column
+            for column in get_columns(con, name, database)
+            if column in columns
+        )
+        con.execute(
+            'INSERT OR IGNORE INTO "%s" (%s) SELECT %s FROM "%s"."%s"'
+            % (name, columns, columns, database, name)
+        )
+
+    for name, (object_type, table, sql) in attached_schema.items():
+        if object_type == "index" and sql is not None and name not in schema:
+            con.execute(sql)
+        elif object_type == "view" and (
+            name not in schema or schema[name][2] != sql
+        ):
+            schema_changed = True
+    return schema_changed
+
+
+def _recreate_views(con, database):
+    """Recreate the views of the main database, the views of the attached
+    database replace views with the same name"""
+    views = dict(
+        (name, sql)
+        for name, (object_type, table, sql) in get_schema(con).items()
+        if object_type == "view"
+    )
+    for name, (object_type, table, sql) in get_schema(con, database).items():
+        if object_type == "view":
+            views[name] = sql
+    for name in views:
+        con.execute('DROP VIEW IF EXISTS "%s"' % name)
+    for sql in views.values():
+        con.execute(sql)
+
+
+def merge_tgis_db(
+    tgis_db_path, source_mapset, target_mapset, target_tgis_db=None
+):
+    """Prepare the staged temporal database of a mapset for the merge into
+    a target mapset
+
+    The mapset name of the datasets is renamed and the datasets of the
+    existing temporal database of the target mapset are inserted, if they
+    do not exist in the staged database. All changes are applied in a
+    single transaction. The staged database is a disposable copy, hence
+    its journal is kept in memory and not synced to disk. The views are
+    only recreated if the schema changed.
+
+    Args:
+        tgis_db_path (str): The path of the staged tgis sqlite.db file, that
+                            is modified
+        source_mapset (str): The name of the source mapset
+        target_mapset (str): The name of the target mapset
+        target_tgis_db (str): The path of the tgis sqlite.db file of the
+                              target mapset, None if it does not exist
+    """
+    con = sqlite3.connect(tgis_db_path, isolation_level=None)
+    try:
+        con.execute("PRAGMA journal_mode=MEMORY")
+        con.execute("PRAGMA synchronous=OFF")
+        if target_tgis_db is not None:
+            con.execute("ATTACH DATABASE ? AS target", (target_tgis_db,))
+        con.execute("BEGIN")
+        try:
+            rename_mapset(con, source_mapset, target_mapset)
+            if target_tgis_db is not None:
+                if _merge_attached_database(con, "target") is True:
+                    _recreate_views(con, "target")
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+
+
+def create_benchmark_db(tgis_db_path, mapset, maps, offset=0):
+    """Create a synthetic temporal database with a space time raster
+    dataset and registered raster maps
+
+    Args:
+        tgis_db_path (str): The path of the sqlite.db file to create
+        mapset (str): The name of the mapset
+        maps (int): The number of raster maps
+        offset (int): The number of the first raster map
+    """
+    register = "raster_map_register_%s" % mapset
+    con = sqlite3.connect(tgis_db_path)
+    con.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS tgis_metadata (key VARCHAR NOT NULL,
+            value VARCHAR);
+        CREATE TABLE IF NOT EXISTS raster_base (id VARCHAR PRIMARY KEY,
+            name VARCHAR, mapset VARCHAR, creator VARCHAR,
+            temporal_type VARCHAR, creation_time TIMESTAMP,
+            modification_time TIMESTAMP);
+        CREATE TABLE IF NOT EXISTS raster_absolute_time (
+            id VARCHAR PRIMARY KEY, start_time TIMESTAMP,
+            end_time TIMESTAMP);
+        CREATE TABLE IF NOT EXISTS raster_spatial_extent (
+            id VARCHAR PRIMARY KEY, north DOUBLE PRECISION,
+            south DOUBLE PRECISION, east DOUBLE PRECISION,
+            west DOUBLE PRECISION, proj VARCHAR);
+        CREATE TABLE IF NOT EXISTS strds_base (id VARCHAR PRIMARY KEY,
+            name VARCHAR, mapset VARCHAR, creator VARCHAR,
+            temporal_type VARCHAR, creation_time TIMESTAMP,
+            modification_time TIMESTAMP, semantic_type VARCHAR);
+        CREATE TABLE IF NOT EXISTS strds_metadata (id VARCHAR PRIMARY KEY,
+            raster_register VARCHAR, number_of_maps INTEGER);
+        CREATE TABLE IF NOT EXISTS raster_stds_register (
+            id VARCHAR PRIMARY KEY, registered_stds TEXT);
+        CREATE TABLE IF NOT EXISTS %s (id VARCHAR PRIMARY KEY);
+        CREATE INDEX IF NOT EXISTS raster_base_mapset_index
+            ON raster_base (mapset);
+        CREATE VIEW IF NOT EXISTS raster_view_abs_time AS
+            SELECT A1.id, A1.name, A1.mapset, A2.start_time, A2.end_time,
+            A3.north, A3.south, A3.east, A3.west
+            FROM raster_base A1, raster_absolute_time A2,
+            raster_spatial_extent A3
+            WHERE A1.id = A2.id AND A1.id = A3.id;
+        """
+        % register
+    )
+    strds_id = "strds_%s@%s" % (mapset, mapset)
+    con.execute(
+        "INSERT OR REPLACE INTO strds_base VALUES (?, ?, ?, 'actinia', "
+        "'absolute', '2022-01-01', '2022-01-01', 'mean')",
+        (strds_id, "strds_" + mapset, mapset),
+    )
+    con.execute(
+        "INSERT OR REPLACE INTO strds_metadata VALUES (?, ?, ?)",
+        (strds_id, register, maps),
+    )
+    for number in range(offset, offset + maps):
+        map_id = "map_%i@%s" % (number, mapset)
+        con.execute(
+            "INSERT INTO raster_base VALUES (?, ?, ?, 'actinia', 'absolute', "
+            "'2022-01-01', '2022-01-01')",
+            (map_id, "map_%i" % number, mapset),
+        )
+        con.execute(
+            "INSERT INTO raster_absolute_time VALUES (?, ?, ?)",
+            (map_id, "2022-01-01 00:00:%02i" % (number % 60), None),
+        )
+        con.execute(
+            "INSERT INTO raster_spatial_extent VALUES (?, 1, 0, 1, 0, 'XY')",
+            (map_id,),
+        )
+        con.execute("INSERT INTO %s VALUES (?)" % register, (map_id,))
+        con.execute(
+            "INSERT INTO raster_stds_register VALUES (?, ?)",
+            (map_id, "strds_all@PERMANENT," + strds_id),
+        )
+    con.commit()
+    con.close()
+
+
+def benchmark(maps=100000):
+    """Measure the merge of a temporal database with the given number of
+    registered raster maps into a target temporal database of the same
+    size"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tgis_db_path = os.path.join(temp_dir, "source.db")
+        target_tgis_db = os.path.join(temp_dir, "target.db")
+        start = time.time()
+        create_benchmark_db(tgis_db_path, "mapset_tmp", maps)
+        create_benchmark_db(target_tgis_db, "target", maps, offset=maps)
+        print(
+            "Created databases with %i maps in %.2fs"
+            % (maps, time.time() - start)
+        )
+
+        start = time.time()
+        merge_tgis_db(tgis_db_path, "mapset_tmp", "target", target_tgis_db)
+        print("Merged databases in %.2fs" % (time.time() - start))
+
+        con = sqlite3.connect(tgis_db_path)
+        count = con.execute(
+            "SELECT count(*) FROM raster_view_abs_time WHERE mapset = 'target'"
+        ).fetchone()[0]
+        con.close()
+        print("Merged database has %i maps in mapset <target>" % count)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tile grid computation and on-disk cache of rendered map tiles
+"""
+
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from actinia_core.core.grass_metadata import read_header_file, scan_coordinate
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# The width and height of a tile in pixel
+TILE_SIZE = 256
+
+# Half of the width of the web mercator (EPSG:3857) world extent in meter
+WEB_MERCATOR_HALF_WIDTH = 20037508.342789244
+
+# The files of a raster map that determine its rendered image
+RASTER_RENDER_FILES = (
+    "cellhd/%s",
+    "cell/%s",
+    "fcell/%s",
+    "colr/%s",
+    "cell_misc/%s/null",
+    "cell_misc/%s/range",
+    "cell_misc/%s/f_range",
+)
+
+# The number of lock files that protect the rendering of metatiles
+LOCK_STRIPES = 256
+
+
+def is_web_mercator(location_path):
+    """Check if the coordinate reference system of a location is the web
+    mercator projection EPSG:3857
+
+    Args:
+        location_path (str): The path of the location
+
+    Returns:
+        bool: True if the location has the EPSG code 3857
+    """
+    permanent = os.path.join(location_path, "PERMANENT")
+    proj_epsg = read_header_file(os.path.join(permanent, "PROJ_EPSG"))
+    if proj_epsg is not None:
+        return proj_epsg.get("epsg") == "3857"
+    try:
+        with open(os.path.join(permanent, "PROJ_SRID"), "r") as srid:
+            return srid.read().strip().upper() == "EPSG:3857"
+    except OSError:
+        return False
+
+
+def get_tile_grid(location_path, mapset_path, raster_name):
+    """Return the tile grid of a raster map
+
+    Locations in web mercator use the global XYZ tile grid of web map
+    clients. All other locations use a native tile grid in the coordinate
+    reference system of the location, whose single tile at zoom level 0
+    is the square that covers the raster map, aligned to its north-west
+    corner.
+
+    Args:
+        location_path (str): The path of the location
+        mapset_path (str): The path of the mapset of the raster map
+        raster_name (str): The name of the raster map
+
+    Returns:
+        tuple: (west, north, size) of the tile at zoom level 0, None if the
+               raster map does not exist
+    """
+    if is_web_mercator(location_path) is True:
+        return (
+            -WEB_MERCATOR_HALF_WIDTH,
+            WEB_MERCATOR_HALF_WIDTH,
+            2 * WEB_MERCATOR_HALF_WIDTH,
+        )
+    cellhd = read_header_file(os.path.join(mapset_path, "cellhd", raster_name))
+    if cellhd is None:
+        return None
+    try:
+        north = scan_coordinate(cellhd["north"])
+        south = scan_coordinate(cellhd["south"])
+        east = scan_coordinate(cellhd["east"])
+        west = scan_coordinate(cellhd["west"])
+    except (KeyError, ValueError):
+        return None
+    return (west, north, max(north - south, east - west))
+
+
+def get_metatile(z, x, y, metatile_size):
+    """Return the metatile that contains a tile
+
+    A metatile covers metatile_size x metatile_size tiles, that are
+    rendered at once. At low zoom levels a metatile covers all tiles.
+
+    Args:
+        z (int): The zoom level
+        x (int): The column of the tile
+        y (int): The row of the tile
+        metatile_size (int): The number of tiles per metatile row and column
+
+    Returns:
+        tuple: (x, y, size) with the column and row of the upper left tile
+               and the number of tiles per row and column of the metatile
+    """
+    size = min(metatile_size, 2**z)
+    return x - x % size, y - y % size, size
+
+
+def get_tile_bounds(grid, z, x, y, size=1):
+    """Return the bounds of a tile or of a block of tiles
+
+    Args:
+        grid (tuple): The tile grid (west, north, size) from get_tile_grid()
+        z (int): The zoom level
+        x (int): The column of the upper left tile
+        y (int): The row of the upper left tile
+        size (int): The number of tiles per row and column of the block
+
+    Returns:
+        dict: The n, s, e and w bounds
+    """
+    grid_west, grid_north, grid_size = grid
+    tile_width = grid_size / 2**z
+    west = grid_west + x * tile_width
+    north = grid_north - y * tile_width
+    return {
+        "n": north,
+        "s": north - size * tile_width,
+        "e": west + size * tile_width,
+        "w": west,
+    }
+
+
+def get_raster_fingerprint(mapset_path, raster_name):
+    """Compute the fingerprint of a rendered raster map from the
+    modification times of the files that determine its image, i.e. the
+    header, the data, the null file, the range and the color table
+
+    Args:
+        mapset_path (str): The path of the mapset
+        raster_name (str): The name of the raster map
+
+    Returns:
+        str: The hexadecimal fingerprint, None if the raster map does not
+             exist
+    """
+    mtimes = []
+    for file_name in RASTER_RENDER_FILES:
+        try:
+            stat = os.stat(os.path.join(mapset_path, file_name % raster_name))
+            mtimes.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            mtimes.append(None)
+    if mtimes[0] is None:
+        return None
+    key = repr((os.path.abspath(mapset_path), raster_name, TILE_SIZE, mtimes))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class TileCache(object):
+    """Content addressed on-disk cache of rendered tiles
+
+    The tiles are stored by the fingerprint of the rendered map, hence
+    modified maps are rendered again and their outdated tiles are evicted
+    by least recent use. Every access updates the modification time of a
+    tile, which is used as last access time. The cache directory must be
+    accessible by the API processes and the actinia workers.
+
+    The eviction uses an index of the tiles with their access time and
+    size, that is updated by the lookups and the added tiles. The cache
+    directory is scanned only every scan interval to add the tiles of other
+    processes to the index, to remove temporary files of interrupted
+    renderings and to remove empty directories.
+    """
+
+    def __init__(
+        self, directory, max_size, eviction_interval=60, scan_interval=3600
+    ):
+        """Constructor
+
+        Args:
+            directory (str): The cache directory
+            max_size (int): The maximum size of the cache in bytes
+            eviction_interval (float): The minimum time in seconds between
+                                       two evictions
+            scan_interval (float): The time in seconds between two scans of
+                                   the cache directory
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.eviction_interval = eviction_interval
+        self.scan_interval = scan_interval
+        self.last_eviction = None
+        self.last_scan = None
+        # The access time and size of the tiles by path
+        self.index = {}
+        self.total_size = 0
+        self.lock = threading.Lock()
+
+    def get_tile_path(self, fingerprint, z, x, y):
+        """Return the path of a tile in the cache
+
+        Args:
+            fingerprint (str): The fingerprint of the rendered map
+            z (int): The zoom level
+            x (int): The column of the tile
+            y (int): The row of the tile
+
+        Returns:
+            str: The path of the tile
+        """
+        return os.path.join(
+            self.directory,
+            fingerprint[:2],
+            fingerprint,
+            str(z),
+            str(x),
+            "%i.png" % y,
+        )
+
+    def lookup(self, fingerprint, z, x, y):
+        """Look up a tile and mark it as recently used
+
+        Args:
+            fingerprint (str): The fingerprint of the rendered map
+            z (int): The zoom level
+            x (int): The column of the tile
+            y (int): The row of the tile
+
+        Returns:
+            str: The path of the cached tile, None if the tile is not cached
+        """
+        path = self.get_tile_path(fingerprint, z, x, y)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        with self.lock:
+            if path in self.index:
+                self.index[path] = (time.time(), self.index[path][1])
+        return path
+
+    def add(self, path):
+        """Add a written tile to the index of the cache
+
+        Args:
+            path (str): The path of the tile
+
+        Returns:
+            bool: True if the tile exists
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        with self.lock:
+            self._set_index_entry(path, stat.st_mtime, stat.st_size)
+        return True
+
+    def _set_index_entry(self, path, mtime, size):
+        if path in self.index:
+            self.total_size -= self.index[path][1]
+        self.index[path] = (mtime, size)
+        self.total_size += size
+
+    @staticmethod
+    def get_temporary_path(path):
+        """Create the directory of a tile and an empty temporary file next
+        to it, that is renamed to the tile path once the tile is written
+        completely
+
+        The temporary file keeps the directory from being removed as empty
+        directory by a concurrent scan of the cache.
+
+        Args:
+            path (str): The path of the tile
+
+        Returns:
+            str: The temporary path
+        """
+        temporary_path = "%s.%s.tmp" % (path, uuid4().hex)
+        while True:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                with open(temporary_path, "x"):
+                    return temporary_path
+            except FileNotFoundError:
+                # The directory was removed after it was created
+                continue
+
+    @contextmanager
+    def metatile_lock(self, fingerprint, z, x, y):
+        """Lock the rendering of a metatile across processes, so that
+        concurrent requests of its tiles render it only once
+
+        Args:
+            fingerprint (str): The fingerprint of the rendered map
+            z (int): The zoom level
+            x (int): The column of the upper left tile of the metatile
+            y (int): The row of the upper left tile of the metatile
+        """
+        key = "%s/%i/%i/%i" % (fingerprint, z, x, y)
+        stripe = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16)
+        lock_directory = os.path.join(self.directory, "locks")
+        os.makedirs(lock_directory, exist_ok=True)
+        lock_path = os.path.join(
+            lock_directory, "%03i.lock" % (stripe % LOCK_STRIPES)
+        )
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def evict(self, force=False):
+        """Remove the least recently used tiles of the index until the cache
+        size is below 90% of its maximum size
+
+        The cache directory is scanned before, if the last scan is older
+        than the scan interval.
+
+        Args:
+            force (bool): Evict even if the last eviction is more recent
+                          than the eviction interval
+
+        Returns:
+            int: The number of removed tiles
+        """
+        now = time.monotonic()
+        with self.lock:
+            if (
+                force is False
+                and self.last_eviction is not None
+                and now - self.last_eviction < self.eviction_interval
+            ):
+                return 0
+            self.last_eviction = now
+            scan = (
+                self.last_scan is None
+                or now - self.last_scan >= self.scan_interval
+            )
+            if scan is True:
+                self.last_scan = now
+        if scan is True:
+            self.scan()
+
+        with self.lock:
+            if self.total_size <= self.max_size:
+                return 0
+            tiles = sorted(
+                (mtime, size, path)
+                for path, (mtime, size) in self.index.items()
+            )
+        removed = 0
+        low_water_mark = 0.9 * self.max_size
+        for mtime, size, path in tiles:
+            with self.lock:
+                if self.total_size <= low_water_mark:
+                    break
+                if path not in self.index:
+                    continue
+                self.total_size -= self.index.pop(path)[1]
+            if self._remove(path) is True:
+                removed += 1
+        return removed
+
+    def scan(self):
+        """Rebuild the index from the cache directory, remove temporary
+        files of interrupted renderings and empty directories"""
+        index = {}
+        total_size = 0
+        expired = time.time() - 3600
+        for root, dirs, files in os.walk(self.directory):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if file_name.endswith(".png"):
+                    index[path] = (stat.st_mtime, stat.st_size)
+                    total_size += stat.st_size
+                elif file_name.endswith(".tmp") and stat.st_mtime < expired:
+                    self._remove(path)
+        with self.lock:
+            self.index = index
+            self.total_size = total_size
+
+        for root, dirs, files in os.walk(self.directory, topdown=False):
+            if root != self.directory and not dirs and not files:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        return True
+
+
+_tile_cache = None
+
+
+def get_tile_cache(config):
+    """Return the tile cache of this process, that is created on first use
+    with the directory and the size from the configuration
+
+    Args:
+        config (Configuration): The actinia configuration
+
+    Returns:
+        TileCache: The process wide tile cache
+    """
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = TileCache(
+            directory=config.TILE_CACHE_DIR,
+            max_size=config.TILE_CACHE_MAX_SIZE * 1024 * 1024,
+        )
+    return _tile_cache
@@ -89,6 +89,9 @@ def get_wget_process(source, url):
 def get_mv_process(source, dest):
     """The function returns a move Process for the given source and dest
 
+    The dest is expected to be located in the download cache, hence the
+    size of the source is counted against the download cache quota.
+
     Args:
         source (str): The source file name
         dest (str): The destination file name
@@ -108,6 +111,7 @@ def get_mv_process(source, dest):
         executable_params=copy_params,
         id=f"importer_mv_{os.path.basename(source)}",
         skip_permission_check=True,
+        download_cache=True,
     )
     return p
 
@@ -0,0 +1,529 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Out-of-band webhook delivery
+
+Job processes put webhook requests into a durable Redis stream and return
+immediately. A dedicated dispatcher process (scripts/webhook-dispatcher)
+reads the stream and delivers the requests with pooled HTTP sessions,
+exponential backoff and a concurrency limit per target host.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+logger = logging.getLogger("actinia_core.webhook_dispatcher")
+
+
+def get_webhook_target(url):
+    """Return the target of a webhook URL that is used to limit the number
+    of concurrent requests, which is the network location of the URL
+
+    Args:
+        url (str): The webhook URL
+
+    Returns:
+        str: The target, e.g. "example.com:8080"
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def get_backoff_time(attempt, base, maximum):
+    """Compute the exponential backoff time after a failed delivery
+
+    Args:
+        attempt (int): The number of the failed attempt, starting with 1
+        base (float): The waiting time in seconds after the first attempt
+        maximum (float): The upper limit of the waiting time in seconds
+
+    Returns:
+        float: The waiting time in seconds before the next attempt
+    """
+    return min(float(base) * 2 ** max(int(attempt) - 1, 0), float(maximum))
+
+
+def post_webhook(session, url, payload, auth=None, timeout=10):
+    """Send a single POST request to a webhook
+
+    The payload is send as JSON encoded string, as it was always done by
+    actinia.
+
+    Args:
+        session (requests.Session): The HTTP session to use
+        url (str): The webhook URL
+        payload (str): The JSON encoded response document
+        auth (str): The webhook authentication "username:password", the
+                    username is expected to be without colon (':')
+        timeout (float): The request timeout in seconds
+
+    Returns:
+        tuple: (delivered, retry) with delivered True if the webhook accepted
+               the request and retry True if the request should be repeated
+    """
+    kwargs = dict()
+    if auth:
+        kwargs["auth"] = HTTPBasicAuth(
+            auth.split(":")[0], ":".join(auth.split(":")[1:])
+        )
+    try:
+        resp = session.post(url, json=payload, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        return False, True
+    if 500 <= resp.status_code < 600:
+        return False, True
+    return resp.status_code in [200, 204], False
+
+
+class RedisWebhookInterface(object):
+    """
+    The Redis webhook queue interface
+
+    Webhook requests are stored as entries of a Redis stream that is read
+    by a consumer group of webhook dispatchers. Failed requests are put into
+    a sorted set, using the time of the next attempt as score, and moved back
+    into the stream when they are due. When the finished webhook of a
+    resource is queued, the resource is marked as finished, so that its
+    remaining update webhooks are dropped.
+    """
+
+    stream_name = "ACTINIA-WEBHOOK-STREAM"
+    group_name = "actinia-webhook-dispatcher"
+    retry_set_name = "ACTINIA-WEBHOOK-RETRY"
+    finished_prefix = "ACTINIA-WEBHOOK-FINISHED::"
+    # The time in seconds a resource is marked as finished
+    finished_expiration = 86400
+
+    def __init__(self):
+        self.connection_pool = None
+        self.redis_server = None
+
+    def connect(self, host, port, password=None):
+        """Connect to a specific redis server
+
+        Args:
+            host (str): The host name or IP address
+            port (int): The port
+            password (str): The password
+
+        """
+        kwargs = dict()
+        kwargs["host"] = host
+        kwargs["port"] = port
+        if password and password is not None:
+            kwargs["password"] = password
+        self.connection_pool = redis.ConnectionPool(**kwargs)
+        del kwargs
+        self.redis_server = redis.StrictRedis(
+            connection_pool=self.connection_pool
+        )
+
+    def disconnect(self):
+        self.connection_pool.disconnect()
+
+    def enqueue(
+        self, type, url, payload, auth=None, retries=1, resource_id=None
+    ):
+        """Put a webhook request into the stream
+
+        Args:
+            type (str): The webhook type: 'finished' or 'update'
+            url (str): The webhook URL
+            payload (str): The JSON encoded response document
+            auth (str): The webhook authentication "username:password"
+            retries (int): The maximum number of delivery attempts
+            resource_id (str): The id of the resource the webhook reports
+
+        Returns:
+            The id of the stream entry
+        """
+        entry = {
+            "type": type,
+            "url": url,
+            "payload": payload,
+            "auth": auth if auth else "",
+            "attempt": 0,
+            "retries": int(retries),
+            "resource_id": resource_id if resource_id else "",
+        }
+        pipe = self.redis_server.pipeline()
+        if type == "finished" and resource_id:
+            pipe.set(
+                self.finished_prefix + resource_id,
+                1,
+                ex=self.finished_expiration,
+            )
+        pipe.xadd(self.stream_name, entry)
+        return pipe.execute()[-1]
+
+    def is_finished(self, resource_id):
+        """Check if the finished webhook of a resource was queued
+
+        Args:
+            resource_id (str): The id of the resource
+
+        Returns:
+            bool: True if the resource is marked as finished
+        """
+        return bool(
+            self.redis_server.exists(self.finished_prefix + resource_id)
+        )
+
+    def create_group(self):
+        """Create the consumer group of the dispatchers, if it does not
+        exist already"""
+        try:
+            self.redis_server.xgroup_create(
+                self.stream_name, self.group_name, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def read(self, consumer, count, block=None, pending=False):
+        """Read entries of the stream for a dispatcher
+
+        Args:
+            consumer (str): The name of the dispatcher in the consumer group
+            count (int): The maximum number of entries
+            block (int): The time in milliseconds to wait for new entries
+            pending (bool): Read the entries that were read before by this
+                            consumer, but never acknowledged
+
+        Returns:
+            list: List of (entry id, entry dict) tuples
+        """
+        streams = {self.stream_name: "0" if pending is True else ">"}
+        result = self.redis_server.xreadgroup(
+            self.group_name, consumer, streams, count=count, block=block
+        )
+        entries = []
+        for _, stream_entries in result or []:
+            for entry_id, fields in stream_entries:
+                if not fields:
+                    # The entry was deleted after it was read
+                    self.acknowledge(entry_id)
+                    continue
+                entries.append((entry_id, self._decode(fields)))
+        return entries
+
+    def acknowledge(self, entry_id):
+        """Acknowledge and remove a delivered or dropped entry
+
+        Args:
+            entry_id: The id of the stream entry
+        """
+        pipe = self.redis_server.pipeline()
+        pipe.xack(self.stream_name, self.group_name, entry_id)
+        pipe.xdel(self.stream_name, entry_id)
+        pipe.execute()
+
+    def schedule_retry(self, entry_id, entry, due_time):
+        """Move a failed entry from the stream into the retry set
+
+        Args:
+            entry_id: The id of the stream entry
+            entry (dict): The entry with increased attempt counter
+            due_time (float): The unix time of the next attempt
+        """
+        pipe = self.redis_server.pipeline()
+        pipe.zadd(self.retry_set_name, {json.dumps(entry): due_time})
+        pipe.xack(self.stream_name, self.group_name, entry_id)
+        pipe.xdel(self.stream_name, entry_id)
+        pipe.execute()
+
+    def requeue_due_retries(self, now=None):
+        """Move all entries from the retry set into the stream that are due
+
+        The entries are moved in a single transaction that watches the retry
+        set, so that an entry is neither lost nor moved twice by concurrent
+        dispatchers.
+
+        Args:
+            now (float): The current unix time
+
+        Returns:
+            int: The number of moved entries
+        """
+        if now is None:
+            now = time.time()
+
+        def move_due_entries(pipe):
+            members = pipe.zrangebyscore(self.retry_set_name, "-inf", now)
+            pipe.multi()
+            for member in members:
+                pipe.zrem(self.retry_set_name, member)
+                pipe.xadd(self.stream_name, json.loads(member))
+            return len(members)
+
+        return self.redis_server.transaction(
+            move_due_entries, self.retry_set_name, value_from_callable=True
+        )
+
+    @staticmethod
+    def _decode(fields):
+        entry = {
+            key.decode()
+            if isinstance(key, bytes)
+            else key: (value.decode() if isinstance(value, bytes) else value)
+            for key, value in fields.items()
+        }
+        entry["attempt"] = int(entry.get("attempt", 0))
+        entry["retries"] = int(entry.get("retries", 1))
+        entry.setdefault("resource_id", "")
+        return entry
+
+
+class WebhookDispatcher(object):
+    """
+    Deliver the webhook requests of the Redis webhook stream
+
+    The requests are send from a thread pool that shares a single pooled
+    HTTP session. Not more than max_per_target requests are in flight to
+    the same target host at a time, so that a slow or unreachable target
+    does not block the delivery to all other targets. The requests of a
+    resource are delivered one after another in the order they were read,
+    and update requests of finished resources are dropped, so that an update
+    never arrives after the finished request.
+    """
+
+    def __init__(self, config, consumer, webhook_interface=None):
+        """Constructor
+
+        Args:
+            config (Configuration): The actinia configuration
+            consumer (str): The unique name of this dispatcher in the
+                            consumer group. Entries that were read but
+                            not finished are continued after a restart
+                            with the same name.
+            webhook_interface (RedisWebhookInterface): A connected interface,
+                                                       if None a new one is
+                                                       created
+        """
+        self.config = config
+        self.consumer = consumer
+        self.max_workers = int(config.WEBHOOK_DISPATCHER_WORKERS)
+        self.max_per_target = int(config.WEBHOOK_MAX_CONNECTIONS_PER_TARGET)
+        self.backoff_base = float(config.WEBHOOK_SLEEP)
+        self.backoff_max = float(config.WEBHOOK_BACKOFF_MAX)
+        self.timeout = float(config.WEBHOOK_TIMEOUT)
+
+        if webhook_interface is None:
+            webhook_interface = RedisWebhookInterface()
+            kwargs = dict()
+            kwargs["host"] = config.REDIS_SERVER_URL
+            kwargs["port"] = config.REDIS_SERVER_PORT
+            if config.REDIS_SERVER_PW and config.REDIS_SERVER_PW is not None:
+                kwargs["password"] = config.REDIS_SERVER_PW
+            webhook_interface.connect(**kwargs)
+            del kwargs
+        self.webhook_interface = webhook_interface
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Entries that were read from the stream, waiting for a free slot
+        # of their target
+        self.pending = defaultdict(deque)
+        # The number of requests in flight per target
+        self.active = defaultdict(int)
+        # The resources with a request in flight
+        self.active_resources = set()
+        self.lock = threading.Lock()
+        self.slot_released = threading.Event()
+        self.stopped = threading.Event()
+
+    def deliver(self, entry_id, entry):
+        """Deliver a single entry and acknowledge it or schedule a retry
+
+        Args:
+            entry_id: The id of the stream entry
+            entry (dict): The decoded stream entry
+
+        Returns:
+            bool: True if the webhook was delivered
+        """
+        if (
+            entry["type"] == "update"
+            and entry.get("resource_id")
+            and self.webhook_interface.is_finished(entry["resource_id"])
+        ):
+            # The update is outdated by the finished request
+            self.webhook_interface.acknowledge(entry_id)
+            return False
+
+        entry["attempt"] += 1
+        delivered, retry = post_webhook(
+            self.session,
+            entry["url"],
+            entry["payload"],
+            auth=entry["auth"],
+            timeout=self.timeout,
+        )
+        if delivered is False and retry is True:
+            if entry["attempt"] < entry["retries"]:
+                backoff = get_backoff_time(
+                    entry["attempt"], self.backoff_base, self.backoff_max
+                )
+                self.webhook_interface.schedule_retry(
+                    entry_id, entry, time.time() + backoff
+                )
+                return False
+
+        if delivered is False:
+            logger.error(
+                "Unable to access %s webhook URL %s after %i attempts"
+                % (entry["type"], entry["url"], entry["attempt"])
+            )
+        self.webhook_interface.acknowledge(entry_id)
+        return delivered
+
+    def _dispatch(self, executor):
+        """Submit pending entries of all targets that have a free slot
+
+        The entries are submitted after the lock is released, since the
+        done callback of an already finished delivery runs immediately and
+        takes the lock itself.
+        """
+        submissions = []
+        with self.lock:
+            for target, queue in self.pending.items():
+                # Entries of resources with a request in flight wait, the
+                # other entries are submitted in the order they were read
+                waiting = deque()
+                resources = set()
+                while queue and self.active[target] < self.max_per_target:
+                    entry_id, entry = queue.popleft()
+                    resource_id = entry.get("resource_id")
+                    if resource_id and (
+                        resource_id in self.active_resources
+                        or resource_id in resources
+                    ):
+                        resources.add(resource_id)
+                        waiting.append((entry_id, entry))
+                        continue
+                    if resource_id:
+                        self.active_resources.add(resource_id)
+                    self.active[target] += 1
+                    submissions.append((target, (entry_id, entry)))
+                queue.extendleft(reversed(waiting))
+        for target, (entry_id, entry) in submissions:
+            future = executor.submit(self.deliver, entry_id, entry)
+            future.add_done_callback(
+                functools.partial(
+                    self._release, target, entry.get("resource_id")
+                )
+            )
+
+    def _release(self, target, resource_id, future):
+        with self.lock:
+            self.active[target] -= 1
+            self.active_resources.discard(resource_id)
+        if future.exception() is not None:
+            logger.error(
+                "Webhook delivery failed: %s" % str(future.exception())
+            )
+        self.slot_released.set()
+
+    def _add_entries(self, entries):
+        with self.lock:
+            for entry_id, entry in entries:
+                self.pending[get_webhook_target(entry["url"])].append(
+                    (entry_id, entry)
+                )
+
+    def _num_queued(self):
+        with self.lock:
+            return sum(len(queue) for queue in self.pending.values()) + sum(
+                self.active.values()
+            )
+
+    def run(self, burst=False):
+        """Run the dispatcher loop until stop() is called
+
+        Args:
+            burst (bool): Return when the stream and the retry set are empty
+        """
+        self.webhook_interface.create_group()
+        # Continue the entries that were not finished before a restart
+        self._add_entries(
+            self.webhook_interface.read(
+                self.consumer, count=None, pending=True
+            )
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self.stopped.is_set():
+                self.webhook_interface.requeue_due_retries()
+                self._dispatch(executor)
+
+                capacity = 2 * self.max_workers - self._num_queued()
+                if capacity <= 0:
+                    self.slot_released.wait(1)
+                    self.slot_released.clear()
+                    continue
+
+                entries = self.webhook_interface.read(
+                    self.consumer,
+                    count=capacity,
+                    block=None if burst is True else 1000,
+                )
+                self._add_entries(entries)
+                self._dispatch(executor)
+
+                if (
+                    burst is True
+                    and not entries
+                    and self._num_queued() == 0
+                    and self.webhook_interface.redis_server.zcard(
+                        self.webhook_interface.retry_set_name
+                    )
+                    == 0
+                ):
+                    break
+                if not entries:
+                    self.slot_released.wait(0.1)
+                    self.slot_released.clear()
+
+    def stop(self):
+        self.stopped.set()
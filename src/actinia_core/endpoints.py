@@ -66,6 +66,9 @@ from actinia_core.rest.ephemeral_processing_with_export import (
 from actinia_core.rest.ephemeral_processing_with_export import (
     AsyncEphemeralExportGCSResource,
 )
+from actinia_core.rest.ephemeral_processing_batch import (
+    AsyncEphemeralExportBatchResource,
+)
 from actinia_core.rest.persistent_mapset_merger import (
     AsyncPersistentMapsetMergerResource,
 )
@@ -116,7 +119,11 @@ from actinia_core.rest.raster_renderer import (
 from actinia_core.rest.raster_renderer import (
     SyncEphemeralRasterShapeRendererResource,
 )
+from actinia_core.rest.raster_renderer import (
+    SyncEphemeralRasterTileRendererResource,
+)
 from actinia_core.rest.strds_renderer import SyncEphemeralSTRDSRendererResource
+from actinia_core.rest.batch_renderer import SyncEphemeralBatchRendererResource
 from actinia_core.rest.process_chain_monitoring import (
     MaxMapsetSizeResource,
     MapsetSizeResource,
@@ -198,6 +205,12 @@ def create_core_endpoints():
         "/locations/<string:location_name>/mapsets/<string:mapset_name>/"
         "render_shade",
     )
+    flask_api.add_resource(
+        SyncEphemeralRasterTileRendererResource,
+        "/locations/<string:location_name>/mapsets/<string:mapset_name>/"
+        "raster_layers/<string:raster_name>/tiles/"
+        "<int:z>/<int:x>/<int:y>.png",
+    )
     # STRDS management
     flask_api.add_resource(
         SyncSTRDSListerResource,
@@ -234,6 +247,11 @@ def create_core_endpoints():
         "/locations/<string:location_name>/mapsets/<string:mapset_name>/"
         "strds/<string:strds_name>/render",
     )
+    flask_api.add_resource(
+        SyncEphemeralBatchRendererResource,
+        "/locations/<string:location_name>/mapsets/<string:mapset_name>/"
+        "render_batch",
+    )
 
     # Validation
     flask_api.add_resource(
@@ -265,6 +283,10 @@ def create_core_endpoints():
         AsyncEphemeralExportGCSResource,
         "/locations/<string:location_name>/processing_async_export_gcs",
     )
+    flask_api.add_resource(
+        AsyncEphemeralExportBatchResource,
+        "/locations/<string:location_name>/processing_async_export_batch",
+    )
     flask_api.add_resource(
         AsyncPersistentResource,
         "/locations/<string:location_name>/mapsets/"
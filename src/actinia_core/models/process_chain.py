@@ -377,7 +377,7 @@ class StdoutParser(Schema):
         "format": {
             "type": "string",
             "description": "The stdout format to be parsed.",
-            "enum": ["table", "list", "kv", "json"],
+            "enum": ["table", "columns", "list", "kv", "json"],
         },
         "delimiter": {
             "type": "string",
@@ -387,6 +387,22 @@ class StdoutParser(Schema):
             '"=" in key/value pairs. A new line "\\n" is '
             "always the delimiter between rows in the output.",
         },
+        "header": {
+            "type": "boolean",
+            "description": "Only for the *columns* format: If true the first "
+            "row of the output contains the column names, otherwise the "
+            "columns are named by their index.",
+            "default": False,
+        },
+        "export_format": {
+            "type": "string",
+            "description": "The file format that is used to export the "
+            "parsed *table*, *columns* or *list* output as resource, if the "
+            "output exceeds the configured size limit. Parquet and Arrow "
+            "require the python package pyarrow on the server.",
+            "enum": ["CSV", "Parquet", "Arrow"],
+            "default": "CSV",
+        },
     }
     required = ["id", "format", "delimiter"]
     description = (
@@ -399,7 +415,12 @@ class StdoutParser(Schema):
         "result dictionary using the provided id as key. GRASS GIS modules "
         "produce regular output. Many modules have the flag *-g* to "
         "create key value pairs as stdout output. Other create a list of "
-        "values or a table with/without header."
+        "values or a table with/without header. "
+        "The *columns* format converts a table into typed columns "
+        "(integer, float or string) that are named by the header row or "
+        "by their index. Large *table*, *columns* or *list* outputs are "
+        "exported as resource and the result contains the resource URL "
+        "instead of the parsed values."
     )
     example = {"id": "stats", "format": "table", "delimiter": "|"}
 
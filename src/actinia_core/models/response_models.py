@@ -129,6 +129,30 @@ class ProcessLogModel(Schema):
             "format": "float",
             "description": "The size of the mapset in bytes",
         },
+        "stdout_size": {
+            "type": "number",
+            "format": "int64",
+            "description": "The size of the complete stdout output in bytes. "
+            "If it exceeds the configured buffer size, only the head and the "
+            "tail of the output are part of the stdout field",
+        },
+        "stderr_size": {
+            "type": "number",
+            "format": "int64",
+            "description": "The size of the complete stderr output in bytes. "
+            "If it exceeds the configured buffer size, only the head and the "
+            "tail of the output are part of the stderr field",
+        },
+        "stdout_url": {
+            "type": "string",
+            "description": "The URL to download the complete stdout output, "
+            "if it was truncated",
+        },
+        "stderr_url": {
+            "type": "string",
+            "description": "The URL to download the complete stderr output, "
+            "if it was truncated",
+        },
     }
     required = ["executable", "parameter", "stdout", "stderr", "return_code"]
 
@@ -239,6 +263,15 @@ class LockedMapsetListResponseModel(Schema):
             "items": {"type": "string"},
             "description": "The names of all locked mapsets",
         },
+        "lock_waiters": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "array",
+                "items": {"type": "string"},
+            },
+            "description": "The resource ids of the jobs that wait for the "
+            "lock of a mapset in the order of their arrival",
+        },
         "message": {
             "type": "string",
             "description": "A simple message to describes the status of the "
@@ -249,6 +282,11 @@ class LockedMapsetListResponseModel(Schema):
     example = {
         "status": "success",
         "locked_mapsets_list": ["utm32n/test_mapset"],
+        "lock_waiters": {
+            "utm32n/test_mapset": [
+                "resource_id-2f2b3e5a-8b9c-4f4e-9a43-5f3a6c0e1d7b"
+            ]
+        },
         "message": "number of locked mapsets: 1",
     }
 
@@ -50,7 +50,7 @@ class EphemeralRendererBase(EphemeralProcessing):
 
         Args:
             options: The parser options that contain n, s, e and w entries for
-                     region settings
+                     region settings and the optional PNG compression level
             result_file: The resulting PNG file name
             legacy: If True use the legacy process chain format for the
                     g.region process definition
@@ -66,6 +66,10 @@ class EphemeralRendererBase(EphemeralProcessing):
         os.putenv("GRASS_RENDER_TRUECOLOR", "TRUE")
         os.putenv("GRASS_RENDER_FILE", result_file)
         os.putenv("GRASS_RENDER_FILE_READ", "TRUE")
+        compression = self.config.RENDER_PNG_COMPRESSION
+        if options and "compression" in options:
+            compression = options["compression"]
+        os.putenv("GRASS_RENDER_FILE_COMPRESSION", str(compression))
 
         if legacy is True:
             pc = {"module": "g.region", "inputs": {}, "flags": "g"}
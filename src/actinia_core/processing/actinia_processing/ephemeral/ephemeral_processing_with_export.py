@@ -409,6 +409,8 @@ class EphemeralProcessingWithExport(EphemeralProcessing):
         At the moment only raster layer export is supported.
 
         """
+        # Collects the STAC items of the exported resources
+        stac = None
 
         for resource in self.resource_export_list:
 
@@ -516,13 +518,35 @@ class EphemeralProcessingWithExport(EphemeralProcessing):
 
                     if "metadata" in resource:
                         if resource["metadata"]["format"] == "STAC":
-                            stac = STACExporter()
+                            if stac is None:
+                                stac = STACExporter()
 
                             stac_catalog = stac.stac_builder(
                                 resource_url, file_name, output_type
                             )
                             self.resource_url_list.append(stac_catalog)
 
+        # Save all STAC items at once
+        if stac is not None:
+            stac.save()
+
+    def _export_spooled_outputs(self):
+        """Store the complete stdout and stderr outputs of all executables
+        whose outputs were truncated in the process log as resources and
+        add the resource URLs to the process log entries
+        """
+        for plm, name, spool_path in self.module_output_files:
+            if spool_path is None or not os.path.isfile(spool_path):
+                continue
+            process_name = plm.get("id") or plm["executable"]
+            file_name = "%s_%s" % (process_name, os.path.basename(spool_path))
+            output_path = os.path.join(os.path.dirname(spool_path), file_name)
+            os.rename(spool_path, output_path)
+            resource_url = self.storage_interface.store_resource(output_path)
+            plm["%s_url" % name] = resource_url
+            self.resource_url_list.append(resource_url)
+        self.module_output_files = list()
+
     def _execute(self, skip_permission_check=False):
         """Overwrite this function in subclasses
 
@@ -547,6 +571,8 @@ class EphemeralProcessingWithExport(EphemeralProcessing):
 
         # Export all resources and generate the finish response
         self._export_resources()
+        # Store the complete outputs that were truncated in the process log
+        self._export_spooled_outputs()
 
     def _final_cleanup(self):
         """
@@ -29,12 +29,22 @@ import fileinput
 import os
 import shutil
 import sqlite3
-import subprocess
 
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
+from contextlib import contextmanager
+from uuid import uuid4
+
 from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.mapset_merge import (
+    MAPSET_ELEMENTS,
+    IncompleteMergeError,
+    MapsetStager,
+    commit_merge,
+    plan_merge,
+)
+from actinia_core.core.tgis_merge import merge_tgis_db
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert, Guido Riembauer, Anika Weinmann"
@@ -75,6 +85,20 @@ class PersistentProcessing(EphemeralProcessing):
         - Unlock the two mapsets after processing is finished, terminated or
           raised an error
 
+    The mapset locks are fair: A job waits up to MAPSET_LOCK_WAIT_TIMEOUT
+    seconds in a first in, first out queue for a locked mapset. The locks
+    are acquired with the short expiration time MAPSET_LOCK_TTL and renewed
+    by a background heartbeat thread, so that the locks of crashed workers
+    expire soon. Each lock carries a fencing token that is checked before
+    every process and before the mapset is merged.
+
+    Processes that only read a mapset hold shared read locks while it is
+    linked into their temporary location. The exclusive lock of the target
+    mapset does not block these readers. Only the short merge phase, that
+    hardlinks the prepared temporary mapset into the target mapset, waits
+    for the readers to finish and blocks new readers. A new target mapset is
+    copied to a staging directory first and then renamed, which is atomic.
+
     """
 
     def __init__(self, rdc):
@@ -104,6 +128,11 @@ class PersistentProcessing(EphemeralProcessing):
             self.user_group, self.location_name, self.temp_mapset_name
         )
         self.temp_mapset_lock_set = False
+        # The fencing tokens of the mapset locks held by this process
+        self.lock_tokens = {}
+        # Renew the mapset locks in a background thread, set False to lock
+        # the mapsets for the time that the user can allocate at maximum
+        self.use_lock_heartbeat = True
 
     def _generate_mapset_lock_id(self, user_group, location_name, mapset_name):
         """Generate a unique id to lock a mapset in the redis database
@@ -126,19 +155,176 @@ class PersistentProcessing(EphemeralProcessing):
         """
         return "%s/%s/%s" % (user_group, location_name, mapset_name)
 
+    def _acquire_mapset_lock(self, lock_id):
+        """Acquire the fair lock of a mapset for this process
+
+        The process waits up to MAPSET_LOCK_WAIT_TIMEOUT seconds for the
+        lock, if the mapset is locked by another process. The acquired lock
+        is renewed by the heartbeat thread.
+
+        Args:
+            lock_id (str): The lock id of the mapset
+
+        Returns:
+            bool: True if the lock was acquired, False otherwise
+
+        """
+        if self.use_lock_heartbeat is True:
+            expiration = self.config.MAPSET_LOCK_TTL
+        else:
+            expiration = self.process_time_limit * self.process_num_limit
+
+        token = self.lock_interface.lock(
+            resource_id=lock_id, expiration=expiration, owner=self.resource_id
+        )
+        timeout = self.config.MAPSET_LOCK_WAIT_TIMEOUT
+        if token == 0 and timeout > 0:
+            self._send_resource_update(
+                "Waiting up to %i seconds for the lock of mapset <%s>"
+                % (timeout, lock_id.split("/")[-1])
+            )
+            token = self.lock_interface.lock(
+                resource_id=lock_id,
+                expiration=expiration,
+                owner=self.resource_id,
+                timeout=timeout,
+            )
+        if token == 0:
+            return False
+
+        self.lock_tokens[lock_id] = token
+        if self.use_lock_heartbeat is True:
+            self._add_lock_to_heartbeat(lock_id)
+        return True
+
+    def _check_mapset_locks(self):
+        """Check that all mapset locks are still held by this process
+
+        A lock is lost if its heartbeat failed, so that it expired and
+        another process acquired it with a higher fencing token.
+
+        Raises:
+            AsyncProcessError
+
+        """
+        for lock_id, token in self.lock_tokens.items():
+            if self.lock_interface.get_token(lock_id) != (
+                token,
+                self.resource_id,
+            ):
+                raise AsyncProcessError(
+                    "Lost the lock of mapset <%s>" % lock_id.split("/")[-1]
+                )
+
+    def _release_mapset_locks(self):
+        """Release all mapset locks held by this process and stop the
+        heartbeat
+
+        The target mapset lock protects modifications of the target mapset,
+        hence the generation of the target mapset is increased before its
+        lock is released.
+        """
+        if self.lock_heartbeat is not None:
+            self.lock_heartbeat.stop()
+            self.lock_heartbeat = None
+        if (
+            self.target_mapset_lock_set is True
+            and self.target_mapset_lock_id in self.lock_tokens
+        ):
+            self._bump_mapset_generation(self.target_mapset_name)
+        for lock_id in self.lock_tokens:
+            self.lock_interface.unlock(lock_id, owner=self.resource_id)
+        self.lock_tokens = {}
+
+    def _bump_mapset_generation(self, mapset_name):
+        """Increase the generation of a mapset of the user location after
+        it was modified, so that caches of its content become invalid
+
+        Args:
+            mapset_name (str): The name of the mapset in the user location
+
+        """
+        try:
+            self.mapset_generation_interface.bump(
+                self.user_group, self.location_name, mapset_name
+            )
+        except Exception as e:
+            self.message_logger.error(
+                "Unable to increase the generation of mapset <%s>: %s"
+                % (mapset_name, str(e))
+            )
+
+    @contextmanager
+    def _merge_window(self, mapset_name):
+        """Exclusive access to a mapset while data is merged into it
+
+        Waits up to MAPSET_MERGE_WAIT_TIMEOUT seconds until all other
+        processes released their read locks of the mapset. New readers
+        wait until the merge is finished. The read locks of the other linked
+        mapsets are released before, since they are not read anymore and a
+        process that merges into them may wait for them while reading this
+        mapset.
+
+        Args:
+            mapset_name (str): The name of the mapset in the user location
+
+        Raises:
+            AsyncProcessError
+
+        """
+        lock_id = self._generate_mapset_lock_id(
+            self.user_group, self.location_name, mapset_name
+        )
+        self._release_read_locks(keep=[lock_id])
+        timeout = self.config.MAPSET_MERGE_WAIT_TIMEOUT
+        if (
+            self.lock_interface.lock_exclusive(
+                resource_id=lock_id,
+                expiration=self.config.MAPSET_LOCK_TTL,
+                owner=self.resource_id,
+            )
+            == 0
+        ):
+            self._send_resource_update(
+                "Waiting up to %i seconds for the readers of mapset <%s>"
+                % (timeout, mapset_name)
+            )
+            if (
+                self.lock_interface.lock_exclusive(
+                    resource_id=lock_id,
+                    expiration=self.config.MAPSET_LOCK_TTL,
+                    owner=self.resource_id,
+                    timeout=timeout,
+                )
+                == 0
+            ):
+                raise AsyncProcessError(
+                    "Unable to merge into mapset <%s>, the mapset is still "
+                    "read by other processes" % mapset_name
+                )
+        self._add_lock_to_heartbeat(
+            lock_id, extend=self.lock_interface.extend_exclusive
+        )
+        try:
+            self._check_mapset_locks()
+            yield
+            self._bump_mapset_generation(mapset_name)
+        except IncompleteMergeError:
+            # The mapset was modified, although the merge failed
+            self._bump_mapset_generation(mapset_name)
+            raise
+        finally:
+            self.lock_heartbeat.remove(lock_id)
+            self.lock_interface.unlock_exclusive(
+                lock_id, owner=self.resource_id
+            )
+
     def _lock_temp_mapset(self):
         """Lock the temporary mapset
 
         This method sets in case of success: self.tmp_mapset_lock_set = True
         """
-        # Lock the temporary mapset for the time that the user can allocate at
-        # maximum
-        ret = self.lock_interface.lock(
-            resource_id=self.temp_mapset_lock_id,
-            expiration=self.process_time_limit * self.process_num_limit,
-        )
-
-        if ret == 0:
+        if self._acquire_mapset_lock(self.temp_mapset_lock_id) is False:
             raise AsyncProcessError(
                 "Unable to lock temporary mapset <%s>, "
                 "resource is already locked" % self.target_mapset_name
@@ -287,13 +473,7 @@ class PersistentProcessing(EphemeralProcessing):
 
         """
 
-        # Lock the mapset for the time that the user can allocate at maximum
-        ret = self.lock_interface.lock(
-            resource_id=self.target_mapset_lock_id,
-            expiration=self.process_time_limit * self.process_num_limit,
-        )
-
-        if ret == 0:
+        if self._acquire_mapset_lock(self.target_mapset_lock_id) is False:
             raise AsyncProcessError(
                 "Unable to lock location/mapset <%s/%s>, "
                 "resource is already locked"
@@ -332,93 +512,11 @@ class PersistentProcessing(EphemeralProcessing):
                     "group %s has no REF file" % (group_dir)
                 )
 
-    def _update_views_in_tgis(self, tgis_db_path):
-        """Update views in tgis sqlite.db
-
-        Args:
-            tgis_db_path(str): Path to the tgis sqlite.db file where the views
-                               should be updated
-        """
-        con = sqlite3.connect(tgis_db_path)
-        cur = con.cursor()
-
-        sql_script_folder = os.path.join(os.getenv("GISBASE"), "etc", "sql")
-        drop_view_sql = os.path.join(sql_script_folder, "drop_views.sql")
-        with open(drop_view_sql, "r") as sql:
-            sql_drop_str = sql.read()
-        cur.executescript(sql_drop_str)
-
-        view_sql_file_names = [
-            "raster_views.sql",
-            "raster3d_views.sql",
-            "vector_views.sql",
-            "strds_views.sql",
-            "str3ds_views.sql",
-            "stvds_views.sql",
-        ]
-        for view_sql_file_name in view_sql_file_names:
-            view_sql_file = os.path.join(sql_script_folder, view_sql_file_name)
-            with open(view_sql_file, "r") as sql:
-                sql_view_str = sql.read()
-            cur.executescript(sql_view_str)
-        con.commit()
-        if con:
-            con.close()
-        del cur
-
-    def _merge_tgis_dbs(self, tgis_db_path_1, tgis_db_path_2):
-        """Merge two tgis sqlite.db files
-
-        Args:
-            tgis_db_path_1(str): path of a tgis sqlite.db file in which the
-                                 other should be merged
-            tgis_db_path_2(str): path of a tgis sqlite.db file which should be
-                                 merged in tgis_db_path_1
-        """
-        con = sqlite3.connect(tgis_db_path_1)
-        con.execute(f"ATTACH '{tgis_db_path_2}' as dba")
-        con.execute("BEGIN")
-
-        table_names1 = [
-            row[1]
-            for row in con.execute(
-                "SELECT * FROM sqlite_master where type='table'"
-            )
-        ]
-        table_names2 = [
-            row[1]
-            for row in con.execute(
-                "SELECT * FROM dba.sqlite_master where type='table'"
-            )
-        ]
-
-        # merge databases
-        for table in table_names2:
-            if table == "tgis_metadata":
-                con.execute(f"DROP TABLE {table}")
-                con.execute(
-                    f"CREATE TABLE {table} AS " f"SELECT * FROM dba.{table}"
-                )
-                continue
-            # for example raster_register_xxx tables are not in both dbs
-            if table not in table_names1:
-                con.execute(
-                    f"CREATE TABLE {table} AS " f"SELECT * FROM dba.{table}"
-                )
-                continue
-            combine = (
-                f"INSERT OR IGNORE INTO {table} SELECT * FROM dba.{table}"
-            )
-            con.execute(combine)
-        con.commit()
-        con.execute("detach database dba")
-        if con:
-            con.close()
-
     def _change_mapsetname_in_tgis(
         self, tgis_path, source_mapset, target_mapset, target_tgis_db
     ):
-        """Replaces the mapset name in the tgis sqlite.db
+        """Replaces the mapset name in the tgis sqlite.db and merges the
+        tgis sqlite.db of the target mapset into it
 
         Args:
             tgis_path(str): path of the tgis folder in the source mapset
@@ -429,142 +527,134 @@ class PersistentProcessing(EphemeralProcessing):
         """
 
         tgis_db_path = os.path.join(tgis_path, "sqlite.db")
-
-        # tables
-        con = sqlite3.connect(tgis_db_path)
-        cur = con.cursor()
-        table_names = [
-            row[1]
-            for row in cur.execute(
-                "SELECT * FROM sqlite_master where type='table'"
+        try:
+            merge_tgis_db(
+                tgis_db_path, source_mapset, target_mapset, target_tgis_db
             )
-        ]
-        for table_name in table_names:
-            columns = [
-                row[0]
-                for row in cur.execute(
-                    f"SELECT * FROM {table_name}"
-                ).description
-            ]
-            for col in columns:
-                cur.execute(
-                    f"UPDATE {table_name} SET {col} = REPLACE({col}, "
-                    f"'{source_mapset}', '{target_mapset}')"
-                )
-        con.commit()
-        if con:
-            con.close()
-        del cur
+        except sqlite3.Error as e:
+            raise AsyncProcessError(
+                "Unable to merge the temporal database of mapset <%s> into "
+                "mapset <%s>. Exception %s"
+                % (source_mapset, target_mapset, str(e))
+            )
+
+    def _merge_mapset_into_target(
+        self, source_mapset, target_mapset, source_path=None
+    ):
+        """Merge the source mapset content into the target mapset
 
-        # if there already exists a sqlite.db file then merge it
-        if target_tgis_db is not None:
-            self._merge_tgis_dbs(tgis_db_path, target_tgis_db)
+        The content is staged next to the target mapset first: Files are
+        moved if the source can be consumed, hardlinked if the source must be
+        kept, or cloned or copied from another file system. The group and
+        temporal database files of the staged mapset are prepared and the
+        name collisions are checked. Then the staged content is renamed into
+        the target mapset in a short merge window that excludes all readers
+        of the target mapset.
 
-        # update views
-        self._update_views_in_tgis(tgis_db_path)
+        Attention: Not all directories and files in the mapset are merged.
+            See MAPSET_ELEMENTS.
 
-    def _merge_mapset_into_target(self, source_mapset, target_mapset):
-        """Link the source mapset content into the target mapset
+        Args:
+            source_mapset (str): The name of the source mapset
+            target_mapset (str): The name of the target mapset
+            source_path (str): The path of a source mapset that is consumed
+                               by the merge, by default the source mapset of
+                               the user location is used and kept
+
+        Raises:
+            AsyncProcessError
 
-        Attention: Not all directories and files in the mapset are copied.
-            See list directories.
         """
         self.message_logger.info(
             "Copy source mapset <%s> content "
             "into the target mapset <%s>" % (source_mapset, target_mapset)
         )
 
-        # Raster, vector, group and space time data set directories/files
-        directories = [
-            "cell",
-            "misc",
-            "fcell",
-            "cats",
-            "cellhd",
-            "cell_misc",
-            "colr",
-            "colr2",
-            "hist",
-            "vector",
-            "group",
-            "tgis",
-            "VAR",
-        ]
-
-        for directory in directories:
-            source_path = os.path.join(
-                self.user_location_path, source_mapset, directory
+        keep_source = source_path is None
+        if keep_source is True:
+            source_path = os.path.join(self.user_location_path, source_mapset)
+        target_path = os.path.join(self.user_location_path, target_mapset)
+        staging_path = os.path.join(
+            self.user_location_path, "mapset_" + uuid4().hex
+        )
+
+        keep_staging_path = False
+        try:
+            stager = MapsetStager(
+                source_path,
+                staging_path,
+                keep_source=keep_source,
+                workers=self.config.MAPSET_MERGE_WORKERS,
             )
-            target_path = os.path.join(self.user_location_path, target_mapset)
+            report = stager.stage(elements=MAPSET_ELEMENTS)
 
-            if os.path.exists(source_path) is True:
-                if directory == "group":
-                    self._change_mapsetname_in_group(
-                        source_path, source_mapset, target_mapset
-                    )
-                if directory == "tgis":
-                    target_tgis_db = None
-                    if os.path.isdir(os.path.join(target_path, "tgis")):
-                        target_tgis_db = os.path.join(
-                            target_path, "tgis", "sqlite.db"
-                        )
-                    self._change_mapsetname_in_tgis(
-                        source_path,
-                        source_mapset,
-                        target_mapset,
-                        target_tgis_db,
+            group_path = os.path.join(staging_path, "group")
+            if os.path.exists(group_path) is True:
+                self._change_mapsetname_in_group(
+                    group_path, source_mapset, target_mapset
+                )
+            tgis_path = os.path.join(staging_path, "tgis")
+            if os.path.exists(tgis_path) is True:
+                target_tgis_db = None
+                if os.path.isdir(os.path.join(target_path, "tgis")):
+                    target_tgis_db = os.path.join(
+                        target_path, "tgis", "sqlite.db"
                     )
+                self._change_mapsetname_in_tgis(
+                    tgis_path,
+                    source_mapset,
+                    target_mapset,
+                    target_tgis_db,
+                )
 
-            if os.path.exists(source_path) is True:
-                # Hardlink the sources into the target
-                stdout = subprocess.PIPE
-                stderr = subprocess.PIPE
-
-                p = subprocess.Popen(
-                    [
-                        "/bin/cp",
-                        "-flr",
-                        "%s" % source_path,
-                        "%s/." % target_path,
-                    ],
-                    stdout=stdout,
-                    stderr=stderr,
+            plan = plan_merge(staging_path, target_path, MAPSET_ELEMENTS)
+            if plan.conflicts:
+                raise AsyncProcessError(
+                    "Unable to merge mapset <%s> into mapset <%s>, the "
+                    "entries %s collide with the target mapset"
+                    % (source_mapset, target_mapset, ", ".join(plan.conflicts))
                 )
-                (stdout_buff, stderr_buff) = p.communicate()
-                if p.returncode != 0:
-                    raise AsyncProcessError(
-                        "Unable to merge mapsets. Error in linking:"
-                        " stdout: %s stderr: %s" % (stdout_buff, stderr_buff)
-                    )
+
+            with self._merge_window(target_mapset):
+                commit_merge(staging_path, target_path, plan)
+        except IncompleteMergeError as e:
+            # The staging directory keeps the original entries of the
+            # target mapset
+            keep_staging_path = True
+            self.message_logger.error(
+                "The replaced entries of mapset <%s> are kept in %s"
+                % (target_mapset, e.replaced_path)
+            )
+            raise AsyncProcessError(
+                "Unable to merge mapset <%s> into mapset <%s>, the target "
+                "mapset is incomplete. Exception %s"
+                % (source_mapset, target_mapset, str(e))
+            )
+        except OSError as e:
+            raise AsyncProcessError(
+                "Unable to merge mapset <%s> into mapset <%s>. Exception %s"
+                % (source_mapset, target_mapset, str(e))
+            )
+        finally:
+            if keep_staging_path is False:
+                shutil.rmtree(staging_path, ignore_errors=True)
+
+        self.message_logger.info(
+            "Merged mapset <%s> into mapset <%s>: %s, %i entries replaced"
+            % (source_mapset, target_mapset, str(report), len(plan.replaced))
+        )
 
     def _copy_merge_tmp_mapset_to_target_mapset(self):
         """Copy the temporary mapset into the original location
 
-        In case the mapset does not exists, then use the target mapset name,
-        otherwise use the temporary mapset name for copying which is later on
-        merged into the target mapset and then removed
+        In case the mapset does not exists, then copy it to a staging
+        directory that is renamed to the target mapset name, otherwise merge
+        the temporary mapset into the target mapset
         """
 
-        # Extent the mapset lock for an hour, since copying can take long
-        if self.target_mapset_lock_set is True:
-            ret = self.lock_interface.extend(
-                resource_id=self.target_mapset_lock_id, expiration=3600
-            )
-            if ret == 0:
-                raise AsyncProcessError(
-                    "Unable to extend lock for mapset "
-                    "<%s>" % self.target_mapset_name
-                )
-
-        if self.temp_mapset_lock_set is True:
-            ret = self.lock_interface.extend(
-                resource_id=self.temp_mapset_lock_id, expiration=3600
-            )
-            if ret == 0:
-                raise AsyncProcessError(
-                    "Unable to extend lock for "
-                    "temporary mapset <%s>" % self.temp_mapset_name
-                )
+        # The heartbeat renews the mapset locks while copying, make sure
+        # that no other process took them over before
+        self._check_mapset_locks()
 
         self.message_logger.info(
             "Copy temporary mapset from %s to %s"
@@ -574,59 +664,53 @@ class PersistentProcessing(EphemeralProcessing):
             )
         )
 
-        source_path = self.temp_mapset_path
-
-        # In case the mapset does not exists, then use the target mapset name,
-        # otherwise use the temporary mapset name for copying which is later
-        # on merged into the target mapset and then removed
+        # In case the mapset does not exists, then stage it and rename it to
+        # the target mapset name, so that the mapset appears completely at
+        # once, otherwise merge the temporary mapset into the target mapset
         if self.target_mapset_exists is True:
-            target_path = self.user_location_path + "/."
-            message = (
-                "Copy temporary mapset <%s> to target location "
-                "<%s>" % (self.temp_mapset_name, self.location_name)
+            self._send_resource_update(
+                "Merge temporary mapset <%s> into target mapset <%s>"
+                % (self.temp_mapset_name, self.target_mapset_name)
             )
-        else:
-            target_path = os.path.join(
-                self.user_location_path, self.target_mapset_name
+            self._merge_mapset_into_target(
+                self.temp_mapset_name,
+                self.target_mapset_name,
+                source_path=self.temp_mapset_path,
             )
-            message = (
+        else:
+            self._send_resource_update(
                 "Copy temporary mapset <%s> to target location "
                 "<%s>" % (self.target_mapset_name, self.location_name)
             )
-
-        self._send_resource_update(message)
-
-        try:
-            stdout = subprocess.PIPE
-            stderr = subprocess.PIPE
-            p = subprocess.Popen(
-                ["/bin/cp", "-fr", "%s" % source_path, "%s" % target_path],
-                stdout=stdout,
-                stderr=stderr,
+            staging_path = os.path.join(
+                self.user_location_path, "mapset_" + self.unique_id
             )
-            (stdout_buff, stderr_buff) = p.communicate()
-            if p.returncode != 0:
+            try:
+                stager = MapsetStager(
+                    self.temp_mapset_path,
+                    staging_path,
+                    keep_source=False,
+                    workers=self.config.MAPSET_MERGE_WORKERS,
+                )
+                report = stager.stage()
+                os.rename(
+                    staging_path,
+                    os.path.join(
+                        self.user_location_path, self.target_mapset_name
+                    ),
+                )
+                self._bump_mapset_generation(self.target_mapset_name)
+            except OSError as e:
+                shutil.rmtree(staging_path, ignore_errors=True)
                 raise AsyncProcessError(
                     "Unable to copy temporary mapset to "
-                    "original location. Copy error "
-                    "stdout: %s stderr: %s returncode: %i"
-                    % (stdout_buff, stderr_buff, p.returncode)
+                    "original location. Exception %s" % str(e)
                 )
-        except Exception as e:
-            raise AsyncProcessError(
-                "Unable to copy temporary mapset to "
-                "original location. Exception %s" % str(e)
+            self.message_logger.info(
+                "Copied mapset <%s>: %s" % (self.target_mapset_name, report)
             )
 
-        # Merge the temp mapset into the target mapset in case the target
-        # already exists
         if self.target_mapset_exists is True:
-            self._merge_mapset_into_target(
-                self.temp_mapset_name, self.target_mapset_name
-            )
-            shutil.rmtree(
-                os.path.join(self.user_location_path, self.temp_mapset_name)
-            )
             # remove interim results
             if self.interim_result.saving_interim_results is True:
                 interim_dir = os.path.join(
@@ -640,7 +724,7 @@ class PersistentProcessing(EphemeralProcessing):
                     shutil.rmtree(interim_dir)
 
     def _execute_process_list(self, process_list):
-        """Extend the mapset lock and execute the provided process list
+        """Check the mapset locks and execute the provided process list
 
         Args:
             process_list: The process list to execute
@@ -650,34 +734,14 @@ class PersistentProcessing(EphemeralProcessing):
             AsyncProcessTermination
         """
         for process in process_list:
-            # Extent the lock for each process by max processing time * 2
-            if self.target_mapset_lock_set is True:
-                ret = self.lock_interface.extend(
-                    resource_id=self.target_mapset_lock_id,
-                    expiration=self.process_time_limit * 2,
-                )
-                if ret == 0:
-                    raise AsyncProcessError(
-                        "Unable to extend lock for mapset <%s>"
-                        % self.target_mapset_name
-                    )
-
-            if self.temp_mapset_lock_set is True:
-                # Extent the lock for each process by max processing time * 2
-                ret = self.lock_interface.extend(
-                    resource_id=self.temp_mapset_lock_id,
-                    expiration=self.process_time_limit * 2,
-                )
-                if ret == 0:
-                    raise AsyncProcessError(
-                        "Unable to extend lock for "
-                        "temporary mapset <%s>" % self.temp_mapset_name
-                    )
+            self._check_mapset_locks()
 
             if process.exec_type == "grass":
                 self._run_module(process)
             elif process.exec_type == "exec":
                 self._run_process(process)
+            elif process.exec_type == "parallel":
+                self._execute_parallel_process_lists(process.executable_params)
             elif process.exec_type == "python":
                 eval(process.executable)
 
@@ -690,7 +754,7 @@ class PersistentProcessing(EphemeralProcessing):
           a user can consume -> process_num_limit*process_time_limit
         - Initialize and create the temporal database and mapset
           or use the original mapset
-        - Run the modules and extend the lock each run
+        - Run the modules and check the locks each run
         - Copy the mapset if it has not already exist
         - Cleanup and unlock the mapset
 
@@ -769,7 +833,4 @@ class PersistentProcessing(EphemeralProcessing):
         # Clean up and remove the temporary gisdbase
         self._cleanup()
         # Unlock the mapsets
-        if self.target_mapset_lock_set is True:
-            self.lock_interface.unlock(self.target_mapset_lock_id)
-        if self.temp_mapset_lock_set is True:
-            self.lock_interface.unlock(self.temp_mapset_lock_id)
+        self._release_mapset_locks()
@@ -63,6 +63,10 @@ class EphemeralRasterLegend(EphemeralProcessing):
         os.putenv("GRASS_RENDER_TRUECOLOR", "TRUE")
         os.putenv("GRASS_RENDER_FILE", result_file)
         os.putenv("GRASS_RENDER_FILE_READ", "TRUE")
+        os.putenv(
+            "GRASS_RENDER_FILE_COMPRESSION",
+            str(self.config.RENDER_PNG_COMPRESSION),
+        )
 
         pc = {}
         pc["1"] = {
@@ -32,10 +32,11 @@ import requests
 import shutil
 import subprocess
 import sys
-import tempfile
+import threading
 import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import json
 from requests.auth import HTTPBasicAuth
@@ -43,7 +44,34 @@ from requests.auth import HTTPBasicAuth
 from actinia_core.core.common.process_object import Process
 from actinia_core.core.grass_init import GrassInitializer
 from actinia_core.core.messages_logger import MessageLogger
-from actinia_core.core.redis_lock import RedisLockingInterface
+from actinia_core.core.output_capture import (
+    OutputCapture,
+    iter_stripped_rows,
+)
+from actinia_core.core.redis_lock import (
+    LockHeartbeat,
+    RedisLockingInterface,
+)
+from actinia_core.core.redis_mapset_generation import (
+    RedisMapsetGenerationInterface,
+)
+from actinia_core.core.redis_process_result_cache import (
+    RedisProcessResultCacheInterface,
+    get_mapset_fingerprints,
+)
+from actinia_core.core.redis_storage_usage import (
+    DOWNLOAD_CACHE,
+    RedisStorageUsageInterface,
+    get_path_size,
+)
+from actinia_core.core.webhook_dispatcher import RedisWebhookInterface
+from actinia_core.core.stdout_parser import (
+    EXPORT_FORMAT_SUFFIXES,
+    rows_to_columns,
+    split_rows,
+    write_columns,
+    write_csv,
+)
 from actinia_core.core.resources_logger import ResourceLogger
 from actinia_core.core.common.process_chain import ProcessChainConverter
 from actinia_core.core.common.exceptions import (
@@ -165,6 +193,10 @@ class EphemeralProcessing(object):
 
         self.location_name = self.rdc.location_name
         self.mapset_name = self.rdc.mapset_name
+        # The hash of the process chain if its result should be cached and
+        # the fingerprints of the referenced mapsets before processing
+        self.result_cache_key = self.rdc.result_cache_key
+        self.result_cache_mapsets = None
         # Set this True if the work is performed based on global database
         self.is_global_database = False
 
@@ -198,6 +230,9 @@ class EphemeralProcessing(object):
         # List of resources that should be created
         self.resource_export_list = list()
         self.resource_url_list = list()
+        # The storage interface to store resources, it is only available in
+        # subclasses that export resources
+        self.storage_interface = None
 
         # Initialize the user specific permissions
         self.cell_limit = 0
@@ -246,6 +281,12 @@ class EphemeralProcessing(object):
 
         self.setup_flag = False
 
+        # The lock ids of the user group mapsets that are linked into the
+        # temporary location and read locked by this process
+        self.read_lock_ids = []
+        # Renews the mapset locks of this process in a background thread
+        self.lock_heartbeat = None
+
         # The names of the temporarily generated files
         # "key":"temporary_file_path"
         self.temporary_pc_files = {}
@@ -253,6 +294,13 @@ class EphemeralProcessing(object):
         self.temp_file_count = 0
         # This dictionary contains the output of a process on stdout
         self.process_dict = {}
+        # The counter to generate unique names for spooled process outputs
+        self.output_file_count = 0
+        # Protects the counters of processes that run in parallel
+        self.process_lock = threading.Lock()
+        # A list of (process log, stream name, spool file path) tuples of
+        # process outputs that were truncated in the process log
+        self.module_output_files = list()
 
         # The class that is used to create the response
         self.response_model_class = ProcessingResponseModel
@@ -276,6 +324,9 @@ class EphemeralProcessing(object):
         # The authentication for the webhook (base 64 decoded
         # "username:password")
         self.webhook_auth = None
+        # The Redis webhook queue interface, if the webhooks are delivered
+        # by a webhook dispatcher
+        self.webhook_interface = None
 
     def _send_resource_update(self, message, results=None):
         """Create an HTTP response document and send it to the status database
@@ -473,6 +524,10 @@ class EphemeralProcessing(object):
         of tries. The number of tries is WEBHOOK_RETRIES which can be set in the
         config.
 
+        If WEBHOOK_DISPATCHER is enabled in the config, the request is only
+        put into the Redis webhook stream and delivered by the webhook
+        dispatcher.
+
         Args:
             document (str): The response document
             type (str): The webhook type: 'finished' or 'update'
@@ -493,6 +548,19 @@ class EphemeralProcessing(object):
 
         http_code, response_model = pickle.loads(document)
 
+        # The webhook dispatcher sends the request, so that the job process
+        # does not have to wait for the webhook
+        if self.webhook_interface is not None:
+            self.webhook_interface.enqueue(
+                type=type,
+                url=webhook_url,
+                payload=json.dumps(response_model),
+                auth=self.webhook_auth,
+                retries=webhook_retries,
+                resource_id=self.resource_id,
+            )
+            return
+
         webhook_not_reached = True
         retry = 0
         while webhook_not_reached is True and retry < webhook_retries:
@@ -656,36 +724,57 @@ class EphemeralProcessing(object):
             # to access it in the python udf environment
             self._add_actinia_process(process)
 
-            if process.exec_type == "grass" or process.exec_type == "exec":
-                if skip_permission_check is False:
-                    if process.skip_permission_check is False:
-                        resp = check_location_mapset_module_access(
-                            user_credentials=self.user_credentials,
-                            config=self.config,
-                            module_name=process.executable,
+            if process.exec_type == "parallel":
+                for parallel_process_list in process.executable_params:
+                    for parallel_process in parallel_process_list:
+                        self._check_process(
+                            parallel_process, skip_permission_check
                         )
-                        if resp is not None:
-                            raise AsyncProcessError(
-                                "Module or executable <%s> is not supported"
-                                % process.executable
-                            )
             else:
-                message = (
-                    "Wrong process description, type: %s "
-                    "module/executable: %s, args: %s"
-                    % (
-                        str(process.exec_type),
-                        str(process.executable),
-                        str(process.executable_params),
-                    )
-                )
-                raise AsyncProcessError(message)
+                self._check_process(process, skip_permission_check)
 
         # Update the processing
         self._update_num_of_steps(len(process_list))
 
         return process_list
 
+    def _check_process(self, process, skip_permission_check=False):
+        """Check the type of a process and if the user is allowed to run its
+        module or executable
+
+        Args:
+            process (Process): The process to check
+            skip_permission_check (bool): If set True, the permission checks
+                                          of module access are skipped
+
+        Raises:
+            AsyncProcessError
+        """
+        if process.exec_type == "grass" or process.exec_type == "exec":
+            if skip_permission_check is False:
+                if process.skip_permission_check is False:
+                    resp = check_location_mapset_module_access(
+                        user_credentials=self.user_credentials,
+                        config=self.config,
+                        module_name=process.executable,
+                    )
+                    if resp is not None:
+                        raise AsyncProcessError(
+                            "Module or executable <%s> is not supported"
+                            % process.executable
+                        )
+        else:
+            message = (
+                "Wrong process description, type: %s "
+                "module/executable: %s, args: %s"
+                % (
+                    str(process.exec_type),
+                    str(process.executable),
+                    str(process.executable_params),
+                )
+            )
+            raise AsyncProcessError(message)
+
     def _setup(self, init_grass=True):
         """Setup the logger, the mapset lock and the credentials. Create the
         temporary grass database and temporary file directories
@@ -754,6 +843,20 @@ class EphemeralProcessing(object):
 
         self.lock_interface = RedisLockingInterface()
         self.lock_interface.connect(**kwargs)
+        self.mapset_generation_interface = RedisMapsetGenerationInterface()
+        self.mapset_generation_interface.connect(**kwargs)
+        self.storage_usage_interface = RedisStorageUsageInterface()
+        self.storage_usage_interface.connect(**kwargs)
+        if self.storage_interface is not None:
+            self.storage_interface.storage_usage_interface = (
+                self.storage_usage_interface
+            )
+        if self.result_cache_key is not None:
+            self.result_cache_interface = RedisProcessResultCacheInterface()
+            self.result_cache_interface.connect(**kwargs)
+        if self.config.WEBHOOK_DISPATCHER is True:
+            self.webhook_interface = RedisWebhookInterface()
+            self.webhook_interface.connect(**kwargs)
         del kwargs
         self.process_time_limit = int(
             self.user_credentials["permissions"]["process_time_limit"]
@@ -889,6 +992,10 @@ class EphemeralProcessing(object):
                             f"<{self.location_name}>"
                         )
 
+            # Read lock the mapsets of the user group, so that they are not
+            # merged while they are linked
+            self._lock_linked_mapsets(mapsets_to_link)
+
             # Link the original mapsets from global and user database into the
             # temporary location
             for mapset_path, mapset in mapsets_to_link:
@@ -909,6 +1016,86 @@ class EphemeralProcessing(object):
                 ", Exception: %s" % str(e)
             )
 
+    def _lock_linked_mapsets(self, mapsets_to_link):
+        """Acquire shared read locks of the user group mapsets that will be
+        linked into the temporary location
+
+        Many processes can read a mapset at the same time. A process that
+        merges new data into a mapset waits until all readers released their
+        locks, and new readers wait until the merge is finished. Mapsets of
+        the global database are read only and not locked.
+
+        Args:
+            mapsets_to_link (list): List of (mapset path, mapset name) tuples
+
+        Raises:
+            AsyncProcessError
+
+        """
+        lock_ids = []
+        for mapset_path, mapset in mapsets_to_link:
+            if os.path.dirname(mapset_path) == self.user_location_path:
+                lock_id = "%s/%s/%s" % (
+                    self.user_group,
+                    self.location_name,
+                    mapset,
+                )
+                if lock_id not in self.read_lock_ids:
+                    lock_ids.append(lock_id)
+        if not lock_ids:
+            return
+
+        ret = self.lock_interface.lock_shared(
+            resource_ids=lock_ids,
+            expiration=self.config.MAPSET_LOCK_TTL,
+            owner=self.resource_id,
+            timeout=self.config.MAPSET_READ_WAIT_TIMEOUT,
+        )
+        if ret == 0:
+            raise AsyncProcessError(
+                "Unable to read lock the mapsets <%s>, a mapset is merged"
+                % ", ".join(lock_id.split("/")[-1] for lock_id in lock_ids)
+            )
+        for lock_id in lock_ids:
+            self.read_lock_ids.append(lock_id)
+            self._add_lock_to_heartbeat(
+                lock_id, extend=self.lock_interface.extend_shared
+            )
+
+    def _add_lock_to_heartbeat(self, lock_id, extend=None):
+        """Renew a lock of this process in the background from now on
+
+        Args:
+            lock_id (str): The lock id
+            extend (function): The method of the lock interface that
+                               extends the lock
+        """
+        if self.lock_heartbeat is None:
+            self.lock_heartbeat = LockHeartbeat(
+                self.lock_interface, self.config.MAPSET_LOCK_TTL
+            )
+        self.lock_heartbeat.add(lock_id, self.resource_id, extend=extend)
+
+    def _release_read_locks(self, keep=()):
+        """Release the read locks of the linked mapsets, the heartbeat is
+        stopped if it renews no other locks
+
+        Args:
+            keep (list): The lock ids of the read locks that are kept
+        """
+        kept_lock_ids = []
+        for lock_id in self.read_lock_ids:
+            if lock_id in keep:
+                kept_lock_ids.append(lock_id)
+                continue
+            if self.lock_heartbeat is not None:
+                self.lock_heartbeat.remove(lock_id)
+            self.lock_interface.unlock_shared(lock_id, owner=self.resource_id)
+        self.read_lock_ids = kept_lock_ids
+        if self.lock_heartbeat is not None and not self.lock_heartbeat.locks:
+            self.lock_heartbeat.stop()
+            self.lock_heartbeat = None
+
     def _link_mapsets(self, mapsets, mapsets_to_link, check_all_mapsets):
         """Helper method to link locations mapsets
 
@@ -1166,14 +1353,73 @@ class EphemeralProcessing(object):
                     os.path.join(self.temp_mapset_path, "WIND"),
                 )
 
+    def _add_to_download_cache(self, path):
+        """Count a downloaded file or directory that will be moved into the
+        download cache of the user against the download cache quota
+
+        Args:
+            path (str): The path of the downloaded file or directory
+
+        Raises:
+            AsyncProcessError: If the download cache quota is exceeded
+
+        Returns:
+            int: The size in bytes that was added to the usage
+        """
+        size = get_path_size(path)
+        quota = self.config.DOWNLOAD_CACHE_QUOTA
+        if (
+            self.storage_usage_interface.add_within_quota(
+                DOWNLOAD_CACHE,
+                self.user_id,
+                size,
+                int(quota * 1024 * 1024 * 1024),
+                os.path.join(self.config.DOWNLOAD_CACHE, self.user_id),
+                self.config.STORAGE_USAGE_RECONCILE_INTERVAL,
+            )
+            is False
+        ):
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+            raise AsyncProcessError(
+                "Unable to move <%s> into the download cache, the download "
+                "cache quota of %i GB is exceeded"
+                % (os.path.basename(path), quota)
+            )
+        return size
+
+    def _remove_from_download_cache(self, path):
+        """Remove an uploaded file or directory from the download cache of
+        the user and subtract its size from the download cache usage
+
+        Args:
+            path (str): The path of the file or directory
+        """
+        self.storage_usage_interface.add(
+            DOWNLOAD_CACHE,
+            self.user_id,
+            -get_path_size(path),
+            os.path.join(self.config.DOWNLOAD_CACHE, self.user_id),
+            self.config.STORAGE_USAGE_RECONCILE_INTERVAL,
+        )
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
     def _cleanup(self):
         """Clean up the GrassInitializer files created in
-        self._setup() and remove the created temporary database.
+        self._setup(), release the read locks of the linked mapsets and
+        remove the created temporary database.
 
         """
         if self.ginit:
             self.ginit.clean_up()
 
+        self._release_read_locks()
+
         if (
             self.temp_grass_data_base is not None
             and os.path.exists(self.temp_grass_data_base)
@@ -1257,8 +1503,9 @@ class EphemeralProcessing(object):
         Args:
             num (int): The number for which the progress should be increased
         """
-        self.progress_steps += num
-        self.progress["step"] = self.progress_steps
+        with self.process_lock:
+            self.progress_steps += num
+            self.progress["step"] = self.progress_steps
 
     def _add_actinia_process(self, process: Process):
         """Add an actinia process to the list and dictionary
@@ -1391,7 +1638,21 @@ class EphemeralProcessing(object):
                 "user request" % process.executable
             )
 
-        return self._run_executable(process, poll_time)
+        if process.download_cache is False:
+            return self._run_executable(process, poll_time)
+
+        size = self._add_to_download_cache(process.executable_params[0])
+        try:
+            return self._run_executable(process, poll_time)
+        except Exception:
+            self.storage_usage_interface.add(
+                DOWNLOAD_CACHE,
+                self.user_id,
+                -size,
+                os.path.join(self.config.DOWNLOAD_CACHE, self.user_id),
+                self.config.STORAGE_USAGE_RECONCILE_INTERVAL,
+            )
+            raise
 
     def _run_module(self, process, poll_time=0.05):
         """Run the GRASS module actinia_core.core.common.process_object.Process
@@ -1500,12 +1761,26 @@ class EphemeralProcessing(object):
 
         """
 
-        # Use temporary files to catch stdout and stderr
-        stdout_buff = tempfile.NamedTemporaryFile(
-            mode="w+b", delete=True, dir=self.temp_file_path
+        # Stream stdout and stderr through pipes into bounded buffers, the
+        # complete output is spooled into files in the temporary directory
+        stdout_spool_path = None
+        stderr_spool_path = None
+        if self.temp_file_path is not None:
+            with self.process_lock:
+                self.output_file_count += 1
+                output_file_count = self.output_file_count
+            spool_base = os.path.join(
+                self.temp_file_path, "output_%i" % output_file_count
+            )
+            stdout_spool_path = spool_base + "_stdout.txt"
+            stderr_spool_path = spool_base + "_stderr.txt"
+        stdout_capture = OutputCapture(
+            spool_path=stdout_spool_path,
+            buffer_size=self.config.PROCESS_OUTPUT_BUFFER_SIZE,
         )
-        stderr_buff = tempfile.NamedTemporaryFile(
-            mode="w+b", delete=True, dir=self.temp_file_path
+        stderr_capture = OutputCapture(
+            spool_path=stderr_spool_path,
+            buffer_size=self.config.PROCESS_OUTPUT_BUFFER_SIZE,
         )
         stdin_file = None
 
@@ -1518,6 +1793,10 @@ class EphemeralProcessing(object):
 
         self._increment_progress(num=1)
 
+        env = None
+        if process.env:
+            env = dict(os.environ, **process.env)
+
         # GRASS andactinia_core.core.Unix executables have different run
         # methods
         if process.exec_type in "grass":
@@ -1525,9 +1804,10 @@ class EphemeralProcessing(object):
                 process.executable,
                 process.executable_params,
                 raw=True,
-                stdout=stdout_buff,
-                stderr=stderr_buff,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 stdin=stdin_file,
+                env=env,
             )
         else:
             inputlist = list()
@@ -1536,25 +1816,25 @@ class EphemeralProcessing(object):
 
             proc = subprocess.Popen(
                 args=inputlist,
-                stdout=stdout_buff,
-                stderr=stderr_buff,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 stdin=stdin_file,
+                env=env,
             )
 
+        stdout_capture.start(proc.stdout)
+        stderr_capture.start(proc.stderr)
+
         run_time = self._wait_for_process(
             process.executable, process.executable_params, proc, poll_time
         )
 
         proc.wait()
 
-        stdout_buff.flush()
-        stderr_buff.flush()
-        stdout_buff.seek(0)
-        stderr_buff.seek(0)
-        stdout_string = stdout_buff.read().decode()
-        stderr_string = stderr_buff.read().decode()
-        stdout_buff.close()
-        stderr_buff.close()
+        stdout_capture.finish()
+        stderr_capture.finish()
+        stdout_string = stdout_capture.get_string()
+        stderr_string = stderr_capture.get_string()
         if stdin_file:
             stdin_file.close()
 
@@ -1568,6 +1848,8 @@ class EphemeralProcessing(object):
             "stdout": stdout_string,
             "stderr": stderr_string.split("\n"),
             "run_time": run_time,
+            "stdout_size": stdout_capture.total_bytes,
+            "stderr_size": stderr_capture.total_bytes,
         }
         if self.temp_mapset_path:
             kwargs["mapset_size"] = get_directory_size(self.temp_mapset_path)
@@ -1579,6 +1861,16 @@ class EphemeralProcessing(object):
         # generation
         if process.id is not None:
             self.module_output_dict[process.id] = plm
+        # Remember the spool files of truncated outputs, they are used
+        # by the stdout parser and can be exported as resources
+        for name, capture in (
+            ("stdout", stdout_capture),
+            ("stderr", stderr_capture),
+        ):
+            if capture.truncated is True and capture.spool_path is not None:
+                self.module_output_files.append(
+                    (plm, name, capture.spool_path)
+                )
 
         if proc.returncode != 0:
             raise AsyncProcessError(
@@ -1780,20 +2072,113 @@ class EphemeralProcessing(object):
             process_chain=process_chain,
             skip_permission_check=skip_permission_check,
         )
+        self._fingerprint_result_cache_mapsets(process_list)
 
         # Init GRASS and create the temporary mapset
         self._create_temporary_grass_environment()
 
         return process_list
 
+    def _fingerprint_result_cache_mapsets(self, process_list):
+        """Compute the fingerprints of the mapsets that are referenced by the
+        process chain, if the result of the process chain should be cached
+
+        The result of process chains that import data, call webhooks, run
+        executables, read remote inputs or use stdin is not cached, since it
+        does not only depend on the mapsets.
+
+        Args:
+            process_list (list): The process list of the process chain
+        """
+        if self.result_cache_key is None:
+            return
+        if (
+            self.proc_chain_converter.import_descr_list
+            or self.proc_chain_converter.webhook_finished is not None
+            or not all(
+                self._is_result_cacheable(process) for process in process_list
+            )
+        ):
+            self.result_cache_key = None
+            return
+        mapsets = ["PERMANENT"]
+        mapsets.extend(
+            mapset for mapset in self.required_mapsets if mapset not in mapsets
+        )
+        self.result_cache_mapsets = get_mapset_fingerprints(
+            self.config, self.user_group, self.location_name, mapsets
+        )
+
+    @staticmethod
+    def _is_result_cacheable(process):
+        """Check if the result of a process only depends on the mapsets
+
+        Args:
+            process (Process): The process to check
+
+        Returns:
+            bool: False if the process is not a GRASS module, reads stdin or
+                  a remote or virtual file system input
+        """
+        if process.exec_type == "parallel":
+            return all(
+                EphemeralProcessing._is_result_cacheable(parallel_process)
+                for parallel_process_list in process.executable_params
+                for parallel_process in parallel_process_list
+            )
+        if process.exec_type != "grass" or process.stdin_source is not None:
+            return False
+        for param in process.executable_params:
+            if "/vsi" in str(param) or "://" in str(param):
+                return False
+        return True
+
+    def _store_result_in_cache(self):
+        """Store the results of the successfully finished process chain in
+        the process result cache
+        """
+        if self.result_cache_key is None or self.result_cache_mapsets is None:
+            return
+        ttl = self.config.PROCESS_RESULT_CACHE_TTL
+        resource_paths = []
+        if self.resource_url_list and self.storage_interface is not None:
+            resource_paths = self.storage_interface.get_local_resource_paths()
+            # A cached result must leave enough time to download the
+            # resources before their urls expire
+            url_lifetime = self.storage_interface.url_lifetime
+            if url_lifetime is not None:
+                ttl = min(ttl, url_lifetime // 2)
+        try:
+            self.result_cache_interface.set(
+                self.result_cache_key,
+                {
+                    "mapsets": self.result_cache_mapsets,
+                    "process_results": self.module_results,
+                    "resource_urls": self.resource_url_list,
+                    "resource_paths": resource_paths,
+                    "message": self.finish_message,
+                },
+                ttl=ttl,
+                max_size=self.config.PROCESS_RESULT_CACHE_SIZE,
+            )
+        except Exception as e:
+            self.message_logger.warning(
+                "Unable to cache the process chain result: %s" % str(e)
+            )
+
     def _parse_module_outputs(self):
         """Parse the module stdout outputs and parse them into the required
-        formats: table, list or kv
+        formats: table, columns, list or kv
 
         This functions analyzes the output_parser_list for entries to parse.
-        It will convert the stdout strings into tables, lists or key/value
-        outputs and stores the result in the module_result dictionary using the
-        provided id of the StdoutParser.
+        It will convert the stdout strings into tables, typed columns, lists
+        or key/value outputs and stores the result in the module_result
+        dictionary using the provided id of the StdoutParser.
+
+        Table, columns and list outputs that exceed the configured size
+        STDOUT_PARSER_RESULT_LIMIT are exported as resource file, if a
+        storage interface is available. In this case the result contains
+        the URL of the resource instead of the parsed values.
 
         """
 
@@ -1806,27 +2191,40 @@ class EphemeralProcessing(object):
                     raise AsyncProcessError(
                         "Unable to find process id in module output dictionary"
                     )
-                stdout = self.module_output_dict[process_id]["stdout"]
-                # Split the rows by the \n new line delimiter
-                rows = stdout.strip().split("\n")
-                if "table" in format:
-                    result = []
-                    for row in rows:
-                        row = row.strip()
-                        values = row.split(delimiter)
-                        value_list = []
-                        for value in values:
-                            value_list.append(value.strip())
-                        result.append(value_list)
+                plm = self.module_output_dict[process_id]
+                spool_path = self._get_spooled_output_path(plm, "stdout")
+                if spool_path is None:
+                    stdout = plm["stdout"]
+                    # Split the rows by the \n new line delimiter
+                    rows = stdout.strip().split("\n")
+                else:
+                    # The process log contains only the head and tail of
+                    # the output, hence the complete output is streamed
+                    # from the spool file
+                    stdout_file = open(spool_path, "r", errors="replace")
+                    rows = iter_stripped_rows(stdout_file)
+                    if "json" in format:
+                        stdout = stdout_file.read()
+
+                if self._is_parser_result_export_required(format, plm):
+                    if format == "list":
+                        value_rows = ([row.strip()] for row in rows)
+                    else:
+                        value_rows = split_rows(rows, delimiter)
+                    result = self._export_parser_result(stdout_def, value_rows)
+                elif "table" in format:
+                    result = list(split_rows(rows, delimiter))
+                elif "columns" in format:
+                    names, types, columns = rows_to_columns(
+                        split_rows(rows, delimiter),
+                        header=stdout_def.get("header", False),
+                    )
+                    result = dict(zip(names, columns))
                 elif "list" in format:
-                    result = []
-                    for row in rows:
-                        value = row.strip()
-                        result.append(value)
+                    result = [row.strip() for row in rows]
                 elif "kv" in format:
                     result = dict()
                     for row in rows:
-                        row = row.strip()
                         key, value = row.split(delimiter, 1)
                         result[key.strip()] = value.strip()
                 elif "json" in format:
@@ -1850,9 +2248,102 @@ class EphemeralProcessing(object):
                 else:
                     raise AsyncProcessError("Wrong stdout parser format")
 
+                if spool_path is not None:
+                    stdout_file.close()
+
                 # Store the parser result
                 self.module_results[id] = result
 
+    def _is_parser_result_export_required(self, format, plm):
+        """Check if the stdout parser result must be exported as resource
+        instead of being part of the response document
+
+        Args:
+            format (str): The stdout parser format
+            plm (ProcessLogModel): The process log of the parsed process
+
+        Returns:
+            bool: True if the result must be exported
+        """
+        if self.storage_interface is None:
+            return False
+        if format not in ["table", "columns", "list"]:
+            return False
+        stdout_size = plm.get("stdout_size")
+        if stdout_size is None:
+            stdout_size = len(plm["stdout"])
+        return stdout_size > self.config.STDOUT_PARSER_RESULT_LIMIT
+
+    def _export_parser_result(self, stdout_def, value_rows):
+        """Write the parsed stdout output into a CSV, Parquet or Arrow file
+        and store it as resource
+
+        Args:
+            stdout_def (dict): The stdout parser definition
+            value_rows: An iterable of value lists created by split_rows()
+
+        Raises:
+            AsyncProcessError: If the export format is not supported
+
+        Returns:
+            dict: The description of the exported result that contains the
+                  resource URL, the format and the number of rows
+        """
+        export_format = stdout_def.get("export_format", "CSV")
+        if export_format not in EXPORT_FORMAT_SUFFIXES:
+            raise AsyncProcessError(
+                "Unsupported export format <%s> of the stdout parser"
+                % export_format
+            )
+        file_path = os.path.join(
+            self.temp_file_path,
+            stdout_def["id"] + EXPORT_FORMAT_SUFFIXES[export_format],
+        )
+
+        message = "Export the parsed stdout output <%s> as %s" % (
+            stdout_def["id"],
+            export_format,
+        )
+        self._send_resource_update(message)
+
+        if export_format == "CSV":
+            # The rows are streamed into the CSV file without type conversion
+            num_rows = write_csv(value_rows, file_path)
+        else:
+            header = False
+            if stdout_def["format"] == "columns":
+                header = stdout_def.get("header", False)
+            names, types, columns = rows_to_columns(value_rows, header=header)
+            num_rows = write_columns(
+                names, columns, file_path, format=export_format
+            )
+
+        resource_url = self.storage_interface.store_resource(file_path)
+        self.resource_url_list.append(resource_url)
+
+        return {
+            "resource_url": resource_url,
+            "format": export_format,
+            "rows": num_rows,
+        }
+
+    def _get_spooled_output_path(self, plm, name):
+        """Return the path of the spool file that contains the complete
+        output of a process, if the output in the process log was truncated
+
+        Args:
+            plm (ProcessLogModel): The process log of the process
+            name (str): The name of the output stream: stdout or stderr
+
+        Returns:
+            str:
+            The path to the spool file or None if the output was not truncated
+        """
+        for entry_plm, entry_name, spool_path in self.module_output_files:
+            if entry_plm is plm and entry_name == name:
+                return spool_path
+        return None
+
     def _execute_process_list(self, process_list):
         """
         Run all modules or executables that are specified in the process list
@@ -1872,9 +2363,56 @@ class EphemeralProcessing(object):
                 self._run_module(process)
             elif process.exec_type == "exec":
                 self._run_process(process)
+            elif process.exec_type == "parallel":
+                self._execute_parallel_process_lists(process.executable_params)
             elif process.exec_type == "python":
                 eval(process.executable)
 
+    def _execute_parallel_process_lists(self, process_lists):
+        """Run several independent process lists concurrently
+
+        The processes of each list run one after another, at most
+        PARALLEL_PROCESS_WORKERS lists run at the same time. The process
+        lists must not depend on each other, hence they must not use the
+        region or the mask of the mapset. If a process fails, the remaining
+        processes are not started and the error is raised once the running
+        processes are finished.
+
+        Args:
+            process_lists (list): A list of process lists
+
+        Raises:
+            This method will raise an AsyncProcessError, AsyncProcessTimeLimit
+            or AsyncProcessTermination
+        """
+        # The parallel process is counted as single step in the process list
+        self._update_num_of_steps(
+            sum([len(process_list) for process_list in process_lists]) - 1
+        )
+        stop_event = threading.Event()
+
+        def execute(process_list):
+            for process in process_list:
+                if stop_event.is_set():
+                    return
+                try:
+                    self._execute_process_list([process])
+                except BaseException:
+                    stop_event.set()
+                    raise
+
+        num_workers = min(
+            max(self.config.PARALLEL_PROCESS_WORKERS, 1),
+            max(len(process_lists), 1),
+        )
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(execute, process_list)
+                for process_list in process_lists
+            ]
+        for future in futures:
+            future.result()
+
     def _final_cleanup(self):
         """Overwrite this function in subclasses to perform the final cleanup,
         by default this function calls self._cleanup() to remove the temporary
@@ -1946,6 +2484,7 @@ class EphemeralProcessing(object):
                 self.run_state = {"error": str(e), "exception": model}
             # After all processing finished, send the final status
             if "success" in self.run_state:
+                self._store_result_in_cache()
                 self._send_resource_finished(
                     message=self.finish_message, results=self.module_results
                 )
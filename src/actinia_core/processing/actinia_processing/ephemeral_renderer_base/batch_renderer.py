@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Batch renderer of raster and vector map layers
+"""
+import os
+from tempfile import NamedTemporaryFile
+from actinia_core.processing.actinia_processing.ephemeral.base.renderer_base import (
+    EphemeralRendererBase,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# The display module and its flags of each supported map type
+RENDER_MODULES = {
+    "raster": ("d.rast", "n"),
+    "vector": ("d.vect", "c"),
+}
+
+
+def get_region_key(render_spec):
+    """Return the key of the computational region of a render
+    specification, render specifications with equal keys share the region
+
+    The region is derived from the map layer and the optional bounds, hence
+    only render specifications of the same map layer with the same bounds
+    share a region. The key is only compared for equality, since the
+    bounds may be missing.
+
+    Args:
+        render_spec (dict): The render specification with name, type and
+                            the optional n, s, e and w entries
+
+    Returns:
+        tuple: The region key
+    """
+    return (
+        render_spec["type"],
+        render_spec["name"],
+        tuple((key, render_spec.get(key)) for key in ("n", "s", "e", "w")),
+    )
+
+
+def group_render_specs(render_specs):
+    """Group the render specifications by their region
+
+    Args:
+        render_specs (list): The render specifications
+
+    Returns:
+        list: The lists of the indices of the render specifications that
+              share a region, in the order of their first occurrence
+    """
+    groups = {}
+    for index, render_spec in enumerate(render_specs):
+        groups.setdefault(get_region_key(render_spec), []).append(index)
+    return list(groups.values())
+
+
+class EphemeralBatchRenderer(EphemeralRendererBase):
+    def __init__(self, *args):
+        EphemeralRendererBase.__init__(self, *args)
+
+    def _execute(self, skip_permission_check=True):
+        """Render a list of raster and vector map layers in a single
+        ephemeral GRASS GIS environment
+
+        Workflow:
+
+            1. The temporary database is created once
+            2. The render specifications are grouped by their region, so
+               that g.region is only invoked if the region changes
+            3. d.rast or d.vect is invoked for each map layer to create a
+               PNG file with the requested size
+
+        """
+
+        self._setup()
+
+        render_specs = self.rdc.user_data
+        self.required_mapsets.append(self.mapset_name)
+
+        # Validate all process chains before the environment is created
+        render_jobs = []
+        for group in group_render_specs(render_specs):
+            for index in group:
+                render_spec = render_specs[index]
+                map_name = render_spec["name"] + "@" + self.mapset_name
+                module, flags = RENDER_MODULES[render_spec["type"]]
+
+                pc = {}
+                # The region is set once for all maps of the group
+                if index == group[0]:
+                    pc["1"] = {
+                        "module": "g.region",
+                        "inputs": {render_spec["type"]: map_name},
+                    }
+                    pc["2"] = {
+                        "module": "g.region",
+                        "inputs": {},
+                        "flags": "g",
+                    }
+                    for key in ("n", "s", "e", "w"):
+                        if key in render_spec:
+                            pc["2"]["inputs"][key] = render_spec[key]
+                pc["3"] = {
+                    "module": module,
+                    "inputs": {"map": map_name},
+                    "flags": flags,
+                }
+                process_list = self._validate_process_chain(
+                    process_chain=pc, skip_permission_check=True
+                )
+                render_jobs.append((index, process_list))
+
+        self.skip_region_check = True
+        self._create_temporary_grass_environment()
+
+        results = [None] * len(render_specs)
+        try:
+            for index, process_list in render_jobs:
+                render_spec = render_specs[index]
+                with NamedTemporaryFile(suffix=".png") as file:
+                    result_file = file.name
+                results[index] = {
+                    "name": render_spec["name"],
+                    "type": render_spec["type"],
+                    "file": result_file,
+                }
+                # Only the render environment changes between the maps
+                self._setup_render_environment_and_region(
+                    options=render_spec, result_file=result_file
+                )
+                self._execute_process_list(process_list)
+        except Exception:
+            for result in results:
+                if result is not None and os.path.isfile(result["file"]):
+                    os.remove(result["file"])
+            raise
+
+        self.module_results = results
@@ -25,7 +25,15 @@
 Raster map renderer
 
 """
+import os
+import warnings
 from tempfile import NamedTemporaryFile
+
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.windows import Window
+
+from actinia_core.core.tile_cache import TileCache
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
@@ -204,3 +212,113 @@ class EphemeralRasterShadeRenderer(EphemeralRendererBase):
         self._execute_process_list(process_list)
 
         self.module_results = result_file
+
+
+class EphemeralRasterTileRenderer(EphemeralRendererBase):
+    def __init__(self, *args):
+        EphemeralRendererBase.__init__(self, *args)
+
+    def _execute(self, skip_permission_check=True):
+        """Render a metatile of a raster layer and split it into tiles
+
+        Workflow:
+
+            1. The region is set to the metatile bounds with the resolution
+               of the metatile image
+            2. d.rast is invoked to create the metatile PNG file
+            3. The metatile is split into the tiles, that are moved
+               atomically into the tile cache
+
+        """
+
+        self._setup()
+
+        raster_name = self.map_name
+        options = self.rdc.user_data
+        self.required_mapsets.append(self.mapset_name)
+
+        with NamedTemporaryFile(suffix=".png") as file:
+            result_file = file.name
+
+        # The metatile is decoded right away, the tiles are compressed
+        options["compression"] = 1
+        region_pc = self._setup_render_environment_and_region(
+            options=options, result_file=result_file
+        )
+        region_pc["inputs"]["res"] = (options["e"] - options["w"]) / options[
+            "width"
+        ]
+
+        pc = {}
+        pc["1"] = region_pc
+        pc["2"] = {
+            "module": "d.rast",
+            "inputs": {"map": raster_name + "@" + self.mapset_name},
+            "flags": "n",
+        }
+
+        # Run the selected modules
+        self.skip_region_check = True
+        process_list = (
+            self._create_temporary_grass_environment_and_process_list(
+                process_chain=pc, skip_permission_check=True
+            )
+        )
+        self._execute_process_list(process_list)
+
+        try:
+            self.module_results = self._split_metatile(
+                result_file,
+                options["tiles"],
+                options["tile_size"],
+                self.config.RENDER_PNG_COMPRESSION,
+            )
+        finally:
+            if os.path.isfile(result_file):
+                os.remove(result_file)
+
+    @staticmethod
+    def _split_metatile(metatile_file, tiles, tile_size, compression):
+        """Split a metatile PNG file into tiles
+
+        Args:
+            metatile_file (str): The path of the metatile PNG file
+            tiles (list): The [row, column, path] entries of the tiles
+            tile_size (int): The width and height of a tile in pixel
+            compression (int): The PNG compression level of the tiles
+
+        Returns:
+            list: The paths of the written tiles
+        """
+        written = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", NotGeoreferencedWarning)
+            with rasterio.open(metatile_file) as metatile:
+                profile = {
+                    "driver": "PNG",
+                    "width": tile_size,
+                    "height": tile_size,
+                    "count": metatile.count,
+                    "dtype": metatile.dtypes[0],
+                    "zlevel": max(1, compression),
+                }
+                for row, column, path in tiles:
+                    window = Window(
+                        column * tile_size,
+                        row * tile_size,
+                        tile_size,
+                        tile_size,
+                    )
+                    data = metatile.read(window=window)
+                    temporary_path = TileCache.get_temporary_path(path)
+                    try:
+                        with rasterio.open(
+                            temporary_path, "w", **profile
+                        ) as tile:
+                            tile.write(data)
+                        os.replace(temporary_path, path)
+                    finally:
+                        if os.path.isfile(temporary_path):
+                            os.remove(temporary_path)
+                    written.append(path)
+        return written
@@ -25,6 +25,12 @@
 Raster map renderer
 """
 from tempfile import NamedTemporaryFile
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.grass_metadata import (
+    find_mapset_path,
+    get_union_extent,
+    list_strds_raster_maps,
+)
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
@@ -48,6 +54,86 @@ class EphemeralSTRDSRenderer(EphemeralRendererBase):
     def _execute(self, skip_permission_check=True):
         """Render the raster map layers of a STRDS
 
+        Workflow:
+
+            1. The raster map layers and their extents are read from the
+               temporal database, constrained by time and region settings
+            2. The region is set to the union extent of the raster map layers
+               or the user specific region, with the resolution of the image
+            3. d.rast.multi is invoked to create the PNG file
+
+        If the temporal database of the mapset can not be read directly,
+        the raster map layers and the region are computed with t.rast.list
+        and g.region.
+
+        """
+
+        self._setup()
+
+        options = self.rdc.user_data
+        mapset_path = find_mapset_path(
+            self.config, self.user_group, self.location_name, self.mapset_name
+        )
+        maps = None
+        if mapset_path is not None:
+            maps = list_strds_raster_maps(
+                mapset_path,
+                self.map_name,
+                start_time=options.get("start_time"),
+                end_time=options.get("end_time"),
+                n=options.get("n"),
+                s=options.get("s"),
+                e=options.get("e"),
+                w=options.get("w"),
+            )
+        if maps is None:
+            return self._execute_with_t_rast_list()
+        if len(maps) == 0:
+            raise AsyncProcessError(
+                "No raster map layers found in STRDS <%s>" % self.map_name
+            )
+
+        self.required_mapsets.append(self.mapset_name)
+
+        with NamedTemporaryFile(suffix=".png") as file:
+            result_file = file.name
+
+        self._setup_render_environment_and_region(
+            options=options, result_file=result_file
+        )
+
+        region = get_union_extent(map_row[1:] for map_row in maps)
+        for key in ("n", "s", "e", "w"):
+            if key in options:
+                region[key] = options[key]
+        region["ewres"] = abs(region["e"] - region["w"]) / float(
+            options["width"]
+        )
+        region["nsres"] = abs(region["n"] - region["s"]) / float(
+            options["height"]
+        )
+
+        pc = {}
+        pc["1"] = {"module": "g.region", "inputs": region, "flags": "g"}
+        pc["2"] = {
+            "module": "d.rast.multi",
+            "inputs": {"map": ",".join(map_row[0] for map_row in maps)},
+        }
+
+        # Run the selected modules
+        self.skip_region_check = True
+        process_list = (
+            self._create_temporary_grass_environment_and_process_list(
+                process_chain=pc, skip_permission_check=True
+            )
+        )
+        self._execute_process_list(process_list)
+
+        self.module_results = result_file
+
+    def _execute_with_t_rast_list(self):
+        """Render the raster map layers of a STRDS using t.rast.list
+
         Workflow:
 
             1. A list of raster map layers is generated from a t.rast.list call
@@ -59,8 +145,6 @@ class EphemeralSTRDSRenderer(EphemeralRendererBase):
 
         """
 
-        self._setup()
-
         strds_name = self.map_name
         options = self.rdc.user_data
         self.required_mapsets.append(self.mapset_name)
@@ -33,6 +33,7 @@ from actinia_core.processing.actinia_processing.ephemeral.persistent_processing
 )
 from actinia_core.core.common.process_object import Process
 from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.redis_storage_usage import DOWNLOAD_CACHE
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -72,6 +73,7 @@ class DownloadCacheDelete(PersistentProcessing):
             )
 
             os.mkdir(self.user_download_cache_path)
+            self.storage_usage_interface.reset(DOWNLOAD_CACHE, self.user_id)
             self.finish_message = "Download cache successfully removed."
         else:
             raise AsyncProcessError(
@@ -239,7 +239,7 @@ class PersistentMapsetDeleter(PersistentProcessing):
         # _check_lock_target_mapset()
         if self.target_mapset_exists is True:
             shutil.rmtree(self.orig_mapset_path)
-            self.lock_interface.unlock(self.target_mapset_lock_id)
+            self._release_mapset_locks()
             self.finish_message = (
                 "Mapset <%s> successfully removed." % self.target_mapset_name
             )
@@ -278,6 +278,8 @@ class PersistentMapsetLocker(PersistentProcessing):
 
     def __init__(self, *args):
         PersistentProcessing.__init__(self, *args)
+        # The lock must outlive this process
+        self.use_lock_heartbeat = False
 
     def _execute(self):
         self._setup()
@@ -70,8 +70,7 @@ class PersistentMapsetMerger(PersistentProcessing):
 
         If the mapset is a global mapset and Error will be raised.
 
-        The duration of the lock is process_time_limit * process_num_limit
-        and should be extended if needed.
+        The lock is renewed by the heartbeat thread.
 
         Only mapsets of the user database are locked.
 
@@ -86,19 +85,13 @@ class PersistentMapsetMerger(PersistentProcessing):
                 % mapset_name
             )
 
-        # Finally lock the mapset for the time that the user can allocate at
-        # maximum
+        # Finally lock the mapset
         lock_id = "%s/%s/%s" % (
             self.user_group,
             self.location_name,
             mapset_name,
         )
-        ret = self.lock_interface.lock(
-            resource_id=lock_id,
-            expiration=self.process_time_limit * self.process_num_limit,
-        )
-
-        if ret == 0:
+        if self._acquire_mapset_lock(lock_id) is False:
             raise AsyncProcessError(
                 "Unable to lock mapset <%s>, resource is already locked"
                 % mapset_name
@@ -135,7 +128,7 @@ class PersistentMapsetMerger(PersistentProcessing):
           a user can consume -> process_num_limit*process_time_limit
         - Check and lock all source mapsets with the same scheme
         - Copy each source mapset into the target mapset
-        - Extend the locks each copy run
+        - Check the locks each copy run
         - Cleanup and unlock the mapsets
 
         """
@@ -166,15 +159,7 @@ class PersistentMapsetMerger(PersistentProcessing):
             mapset_name = self.lock_ids[lock_id]
             mapsets_to_merge.append(mapset_name)
 
-            for lock_id in self.lock_ids:
-                # Extent the lock for each process by max processing time * 2
-                ret = self.lock_interface.extend(
-                    resource_id=lock_id, expiration=self.process_time_limit * 2
-                )
-                if ret == 0:
-                    raise AsyncProcessError(
-                        "Unable to extend lock for mapset <%s>" % mapset_name
-                    )
+            self._check_mapset_locks()
 
             message = (
                 "Step %i of %i: Copy content from source "
@@ -200,7 +185,7 @@ class PersistentMapsetMerger(PersistentProcessing):
               a user can consume -> process_num_limit*process_time_limit
             - Check and lock all source mapsets with the same scheme
             - Copy each source mapset into the target mapset
-            - Extend the locks each copy run
+            - Check the locks each copy run
             - Cleanup and unlock the mapsets
 
         """
@@ -215,6 +200,3 @@ class PersistentMapsetMerger(PersistentProcessing):
         # Clean up and remove the temporary gisdbase
         # Unlock mapsets
         PersistentProcessing._final_cleanup(self)
-        # Unlock the mapsets
-        for lock_id in self.lock_ids:
-            self.lock_interface.unlock(lock_id)
@@ -24,7 +24,6 @@
 """
 Raster layer resources
 """
-import os
 from actinia_core.processing.actinia_processing.ephemeral.persistent_processing import (
     PersistentProcessing,
 )
@@ -144,7 +143,7 @@ class PersistentRasterCreator(PersistentProcessing):
 
         if len(raster_list[0]) > 0:
             try:
-                os.remove(self.rdc.request_data)
+                self._remove_from_download_cache(self.rdc.request_data)
             except Exception:
                 pass
             raise AsyncProcessError(
@@ -158,7 +157,7 @@ class PersistentRasterCreator(PersistentProcessing):
         # Delete imported file
         msg = ""
         try:
-            os.remove(self.rdc.request_data)
+            self._remove_from_download_cache(self.rdc.request_data)
         except Exception:
             msg = " WARNING: Uploaded file can not be removed."
 
@@ -33,6 +33,7 @@ from actinia_core.processing.actinia_processing.ephemeral.persistent_processing
 )
 from actinia_core.core.common.process_object import Process
 from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.redis_storage_usage import RESOURCE_STORAGE
 
 
 __license__ = "GPLv3"
@@ -72,6 +73,7 @@ class ResourceStorageDelete(PersistentProcessing):
             )
 
             os.mkdir(self.user_resource_storage_path)
+            self.storage_usage_interface.reset(RESOURCE_STORAGE, self.user_id)
             self.finish_message = "Resource storage successfully removed."
         else:
             raise AsyncProcessError(
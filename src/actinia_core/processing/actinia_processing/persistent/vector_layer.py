@@ -25,7 +25,6 @@
 Vector layer resources
 """
 import os
-from shutil import rmtree
 
 from actinia_core.core.common.exceptions import AsyncProcessError
 from actinia_core.processing.actinia_processing.ephemeral.persistent_processing import (
@@ -158,11 +157,11 @@ class PersistentVectorCreator(PersistentProcessing):
         msg = ""
         try:
             if self.rdc.request_data.endswith(".shp"):
-                rmtree(
-                    os.path.dirname(self.rdc.request_data), ignore_errors=True
+                self._remove_from_download_cache(
+                    os.path.dirname(self.rdc.request_data)
                 )
             else:
-                os.remove(self.rdc.request_data)
+                self._remove_from_download_cache(self.rdc.request_data)
         except Exception:
             msg = " WARNING: Uploaded file cannot be removed."
 
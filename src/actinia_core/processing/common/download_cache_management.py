@@ -37,14 +37,6 @@ __copyright__ = (
 __maintainer__ = "mundialis"
 
 
-DownloadCacheSize = try_import(
-    (
-        "actinia_core.processing.actinia_processing.ephemeral"
-        + ".download_cache_management"
-    ),
-    "DownloadCacheSize",
-)
-
 DownloadCacheDelete = try_import(
     (
         "actinia_core.processing.actinia_processing.persistent"
@@ -54,11 +46,6 @@ DownloadCacheDelete = try_import(
 )
 
 
-def start_download_cache_size(*args):
-    processing = DownloadCacheSize(*args)
-    processing.run()
-
-
 def start_download_cache_remove(*args):
     processing = DownloadCacheDelete(*args)
     processing.run()
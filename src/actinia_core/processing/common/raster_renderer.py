@@ -60,6 +60,14 @@ EphemeralRasterShadeRenderer = try_import(
     "EphemeralRasterShadeRenderer",
 )
 
+EphemeralRasterTileRenderer = try_import(
+    (
+        "actinia_core.processing.actinia_processing.ephemeral_renderer_base"
+        + ".raster_renderer"
+    ),
+    "EphemeralRasterTileRenderer",
+)
+
 
 def start_job(*args):
     processing = EphemeralRasterRenderer(*args)
@@ -74,3 +82,8 @@ def start_rgb_job(*args):
 def start_shade_job(*args):
     processing = EphemeralRasterShadeRenderer(*args)
     processing.run()
+
+
+def start_tile_job(*args):
+    processing = EphemeralRasterTileRenderer(*args)
+    processing.run()
@@ -37,14 +37,6 @@ __copyright__ = (
 __maintainer__ = "mundialis"
 
 
-ResourceStorageSize = try_import(
-    (
-        "actinia_core.processing.actinia_processing.ephemeral"
-        + ".resource_storage_management"
-    ),
-    "ResourceStorageSize",
-)
-
 ResourceStorageDelete = try_import(
     (
         "actinia_core.processing.actinia_processing.persistent"
@@ -54,11 +46,6 @@ ResourceStorageDelete = try_import(
 )
 
 
-def start_resource_storage_size(*args):
-    processing = ResourceStorageSize(*args)
-    processing.run()
-
-
 def start_resource_storage_remove(*args):
     processing = ResourceStorageDelete(*args)
     processing.run()
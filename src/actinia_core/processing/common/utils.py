@@ -27,6 +27,9 @@ Utils for processing
 
 import importlib
 from actinia_core.core.common.config import global_config
+from actinia_core.core.redis_job_payload import unpack_job_args
+from actinia_core.core.resources_logger import ResourceLogger
+from actinia_core.models.response_models import create_response_from_model
 
 __license__ = "GPLv3"
 __author__ = "Carmen Tawalika"
@@ -66,3 +69,48 @@ def try_import(actinia_module, actinia_class):
                 + "for local queue!"
             )
             raise e
+
+
+def start_job_from_payload(func, rdc, *args):
+    """Resolve the job payloads of a resource data container that was packed
+    by pack_job_args() and start the job
+
+    If the payloads do not exist anymore, the resource is set to error
+    instead of starting the job.
+
+    Args:
+        func: The function that starts the job
+        rdc (ResourceDataContainer): The packed resource data container
+        *args: The other function arguments
+    """
+    try:
+        unpack_job_args(rdc, global_config)
+    except KeyError as e:
+        kwargs = dict()
+        kwargs["host"] = global_config.REDIS_SERVER_URL
+        kwargs["port"] = global_config.REDIS_SERVER_PORT
+        if global_config.REDIS_SERVER_PW:
+            kwargs["password"] = global_config.REDIS_SERVER_PW
+        resource_logger = ResourceLogger(**kwargs)
+        document = create_response_from_model(
+            status="error",
+            user_id=rdc.user_id,
+            resource_id=rdc.resource_id,
+            queue=rdc.queue,
+            iteration=rdc.iteration,
+            message="Unable to start the job: %s" % str(e.args[0]),
+            http_code=500,
+            status_url=rdc.status_url,
+            orig_time=rdc.orig_time,
+            orig_datetime=rdc.orig_datetime,
+            api_info=rdc.api_info,
+        )
+        resource_logger.commit(
+            user_id=rdc.user_id,
+            resource_id=rdc.resource_id,
+            iteration=rdc.iteration,
+            document=document,
+            expiration=global_config.REDIS_RESOURCE_EXPIRE_TIME,
+        )
+        return
+    func(rdc, *args)
@@ -80,6 +80,14 @@ REGION_PARAMETERS = {
             "in": "query",
             "type": "double",
         },
+        {
+            "name": "compression",
+            "description": "PNG compression level from 0 (fastest) to 9 "
+            "(smallest image)",
+            "required": False,
+            "in": "query",
+            "type": "integer",
+        },
     ]
 }
 
@@ -100,6 +108,7 @@ class RendererBaseResource(ResourceBase):
             height : for the image height
             start_time : start time for STRDS where selection
             end_time : end time for STRDS where selection
+            compression : the PNG compression level
 
         Returns:
             The argument parser
@@ -142,6 +151,12 @@ class RendererBaseResource(ResourceBase):
             location="args",
             help="Image height must be specified as double value",
         )
+        parser.add_argument(
+            "compression",
+            type=int,
+            location="args",
+            help="PNG compression level must be specified as integer value",
+        )
         parser.add_argument(
             "start_time",
             type=str,
@@ -203,6 +218,12 @@ class RendererBaseResource(ResourceBase):
                     "Height can not be larger than 10000"
                 )
             options["height"] = args["height"]
+        if "compression" in args and args["compression"] is not None:
+            if args["compression"] < 0 or args["compression"] > 9:
+                return self.get_error_response(
+                    message="Compression must be between 0 and 9"
+                )
+            options["compression"] = args["compression"]
         if "start_time" in args and args["start_time"] is not None:
             options["start_time"] = args["start_time"]
         if "end_time" in args and args["end_time"] is not None:
@@ -29,7 +29,7 @@ import pickle
 import time
 import uuid
 from datetime import datetime
-from flask import make_response, jsonify
+from flask import make_response, jsonify, send_file
 from flask import request, g
 from flask.json import loads as json_loads
 from flask_restful_swagger_2 import Resource
@@ -40,12 +40,17 @@ from actinia_core.core.common.app import flask_api
 from actinia_core.core.common.config import global_config
 from actinia_core.core.common.api_logger import log_api_call
 from actinia_core.core.messages_logger import MessageLogger
+from actinia_core.core.redis_process_result_cache import (
+    get_process_chain_hash,
+    redis_process_result_cache_interface,
+)
 from actinia_core.core.resources_logger import ResourceLogger
 from actinia_core.core.resource_data_container import ResourceDataContainer
 from actinia_core.models.response_models import ProcessingResponseModel
 from actinia_core.models.response_models import (
     create_response_from_model,
     ApiInfoModel,
+    ProgressInfoModel,
 )
 from actinia_core.rest.resource_streamer import RequestStreamerResource
 from actinia_core.rest.resource_management import ResourceManager
@@ -127,15 +132,7 @@ class ResourceBase(Resource):
             self.resource_id = resource_id
             self.request_id = self.generate_request_id_from_resource_id()
 
-        if global_config.QUEUE_TYPE == "per_job":
-            self.queue = "%s_%s" % (
-                global_config.WORKER_QUEUE_PREFIX,
-                self.resource_id,
-            )
-        elif global_config.QUEUE_TYPE == "redis":
-            self.queue = "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, "count")
-        else:
-            self.queue = "local"
+        self.queue = self._get_queue_name(self.resource_id)
 
         # set iteration and post_url
         self.iteration = iteration
@@ -145,18 +142,7 @@ class ResourceBase(Resource):
         self.resource_url_base = None
 
         # Generate the status URL
-        self.status_url = flask_api.url_for(
-            ResourceManager,
-            user_id=self.user_id,
-            resource_id=self.resource_id,
-            _external=True,
-        )
-
-        if (
-            global_config.FORCE_HTTPS_URLS is True
-            and "http://" in self.status_url
-        ):
-            self.status_url = self.status_url.replace("http://", "https://")
+        self.status_url = self._get_status_url(self.resource_id)
 
         self.request_url = request.url
         self.resource_url = None
@@ -337,50 +323,16 @@ class ResourceBase(Resource):
             if self.check_for_json() is False:
                 return None
 
-        # Compute the job timeout of the worker queue from the user credentials
-        process_time_limit = self.user_credentials["permissions"][
-            "process_time_limit"
-        ]
-        process_num_limit = self.user_credentials["permissions"][
-            "process_num_limit"
-        ]
-        self.job_timeout = int(process_time_limit * process_num_limit * 20)
+        self._set_job_timeout()
 
         # Create the resource URL base and use a placeholder for the file name
         # The placeholder __None__ must be replaced by the resource URL
         # generator
-        self.resource_url_base = flask_api.url_for(
-            RequestStreamerResource,
-            user_id=self.user_id,
-            resource_id=self.resource_id,
-            file_name="__None__",
-            _external=True,
-        )
-
-        if (
-            global_config.FORCE_HTTPS_URLS is True
-            and "http://" in self.resource_url_base
-        ):
-            self.resource_url_base = self.resource_url_base.replace(
-                "http://", "https://"
-            )
+        self.resource_url_base = self._get_resource_url_base(self.resource_id)
 
         # Create the accepted response that will be always send
-        self.response_data = create_response_from_model(
-            self.response_model_class,
-            status="accepted",
-            user_id=self.user_id,
-            resource_id=self.resource_id,
-            queue=self.queue,
-            iteration=self.iteration,
-            process_log=None,
-            results={},
-            message="Resource accepted",
-            http_code=200,
-            orig_time=self.orig_time,
-            orig_datetime=self.orig_datetime,
-            status_url=self.status_url,
-            api_info=self.api_info,
+        self.response_data = self._create_accepted_response(
+            self.resource_id, self.status_url
         )
 
         # Send the status to the database
@@ -411,6 +363,255 @@ class ResourceBase(Resource):
             map_name=map_name,
         )
 
+    def preprocess_batch(self, request_data_list, location_name=None):
+        """Preprocessing steps for a batch of asynchronous processing jobs
+
+        Each entry of the request data list becomes a job with its own
+        resource id. The accept entries of all jobs are sent to the resource
+        redis database with a single request.
+
+        Args:
+            request_data_list (list): The request data of each job
+            location_name (str): The name of the location to work in
+
+        Returns:
+            (list, list):
+            The ResourceDataContainer of each job and the accepted response
+            of each job as dictionary
+
+        """
+        self._set_job_timeout()
+
+        rdcs = []
+        responses = []
+        documents = []
+        for request_data in request_data_list:
+            request_id, resource_id = self.generate_uuids()
+            status_url = self._get_status_url(resource_id)
+            response_data = self._create_accepted_response(
+                resource_id, status_url
+            )
+            documents.append((resource_id, self.iteration, response_data))
+            responses.append(pickle.loads(response_data)[1])
+            rdcs.append(
+                ResourceDataContainer(
+                    grass_data_base=self.grass_data_base,
+                    grass_user_data_base=self.grass_user_data_base,
+                    grass_base_dir=self.grass_base_dir,
+                    request_data=request_data,
+                    user_id=self.user_id,
+                    user_group=self.user_group,
+                    user_credentials=self.user_credentials,
+                    resource_id=resource_id,
+                    iteration=self.iteration,
+                    status_url=status_url,
+                    api_info=self.api_info,
+                    resource_url_base=self._get_resource_url_base(resource_id),
+                    orig_time=self.orig_time,
+                    orig_datetime=self.orig_datetime,
+                    config=global_config,
+                    location_name=location_name,
+                )
+            )
+
+        # Send the status of all jobs to the database at once
+        self.resource_logger.commit_many(self.user_id, documents)
+
+        return rdcs, responses
+
+    def _set_job_timeout(self):
+        """Compute the job timeout of the worker queue from the user
+        credentials"""
+        process_time_limit = self.user_credentials["permissions"][
+            "process_time_limit"
+        ]
+        process_num_limit = self.user_credentials["permissions"][
+            "process_num_limit"
+        ]
+        self.job_timeout = int(process_time_limit * process_num_limit * 20)
+
+    @staticmethod
+    def _get_queue_name(resource_id):
+        """Return the name of the queue of a resource"""
+        if global_config.QUEUE_TYPE == "per_job":
+            return "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, resource_id)
+        elif global_config.QUEUE_TYPE == "redis":
+            return "%s_%s" % (global_config.WORKER_QUEUE_PREFIX, "count")
+        return "local"
+
+    @staticmethod
+    def _force_https(url):
+        if global_config.FORCE_HTTPS_URLS is True and "http://" in url:
+            return url.replace("http://", "https://")
+        return url
+
+    def _get_status_url(self, resource_id):
+        """Return the status URL of a resource"""
+        return self._force_https(
+            flask_api.url_for(
+                ResourceManager,
+                user_id=self.user_id,
+                resource_id=resource_id,
+                _external=True,
+            )
+        )
+
+    def _get_resource_url_base(self, resource_id):
+        """Return the URL base of the files of a resource, with the
+        placeholder __None__ for the file name"""
+        return self._force_https(
+            flask_api.url_for(
+                RequestStreamerResource,
+                user_id=self.user_id,
+                resource_id=resource_id,
+                file_name="__None__",
+                _external=True,
+            )
+        )
+
+    def _create_accepted_response(self, resource_id, status_url):
+        """Create the pickled accepted response of a resource"""
+        return create_response_from_model(
+            self.response_model_class,
+            status="accepted",
+            user_id=self.user_id,
+            resource_id=resource_id,
+            queue=self._get_queue_name(resource_id),
+            iteration=self.iteration,
+            process_log=None,
+            results={},
+            message="Resource accepted",
+            http_code=200,
+            orig_time=self.orig_time,
+            orig_datetime=self.orig_datetime,
+            status_url=status_url,
+            api_info=self.api_info,
+        )
+
+    def send_finished_response(
+        self,
+        results,
+        response_model_class=None,
+        message="Processing successfully finished",
+    ):
+        """Create the finished response of a request that was answered in the
+        API process without enqueueing a job and send it to the resource
+        redis database
+
+        Call this method after preprocess(), the response is available in
+        the self.response_data variable afterwards.
+
+        Args:
+            results: The process results of the response
+            response_model_class (class): The response model class, by
+                                          default self.response_model_class
+            message (str): The message of the response
+
+        """
+        if response_model_class is None:
+            response_model_class = self.response_model_class
+        self.response_data = create_response_from_model(
+            response_model_class,
+            status="finished",
+            user_id=self.user_id,
+            resource_id=self.resource_id,
+            queue=self.queue,
+            iteration=self.iteration,
+            process_log=[],
+            progress=ProgressInfoModel(step=1, num_of_steps=1),
+            results=results,
+            message=message,
+            http_code=200,
+            orig_time=self.orig_time,
+            orig_datetime=self.orig_datetime,
+            status_url=self.status_url,
+            api_info=self.api_info,
+        )
+        self.resource_logger.commit(
+            self.user_id, self.resource_id, self.iteration, self.response_data
+        )
+
+    def send_cached_process_result(self, rdc):
+        """Send the finished response of a process chain from the process
+        result cache, if the same process chain was processed before and the
+        mapsets it references are unchanged
+
+        Otherwise the result of the process chain is stored in the cache
+        when its processing finished. The cache lookup is bypassed with the
+        request parameter cache=false.
+
+        Call this method after preprocess() and after the storage model was
+        set, the response is available in the self.response_data variable
+        afterwards.
+
+        Args:
+            rdc (ResourceDataContainer): The resource data container
+
+        Returns:
+            bool: True if the cached response was sent, False if the process
+                  chain must be processed
+        """
+        if global_config.PROCESS_RESULT_CACHE is not True:
+            return False
+        chain_hash = get_process_chain_hash(
+            self.request_data,
+            self.user_id,
+            request.path,
+            rdc.get_storage_model(),
+        )
+        rdc.set_result_cache_key(chain_hash)
+        if request.args.get("cache", "true").lower() == "false":
+            return False
+
+        entry = redis_process_result_cache_interface.lookup(
+            chain_hash, global_config, self.user_group, rdc.location_name
+        )
+        if entry is None:
+            return False
+
+        self.response_data = create_response_from_model(
+            self.response_model_class,
+            status="finished",
+            user_id=self.user_id,
+            resource_id=self.resource_id,
+            queue=self.queue,
+            iteration=self.iteration,
+            process_log=[],
+            progress=ProgressInfoModel(step=1, num_of_steps=1),
+            results=entry["process_results"],
+            message=entry["message"],
+            http_code=200,
+            orig_time=self.orig_time,
+            orig_datetime=self.orig_datetime,
+            status_url=self.status_url,
+            api_info=self.api_info,
+            resource_urls=entry["resource_urls"],
+            process_chain_list=[self.request_data],
+        )
+        self.resource_logger.commit(
+            self.user_id, self.resource_id, self.iteration, self.response_data
+        )
+        return True
+
+    @staticmethod
+    def send_image_file(result_file, mimetype="image/png"):
+        """Stream a rendered image file as response and delete it
+
+        The file is unlinked right after it was opened, hence the operating
+        system removes it when the response closed the file descriptor. The
+        image is streamed from the file instead of being read into memory.
+
+        Args:
+            result_file (str): The path of the image file
+            mimetype (str): The mimetype of the image
+
+        Returns:
+            The flask response
+        """
+        image_file = open(result_file, "rb")
+        os.remove(result_file)
+        return send_file(image_file, mimetype=mimetype, add_etags=False)
+
     def generate_uuids(self):
         """Return a unique request and resource id based on uuid4
 
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Batch renderer of raster and vector map layers
+"""
+
+import os
+import pickle
+import zipfile
+from tempfile import NamedTemporaryFile
+from uuid import uuid4
+from flask_restful_swagger_2 import swagger
+from flask import jsonify, make_response, Response, send_file
+
+from actinia_core.rest.base.endpoint_config import (
+    check_endpoint,
+    endpoint_decorator,
+)
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.models.response_models import (
+    ProcessingErrorResponseModel,
+)
+from actinia_core.rest.base.renderer_base import RendererBaseResource
+from actinia_core.processing.common.batch_renderer import start_job
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+# The map types that can be rendered in a batch
+RENDER_TYPES = ("raster", "vector")
+
+# The supported response formats
+RESPONSE_FORMATS = ("zip", "multipart")
+
+batch_render_post_doc = {
+    "tags": ["Raster Management", "Vector Management"],
+    "description": "Render a list of raster and vector map layers of a "
+    "mapset as PNG images in a single ephemeral GRASS GIS environment. "
+    "Each entry of the 'maps' list specifies the 'name' and the 'type' "
+    "(raster or vector) of the map layer and the optional n, s, e, w "
+    "region, the width and height and the PNG compression level of the "
+    "image. The images are "
+    "returned as zip file or as multipart/mixed response, that can be "
+    "selected with 'format'. Minimum required user role: user.",
+    "parameters": [
+        {
+            "name": "location_name",
+            "description": "The location name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "nc_spm_08",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the "
+            "required map layers",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "PERMANENT",
+        },
+        {
+            "name": "render_specs",
+            "description": "The list of map layers to render, e.g. "
+            '{"maps": [{"name": "elevation", "type": "raster", '
+            '"width": 200, "height": 150}], "format": "zip"}',
+            "required": True,
+            "in": "body",
+            "schema": {"type": "object"},
+        },
+    ],
+    "consumes": ["application/json"],
+    "produces": ["application/zip", "multipart/mixed"],
+    "responses": {
+        "200": {"description": "The rendered PNG images"},
+        "400": {
+            "description": "The error message and a detailed log why "
+            "rendering did not succeeded",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
+class SyncEphemeralBatchRendererResource(RendererBaseResource):
+    """Render several raster and vector layers in a single job
+    synchronously
+    """
+
+    def extract_render_specs(self, request_data):
+        """Check the render specifications of the request
+
+        Args:
+            request_data (dict): The request with the "maps" list and the
+                                 optional response "format"
+
+        Returns:
+             list:
+             The list of render specifications or an error response, if the
+             request is invalid
+        """
+        if not isinstance(request_data, dict) or not isinstance(
+            request_data.get("maps"), list
+        ):
+            return self.get_error_response(
+                message="The request must contain a list of maps to render"
+            )
+        maps = request_data["maps"]
+        if len(maps) == 0:
+            return self.get_error_response(message="No maps to render")
+        if len(maps) > global_config.RENDER_BATCH_LIMIT:
+            return self.get_error_response(
+                message="Not more than %i maps can be rendered at once"
+                % global_config.RENDER_BATCH_LIMIT
+            )
+
+        render_specs = []
+        for entry in maps:
+            if not isinstance(entry, dict) or not isinstance(
+                entry.get("name"), str
+            ):
+                return self.get_error_response(
+                    message="Each map must have a name"
+                )
+            if "@" in entry["name"]:
+                return self.get_error_response(
+                    message="Mapset name is not allowed in layer names"
+                )
+            map_type = entry.get("type", "raster")
+            if map_type not in RENDER_TYPES:
+                return self.get_error_response(
+                    message="Unsupported map type <%s>, supported are: %s"
+                    % (map_type, ", ".join(RENDER_TYPES))
+                )
+            for key in ("n", "s", "e", "w", "width", "height", "compression"):
+                value = entry.get(key)
+                number_types = int if key == "compression" else (int, float)
+                if value is not None and (
+                    isinstance(value, bool)
+                    or not isinstance(value, number_types)
+                ):
+                    return self.get_error_response(
+                        message="<%s> of map <%s> must be a number"
+                        % (key, entry["name"])
+                    )
+
+            options = self.create_parser_options(entry)
+            if isinstance(options, dict) is False:
+                return options
+            options["name"] = entry["name"]
+            options["type"] = map_type
+            render_specs.append(options)
+
+        return render_specs
+
+    @endpoint_decorator()
+    @swagger.doc(check_endpoint("post", batch_render_post_doc))
+    def post(self, location_name, mapset_name):
+        """Render a list of raster and vector map layers as PNG images."""
+        rdc = self.preprocess(
+            has_json=True,
+            has_xml=False,
+            location_name=location_name,
+            mapset_name=mapset_name,
+        )
+        if not rdc:
+            http_code, response_model = pickle.loads(self.response_data)
+            return make_response(jsonify(response_model), http_code)
+
+        response_format = self.request_data.get("format", "zip")
+        if response_format not in RESPONSE_FORMATS:
+            return self.get_error_response(
+                message="Unsupported response format <%s>, supported are: %s"
+                % (response_format, ", ".join(RESPONSE_FORMATS))
+            )
+        render_specs = self.extract_render_specs(self.request_data)
+        if isinstance(render_specs, list) is False:
+            return render_specs
+
+        rdc.set_user_data(render_specs)
+
+        enqueue_job(
+            self.job_timeout, start_job, rdc, queue_type_overwrite=True
+        )
+
+        http_code, response_model = self.wait_until_finish(0.05)
+        if http_code == 200 and response_model["process_results"]:
+            results = response_model["process_results"]
+            if response_format == "multipart":
+                return self._create_multipart_response(results)
+            return self._create_zip_response(results)
+        return make_response(jsonify(response_model), http_code)
+
+    @staticmethod
+    def _get_file_name(index, result):
+        return "%03i_%s_%s.png" % (index, result["type"], result["name"])
+
+    def _create_zip_response(self, results):
+        """Pack the rendered images into an uncompressed zip file, that is
+        removed after it was opened for the response
+
+        Args:
+            results (list): The name, type and file of each rendered image
+
+        Returns:
+            The flask response
+        """
+        with NamedTemporaryFile(suffix=".zip", delete=False) as file:
+            zip_path = file.name
+            # PNG images are already compressed
+            with zipfile.ZipFile(file, "w", zipfile.ZIP_STORED) as zip_file:
+                for index, result in enumerate(results):
+                    if os.path.isfile(result["file"]):
+                        zip_file.write(
+                            result["file"], self._get_file_name(index, result)
+                        )
+                        os.remove(result["file"])
+
+        zip_file = open(zip_path, "rb")
+        os.remove(zip_path)
+        return send_file(
+            zip_file,
+            mimetype="application/zip",
+            as_attachment=True,
+            attachment_filename="render_batch.zip",
+        )
+
+    def _create_multipart_response(self, results):
+        """Stream the rendered images as multipart/mixed response and
+        remove them after they were sent
+
+        Args:
+            results (list): The name, type and file of each rendered image
+
+        Returns:
+            The flask response
+        """
+        boundary = uuid4().hex
+
+        def generate():
+            try:
+                for index, result in enumerate(results):
+                    if not os.path.isfile(result["file"]):
+                        continue
+                    yield (
+                        "--%s\r\n"
+                        "Content-Type: image/png\r\n"
+                        'Content-Disposition: attachment; filename="%s"\r\n'
+                        "\r\n" % (boundary, self._get_file_name(index, result))
+                    ).encode()
+                    with open(result["file"], "rb") as image:
+                        for chunk in iter(lambda: image.read(65536), b""):
+                            yield chunk
+                    os.remove(result["file"])
+                    yield b"\r\n"
+                yield ("--%s--\r\n" % boundary).encode()
+            finally:
+                for result in results:
+                    if os.path.isfile(result["file"]):
+                        os.remove(result["file"])
+
+        return Response(
+            generate(),
+            content_type="multipart/mixed; boundary=%s" % boundary,
+        )
@@ -43,9 +43,17 @@ from actinia_core.rest.base.user_auth import check_admin_role
 from actinia_core.rest.base.user_auth import check_user_permissions
 from actinia_core.core.common.app import auth
 from actinia_core.processing.common.download_cache_management import (
-    start_download_cache_size,
     start_download_cache_remove,
 )
+from actinia_core.core.common.config import global_config
+from actinia_core.core.redis_storage_usage import (
+    DOWNLOAD_CACHE,
+    redis_storage_usage_interface,
+)
+from actinia_core.models.response_models import (
+    StorageResponseModel,
+    StorageModel,
+)
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -70,15 +78,30 @@ class SyncDownloadCacheResource(ResourceBase):
         rdc = self.preprocess(has_json=False, has_xml=False)
 
         if rdc:
-            enqueue_job(
-                self.job_timeout,
-                start_download_cache_size,
-                rdc,
-                queue_type_overwrite=True,
+            # The size is read from the storage usage counter
+            used = redis_storage_usage_interface.get_usage(
+                DOWNLOAD_CACHE,
+                self.user_id,
+                self.download_cache,
+                global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
             )
-            http_code, response_model = self.wait_until_finish()
-        else:
-            http_code, response_model = pickle.loads(self.response_data)
+            quota_size = int(
+                global_config.DOWNLOAD_CACHE_QUOTA * 1024 * 1024 * 1024
+            )
+
+            model = StorageModel(
+                used=used,
+                free=quota_size - used,
+                quota=quota_size,
+                free_percent=int(100 * (quota_size - used) / quota_size),
+            )
+            self.send_finished_response(
+                model,
+                response_model_class=StorageResponseModel,
+                message="Download cache size successfully computed",
+            )
+
+        http_code, response_model = pickle.loads(self.response_data)
 
         return make_response(jsonify(response_model), http_code)
 
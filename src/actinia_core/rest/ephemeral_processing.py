@@ -171,7 +171,7 @@ class AsyncEphemeralResource(ResourceBase):
         # Preprocess the post call
         rdc = self.preprocess(location_name=location_name)
 
-        if rdc:
+        if rdc and self.send_cached_process_result(rdc) is False:
             enqueue_job(self.job_timeout, start_job, rdc)
 
         html_code, response_model = pickle.loads(self.response_data)
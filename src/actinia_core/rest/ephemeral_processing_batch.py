@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Batch submission of asynchronous computations in ephemeral mapsets with
+export of required map layers
+"""
+import pickle
+from flask import jsonify, make_response
+from flask_restful_swagger_2 import swagger
+
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.common.process_chain import (
+    render_process_chain_template,
+)
+from actinia_core.core.common.redis_interface import enqueue_jobs
+from actinia_core.models.response_models import (
+    ProcessingErrorResponseModel,
+    ProcessingResponseListModel,
+)
+from actinia_core.rest.base.endpoint_config import (
+    check_endpoint,
+    endpoint_decorator,
+)
+from actinia_core.rest.base.resource_base import ResourceBase
+from actinia_core.processing.common.ephemeral_processing_with_export import (
+    start_job,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+batch_post_doc = {
+    "tags": ["Processing"],
+    "description": "Submit a batch of process chains, that are executed "
+    "asynchronously in ephemeral mapsets of the location. The exported "
+    "results of each process chain are stored for download. The batch is "
+    "either a list of process chains in 'process_chains' or a single "
+    "process chain in 'template' with a list of 'parameters'. Each entry "
+    "of the parameter list creates a process chain from the template, "
+    "whose placeholders {{name}} are replaced by the values of the entry. "
+    "The response contains the accepted response of each process chain "
+    "with its own resource id. Minimum required user role: user.",
+    "parameters": [
+        {
+            "name": "location_name",
+            "description": "The location name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "nc_spm_08",
+        },
+        {
+            "name": "batch",
+            "description": "The process chains of the batch, e.g. "
+            '{"template": {"version": 1, "list": [{"id": "1", "module": '
+            '"g.region", "inputs": [{"param": "n", "value": "{{n}}"}]}]}, '
+            '"parameters": [{"n": 228500}, {"n": 220000}]}',
+            "required": True,
+            "in": "body",
+            "schema": {"type": "object"},
+        },
+    ],
+    "consumes": ["application/json"],
+    "produces": ["application/json"],
+    "responses": {
+        "200": {
+            "description": "The accepted responses of the process chains",
+            "schema": ProcessingResponseListModel,
+        },
+        "400": {
+            "description": "The error message why the batch was not "
+            "accepted",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
+class AsyncEphemeralExportBatchResource(ResourceBase):
+    """
+    This class represents a resource that accepts a batch of asynchronous
+    processing tasks, that run in temporary mapsets and export the computed
+    results as geotiff files.
+    """
+
+    def __init__(self, resource_id=None, iteration=None, post_url=None):
+        ResourceBase.__init__(self, resource_id, iteration, post_url)
+
+    def extract_process_chains(self, request_data):
+        """Create the process chains of the batch
+
+        Args:
+            request_data (dict): The request with the "process_chains" list
+                                 or the "template" and the "parameters" list
+
+        Returns:
+             list:
+             The list of process chains or an error response, if the
+             request is invalid
+        """
+        if not isinstance(request_data, dict) or (
+            ("process_chains" in request_data) == ("template" in request_data)
+        ):
+            return self.get_error_response(
+                message="The request must contain either a list of "
+                "process chains or a process chain template with a list of "
+                "parameters"
+            )
+        if "process_chains" in request_data:
+            entries = request_data["process_chains"]
+        else:
+            entries = request_data.get("parameters")
+        if not isinstance(entries, list) or len(entries) == 0:
+            return self.get_error_response(
+                message="The batch must contain at least one process chain"
+            )
+        if len(entries) > global_config.PROCESSING_BATCH_LIMIT:
+            return self.get_error_response(
+                message="Not more than %i process chains can be submitted "
+                "at once" % global_config.PROCESSING_BATCH_LIMIT
+            )
+        if any(not isinstance(entry, dict) for entry in entries):
+            return self.get_error_response(
+                message="Each process chain and each parameter entry must "
+                "be a JSON object"
+            )
+
+        if "process_chains" in request_data:
+            return entries
+        try:
+            return [
+                render_process_chain_template(
+                    request_data["template"], parameters
+                )
+                for parameters in entries
+            ]
+        except AsyncProcessError as e:
+            return self.get_error_response(message=str(e))
+
+    @endpoint_decorator()
+    @swagger.doc(check_endpoint("post", batch_post_doc))
+    def post(self, location_name):
+        """Execute a batch of user defined process chains in ephemeral
+        location/mapsets and store the processing results for download.
+        """
+        if self.check_for_json() is False:
+            http_code, response_model = pickle.loads(self.response_data)
+            return make_response(jsonify(response_model), http_code)
+
+        process_chains = self.extract_process_chains(self.request_data)
+        if isinstance(process_chains, list) is False:
+            return process_chains
+
+        rdcs, responses = self.preprocess_batch(
+            process_chains, location_name=location_name
+        )
+        for rdc in rdcs:
+            rdc.set_storage_model_to_file()
+        enqueue_jobs(self.job_timeout, start_job, [(rdc,) for rdc in rdcs])
+
+        return make_response(
+            jsonify(ProcessingResponseListModel(resource_list=responses)), 200
+        )
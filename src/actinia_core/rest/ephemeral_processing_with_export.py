@@ -73,7 +73,8 @@ class AsyncEphemeralExportResource(ResourceBase):
 
         if rdc:
             rdc.set_storage_model_to_file()
-            enqueue_job(self.job_timeout, start_job, rdc)
+            if self.send_cached_process_result(rdc) is False:
+                enqueue_job(self.job_timeout, start_job, rdc)
 
         html_code, response_model = pickle.loads(self.response_data)
         return make_response(jsonify(response_model), html_code)
@@ -100,7 +101,8 @@ class AsyncEphemeralExportS3Resource(ResourceBase):
         rdc = self.preprocess(has_json=True, location_name=location_name)
         rdc.set_storage_model_to_s3()
 
-        enqueue_job(self.job_timeout, start_job, rdc)
+        if self.send_cached_process_result(rdc) is False:
+            enqueue_job(self.job_timeout, start_job, rdc)
 
         html_code, response_model = pickle.loads(self.response_data)
         return make_response(jsonify(response_model), html_code)
@@ -127,7 +129,8 @@ class AsyncEphemeralExportGCSResource(ResourceBase):
         rdc = self.preprocess(has_json=True, location_name=location_name)
         rdc.set_storage_model_to_gcs()
 
-        enqueue_job(self.job_timeout, start_job, rdc)
+        if self.send_cached_process_result(rdc) is False:
+            enqueue_job(self.job_timeout, start_job, rdc)
 
         html_code, response_model = pickle.loads(self.response_data)
         return make_response(jsonify(response_model), html_code)
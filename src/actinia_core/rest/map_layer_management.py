@@ -29,12 +29,21 @@ from flask_restful_swagger_2 import swagger
 import pickle
 from actinia_api.swagger2.actinia_core.apidocs import map_layer_management
 
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.grass_metadata import (
+    find_mapset_path,
+    get_listing_cache,
+    list_map_layers,
+)
 from actinia_core.rest.base.endpoint_config import (
     check_endpoint,
     endpoint_decorator,
 )
 from actinia_core.core.request_parser import glist_parser
+from actinia_core.models.response_models import (
+    StringListProcessingResultResponseModel,
+)
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.processing.common.map_layer_management import (
     list_raster_layers,
@@ -99,19 +108,60 @@ class MapsetLayersResource(ResourceBase):
 
         if rdc:
             args = glist_parser.parse_args()
-            rdc.set_user_data((args, self.layer_type))
-            enqueue_job(
-                self.job_timeout,
-                list_raster_layers,
-                rdc,
-                queue_type_overwrite=True,
-            )
-            http_code, response_model = self.wait_until_finish()
+            if self._list_native_layers(rdc, args) is True:
+                http_code, response_model = pickle.loads(self.response_data)
+            else:
+                rdc.set_user_data((args, self.layer_type))
+                enqueue_job(
+                    self.job_timeout,
+                    list_raster_layers,
+                    rdc,
+                    queue_type_overwrite=True,
+                )
+                http_code, response_model = self.wait_until_finish()
         else:
             http_code, response_model = pickle.loads(self.response_data)
 
         return make_response(jsonify(response_model), http_code)
 
+    def _list_native_layers(self, rdc, args):
+        """List the layers by scanning the mapset directory, without starting
+        a job that runs g.list
+
+        Args:
+            rdc (ResourceDataContainer): The resource data container
+            args (dict): The parsed g.list arguments
+
+        Returns:
+            bool: True if the finished response was created and committed,
+                  False if g.list is required to list the layers
+        """
+        if global_config.NATIVE_METADATA_READER is not True:
+            return False
+        mapset_path = find_mapset_path(
+            global_config, self.user_group, rdc.location_name, rdc.mapset_name
+        )
+        if mapset_path is None:
+            return False
+        try:
+            layers = list_map_layers(
+                mapset_path,
+                self.layer_type,
+                pattern=args.get("pattern"),
+                cache=get_listing_cache(global_config),
+            )
+        except ValueError:
+            # g.list reports invalid patterns
+            return False
+        if layers is None:
+            return False
+
+        self.send_finished_response(
+            layers,
+            response_model_class=StringListProcessingResultResponseModel,
+        )
+        return True
+
     def _delete(self, location_name, mapset_name):
         """Remove a list of layers identified by a pattern
 
@@ -31,19 +31,28 @@ Mapset management resources
 
 from flask import jsonify, make_response
 from flask_restful_swagger_2 import swagger
+import os
 import pickle
 from actinia_api.swagger2.actinia_core.apidocs import mapset_management
 
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.grass_metadata import get_listing_cache, list_mapsets
 from actinia_core.rest.base.endpoint_config import (
     check_endpoint,
     endpoint_decorator,
 )
 from actinia_core.rest.base.user_auth import check_user_permissions
+from actinia_core.rest.base.user_auth import (
+    check_location_mapset_module_access,
+)
 from actinia_core.rest.base.user_auth import check_admin_role, check_user_role
+from actinia_core.models.response_models import (
+    StringListProcessingResultResponseModel,
+)
 from actinia_core.processing.common.mapset_management import (
     list_raster_mapsets,
     read_current_region,
@@ -80,7 +89,9 @@ class ListMapsetsResource(ResourceBase):
             location_name=location_name,
             mapset_name="PERMANENT",
         )
-        if rdc:
+        if rdc and self._list_native_mapsets(rdc) is True:
+            http_code, response_model = pickle.loads(self.response_data)
+        elif rdc:
             enqueue_job(
                 self.job_timeout,
                 list_raster_mapsets,
@@ -93,6 +104,64 @@ class ListMapsetsResource(ResourceBase):
 
         return make_response(jsonify(response_model), http_code)
 
+    def _list_native_mapsets(self, rdc):
+        """List the mapsets by scanning the global and the user group
+        location directories, without starting a job that runs g.mapsets
+
+        Like in the job, only the mapsets of the global location that the
+        user is allowed to access are listed.
+
+        Args:
+            rdc (ResourceDataContainer): The resource data container
+
+        Returns:
+            bool: True if the finished response was created and committed,
+                  False if g.mapsets is required to list the mapsets
+        """
+        if global_config.NATIVE_METADATA_READER is not True:
+            return False
+        cache = get_listing_cache(global_config)
+        global_location_path = os.path.join(
+            global_config.GRASS_DATABASE, rdc.location_name
+        )
+        user_location_path = os.path.join(
+            global_config.GRASS_USER_DATABASE,
+            self.user_group,
+            rdc.location_name,
+        )
+        if not os.path.isdir(global_location_path) and not os.path.isdir(
+            user_location_path
+        ):
+            return False
+
+        mapsets = []
+        if os.path.isdir(global_location_path):
+            global_mapsets = list_mapsets(global_location_path, cache=cache)
+            if global_mapsets is None:
+                return False
+            for mapset in global_mapsets:
+                resp = check_location_mapset_module_access(
+                    user_credentials=self.user_credentials,
+                    config=global_config,
+                    location_name=rdc.location_name,
+                    mapset_name=mapset,
+                )
+                if resp is None:
+                    mapsets.append(mapset)
+        if os.path.isdir(user_location_path):
+            user_mapsets = list_mapsets(user_location_path, cache=cache)
+            if user_mapsets is None:
+                return False
+            mapsets.extend(
+                mapset for mapset in user_mapsets if mapset not in mapsets
+            )
+
+        self.send_finished_response(
+            sorted(mapsets),
+            response_model_class=StringListProcessingResultResponseModel,
+        )
+        return True
+
 
 class MapsetManagementResourceUser(ResourceBase):
     """This class returns information about a mapset"""
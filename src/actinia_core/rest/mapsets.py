@@ -96,7 +96,21 @@ class AllMapsetsListingResourceAdmin(ResourceBase):
 
                 redis_interface.connect(**kwargs)
                 redis_connection = redis_interface.redis_server
-                keys_locked = redis_connection.keys("RESOURCE-LOCK*")
+                keys_locked = redis_connection.keys(
+                    redis_interface.lock_prefix + "*"
+                )
+                keys_queued = redis_connection.keys(
+                    redis_interface.queue_prefix + "*"
+                )
+                lock_waiters = dict()
+                for key in keys_queued:
+                    resource_id = key.decode().replace(
+                        redis_interface.queue_prefix, "", 1
+                    )
+                    waiters = redis_interface.get_waiters(resource_id)
+                    if waiters:
+                        mapset = "/".join(resource_id.split("/")[-2:])
+                        lock_waiters[mapset] = waiters
                 redis_interface.disconnect()
                 keys_locked_dec = [key.decode() for key in keys_locked]
                 mapsets_locked = [
@@ -110,6 +124,7 @@ class AllMapsetsListingResourceAdmin(ResourceBase):
                                 message="number of locked mapsets: %s"
                                 % len(mapsets_locked),
                                 locked_mapsets_list=mapsets_locked,
+                                lock_waiters=lock_waiters,
                             )
                         ),
                         200,
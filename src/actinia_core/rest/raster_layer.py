@@ -31,8 +31,21 @@ import pickle
 from uuid import uuid4
 from werkzeug.utils import secure_filename
 from actinia_api.swagger2.actinia_core.apidocs import raster_layer
+from actinia_api.swagger2.actinia_core.schemas.raster_layer import (
+    RasterInfoModel,
+)
 
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.redis_storage_usage import (
+    DOWNLOAD_CACHE,
+    redis_storage_usage_interface,
+)
+from actinia_core.core.grass_metadata import (
+    find_mapset_path,
+    get_metadata_cache,
+    read_raster_info,
+)
 from actinia_core.rest.base.endpoint_config import (
     check_endpoint,
     endpoint_decorator,
@@ -68,7 +81,9 @@ class RasterLayerResource(MapLayerRegionResourceBase):
             mapset_name=mapset_name,
             map_name=raster_name,
         )
-        if rdc:
+        if rdc and self._read_native_raster_info(rdc) is True:
+            http_code, response_model = pickle.loads(self.response_data)
+        elif rdc:
             enqueue_job(
                 self.job_timeout,
                 start_info_job,
@@ -81,6 +96,33 @@ class RasterLayerResource(MapLayerRegionResourceBase):
 
         return make_response(jsonify(response_model), http_code)
 
+    def _read_native_raster_info(self, rdc):
+        """Read the raster layer information directly from the GRASS GIS
+        database files, without starting a job that runs r.info
+
+        Args:
+            rdc (ResourceDataContainer): The resource data container
+
+        Returns:
+            bool: True if the finished response was created and committed,
+                  False if r.info is required to get the information
+        """
+        if global_config.NATIVE_METADATA_READER is not True:
+            return False
+        mapset_path = find_mapset_path(
+            global_config, self.user_group, rdc.location_name, rdc.mapset_name
+        )
+        if mapset_path is None:
+            return False
+        raster_info = read_raster_info(
+            mapset_path, rdc.map_name, cache=get_metadata_cache(global_config)
+        )
+        if raster_info is None:
+            return False
+
+        self.send_finished_response(RasterInfoModel(**raster_info))
+        return True
+
     @endpoint_decorator()
     @swagger.doc(check_endpoint("delete", raster_layer.delete_doc))
     def delete(self, location_name, mapset_name, raster_name):
@@ -158,7 +200,6 @@ class RasterLayerResource(MapLayerRegionResourceBase):
             name, extension = secure_filename(file.filename).rsplit(".", 1)
             filename = f"{name}_{id}.{extension}"
             file_path = os.path.join(self.download_cache, filename)
-            file.save(file_path)
         else:
             os.remove(file_path)
             return make_response(
@@ -172,6 +213,33 @@ class RasterLayerResource(MapLayerRegionResourceBase):
                 400,
             )
 
+        # Count the upload in the download cache usage before it is written
+        file.stream.seek(0, os.SEEK_END)
+        file_size = file.stream.tell()
+        file.stream.seek(0)
+        if (
+            redis_storage_usage_interface.add_within_quota(
+                DOWNLOAD_CACHE,
+                self.user_id,
+                file_size,
+                int(global_config.DOWNLOAD_CACHE_QUOTA * 1024 * 1024 * 1024),
+                self.download_cache,
+                global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
+            )
+            is False
+        ):
+            return make_response(
+                jsonify(
+                    SimpleResponseModel(
+                        status="error",
+                        message="The download cache quota of %i GB is "
+                        "exceeded." % global_config.DOWNLOAD_CACHE_QUOTA,
+                    )
+                ),
+                400,
+            )
+        file.save(file_path)
+
         rdc = self.preprocess(
             has_json=False,
             has_xml=False,
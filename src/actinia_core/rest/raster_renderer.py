@@ -27,19 +27,34 @@ Raster map renderer
 """
 from flask_restful_swagger_2 import swagger
 import os
-from flask import jsonify, make_response, Response
+import pickle
+from flask import jsonify, make_response, request, send_file
 from actinia_api.swagger2.actinia_core.apidocs import raster_renderer
 
 from actinia_core.rest.base.endpoint_config import (
     check_endpoint,
     endpoint_decorator,
 )
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.grass_metadata import find_mapset_path
+from actinia_core.core.tile_cache import (
+    get_metatile,
+    get_raster_fingerprint,
+    get_tile_bounds,
+    get_tile_cache,
+    get_tile_grid,
+    TILE_SIZE,
+)
+from actinia_core.models.response_models import (
+    ProcessingErrorResponseModel,
+)
 from actinia_core.rest.base.renderer_base import RendererBaseResource
 from actinia_core.processing.common.raster_renderer import (
     start_job,
     start_rgb_job,
     start_shade_job,
+    start_tile_job,
 )
 
 __license__ = "GPLv3"
@@ -81,12 +96,10 @@ class SyncEphemeralRasterRendererResource(RendererBaseResource):
         http_code, response_model = self.wait_until_finish(0.05)
         if http_code == 200:
             result_file = response_model["process_results"]
-            # Open the image file, read it and then delete it
+            # Stream the image file, that is deleted after the response
             if result_file:
                 if os.path.isfile(result_file):
-                    image = open(result_file, "rb").read()
-                    os.remove(result_file)
-                    return Response(image, mimetype="image/png")
+                    return self.send_image_file(result_file)
         return make_response(jsonify(response_model), http_code)
 
 
@@ -183,12 +196,10 @@ class SyncEphemeralRasterRGBRendererResource(RendererBaseResource):
         http_code, response_model = self.wait_until_finish(0.05)
         if http_code == 200:
             result_file = response_model["process_results"]
-            # Open the image file, read it and then delete it
+            # Stream the image file, that is deleted after the response
             if result_file:
                 if os.path.isfile(result_file):
-                    image = open(result_file, "rb").read()
-                    os.remove(result_file)
-                    return Response(image, mimetype="image/png")
+                    return self.send_image_file(result_file)
         return make_response(jsonify(response_model), http_code)
 
 
@@ -270,10 +281,218 @@ class SyncEphemeralRasterShapeRendererResource(RendererBaseResource):
         http_code, response_model = self.wait_until_finish(0.05)
         if http_code == 200:
             result_file = response_model["process_results"]
-            # Open the image file, read it and then delete it
+            # Stream the image file, that is deleted after the response
             if result_file:
                 if os.path.isfile(result_file):
-                    image = open(result_file, "rb").read()
-                    os.remove(result_file)
-                    return Response(image, mimetype="image/png")
+                    return self.send_image_file(result_file)
         return make_response(jsonify(response_model), http_code)
+
+
+raster_tile_get_doc = {
+    "tags": ["Raster Management"],
+    "description": "Render a tile of a raster map layer as PNG image. "
+    "Locations in web mercator (EPSG:3857) use the XYZ tile grid of web "
+    "map clients, all other locations a tile grid in their coordinate "
+    "reference system whose single tile at zoom level 0 covers the raster "
+    "map layer. The tiles are rendered in metatiles and cached until the "
+    "raster map layer or its color table changes. "
+    "Minimum required user role: user.",
+    "parameters": [
+        {
+            "name": "location_name",
+            "description": "The location name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "nc_spm_08",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the "
+            "required raster map layer",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "PERMANENT",
+        },
+        {
+            "name": "raster_name",
+            "description": "The name of the raster map layer to render",
+            "required": True,
+            "in": "path",
+            "type": "string",
+            "default": "elevation",
+        },
+        {
+            "name": "z",
+            "description": "The zoom level of the tile",
+            "required": True,
+            "in": "path",
+            "type": "integer",
+            "default": 0,
+        },
+        {
+            "name": "x",
+            "description": "The column of the tile",
+            "required": True,
+            "in": "path",
+            "type": "integer",
+            "default": 0,
+        },
+        {
+            "name": "y",
+            "description": "The row of the tile",
+            "required": True,
+            "in": "path",
+            "type": "integer",
+            "default": 0,
+        },
+    ],
+    "produces": ["image/png"],
+    "responses": {
+        "200": {"description": "The PNG tile of the raster map layer"},
+        "304": {"description": "The tile was not modified"},
+        "400": {
+            "description": "The error message and a detailed log why "
+            "rendering did not succeeded",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
+class SyncEphemeralRasterTileRendererResource(RendererBaseResource):
+    """Render XYZ tiles of a raster layer in metatiles and serve them from
+    the on-disk tile cache
+    """
+
+    @endpoint_decorator()
+    @swagger.doc(check_endpoint("get", raster_tile_get_doc))
+    def get(self, location_name, mapset_name, raster_name, z, x, y):
+        """Render a tile of a raster map layer as a PNG image."""
+        if z > global_config.TILE_MAX_ZOOM or x >= 2**z or y >= 2**z:
+            return self.get_error_response(
+                message="Tile <%i/%i/%i> is outside of the tile grid"
+                % (z, x, y)
+            )
+
+        mapset_path = find_mapset_path(
+            global_config, self.user_group, location_name, mapset_name
+        )
+        fingerprint = None
+        if mapset_path is not None:
+            fingerprint = get_raster_fingerprint(mapset_path, raster_name)
+        if fingerprint is None:
+            return self.get_error_response(
+                message="Raster map <%s> not found in mapset <%s>"
+                % (raster_name, mapset_name)
+            )
+
+        tile_cache = get_tile_cache(global_config)
+        tile_path = tile_cache.lookup(fingerprint, z, x, y)
+        if tile_path is None:
+            metatile_x, metatile_y, size = get_metatile(
+                z, x, y, global_config.METATILE_SIZE
+            )
+            # Concurrent requests of the same metatile wait for the first
+            # rendering and are served from the cache afterwards
+            with tile_cache.metatile_lock(
+                fingerprint, z, metatile_x, metatile_y
+            ):
+                tile_path = tile_cache.lookup(fingerprint, z, x, y)
+                if tile_path is None:
+                    error_response = self._render_metatile(
+                        location_name,
+                        mapset_name,
+                        raster_name,
+                        mapset_path,
+                        fingerprint,
+                        z,
+                        metatile_x,
+                        metatile_y,
+                        size,
+                    )
+                    if error_response is not None:
+                        return error_response
+                    tile_path = tile_cache.lookup(fingerprint, z, x, y)
+            tile_cache.evict()
+            if tile_path is None:
+                return self.get_error_response(
+                    message="Unable to render tile <%i/%i/%i>" % (z, x, y)
+                )
+
+        response = send_file(tile_path, mimetype="image/png", add_etags=False)
+        response.set_etag("%s-%i-%i-%i" % (fingerprint, z, x, y))
+        response.cache_control.public = True
+        response.cache_control.max_age = global_config.TILE_CACHE_MAX_AGE
+        return response.make_conditional(request)
+
+    def _render_metatile(
+        self,
+        location_name,
+        mapset_name,
+        raster_name,
+        mapset_path,
+        fingerprint,
+        z,
+        metatile_x,
+        metatile_y,
+        size,
+    ):
+        """Render a metatile with a single job and store its tiles in the
+        tile cache
+
+        Returns:
+            None if the metatile was rendered, otherwise the error response
+        """
+        location_path = os.path.dirname(
+            find_mapset_path(
+                global_config, self.user_group, location_name, "PERMANENT"
+            )
+            or mapset_path
+        )
+        grid = get_tile_grid(location_path, mapset_path, raster_name)
+        if grid is None:
+            return self.get_error_response(
+                message="Unable to read the region of raster map <%s>"
+                % raster_name
+            )
+
+        tile_cache = get_tile_cache(global_config)
+        options = get_tile_bounds(grid, z, metatile_x, metatile_y, size)
+        options["width"] = size * TILE_SIZE
+        options["height"] = size * TILE_SIZE
+        options["tile_size"] = TILE_SIZE
+        options["tiles"] = [
+            [
+                row,
+                column,
+                tile_cache.get_tile_path(
+                    fingerprint, z, metatile_x + column, metatile_y + row
+                ),
+            ]
+            for row in range(size)
+            for column in range(size)
+        ]
+
+        rdc = self.preprocess(
+            has_json=False,
+            has_xml=False,
+            location_name=location_name,
+            mapset_name=mapset_name,
+            map_name=raster_name,
+        )
+        if not rdc:
+            http_code, response_model = pickle.loads(self.response_data)
+            return make_response(jsonify(response_model), http_code)
+
+        rdc.set_user_data(options)
+        enqueue_job(
+            self.job_timeout, start_tile_job, rdc, queue_type_overwrite=True
+        )
+        http_code, response_model = self.wait_until_finish(0.05)
+        if http_code != 200:
+            return make_response(jsonify(response_model), http_code)
+        for row, column, path in options["tiles"]:
+            tile_cache.add(path)
+        return None
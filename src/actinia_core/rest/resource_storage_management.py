@@ -29,6 +29,7 @@ TODO: Tests required
 
 from flask import jsonify, make_response
 from flask_restful_swagger_2 import swagger
+import os
 import pickle
 from actinia_api.swagger2.actinia_core.apidocs import (
     resource_storage_management,
@@ -37,9 +38,17 @@ from actinia_api.swagger2.actinia_core.apidocs import (
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.redis_interface import enqueue_job
 from actinia_core.processing.common.resource_storage_management import (
-    start_resource_storage_size,
     start_resource_storage_remove,
 )
+from actinia_core.core.common.config import global_config
+from actinia_core.core.redis_storage_usage import (
+    RESOURCE_STORAGE,
+    redis_storage_usage_interface,
+)
+from actinia_core.models.response_models import (
+    StorageResponseModel,
+    StorageModel,
+)
 
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
@@ -74,15 +83,30 @@ class SyncResourceStorageResource(ResourceBase):
         rdc = self.preprocess(has_json=False, has_xml=False)
 
         if rdc:
-            enqueue_job(
-                self.job_timeout,
-                start_resource_storage_size,
-                rdc,
-                queue_type_overwrite=True,
+            # The size is read from the storage usage counter
+            used = redis_storage_usage_interface.get_usage(
+                RESOURCE_STORAGE,
+                self.user_id,
+                os.path.join(global_config.GRASS_RESOURCE_DIR, self.user_id),
+                global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
             )
-            http_code, response_model = self.wait_until_finish()
-        else:
-            http_code, response_model = pickle.loads(self.response_data)
+            quota_size = int(
+                global_config.GRASS_RESOURCE_QUOTA * 1024 * 1024 * 1024
+            )
+
+            model = StorageModel(
+                used=used,
+                free=quota_size - used,
+                quota=quota_size,
+                free_percent=int(100 * (quota_size - used) / quota_size),
+            )
+            self.send_finished_response(
+                model,
+                response_model_class=StorageResponseModel,
+                message="Resource storage size successfully computed",
+            )
+
+        http_code, response_model = pickle.loads(self.response_data)
 
         return make_response(jsonify(response_model), http_code)
 
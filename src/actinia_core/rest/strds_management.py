@@ -38,7 +38,16 @@ from actinia_core.rest.base.endpoint_config import (
 )
 from actinia_core.core.request_parser import where_parser
 from actinia_core.rest.base.resource_base import ResourceBase
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.grass_metadata import (
+    find_mapset_path,
+    get_listing_cache,
+    list_strds,
+)
+from actinia_core.models.response_models import (
+    StringListProcessingResultResponseModel,
+)
 from actinia_core.processing.common.strds_management import (
     list_raster_mapsets,
     strds_create,
@@ -74,20 +83,59 @@ class SyncSTRDSListerResource(ResourceBase):
 
         if rdc:
             args = where_parser.parse_args()
-            rdc.set_user_data(args)
-
-            enqueue_job(
-                self.job_timeout,
-                list_raster_mapsets,
-                rdc,
-                queue_type_overwrite=True,
-            )
-            http_code, response_model = self.wait_until_finish()
+            if self._list_native_strds(rdc, args) is True:
+                http_code, response_model = pickle.loads(self.response_data)
+            else:
+                rdc.set_user_data(args)
+
+                enqueue_job(
+                    self.job_timeout,
+                    list_raster_mapsets,
+                    rdc,
+                    queue_type_overwrite=True,
+                )
+                http_code, response_model = self.wait_until_finish()
         else:
             http_code, response_model = pickle.loads(self.response_data)
 
         return make_response(jsonify(response_model), http_code)
 
+    def _list_native_strds(self, rdc, args):
+        """List the STRDS by reading the temporal database of the mapset,
+        without starting a job that runs t.list
+
+        Only listings without where, order and columns options are
+        supported, since these options are SQL statements of t.list.
+
+        Args:
+            rdc (ResourceDataContainer): The resource data container
+            args (dict): The parsed t.list arguments
+
+        Returns:
+            bool: True if the finished response was created and committed,
+                  False if t.list is required to list the STRDS
+        """
+        if global_config.NATIVE_METADATA_READER is not True:
+            return False
+        if any(value is not None for value in args.values()):
+            return False
+        mapset_path = find_mapset_path(
+            global_config, self.user_group, rdc.location_name, rdc.mapset_name
+        )
+        if mapset_path is None:
+            return False
+        strds_list = list_strds(
+            mapset_path, cache=get_listing_cache(global_config)
+        )
+        if strds_list is None:
+            return False
+
+        self.send_finished_response(
+            strds_list,
+            response_model_class=StringListProcessingResultResponseModel,
+        )
+        return True
+
 
 """
 STRDS Management
@@ -24,7 +24,7 @@
 """
 Raster map renderer
 """
-from flask import jsonify, make_response, Response
+from flask import jsonify, make_response
 from actinia_core.core.common.redis_interface import enqueue_job
 from actinia_core.rest.base.renderer_base import RendererBaseResource
 import os
@@ -76,10 +76,8 @@ class SyncEphemeralSTRDSRendererResource(RendererBaseResource):
         http_code, response_model = self.wait_until_finish(0.05)
         if http_code == 200:
             result_file = response_model["process_results"]
-            # Open the image file, read it and then delete it
+            # Stream the image file, that is deleted after the response
             if result_file:
                 if os.path.isfile(result_file):
-                    image = open(result_file, "rb").read()
-                    os.remove(result_file)
-                    return Response(image, mimetype="image/png")
+                    return self.send_image_file(result_file)
         return make_response(jsonify(response_model), http_code)
@@ -28,6 +28,7 @@ from flask import jsonify, make_response, request
 from flask_restful_swagger_2 import swagger
 import os
 import pickle
+import shutil
 from uuid import uuid4
 from werkzeug.utils import secure_filename
 from zipfile import ZipFile
@@ -37,7 +38,13 @@ from actinia_core.rest.base.endpoint_config import (
     check_endpoint,
     endpoint_decorator,
 )
+from actinia_core.core.common.config import global_config
 from actinia_core.core.common.redis_interface import enqueue_job
+from actinia_core.core.redis_storage_usage import (
+    DOWNLOAD_CACHE,
+    get_path_size,
+    redis_storage_usage_interface,
+)
 from actinia_core.core.utils import allowed_file
 from actinia_core.models.response_models import SimpleResponseModel
 from actinia_core.rest.base.map_layer_base import MapLayerRegionResourceBase
@@ -164,7 +171,6 @@ class VectorLayerResource(MapLayerRegionResourceBase):
             name, extension = secure_filename(file.filename).rsplit(".", 1)
             filename = f"{name}_{id}.{extension}"
             file_path = os.path.join(self.download_cache, filename)
-            file.save(file_path)
         else:
             os.remove(file_path)
             return make_response(
@@ -178,40 +184,80 @@ class VectorLayerResource(MapLayerRegionResourceBase):
                 400,
             )
 
+        # Count the upload in the download cache usage before it is written
+        file.stream.seek(0, os.SEEK_END)
+        file_size = file.stream.tell()
+        file.stream.seek(0)
+        if (
+            redis_storage_usage_interface.add_within_quota(
+                DOWNLOAD_CACHE,
+                self.user_id,
+                file_size,
+                int(global_config.DOWNLOAD_CACHE_QUOTA * 1024 * 1024 * 1024),
+                self.download_cache,
+                global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
+            )
+            is False
+        ):
+            return make_response(
+                jsonify(
+                    SimpleResponseModel(
+                        status="error",
+                        message="The download cache quota of %i GB is "
+                        "exceeded." % global_config.DOWNLOAD_CACHE_QUOTA,
+                    )
+                ),
+                400,
+            )
+        file.save(file_path)
+
         # Shapefile upload as zip
         if extension == "zip":
             unzip_folder = os.path.join(self.download_cache, f"unzip_{id}")
             with ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(unzip_folder)
-            shp_files = [
-                entry
-                for entry in os.listdir(unzip_folder)
-                if entry.endswith(".shp")
-            ]
-            if len(shp_files) == 0:
-                return make_response(
-                    jsonify(
-                        SimpleResponseModel(
-                            status="error",
-                            message="No .shp file found in zip file.",
-                        )
+                # The extracted files are counted before they are written
+                unzipped = redis_storage_usage_interface.add_within_quota(
+                    DOWNLOAD_CACHE,
+                    self.user_id,
+                    sum(info.file_size for info in zip_ref.infolist()),
+                    int(
+                        global_config.DOWNLOAD_CACHE_QUOTA * 1024 * 1024 * 1024
                     ),
-                    400,
+                    self.download_cache,
+                    global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
+                )
+                if unzipped is True:
+                    zip_ref.extractall(unzip_folder)
+            message = None
+            if unzipped is False:
+                message = (
+                    "The download cache quota of %i GB is exceeded."
+                    % global_config.DOWNLOAD_CACHE_QUOTA
                 )
-            elif len(shp_files) > 1:
+            else:
+                shp_files = [
+                    entry
+                    for entry in os.listdir(unzip_folder)
+                    if entry.endswith(".shp")
+                ]
+                if len(shp_files) == 0:
+                    message = "No .shp file found in zip file."
+                elif len(shp_files) > 1:
+                    message = (
+                        f"{len(shp_files)} .shp files found in zip"
+                        " file. Please put only one in the zip file."
+                    )
+            self._remove_from_download_cache(file_path)
+            if message is not None:
+                if unzipped is True:
+                    self._remove_from_download_cache(unzip_folder)
                 return make_response(
                     jsonify(
-                        SimpleResponseModel(
-                            status="error",
-                            message=f"{len(shp_files)} .shp files found in zip"
-                            " file. Please put only one in the zip file.",
-                        )
+                        SimpleResponseModel(status="error", message=message)
                     ),
                     400,
                 )
-            else:
-                os.remove(file_path)
-                file_path = os.path.join(unzip_folder, shp_files[0])
+            file_path = os.path.join(unzip_folder, shp_files[0])
 
         rdc = self.preprocess(
             has_json=False,
@@ -226,3 +272,22 @@ class VectorLayerResource(MapLayerRegionResourceBase):
 
         http_code, response_model = pickle.loads(self.response_data)
         return make_response(jsonify(response_model), http_code)
+
+    def _remove_from_download_cache(self, path):
+        """Subtract the size of an uploaded file or directory from the
+        download cache usage of the user and remove it
+
+        Args:
+            path (str): The path of the file or directory
+        """
+        redis_storage_usage_interface.add(
+            DOWNLOAD_CACHE,
+            self.user_id,
+            -get_path_size(path),
+            self.download_cache,
+            global_config.STORAGE_USAGE_RECONCILE_INTERVAL,
+        )
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
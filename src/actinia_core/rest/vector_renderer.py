@@ -28,7 +28,7 @@ Raster map renderer
 
 import os
 from flask_restful_swagger_2 import swagger
-from flask import jsonify, make_response, Response
+from flask import jsonify, make_response
 from actinia_api.swagger2.actinia_core.apidocs import vector_renderer
 
 from actinia_core.rest.base.endpoint_config import (
@@ -78,11 +78,9 @@ class SyncEphemeralVectorRendererResource(RendererBaseResource):
         http_code, response_model = self.wait_until_finish(0.05)
         if http_code == 200:
             result_file = response_model["process_results"]
-            # Open the image file, read it and then delete it
+            # Stream the image file, that is deleted after the response
             if result_file:
                 if os.path.isfile(result_file):
-                    image = open(result_file, "rb").read()
-                    os.remove(result_file)
-                    return Response(image, mimetype="image/png")
+                    return self.send_image_file(result_file)
 
         return make_response(jsonify(response_model), http_code)
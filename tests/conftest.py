@@ -22,9 +22,265 @@
 #
 #######
 """
-    Dummy conftest.py for actinia API.
+    conftest.py for actinia API.
 
-    If you don't know what this is for, just leave it empty.
+    Provides the fixtures that are shared by the unittests.
     Read more about conftest.py under:
     https://pytest.org/latest/plugins.html
 """
+import pytest
+from redis.exceptions import WatchError
+
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class FakeRedis(object):
+    """Fake redis server that keeps the data in dictionaries
+
+    The values are returned as bytes like from a real redis server. The
+    expiration time of keys is ignored. Each command that is sent directly
+    and each executed pipeline is counted as one round trip. The versions of
+    the keys are counted to detect the modification of watched keys.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.sorted_sets = {}
+        self.streams = {}
+        self.versions = {}
+        self.round_trips = 0
+        self.transactions = 0
+        self.script_calls = []
+        self.script_handler = None
+
+    def __getattr__(self, name):
+        command = getattr(type(self), "_" + name, None)
+        if command is None or name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            self.round_trips += 1
+            return command(self, *args, **kwargs)
+
+        return call
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return FakePipeline(self, transaction)
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        with self.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(*watches)
+                    func_value = func(pipe)
+                    exec_value = pipe.execute()
+                    if value_from_callable is True:
+                        return func_value
+                    return exec_value
+                except WatchError:
+                    continue
+
+    def register_script(self, script):
+        def call(keys, args):
+            self.round_trips += 1
+            self.script_calls.append((keys, args))
+            return self.script_handler(keys, args)
+
+        return call
+
+    def _touch(self, *names):
+        for name in names:
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def _get(self, name):
+        return self.values.get(name)
+
+    def _mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def _set(self, name, value, ex=None, nx=False):
+        if nx is True and self._exists(name):
+            return None
+        self._touch(name)
+        self.values[name] = _encode(value)
+        return True
+
+    def _setex(self, name, time, value):
+        return self._set(name, value, ex=time)
+
+    def _incrby(self, name, amount=1):
+        value = int(self.values.get(name, 0)) + int(amount)
+        self._touch(name)
+        self.values[name] = _encode(value)
+        return value
+
+    def _incr(self, name, amount=1):
+        return self._incrby(name, amount)
+
+    def _exists(self, *names):
+        return sum(
+            name in self.values
+            or name in self.hashes
+            or name in self.sorted_sets
+            or name in self.streams
+            for name in names
+        )
+
+    def _delete(self, *names):
+        deleted = self._exists(*names)
+        self._touch(*names)
+        for name in names:
+            self.values.pop(name, None)
+            self.hashes.pop(name, None)
+            self.sorted_sets.pop(name, None)
+            self.streams.pop(name, None)
+        return deleted
+
+    def _hget(self, name, key):
+        return self.hashes.get(name, {}).get(_encode(key))
+
+    def _hset(self, name, key=None, value=None, mapping=None):
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        self._touch(name)
+        fields = self.hashes.setdefault(name, {})
+        added = len(set(map(_encode, items)) - set(fields))
+        for field, field_value in items.items():
+            fields[_encode(field)] = _encode(field_value)
+        return added
+
+    def _zadd(self, name, mapping):
+        self._touch(name)
+        members = self.sorted_sets.setdefault(name, {})
+        added = len(set(map(_encode, mapping)) - set(members))
+        for member, score in mapping.items():
+            members[_encode(member)] = float(score)
+        return added
+
+    def _zrem(self, name, *members):
+        self._touch(name)
+        sorted_set = self.sorted_sets.get(name, {})
+        removed = [_encode(member) for member in members]
+        removed = [member for member in removed if member in sorted_set]
+        for member in removed:
+            del sorted_set[member]
+        return len(removed)
+
+    def _zremrangebyscore(self, name, min, max):
+        self._touch(name)
+        members = self.sorted_sets.get(name, {})
+        removed = [
+            member
+            for member, score in members.items()
+            if float(min) <= score <= float(max)
+        ]
+        for member in removed:
+            del members[member]
+        return len(removed)
+
+    def _zrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        return [
+            member
+            for member in sorted(members, key=lambda member: members[member])
+            if float(min) <= members[member] <= float(max)
+        ]
+
+    def _zcard(self, name):
+        return len(self.sorted_sets.get(name, {}))
+
+    def _zrange(self, name, start, end):
+        members = self.sorted_sets.get(name, {})
+        members = sorted(members, key=lambda member: members[member])
+        if end < 0:
+            end += len(members)
+        return members[start:][: end - start + 1]
+
+    def _xadd(self, name, fields):
+        self._touch(name)
+        entries = self.streams.setdefault(name, [])
+        entry_id = _encode("%i-0" % (len(entries) + 1))
+        entries.append(
+            (
+                entry_id,
+                dict(
+                    (_encode(key), _encode(value))
+                    for key, value in fields.items()
+                ),
+            )
+        )
+        return entry_id
+
+
+class FakePipeline(object):
+    """Fake redis pipeline that buffers the commands until they are executed
+
+    Commands are executed immediately after watch() and before multi(),
+    like in a real redis transaction. A transaction fails with a WatchError
+    if a watched key was modified after watch().
+    """
+
+    def __init__(self, server, transaction=True):
+        self.server = server
+        self.transaction = transaction
+        self.watching = False
+        self.watched = {}
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.watched = {}
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(type(self.server), "_" + name, None)
+        if command is None or name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            if self.watching is True:
+                return getattr(self.server, name)(*args, **kwargs)
+            self.commands.append((command, args, kwargs))
+            return self
+
+        return call
+
+    def watch(self, *names):
+        self.watching = True
+        self.watched = dict(
+            (name, self.server.versions.get(name, 0)) for name in names
+        )
+
+    def multi(self):
+        self.watching = False
+
+    def execute(self):
+        self.server.round_trips += 1
+        watched, self.watched = self.watched, {}
+        self.watching = False
+        for name, version in watched.items():
+            if self.server.versions.get(name, 0) != version:
+                self.commands = []
+                raise WatchError("Watched variable changed.")
+        if self.transaction is True:
+            self.server.transactions += 1
+        results = [
+            command(self.server, *args, **kwargs)
+            for command, args, kwargs in self.commands
+        ]
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def fake_redis():
+    """Return a fake redis server for the redis interfaces"""
+    return FakeRedis()
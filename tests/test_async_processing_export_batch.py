@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Async batch processing test case
+"""
+import json
+import time
+import unittest
+
+try:
+    from .test_resource_base import ActiniaResourceTestCaseBase, URL_PREFIX
+except ModuleNotFoundError:
+    from test_resource_base import ActiniaResourceTestCaseBase, URL_PREFIX
+
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+TEMPLATE = {
+    "version": 1,
+    "list": [
+        {
+            "id": "1",
+            "module": "g.region",
+            "inputs": [
+                {"param": "raster", "value": "elevation@PERMANENT"},
+                {"param": "res", "value": "{{res}}"},
+            ],
+            "flags": "p",
+        },
+        {
+            "id": "2",
+            "module": "r.out.ascii",
+            "inputs": [{"param": "input", "value": "elevation@PERMANENT"}],
+            "outputs": [
+                {
+                    "export": {"type": "file", "format": "TXT"},
+                    "param": "output",
+                    "value": "$file::out_{{res}}",
+                }
+            ],
+        },
+    ],
+}
+
+
+class AsyncProcessBatchTestCase(ActiniaResourceTestCaseBase):
+    def wait_for_resource(self, resource):
+        while True:
+            rv = self.server.get(
+                URL_PREFIX
+                + "/resources/%s/%s"
+                % (resource["user_id"], resource["resource_id"]),
+                headers=self.user_auth_header,
+            )
+            resp = json.loads(rv.data)
+            if resp["status"] in ("finished", "error", "terminated"):
+                return resp
+            time.sleep(0.2)
+
+    def test_async_processing_batch_template(self):
+        rv = self.server.post(
+            URL_PREFIX + "/locations/nc_spm_08/processing_async_export_batch",
+            headers=self.user_auth_header,
+            data=json.dumps(
+                {
+                    "template": TEMPLATE,
+                    "parameters": [{"res": "1000"}, {"res": "5000"}],
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        resources = json.loads(rv.data)["resource_list"]
+        self.assertEqual(len(resources), 2)
+        self.assertNotEqual(
+            resources[0]["resource_id"], resources[1]["resource_id"]
+        )
+
+        for resource in resources:
+            self.assertEqual(resource["status"], "accepted")
+            resp = self.wait_for_resource(resource)
+            self.assertEqual(resp["status"], "finished")
+            self.assertEqual(len(resp["urls"]["resources"]), 1)
+
+    def test_async_processing_batch_error(self):
+        rv = self.server.post(
+            URL_PREFIX + "/locations/nc_spm_08/processing_async_export_batch",
+            headers=self.user_auth_header,
+            data=json.dumps({"template": TEMPLATE, "parameters": [{}]}),
+            content_type="application/json",
+        )
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
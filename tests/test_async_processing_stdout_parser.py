@@ -125,6 +125,40 @@ r_what = {
     "version": "1",
 }
 
+r_what_columns = {
+    "list": [
+        {
+            "module": "g.region",
+            "id": "g_region_1",
+            "inputs": [
+                {"param": "raster", "value": "landuse96_28m@PERMANENT"}
+            ],
+            "flags": "a",
+        },
+        {
+            "module": "r.what",
+            "id": "r_what_1",
+            "flags": "nfic",
+            "inputs": [
+                {"param": "map", "value": "landuse96_28m@PERMANENT"},
+                {
+                    "param": "coordinates",
+                    "value": "633614.08,224125.12,632972.36,225382.87",
+                },
+                {"param": "null_value", "value": "null"},
+                {"param": "separator", "value": "pipe"},
+            ],
+            "stdout": {
+                "id": "sample",
+                "format": "columns",
+                "delimiter": "|",
+                "header": True,
+            },
+        },
+    ],
+    "version": "1",
+}
+
 
 class AsyncProcessStdoutParserTestCase(ActiniaResourceTestCaseBase):
     def test_output_parsing(self):
@@ -204,6 +238,36 @@ class AsyncProcessStdoutParserTestCase(ActiniaResourceTestCaseBase):
 
         self.assertEqual(resp["process_results"], process_results)
 
+    def test_output_parsing_columns(self):
+        rv = self.server.post(
+            URL_PREFIX + "/locations/nc_spm_08/processing_async",
+            headers=self.admin_auth_header,
+            data=json_dumps(r_what_columns),
+            content_type="application/json",
+        )
+
+        resp = self.waitAsyncStatusAssertHTTP(
+            rv,
+            headers=self.admin_auth_header,
+            http_status=200,
+            status="finished",
+        )
+
+        process_results = {
+            "sample": {
+                "easting": [633614.08, 632972.36],
+                "northing": [224125.12, 225382.87],
+                "site_name": [None, None],
+                "landuse96_28m@PERMANENT": [15, 4],
+                "landuse96_28m@PERMANENT_label": [
+                    "Southern Yellow Pine",
+                    "Managed Herbaceous Cover",
+                ],
+            },
+        }
+
+        self.assertEqual(resp["process_results"], process_results)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Batch renderer test case
+"""
+import io
+import json
+import unittest
+import zipfile
+
+try:
+    from .test_resource_base import ActiniaResourceTestCaseBase, URL_PREFIX
+except ModuleNotFoundError:
+    from test_resource_base import ActiniaResourceTestCaseBase, URL_PREFIX
+
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+RENDER_SPECS = {
+    "maps": [
+        {"name": "elevation", "type": "raster", "width": 100, "height": 100},
+        {
+            "name": "elevation",
+            "type": "raster",
+            "n": 228500,
+            "s": 215000,
+            "w": 630000,
+            "e": 645000,
+        },
+        {"name": "geology", "type": "vector", "width": 100, "height": 50},
+    ]
+}
+
+
+class BatchRendererTestCase(ActiniaResourceTestCaseBase):
+    def test_batch_render_zip(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/locations/nc_spm_08/mapsets/PERMANENT/"
+            "render_batch",
+            headers=self.user_auth_header,
+            data=json.dumps(RENDER_SPECS),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/zip", "Wrong mimetype %s" % rv.mimetype
+        )
+        with zipfile.ZipFile(io.BytesIO(rv.data)) as zip_file:
+            self.assertEqual(
+                zip_file.namelist(),
+                [
+                    "000_raster_elevation.png",
+                    "001_raster_elevation.png",
+                    "002_vector_geology.png",
+                ],
+            )
+
+    def test_batch_render_multipart(self):
+        render_specs = dict(RENDER_SPECS, format="multipart")
+        rv = self.server.post(
+            f"{URL_PREFIX}/locations/nc_spm_08/mapsets/PERMANENT/"
+            "render_batch",
+            headers=self.user_auth_header,
+            data=json.dumps(render_specs),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "multipart/mixed", "Wrong mimetype %s" % rv.mimetype
+        )
+        self.assertEqual(rv.data.count(b"Content-Type: image/png"), 3)
+
+    def test_batch_render_error(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/locations/nc_spm_08/mapsets/PERMANENT/"
+            "render_batch",
+            headers=self.user_auth_header,
+            data=json.dumps(
+                {"maps": [{"name": "elevation", "type": "strds"}]}
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -421,6 +421,36 @@ class RasterLayerRendererTestCase(ActiniaResourceTestCaseBase):
             rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
         )
 
+    def test_raster_layer_image_compression(self):
+        rv = self.server.get(
+            f"{URL_PREFIX}/locations/nc_spm_08/mapsets/PERMANENT/raster_layers"
+            "/elevation/render?width=100&height=100&compression=0",
+            headers=self.user_auth_header,
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "image/png", "Wrong mimetype %s" % rv.mimetype
+        )
+
+    def test_raster_layer_image_error_compression(self):
+        rv = self.server.get(
+            f"{URL_PREFIX}/locations/nc_spm_08/mapsets/PERMANENT/raster_layers"
+            "/elevation/render?compression=10",
+            headers=self.user_auth_header,
+        )
+
+        pprint(json_load(rv.data))
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Concurrent cached Sentinel-2 metadata requests unittest case
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from actinia_core.core.common.aws_sentinel_interface import (
+    AWSSentinel2AInterface,
+)
+from actinia_core.core.common.config import global_config
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+PRODUCT_IDS = [
+    "S2A_MSIL1C_20170212T104141_N0204_R008_T31TGJ_201702121041%02i" % i
+    for i in range(8)
+]
+
+
+class MetadataServer(ThreadingHTTPServer):
+    """Local stand-in of the AWS Sentinel-2 metadata service, that answers
+    each request slowly, fails the first request of the first product and
+    records the number of requests, unknown products are not found"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MetadataHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%i" % self.server_address[1]
+
+
+class MetadataHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            first_request = server.requests.count(self.path) == 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(0.1)
+        with server.lock:
+            server.active -= 1
+
+        if self.path.startswith("/missing/"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        if first_request and PRODUCT_IDS[0] in self.path:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.path.endswith("productInfo.json"):
+            product_id = self.path.split("/")[-2]
+            info = {
+                "timestamp": "2017-02-12T10:41:38.000Z",
+                "tiles": [{"path": "tiles/31/T/GJ/2017/2/12/0"}],
+                "name": product_id,
+            }
+        else:
+            info = {"tileDataGeometry": {"type": "Polygon"}}
+        content = json.dumps(info).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def metadata_server():
+    server = MetadataServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unittest
+def test_concurrent_cached_metadata(monkeypatch, tmp_path, metadata_server):
+    monkeypatch.setattr(
+        global_config, "SENTINEL_METADATA_CACHE_DIR", str(tmp_path)
+    )
+    monkeypatch.setattr(global_config, "SENTINEL_METADATA_WORKERS", 4)
+    aws = AWSSentinel2AInterface(global_config)
+    aws.aws_sentinel_base_url = metadata_server.url
+
+    result = aws.get_sentinel_urls(PRODUCT_IDS, ["B04"])
+    assert [scene["product_id"] for scene in result] == PRODUCT_IDS
+    tile = result[0]["tiles"][0]
+    assert tile["B04"]["public_url"].endswith("/B04.jp2")
+    # The failed request is retried and the products are requested
+    # concurrently by at most 4 threads
+    assert len(metadata_server.requests) == len(PRODUCT_IDS) + 1
+    assert 1 < metadata_server.max_active <= 4
+
+    assert "Polygon" in aws.get_sentinel_tile_footprint(tile)
+    num_requests = len(metadata_server.requests)
+
+    # A repeated request is answered from the cache of a new interface
+    aws = AWSSentinel2AInterface(global_config)
+    aws.aws_sentinel_base_url = metadata_server.url
+    assert aws.get_sentinel_urls(PRODUCT_IDS, ["B04"]) == result
+    assert "Polygon" in aws.get_sentinel_tile_footprint(tile)
+    assert len(metadata_server.requests) == num_requests
+
+
+@pytest.mark.unittest
+def test_metadata_request_error(monkeypatch, metadata_server):
+    monkeypatch.setattr(global_config, "SENTINEL_METADATA_CACHE_DIR", "")
+    aws = AWSSentinel2AInterface(global_config)
+    aws.aws_sentinel_base_url = metadata_server.url + "/missing"
+
+    with pytest.raises(Exception, match="HTTP status code: 404"):
+        aws.get_sentinel_urls(PRODUCT_IDS[1:2])
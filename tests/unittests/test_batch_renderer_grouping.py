@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Batch renderer grouping unittest case
+"""
+import pytest
+
+from actinia_core.processing.actinia_processing.ephemeral_renderer_base.batch_renderer import (  # noqa: E501
+    group_render_specs,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.mark.unittest
+def test_group_render_specs():
+    render_specs = [
+        {"name": "elevation", "type": "raster", "n": 228500.0},
+        {"name": "elevation", "type": "raster"},
+        {"name": "geology", "type": "vector"},
+        {"name": "elevation", "type": "raster", "n": 228500.0, "s": 215000},
+        {"name": "elevation", "type": "raster", "width": 100},
+        {"name": "elevation", "type": "raster", "n": 228500.0},
+    ]
+    assert group_render_specs(render_specs) == [[0, 5], [1, 4], [2], [3]]
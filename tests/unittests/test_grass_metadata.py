@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tests: GRASS GIS metadata reader unittest case
+"""
+import os
+import re
+import sqlite3
+import struct
+import pytest
+
+from actinia_core.core.grass_metadata import (
+    MetadataCache,
+    get_mapset_fingerprint,
+    get_union_extent,
+    glob_to_regex,
+    list_map_layers,
+    list_mapsets,
+    list_strds,
+    list_strds_raster_maps,
+    read_raster_info,
+    scan_coordinate,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+CELLHD = """proj:       99
+zone:       0
+north:      228500
+south:      215000
+east:       645000
+west:       630000
+cols:       1500
+rows:       1350
+e-w resol:  10
+n-s resol:  10
+format:     -1
+compressed: 2
+"""
+
+HIST = """Tue Nov  7 01:09:51 2006
+elevation
+PERMANENT
+helena
+raster
+
+
+generated by r.proj
+r.proj input="ned03arcsec" location="northcarolina_latlong" \\
+mapset="helena" output="elev_ned10m" method="cubic" resolution=10
+"""
+
+CATS = """# 255 categories
+South-West Wake county: Elevation NED 10m
+
+
+0.00 0.00 0.00 0.00
+"""
+
+
+def write_file(path, content, mode="w"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode) as out_file:
+        out_file.write(content)
+
+
+@pytest.fixture
+def mapset_path(tmp_path):
+    mapset_path = os.path.join(str(tmp_path), "nc_spm_08", "PERMANENT")
+    write_file(os.path.join(mapset_path, "cellhd", "elevation"), CELLHD)
+    write_file(os.path.join(mapset_path, "hist", "elevation"), HIST)
+    write_file(os.path.join(mapset_path, "cats", "elevation"), CATS)
+    misc_path = os.path.join(mapset_path, "cell_misc", "elevation")
+    write_file(
+        os.path.join(misc_path, "f_format"), "type: float\nbyte_order: xdr\n"
+    )
+    write_file(
+        os.path.join(misc_path, "f_range"),
+        struct.pack(">dd", 55.578792572021484, 156.32986450195312),
+        mode="wb",
+    )
+    return mapset_path
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "value,result",
+    [("228500", 228500.0), ("35:30N", 35.5), ("78:45W", -78.75)],
+)
+def test_scan_coordinate(value, result):
+    assert scan_coordinate(value) == result
+
+
+@pytest.mark.unittest
+def test_read_raster_info(mapset_path):
+    raster_info = read_raster_info(mapset_path, "elevation")
+
+    assert raster_info["north"] == "228500"
+    assert raster_info["ewres"] == "10"
+    assert raster_info["cells"] == "2025000"
+    assert raster_info["datatype"] == "FCELL"
+    assert raster_info["ncats"] == "255"
+    assert raster_info["min"] == "55.57879"
+    assert raster_info["max"] == "156.3299"
+    assert raster_info["map"] == "elevation"
+    assert raster_info["mapset"] == "PERMANENT"
+    assert raster_info["location"] == "nc_spm_08"
+    assert raster_info["date"] == '"Tue Nov  7 01:09:51 2006"'
+    assert raster_info["creator"] == '"helena"'
+    assert (
+        raster_info["title"] == '"South-West Wake county: Elevation NED 10m"'
+    )
+    assert raster_info["description"] == '"generated by r.proj"'
+    assert raster_info["timestamp"] == '"none"'
+    assert raster_info["comments"].startswith('"r.proj input="ned03arcsec"')
+
+
+@pytest.mark.unittest
+def test_read_raster_info_cell_range(mapset_path):
+    misc_path = os.path.join(mapset_path, "cell_misc", "elevation")
+    os.remove(os.path.join(misc_path, "f_format"))
+    os.remove(os.path.join(misc_path, "f_range"))
+    write_file(os.path.join(misc_path, "range"), "1 12\n")
+    raster_info = read_raster_info(mapset_path, "elevation")
+    assert raster_info["datatype"] == "CELL"
+    assert raster_info["min"] == "1"
+    assert raster_info["max"] == "12"
+
+    write_file(os.path.join(misc_path, "range"), "")
+    raster_info = read_raster_info(mapset_path, "elevation")
+    assert raster_info["min"] == "NULL"
+
+
+@pytest.mark.unittest
+def test_read_raster_info_fallback(mapset_path):
+    assert read_raster_info(mapset_path, "missing") is None
+
+    write_file(
+        os.path.join(mapset_path, "cellhd", "elevation"),
+        "reclass\nname: elevation\nmapset: PERMANENT\n",
+    )
+    assert read_raster_info(mapset_path, "elevation") is None
+
+
+@pytest.mark.unittest
+def test_read_raster_info_cache(mapset_path):
+    cache = MetadataCache(maxsize=1)
+    raster_info = read_raster_info(mapset_path, "elevation", cache=cache)
+    assert len(cache.entries) == 1
+    assert read_raster_info(mapset_path, "elevation", cache=cache) == (
+        raster_info
+    )
+
+    # A modified map is read again and replaces the outdated entry
+    cellhd_path = os.path.join(mapset_path, "cellhd", "elevation")
+    write_file(cellhd_path, CELLHD.replace("228500", "228510"))
+    stat = os.stat(cellhd_path)
+    os.utime(cellhd_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    raster_info = read_raster_info(mapset_path, "elevation", cache=cache)
+    assert raster_info["north"] == "228510"
+    assert len(cache.entries) == 1
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "pattern,names",
+    [
+        ("*", ["elev_ned", "elevation", "lsat7_2002_10", "lsat7_2002_20"]),
+        ("elev*", ["elev_ned", "elevation"]),
+        ("lsat7_2002_?0", ["lsat7_2002_10", "lsat7_2002_20"]),
+        ("lsat7_2002_[1]0", ["lsat7_2002_10"]),
+        ("{elevation,lsat7_2002_20}", ["elevation", "lsat7_2002_20"]),
+        ("elev.ned", []),
+    ],
+)
+def test_glob_to_regex(pattern, names):
+    all_names = ["elev_ned", "elevation", "lsat7_2002_10", "lsat7_2002_20"]
+    regex = re.compile(glob_to_regex(pattern))
+    assert [name for name in all_names if regex.search(name)] == names
+
+
+@pytest.mark.unittest
+def test_list_map_layers(mapset_path):
+    write_file(os.path.join(mapset_path, "cellhd", "aspect"), CELLHD)
+    write_file(os.path.join(mapset_path, "vector", "roads", "head"), "")
+    os.makedirs(os.path.join(mapset_path, "vector", "broken"))
+    cache = MetadataCache(ttl=60)
+
+    assert list_map_layers(mapset_path, "raster", cache=cache) == [
+        "aspect",
+        "elevation",
+    ]
+    assert list_map_layers(mapset_path, "raster", pattern="elev*") == [
+        "elevation"
+    ]
+    assert list_map_layers(
+        mapset_path, "raster", pattern="^asp", regex=True
+    ) == ["aspect"]
+    assert list_map_layers(mapset_path, "vector") == ["roads"]
+    assert list_map_layers(mapset_path, "raster_3d") is None
+
+    # Removing a map changes the element directory and invalidates the cache
+    os.remove(os.path.join(mapset_path, "cellhd", "aspect"))
+    assert list_map_layers(mapset_path, "raster", cache=cache) == ["elevation"]
+
+
+@pytest.mark.unittest
+def test_get_mapset_fingerprint(mapset_path):
+    write_file(os.path.join(mapset_path, "vector", "roads", "coor"), "a")
+    fingerprint = get_mapset_fingerprint(mapset_path)
+    assert fingerprint == get_mapset_fingerprint(mapset_path)
+    assert get_mapset_fingerprint(mapset_path + "_missing") is None
+
+    # Rewriting a vector map changes the fingerprint
+    write_file(os.path.join(mapset_path, "vector", "roads", "coor"), "ab")
+    assert fingerprint != get_mapset_fingerprint(mapset_path)
+
+    # Removing a raster map changes the fingerprint
+    fingerprint = get_mapset_fingerprint(mapset_path)
+    os.remove(os.path.join(mapset_path, "cats", "elevation"))
+    assert fingerprint != get_mapset_fingerprint(mapset_path)
+
+
+@pytest.mark.unittest
+def test_list_strds(mapset_path):
+    assert list_strds(mapset_path) == []
+
+    os.makedirs(os.path.join(mapset_path, "tgis"))
+    connection = sqlite3.connect(
+        os.path.join(mapset_path, "tgis", "sqlite.db")
+    )
+    connection.execute("CREATE TABLE strds_base (id, name, mapset)")
+    connection.executemany(
+        "INSERT INTO strds_base VALUES (?, ?, ?)",
+        [
+            ("modis@PERMANENT", "modis", "PERMANENT"),
+            ("lst@PERMANENT", "lst", "PERMANENT"),
+            ("lst@user1", "lst", "user1"),
+        ],
+    )
+    connection.commit()
+    connection.close()
+    assert list_strds(mapset_path) == ["lst", "modis"]
+
+    write_file(
+        os.path.join(mapset_path, "VAR"),
+        "TGISDB_DRIVER: pg\nTGISDB_DATABASE: dbname=grass\n",
+    )
+    assert list_strds(mapset_path) is None
+
+
+@pytest.mark.unittest
+def test_list_strds_raster_maps(mapset_path):
+    assert list_strds_raster_maps(mapset_path, "modis") is None
+
+    os.makedirs(os.path.join(mapset_path, "tgis"))
+    connection = sqlite3.connect(
+        os.path.join(mapset_path, "tgis", "sqlite.db")
+    )
+    connection.execute("CREATE TABLE strds_base (id, temporal_type)")
+    connection.execute("CREATE TABLE strds_metadata (id, raster_register)")
+    connection.execute("CREATE TABLE raster_register_modis (id)")
+    connection.execute(
+        "CREATE TABLE raster_view_abs_time "
+        "(id, start_time, end_time, north, south, east, west)"
+    )
+    connection.executemany(
+        "INSERT INTO strds_base VALUES (?, ?)",
+        [("modis@PERMANENT", "absolute"), ("empty@PERMANENT", "absolute")],
+    )
+    connection.executemany(
+        "INSERT INTO strds_metadata VALUES (?, ?)",
+        [
+            ("modis@PERMANENT", "raster_register_modis"),
+            ("empty@PERMANENT", None),
+        ],
+    )
+    maps = [
+        ("lst_2@PERMANENT", "2020-02-01", "2020-03-01", 40, 10, 20, 0),
+        ("lst_1@PERMANENT", "2020-01-01", "2020-02-01", 50, 20, 30, 10),
+        ("lst_3@PERMANENT", "2020-03-01", "2020-04-01", 45, 30, 50, 25),
+        ("other@PERMANENT", "2020-01-01", "2020-02-01", 90, 0, 90, 0),
+    ]
+    connection.executemany(
+        "INSERT INTO raster_view_abs_time VALUES (?, ?, ?, ?, ?, ?, ?)", maps
+    )
+    connection.executemany(
+        "INSERT INTO raster_register_modis VALUES (?)",
+        [(map_row[0],) for map_row in maps[:3]],
+    )
+    connection.commit()
+    connection.close()
+
+    assert list_strds_raster_maps(mapset_path, "modis") == [
+        maps[1][:1] + maps[1][3:],
+        maps[0][:1] + maps[0][3:],
+        maps[2][:1] + maps[2][3:],
+    ]
+    selected = list_strds_raster_maps(
+        mapset_path, "modis", start_time="2020-02-01", e=20
+    )
+    assert [map_row[0] for map_row in selected] == ["lst_2@PERMANENT"]
+    assert list_strds_raster_maps(mapset_path, "empty") == []
+    assert list_strds_raster_maps(mapset_path, "missing") is None
+
+    extents = [
+        map_row[1:] for map_row in list_strds_raster_maps(mapset_path, "modis")
+    ]
+    assert get_union_extent(extents) == {"n": 50, "s": 10, "e": 50, "w": 0}
+    assert get_union_extent([]) is None
+
+
+@pytest.mark.unittest
+def test_list_mapsets(mapset_path):
+    location_path = os.path.dirname(mapset_path)
+    assert list_mapsets(location_path) is None
+
+    write_file(os.path.join(mapset_path, "WIND"), CELLHD)
+    write_file(os.path.join(location_path, "user1", "WIND"), CELLHD)
+    assert list_mapsets(location_path) == ["PERMANENT", "user1"]
+    assert list_mapsets(os.path.join(location_path, "missing")) is None
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Job payload cache unittest case
+"""
+import pickle
+import pytest
+
+from actinia_core.core import redis_job_payload
+from actinia_core.core.common.config import Configuration, global_config
+from actinia_core.core.redis_job_payload import (
+    JobPayloadCache,
+    RedisJobPayloadInterface,
+    pack_job_args,
+)
+from actinia_core.core.resource_data_container import ResourceDataContainer
+from actinia_core.processing.common import utils
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class FakeResourceLogger(object):
+    """Fake resource logger that records the committed documents"""
+
+    commits = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def commit(self, **kwargs):
+        self.commits.append(kwargs)
+
+
+@pytest.fixture
+def job_payload_cache(monkeypatch, fake_redis):
+    interface = RedisJobPayloadInterface()
+    interface.redis_server = fake_redis
+    job_payload_cache = JobPayloadCache(interface)
+    monkeypatch.setattr(
+        redis_job_payload, "_job_payload_cache", job_payload_cache
+    )
+    return job_payload_cache
+
+
+def create_resource_data_container(config, credentials):
+    return ResourceDataContainer(
+        grass_data_base="/actinia/grassdb",
+        grass_user_data_base="/actinia/userdata",
+        grass_base_dir="/usr/local/grass",
+        request_data={"version": 1, "list": []},
+        user_id="user",
+        user_group="group",
+        resource_id="resource_id-1",
+        iteration=None,
+        status_url="http://localhost/resources/user/resource_id-1",
+        api_info=None,
+        resource_url_base="http://localhost/resource/user/resource_id-1",
+        orig_time=0,
+        orig_datetime="",
+        user_credentials=credentials,
+        config=config,
+        location_name="nc_spm_08",
+        mapset_name=None,
+        map_name=None,
+    )
+
+
+@pytest.mark.unittest
+def test_job_payload_cache(job_payload_cache, fake_redis):
+    credentials = {"permissions": {"accessible_modules": ["r.info"]}}
+    hashes = job_payload_cache.reference_many([credentials, credentials], 60)
+    assert hashes[0] == hashes[1]
+    # The payloads are stored on every call with a single request
+    assert job_payload_cache.reference_many([credentials], 60) == hashes[:1]
+    assert len(fake_redis.values) == 1 and fake_redis.round_trips == 2
+
+    assert job_payload_cache.resolve(hashes[0]) == credentials
+    fake_redis.values.clear()
+    # Resolved payloads are cached
+    assert job_payload_cache.resolve(hashes[0]) == credentials
+    with pytest.raises(KeyError):
+        job_payload_cache.resolve("0" * 64)
+
+
+@pytest.mark.unittest
+def test_pack_job_args(job_payload_cache, fake_redis):
+    config = Configuration()
+    credentials = {"permissions": {"accessible_modules": ["r.info"] * 500}}
+    rdcs = [
+        create_resource_data_container(config, credentials) for i in range(3)
+    ]
+    args_list = pack_job_args([(rdc, "arg") for rdc in rdcs], config)
+
+    # The containers of the jobs are copies that reference the payloads
+    assert rdcs[0].config is config
+    assert [args[1] for args in args_list] == ["arg"] * 3
+    rdc = args_list[0][0]
+    data = pickle.dumps(rdc)
+    assert len(data) < len(pickle.dumps(credentials))
+    assert len(fake_redis.values) == 2 and fake_redis.round_trips == 1
+    prefix = job_payload_cache.interface.job_payload_prefix
+    assert fake_redis.get(prefix + rdc.config) == pickle.dumps(config)
+
+    # The job resolves the payloads
+    job_payload_cache.payloads.clear()
+    calls = []
+    utils.start_job_from_payload(
+        lambda *args: calls.append(args), pickle.loads(data), "arg"
+    )
+    restored, arg = calls[0]
+    assert arg == "arg"
+    assert restored.user_credentials == credentials
+    assert vars(restored.config) == vars(config)
+    assert restored.request_data == rdcs[0].request_data
+    assert restored.location_name == "nc_spm_08"
+
+
+@pytest.mark.unittest
+def test_start_job_from_expired_payload(job_payload_cache, monkeypatch):
+    monkeypatch.setattr(utils, "ResourceLogger", FakeResourceLogger)
+    monkeypatch.setattr(FakeResourceLogger, "commits", [])
+    rdc = create_resource_data_container(Configuration(), {})
+    rdc.config = "0" * 64
+    rdc.user_credentials = "0" * 64
+
+    # The resource is set to error instead of starting the job
+    calls = []
+    utils.start_job_from_payload(lambda *args: calls.append(args), rdc)
+    assert calls == []
+    commit = FakeResourceLogger.commits[0]
+    assert commit["resource_id"] == "resource_id-1"
+    assert commit["expiration"] == global_config.REDIS_RESOURCE_EXPIRE_TIME
+    http_code, response_model = pickle.loads(commit["document"])
+    assert http_code == 500
+    assert response_model["status"] == "error"
+    assert "does not exist" in response_model["message"]
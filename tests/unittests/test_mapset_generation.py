@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Mapset generation counter unittest case
+"""
+import pytest
+
+from actinia_core.core.redis_mapset_generation import (
+    RedisMapsetGenerationInterface,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.mark.unittest
+def test_mapset_generation(fake_redis):
+    interface = RedisMapsetGenerationInterface()
+    interface.redis_server = fake_redis
+
+    assert interface.get("group", "nc_spm_08", "user1") == 0
+    assert interface.bump("group", "nc_spm_08", "user1") == 1
+    assert interface.bump("group", "nc_spm_08", "user1") == 2
+    assert interface.bump("group", "latlong", "user1") == 1
+
+    fake_redis.round_trips = 0
+    mapsets = [
+        ("group", "nc_spm_08", "user1"),
+        ("group", "latlong", "user1"),
+        ("group", "nc_spm_08", "PERMANENT"),
+        # The locations of other user groups are independent
+        ("other_group", "nc_spm_08", "user1"),
+    ]
+    assert interface.get_many(mapsets) == [2, 1, 0, 0]
+    assert fake_redis.round_trips == 1
+    assert interface.get_many([]) == []
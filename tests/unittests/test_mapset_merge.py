@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Mapset merge engine unittest case
+"""
+import os
+import pytest
+
+from actinia_core.core.mapset_merge import (
+    MAPSET_ELEMENTS,
+    REPLACED_DIRECTORY,
+    IncompleteMergeError,
+    MapsetStager,
+    commit_merge,
+    plan_merge,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+def write_files(mapset_path, files):
+    for name, content in files.items():
+        path = os.path.join(mapset_path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as out_file:
+            out_file.write(content)
+
+
+def read_file(path):
+    with open(path, "r") as in_file:
+        return in_file.read()
+
+
+@pytest.fixture
+def location_path(tmp_path):
+    location_path = str(tmp_path)
+    write_files(
+        os.path.join(location_path, "target"),
+        {
+            "WIND": "",
+            "cellhd/elevation": "old",
+            "cell/elevation": "old",
+            "colr/elevation": "old",
+            "cellhd/aspect": "aspect",
+            "vector/roads/coor": "old",
+            "vector/roads/sidx": "old",
+        },
+    )
+    write_files(
+        os.path.join(location_path, "source"),
+        {
+            "WIND": "",
+            "cellhd/elevation": "new",
+            "fcell/elevation": "new",
+            "cell_misc/elevation/f_range": "new",
+            "vector/roads/coor": "new",
+            "group/rgb/REF": "new",
+        },
+    )
+    return location_path
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize("keep_source", [True, False])
+def test_stage_and_merge_mapset(location_path, keep_source):
+    source_path = os.path.join(location_path, "source")
+    target_path = os.path.join(location_path, "target")
+    staging_path = os.path.join(location_path, "staging")
+
+    stager = MapsetStager(source_path, staging_path, keep_source, workers=2)
+    report = stager.stage(MAPSET_ELEMENTS).to_dict()
+    if keep_source is True:
+        # The group is modified in the staged mapset and must be copied
+        assert report["linked"]["files"] == 4
+        assert report["copied"]["files"] == 1
+        assert read_file(os.path.join(source_path, "fcell", "elevation"))
+    else:
+        assert report["moved"] == {"files": 5, "bytes": 15}
+        assert not os.path.exists(os.path.join(source_path, "fcell"))
+    # Files that are not merged are not staged
+    assert not os.path.exists(os.path.join(staging_path, "WIND"))
+
+    plan = plan_merge(staging_path, target_path)
+    assert plan.conflicts == []
+    assert sorted(plan.replaced) == ["cellhd/elevation", "vector/roads"]
+    assert sorted(plan.stale) == ["cell/elevation", "colr/elevation"]
+
+    commit_merge(staging_path, target_path, plan)
+    assert read_file(os.path.join(target_path, "cellhd", "elevation")) == "new"
+    assert read_file(os.path.join(target_path, "fcell", "elevation")) == "new"
+    assert read_file(os.path.join(target_path, "cellhd", "aspect"))
+    assert read_file(os.path.join(target_path, "group", "rgb", "REF"))
+    # Replaced raster and vector maps have no stale files
+    assert not os.path.exists(os.path.join(target_path, "cell", "elevation"))
+    assert not os.path.exists(os.path.join(target_path, "colr", "elevation"))
+    assert os.listdir(os.path.join(target_path, "vector", "roads")) == ["coor"]
+
+
+@pytest.mark.unittest
+def test_merge_conflicts(location_path):
+    source_path = os.path.join(location_path, "source")
+    target_path = os.path.join(location_path, "target")
+    write_files(target_path, {"group": "not a directory"})
+
+    plan = plan_merge(source_path, target_path)
+    assert plan.conflicts == ["group/rgb"]
+    assert "group/rgb" not in plan.entries
+
+
+@pytest.mark.unittest
+def test_stage_complete_mapset(location_path):
+    source_path = os.path.join(location_path, "source")
+    staging_path = os.path.join(location_path, "staging")
+
+    stager = MapsetStager(source_path, staging_path, keep_source=False)
+    assert stager.method == "move"
+    stager.stage()
+    assert sorted(os.listdir(staging_path)) == sorted(
+        ["WIND", "cellhd", "fcell", "cell_misc", "vector", "group"]
+    )
+    assert os.listdir(source_path) == []
+
+
+def failing_rename(monkeypatch, fail_at, fail_rollback=False):
+    """Let the rename number fail_at fail, and all renames of the rollback
+    if fail_rollback is set"""
+    rename = os.rename
+    renames = []
+
+    def rename_stand_in(source, dest):
+        renames.append((source, dest))
+        if len(renames) == fail_at or (
+            fail_rollback is True and len(renames) > fail_at
+        ):
+            raise OSError("Rename of <%s> failed" % source)
+        rename(source, dest)
+
+    monkeypatch.setattr(os, "rename", rename_stand_in)
+
+
+@pytest.mark.unittest
+def test_merge_rollback(location_path, monkeypatch):
+    source_path = os.path.join(location_path, "source")
+    target_path = os.path.join(location_path, "target")
+    plan = plan_merge(source_path, target_path)
+    files = sorted(
+        os.path.relpath(os.path.join(root, name), target_path)
+        for root, dirs, names in os.walk(target_path)
+        for name in names
+    )
+
+    # The last rename of a new entry fails
+    failing_rename(monkeypatch, len(plan.stale + plan.replaced + plan.entries))
+    with pytest.raises(OSError) as e:
+        commit_merge(source_path, target_path, plan)
+    assert not isinstance(e.value, IncompleteMergeError)
+    monkeypatch.undo()
+
+    # The target mapset is restored and the new entries are staged again
+    assert (
+        sorted(
+            os.path.relpath(os.path.join(root, name), target_path)
+            for root, dirs, names in os.walk(target_path)
+            for name in names
+        )
+        == files
+    )
+    assert read_file(os.path.join(target_path, "cellhd/elevation")) == "old"
+    assert not os.path.exists(os.path.join(target_path, "fcell"))
+    assert read_file(os.path.join(source_path, "cellhd/elevation")) == "new"
+    assert os.listdir(os.path.join(source_path, REPLACED_DIRECTORY)) == []
+
+
+@pytest.mark.unittest
+def test_merge_incomplete(location_path, monkeypatch):
+    source_path = os.path.join(location_path, "source")
+    target_path = os.path.join(location_path, "target")
+    plan = plan_merge(source_path, target_path)
+
+    failing_rename(
+        monkeypatch, len(plan.stale + plan.replaced) + 2, fail_rollback=True
+    )
+    with pytest.raises(IncompleteMergeError) as e:
+        commit_merge(source_path, target_path, plan)
+    monkeypatch.undo()
+
+    # The replaced entries are kept
+    replaced_path = os.path.join(source_path, REPLACED_DIRECTORY)
+    assert e.value.replaced_path == replaced_path
+    assert len(os.listdir(replaced_path)) == len(plan.stale + plan.replaced)
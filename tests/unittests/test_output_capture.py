@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tests: Output capture unittest case
+"""
+import io
+import os
+import subprocess
+import tempfile
+import pytest
+
+from actinia_core.core.output_capture import (
+    OutputCapture,
+    iter_stripped_rows,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.mark.unittest
+def test_output_capture_small_output():
+    spool_path = tempfile.mktemp()
+    capture = OutputCapture(spool_path=spool_path, buffer_size=1024)
+    capture.start(io.BytesIO(b"aspect\nbasin_50K\n"))
+    capture.finish()
+
+    assert capture.truncated is False
+    assert capture.total_bytes == 17
+    assert capture.get_string() == "aspect\nbasin_50K\n"
+    assert capture.spool_path is None
+    assert not os.path.exists(spool_path)
+
+
+@pytest.mark.unittest
+def test_output_capture_truncated_output():
+    spool_path = tempfile.mktemp()
+    data = b"".join(b"%i\n" % i for i in range(10000))
+    capture = OutputCapture(
+        spool_path=spool_path, buffer_size=100, chunk_size=7
+    )
+    capture.start(io.BytesIO(data))
+    capture.finish()
+
+    assert capture.truncated is True
+    assert capture.total_bytes == len(data)
+    assert len(capture.head) == 50
+    assert len(capture.tail) == 50
+    output = capture.get_string()
+    assert output.startswith(data[:50].decode())
+    assert output.endswith(data[-50:].decode())
+    assert "[... %i bytes omitted ...]" % (len(data) - 100) in output
+    with open(spool_path, "rb") as spool_file:
+        assert spool_file.read() == data
+    os.remove(spool_path)
+
+
+@pytest.mark.unittest
+def test_output_capture_process_pipe():
+    proc = subprocess.Popen(
+        args=["seq", "1", "100000"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout_capture = OutputCapture(buffer_size=1000)
+    stderr_capture = OutputCapture(buffer_size=1000)
+    stdout_capture.start(proc.stdout)
+    stderr_capture.start(proc.stderr)
+    proc.wait()
+    stdout_capture.finish()
+    stderr_capture.finish()
+
+    assert proc.returncode == 0
+    assert stdout_capture.truncated is True
+    assert stdout_capture.get_string().endswith("99999\n100000\n")
+    assert stderr_capture.total_bytes == 0
+    assert stderr_capture.get_string() == ""
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n\n",
+        "a|b\nc|d\n",
+        "\n  a|b\n\nc|d\n\n\n",
+        "value1\n\n\nvalue2",
+    ],
+)
+def test_iter_stripped_rows(text):
+    rows = list(iter_stripped_rows(io.StringIO(text)))
+    expected = text.strip().split("\n")
+    assert [row.strip() for row in rows] == [row.strip() for row in expected]
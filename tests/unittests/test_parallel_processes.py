@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Parallel execution of process lists unittest case
+"""
+import threading
+import time
+
+import pytest
+
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.common.process_object import Process
+from actinia_core.models.response_models import ProgressInfoModel
+from actinia_core.processing.actinia_processing.ephemeral_processing import (
+    EphemeralProcessing,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class ProcessingStandIn(EphemeralProcessing):
+    """Processing without GRASS GIS, that records the executed processes
+    instead of running them"""
+
+    def __init__(self):
+        self.config = global_config
+        self.process_lock = threading.Lock()
+        self.progress = ProgressInfoModel(step=0, num_of_steps=0)
+        self.progress_steps = 0
+        self.number_of_processes = 0
+        self.executed = []
+        self.active = 0
+        self.max_active = 0
+
+    def _run_process(self, process, poll_time=0.05):
+        with self.process_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.process_lock:
+            self.active -= 1
+        self._increment_progress(num=1)
+        if process.executable == "fail":
+            raise AsyncProcessError("Error while running executable <fail>")
+        with self.process_lock:
+            self.executed.append(process.id)
+
+
+def create_process_lists(num_lists, num_processes, failing=None):
+    process_lists = []
+    for i in range(num_lists):
+        process_list = []
+        for j in range(num_processes):
+            executable = "fail" if (i, j) == failing else "true"
+            process_list.append(
+                Process(
+                    exec_type="exec",
+                    executable=executable,
+                    executable_params=[],
+                    id="%i_%i" % (i, j),
+                )
+            )
+        process_lists.append(process_list)
+    return process_lists
+
+
+@pytest.mark.unittest
+def test_parallel_process_lists(monkeypatch):
+    monkeypatch.setattr(global_config, "PARALLEL_PROCESS_WORKERS", 2)
+    processing = ProcessingStandIn()
+    processing._update_num_of_steps(1)
+    parallel = Process(
+        exec_type="parallel",
+        executable="parallel",
+        executable_params=create_process_lists(4, 3),
+    )
+    processing._execute_process_list([parallel])
+
+    assert len(processing.executed) == 12
+    assert processing.max_active == 2
+    # The processes of each list run in order
+    for i in range(4):
+        ids = [id for id in processing.executed if id.startswith("%i_" % i)]
+        assert ids == ["%i_0" % i, "%i_1" % i, "%i_2" % i]
+    assert processing.progress["step"] == 12
+    assert processing.progress["num_of_steps"] == 12
+
+
+@pytest.mark.unittest
+def test_parallel_process_lists_error(monkeypatch):
+    monkeypatch.setattr(global_config, "PARALLEL_PROCESS_WORKERS", 2)
+    processing = ProcessingStandIn()
+    process_lists = create_process_lists(2, 5, failing=(0, 1))
+
+    with pytest.raises(AsyncProcessError):
+        processing._execute_parallel_process_lists(process_lists)
+    # The remaining processes are not started after the error
+    assert "0_2" not in processing.executed
+    assert len(processing.executed) < 9
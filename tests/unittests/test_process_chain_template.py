@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Process chain template unittest case
+"""
+import pytest
+
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.common.process_chain import (
+    render_process_chain_template,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+TEMPLATE = {
+    "version": 1,
+    "list": [
+        {
+            "id": "1",
+            "module": "g.region",
+            "inputs": [
+                {"param": "n", "value": "{{north}}"},
+                {"param": "raster", "value": "{{ name }}@PERMANENT"},
+            ],
+            "flags": "p",
+        },
+        {
+            "id": "2",
+            "module": "r.out.ascii",
+            "inputs": [{"param": "input", "value": "elevation@PERMANENT"}],
+            "outputs": [{"param": "output", "value": "$file::out_{{name}}"}],
+        },
+    ],
+}
+
+
+@pytest.mark.unittest
+def test_render_process_chain_template():
+    process_chain = render_process_chain_template(
+        TEMPLATE, {"north": 228500, "name": "elevation"}
+    )
+    inputs = process_chain["list"][0]["inputs"]
+    assert inputs[0]["value"] == 228500
+    assert inputs[1]["value"] == "elevation@PERMANENT"
+    outputs = process_chain["list"][1]["outputs"]
+    assert outputs[0]["value"] == "$file::out_elevation"
+    assert process_chain["list"][0]["flags"] == "p"
+    # The template is not modified
+    assert TEMPLATE["list"][0]["inputs"][0]["value"] == "{{north}}"
+
+
+@pytest.mark.unittest
+def test_render_process_chain_template_missing_parameter():
+    with pytest.raises(AsyncProcessError, match="<name>"):
+        render_process_chain_template(TEMPLATE, {"north": 228500})
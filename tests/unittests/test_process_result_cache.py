@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Process chain result cache unittest case
+"""
+import os
+import pytest
+
+from actinia_core.core.common.config import Configuration
+from actinia_core.core.common.process_object import Process
+from actinia_core.core.redis_process_result_cache import (
+    RedisProcessResultCacheInterface,
+    get_mapset_fingerprints,
+    get_process_chain_hash,
+)
+from actinia_core.processing.actinia_processing.ephemeral_processing import (
+    EphemeralProcessing,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Configuration()
+    config.GRASS_DATABASE = str(tmp_path)
+    config.GRASS_USER_DATABASE = os.path.join(str(tmp_path), "userdata")
+    cellhd_path = os.path.join(
+        str(tmp_path), "nc_spm_08", "PERMANENT", "cellhd"
+    )
+    os.makedirs(cellhd_path)
+    with open(os.path.join(cellhd_path, "elevation"), "w") as cellhd:
+        cellhd.write("proj: 99\n")
+    return config
+
+
+@pytest.mark.unittest
+def test_process_chain_hash():
+    process_chain = {
+        "version": "1",
+        "list": [{"id": "1", "module": "r.univar", "flags": "g"}],
+    }
+    chain_hash = get_process_chain_hash(process_chain, "user", "/path")
+    assert chain_hash == get_process_chain_hash(
+        {
+            "list": [{"flags": "g", "module": "r.univar", "id": "1"}],
+            "version": "1",
+        },
+        "user",
+        "/path",
+    )
+    assert chain_hash != get_process_chain_hash(process_chain, "other")
+
+
+@pytest.mark.unittest
+def test_process_result_cache_lookup(config, fake_redis):
+    interface = RedisProcessResultCacheInterface()
+    interface.redis_server = fake_redis
+    mapsets = get_mapset_fingerprints(
+        config, "group", "nc_spm_08", ["PERMANENT"]
+    )
+    assert (
+        get_mapset_fingerprints(
+            config, "group", "nc_spm_08", ["PERMANENT", "missing"]
+        )
+        is None
+    )
+
+    entry = {"mapsets": mapsets, "process_results": {"1": "mean=1"}}
+    interface.set("abc", entry, ttl=60, max_size=10)
+    assert interface.lookup("abc", config, "group", "nc_spm_08") == entry
+    assert interface.lookup("def", config, "group", "nc_spm_08") is None
+
+    # A modified mapset invalidates the entry
+    cellhd_path = os.path.join(
+        config.GRASS_DATABASE, "nc_spm_08", "PERMANENT", "cellhd", "aspect"
+    )
+    with open(cellhd_path, "w") as cellhd:
+        cellhd.write("proj: 99\n")
+    assert interface.lookup("abc", config, "group", "nc_spm_08") is None
+
+
+@pytest.mark.unittest
+def test_process_result_cache_resources(config, fake_redis, tmp_path):
+    interface = RedisProcessResultCacheInterface()
+    interface.redis_server = fake_redis
+    mapsets = get_mapset_fingerprints(
+        config, "group", "nc_spm_08", ["PERMANENT"]
+    )
+    resource_path = os.path.join(str(tmp_path), "elevation.tif")
+    with open(resource_path, "w") as resource:
+        resource.write("tif")
+
+    entry = {
+        "mapsets": mapsets,
+        "resource_urls": ["http://localhost/resource/elevation.tif"],
+        "resource_paths": [resource_path],
+    }
+    interface.set("abc", entry, ttl=60, max_size=10)
+    assert interface.lookup("abc", config, "group", "nc_spm_08") == entry
+
+    # A deleted resource invalidates the entry
+    os.remove(resource_path)
+    assert interface.lookup("abc", config, "group", "nc_spm_08") is None
+
+
+@pytest.mark.unittest
+def test_process_result_cache_eviction(fake_redis):
+    interface = RedisProcessResultCacheInterface()
+    interface.redis_server = fake_redis
+    for chain_hash in ("a", "b", "c"):
+        interface.set(chain_hash, {"mapsets": {}}, ttl=60, max_size=2)
+
+    # The oldest entry is removed
+    assert interface.get("a") is None
+    assert interface.get("b") == {"mapsets": {}}
+    assert interface.get("c") == {"mapsets": {}}
+    assert fake_redis.zrange(interface.result_cache_index, 0, -1) == [
+        b"b",
+        b"c",
+    ]
+
+
+@pytest.mark.unittest
+def test_process_result_cache_exclusion():
+    univar = Process(
+        exec_type="grass",
+        executable="r.univar",
+        executable_params=["map=elevation@PERMANENT"],
+    )
+    assert EphemeralProcessing._is_result_cacheable(univar)
+    assert EphemeralProcessing._is_result_cacheable(
+        Process(
+            exec_type="parallel",
+            executable="parallel",
+            executable_params=[[univar], [univar]],
+        )
+    )
+
+    for process in [
+        Process(
+            exec_type="exec", executable="/bin/date", executable_params=[]
+        ),
+        Process(
+            exec_type="grass",
+            executable="r.univar",
+            executable_params=["map=elevation"],
+            stdin_source=univar.get_stdout,
+        ),
+        Process(
+            exec_type="grass",
+            executable="r.in.gdal",
+            executable_params=["input=/vsicurl/https://example.org/a.tif"],
+        ),
+        Process(
+            exec_type="grass",
+            executable="v.in.ogr",
+            executable_params=["input=https://example.org/a.geojson"],
+        ),
+        Process(
+            exec_type="parallel",
+            executable="parallel",
+            executable_params=[
+                [univar],
+                [
+                    Process(
+                        exec_type="exec",
+                        executable="/bin/date",
+                        executable_params=[],
+                    )
+                ],
+            ],
+        ),
+    ]:
+        assert not EphemeralProcessing._is_result_cacheable(process)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Job queue registry unittest case
+"""
+import pytest
+
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.redis_interface import QueueRegistry
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.mark.unittest
+def test_queue_registry(monkeypatch):
+    monkeypatch.setattr(global_config, "QUEUE_REGISTRY_SIZE", 2)
+    registry = QueueRegistry()
+
+    queue_1 = registry.get_queue("job_queue_1")
+    assert registry.get_queue("job_queue_1") is queue_1
+    queue_2 = registry.get_queue("job_queue_2")
+    # All queues share the pooled connection
+    assert queue_1.connection is queue_2.connection
+    assert queue_1.connection is registry.get_connection()
+
+    # The least recently used queue is dropped
+    registry.get_queue("job_queue_1")
+    registry.get_queue("job_queue_3")
+    assert list(registry.queues) == ["job_queue_1", "job_queue_3"]
+    assert registry.get_queue("job_queue_2") is not queue_2
+
+    registry.clear()
+    assert len(registry.queues) == 0
+    assert registry.connection is None
+
+
+@pytest.mark.unittest
+def test_select_worker_queues(monkeypatch, fake_redis):
+    monkeypatch.setattr(global_config, "NUMBER_OF_WORKERS", 3)
+    monkeypatch.setattr(global_config, "WORKER_QUEUE_PREFIX", "job_queue")
+    registry = QueueRegistry()
+    registry.connection = fake_redis
+    # The queue selection script returns the queue indices of a fixed
+    # selection
+    fake_redis.script_handler = lambda keys, args: [b"2", b"0", b"2"][
+        : args[1]
+    ]
+
+    monkeypatch.setattr(global_config, "QUEUE_ROUTING", "least_loaded")
+    assert registry.select_worker_queues(3) == [
+        "job_queue_2",
+        "job_queue_0",
+        "job_queue_2",
+    ]
+    keys, args = fake_redis.script_calls[0]
+    assert keys[:3] == [
+        "rq:queue:job_queue_0",
+        "rq:wip:job_queue_0",
+        "rq:workers:job_queue_0",
+    ]
+    assert len(keys) == 10 and keys[-1] == "actinia_worker_count"
+    assert args[:2] == [3, 3]
+
+    monkeypatch.setattr(global_config, "QUEUE_ROUTING", "round_robin")
+    assert registry.select_worker_queues(2) == ["job_queue_1", "job_queue_2"]
+    assert registry.select_worker_queues(2) == ["job_queue_0", "job_queue_1"]
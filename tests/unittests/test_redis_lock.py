@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Lock heartbeat unittest case
+"""
+import pytest
+
+from actinia_core.core.redis_lock import LockHeartbeat
+from actinia_core.processing.actinia_processing.ephemeral_processing import (
+    EphemeralProcessing,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class LockInterface(object):
+    """Lock interface that holds the locks in a dictionary"""
+
+    def __init__(self):
+        self.locks = {}
+        self.extended = []
+
+    def extend(self, resource_id, expiration=30, owner=None):
+        self.extended.append((resource_id, expiration))
+        return int(self.locks.get(resource_id) == owner)
+
+    def unlock_shared(self, resource_id, owner):
+        return int(self.locks.pop(resource_id, None) == owner)
+
+
+@pytest.mark.unittest
+def test_lock_heartbeat_renew():
+    lock_interface = LockInterface()
+    lock_interface.locks = {"group/location/mapset": "job_1"}
+    heartbeat = LockHeartbeat(lock_interface, 30, interval=3600)
+    heartbeat.add("group/location/mapset", "job_1")
+    heartbeat.add("group/location/temp_mapset", "job_1")
+    try:
+        heartbeat.renew()
+        assert ("group/location/mapset", 30) in lock_interface.extended
+        assert heartbeat.lost == ["group/location/temp_mapset"]
+
+        # Lost locks are not renewed again
+        lock_interface.extended = []
+        heartbeat.remove("group/location/mapset")
+        heartbeat.renew()
+        assert lock_interface.extended == []
+    finally:
+        heartbeat.stop()
+    assert heartbeat.thread is None
+
+
+@pytest.mark.unittest
+def test_lock_heartbeat_thread():
+    lock_interface = LockInterface()
+    lock_interface.locks = {"group/location/mapset": "job_1"}
+    heartbeat = LockHeartbeat(lock_interface, 30, interval=0.01)
+    heartbeat.add("group/location/mapset", "job_1")
+    heartbeat.stop_event.wait(0.1)
+    heartbeat.stop()
+    assert len(lock_interface.extended) > 1
+    assert heartbeat.lost == []
+
+
+@pytest.mark.unittest
+def test_lock_heartbeat_shared_lock():
+    lock_interface = LockInterface()
+    readers = {"group/location/mapset": {"job_1"}}
+    extended = []
+
+    def extend_shared(resource_id, expiration=30, owner=None):
+        extended.append((resource_id, owner))
+        return int(owner in readers.get(resource_id, ()))
+
+    heartbeat = LockHeartbeat(lock_interface, 30, interval=3600)
+    heartbeat.add("group/location/mapset", "job_1", extend=extend_shared)
+    heartbeat.add("group/location/PERMANENT", "job_1", extend=extend_shared)
+    heartbeat.renew()
+    heartbeat.stop()
+    assert lock_interface.extended == []
+    assert ("group/location/mapset", "job_1") in extended
+    assert heartbeat.lost == ["group/location/PERMANENT"]
+
+
+@pytest.mark.unittest
+def test_release_read_locks():
+    processing = EphemeralProcessing.__new__(EphemeralProcessing)
+    processing.resource_id = "job_1"
+    processing.lock_interface = LockInterface()
+    processing.lock_interface.locks = {
+        "group/location/mapset": "job_1",
+        "group/location/other": "job_1",
+    }
+    processing.read_lock_ids = list(processing.lock_interface.locks)
+    processing.lock_heartbeat = LockHeartbeat(
+        processing.lock_interface, 30, interval=3600
+    )
+    for lock_id in processing.read_lock_ids:
+        processing.lock_heartbeat.add(lock_id, "job_1")
+
+    # The read lock of the merged mapset is kept
+    processing._release_read_locks(keep=["group/location/mapset"])
+    assert processing.read_lock_ids == ["group/location/mapset"]
+    assert processing.lock_interface.locks == {
+        "group/location/mapset": "job_1"
+    }
+    assert list(processing.lock_heartbeat.locks) == ["group/location/mapset"]
+
+    processing._release_read_locks()
+    assert processing.read_lock_ids == []
+    assert processing.lock_interface.locks == {}
+    assert processing.lock_heartbeat is None
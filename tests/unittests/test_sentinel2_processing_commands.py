@@ -183,6 +183,45 @@ class Sentinel2ProcessingLibraryTestCase(unittest.TestCase):
             ("Import band name " "pattern is incorrect"),
         )
 
+    @pytest.mark.unittest
+    def test_parallel_band_import_commands(self):
+        product_id = (
+            "S2A_MSIL1C_20170212T104141_N0204_R008_T31TGJ_20170212T104138"
+        )
+        sp = Sentinel2Processing(
+            product_id=product_id,
+            bands=["B04", "B08"],
+            download_cache=self.tempdir,
+            send_resource_update=update_dummy,
+            message_logger=MessageDummy(),
+        )
+        sp.gml_cache_file_name = "/tmp/%s.gml" % product_id
+        sp.timestamp = "2017-02-12T10:41:38.462Z"
+        sp.bbox = [6.0, 44.0, 7.0, 43.0]
+        sp.import_file_info = {
+            "footprint": (sp.gml_cache_file_name, product_id),
+            "B04": ("/tmp/B04.jp2", "%s_B04" % product_id),
+            "B08": ("/tmp/B08.jp2", "%s_B08" % product_id),
+        }
+
+        result = sp.get_sentinel2_import_process_list()
+        executables = [p.executable for p in result]
+        self.assertEqual(
+            executables, ["v.import", "v.timestamp", "parallel", "g.region"]
+        )
+        band_process_lists = result[2].executable_params
+        self.assertEqual(len(band_process_lists), 2)
+        for process_list in band_process_lists:
+            executables = [p.executable for p in process_list]
+            # The bands are cropped without the mask of the mapset
+            self.assertNotIn("r.mask", executables)
+            for p in process_list:
+                if p.executable == "g.region":
+                    self.assertIn("-u", p.executable_params)
+                if p.executable in ("v.to.rast", "r.mapcalc"):
+                    self.assertTrue(p.env["WIND_OVERRIDE"].endswith("_region"))
+        self.assertIn("align=%s_B08" % product_id, result[3].executable_params)
+
 
 if __name__ == "__main__":
     unittest.main()
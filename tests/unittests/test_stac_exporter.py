@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: STAC export unittest case
+"""
+import pickle
+from datetime import datetime
+
+import pytest
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+pystac = pytest.importorskip("pystac")
+
+from actinia_core.core.redis_stac_result import (  # noqa: E402
+    RedisSTACResultInterface,
+)
+
+
+class FakeActiniaInterface(object):
+    """Fake redis interface of the actinia STAC plugin"""
+
+    actinia_template_id_hash_prefix = "ACTINIA-TEMPLATE-ID-HASH::"
+    actinia_template_id_db = "ACTINIA-TEMPLATE-ID-DATABASE"
+
+    def __init__(self, redis_server):
+        self.redis_server = redis_server
+
+    def exists(self, name):
+        return bool(
+            self.redis_server.exists(
+                self.actinia_template_id_hash_prefix + name
+            )
+        )
+
+    def create(self, name, template):
+        self.redis_server.hset(self.actinia_template_id_db, name, name)
+        self.redis_server.hset(
+            self.actinia_template_id_hash_prefix + name,
+            mapping={
+                "actinia_template_id": name,
+                "actinia_template": pickle.dumps(template),
+            },
+        )
+
+    def read(self, name):
+        return pickle.loads(
+            self.redis_server.hget(
+                self.actinia_template_id_hash_prefix + name,
+                "actinia_template",
+            )
+        )
+
+
+def create_item(item_id, description):
+    return pystac.Item(
+        id=item_id,
+        geometry=None,
+        bbox=None,
+        datetime=datetime(2022, 1, 1),
+        properties={"description": description},
+    )
+
+
+def get_item_links(catalog):
+    return sorted(
+        link["href"] for link in catalog["links"] if link["rel"] == "item"
+    )
+
+
+@pytest.fixture
+def interface(fake_redis, tmp_path):
+    interface = FakeActiniaInterface(fake_redis)
+
+    # The result catalog with an existing item
+    catalog = pystac.Catalog(id="result-catalog", description="STAC catalog")
+    existing = create_item("existing", "old")
+    catalog.add_item(existing)
+    catalog.normalize_and_save(str(tmp_path))
+    interface.create("result-catalog", catalog.to_dict())
+    interface.create("existing", existing.to_dict())
+    fake_redis.round_trips = 0
+    return interface
+
+
+@pytest.mark.unittest
+def test_save_items(interface, fake_redis, tmp_path):
+    result_interface = RedisSTACResultInterface(interface)
+    items = [create_item("existing", "new"), create_item("new", "")]
+    assert result_interface.save_items(items, "result-catalog") == ["new"]
+    # The existence check, the read of the catalog and the transaction
+    assert fake_redis.round_trips == 3
+
+    # The items are written and only the new item is added to the catalog
+    # in a single transaction
+    assert fake_redis.transactions == 1
+    assert interface.read("existing")["properties"]["description"] == "new"
+    assert interface.read("new")["id"] == "new"
+    assert fake_redis.hget(interface.actinia_template_id_db, "new") == b"new"
+    assert get_item_links(interface.read("result-catalog")) == [
+        str(tmp_path / "existing" / "existing.json"),
+        str(tmp_path / "new" / "new.json"),
+    ]
+
+    # The catalog is not read or modified without new items
+    catalog = fake_redis.hget(
+        interface.actinia_template_id_hash_prefix + "result-catalog",
+        "actinia_template",
+    )
+    fake_redis.round_trips = 0
+    items = [create_item("new", "updated")]
+    assert result_interface.save_items(items, "result-catalog") == []
+    assert fake_redis.round_trips == 2
+    assert fake_redis.transactions == 2
+    assert interface.read("new")["properties"]["description"] == "updated"
+    assert (
+        fake_redis.hget(
+            interface.actinia_template_id_hash_prefix + "result-catalog",
+            "actinia_template",
+        )
+        == catalog
+    )
+
+
+@pytest.mark.unittest
+def test_save_items_concurrently(interface, fake_redis, tmp_path):
+    # Another job creates the same item after the existence check
+    pipeline = fake_redis.pipeline
+
+    def create_after_check(transaction=True, shard_hint=None):
+        check = pipeline(transaction, shard_hint)
+        if transaction is False and not interface.exists("new"):
+            execute = check.execute
+
+            def execute_and_create():
+                results = execute()
+                interface.create("new", create_item("new", "other").to_dict())
+                return results
+
+            check.execute = execute_and_create
+        return check
+
+    fake_redis.pipeline = create_after_check
+    result_interface = RedisSTACResultInterface(interface)
+    items = [create_item("new", "")]
+    # The transaction is repeated and the item is not added to the catalog
+    # by this job
+    assert result_interface.save_items(items, "result-catalog") == []
+    assert fake_redis.transactions == 1
+    assert interface.read("new")["properties"]["description"] == ""
+    assert get_item_links(interface.read("result-catalog")) == [
+        str(tmp_path / "existing" / "existing.json"),
+    ]
+
+
+@pytest.mark.unittest
+def test_stac_exporter_save(interface, fake_redis, monkeypatch):
+    pytest.importorskip("pyproj")
+    pytest.importorskip("rasterio")
+    pytest.importorskip("shapely")
+    from actinia_core.core import stac_exporter_interface
+
+    monkeypatch.setattr(
+        stac_exporter_interface, "connectRedis", lambda: None, raising=False
+    )
+    monkeypatch.setattr(
+        stac_exporter_interface,
+        "redis_actinia_interface",
+        interface,
+        raising=False,
+    )
+    exporter = stac_exporter_interface.STACExporter()
+    exporter.items = [create_item("existing", "new"), create_item("new", "")]
+    exporter.save()
+    assert exporter.items == []
+    # The catalog check and the writes of the items
+    assert fake_redis.round_trips == 4
+    assert fake_redis.transactions == 1
+
+    # Nothing is written without items
+    fake_redis.round_trips = 0
+    exporter.save()
+    assert fake_redis.round_trips == 0
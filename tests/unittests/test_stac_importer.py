@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: STAC import commands unittest case
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from actinia_core.core import stac_importer_interface
+from actinia_core.core.common.config import global_config
+from actinia_core.core.stac_importer_interface import (
+    GDAL_COG_OPTIONS,
+    STACImporter,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+COLLECTION_ID = "stac.defaultStac.rastercube.sentinel-s2-l2a-cogs"
+
+
+def create_feature(item_id, datetime):
+    assets = {}
+    for name, common_name in (("B04", "red"), ("B08", "nir")):
+        assets[name] = {
+            "href": "https://example.com/%s/%s.tif" % (item_id, name),
+            "eo:bands": [{"name": name, "common_name": common_name}],
+        }
+    return {
+        "id": item_id,
+        "properties": {"datetime": datetime},
+        "assets": assets,
+    }
+
+
+class StaticCatalogHandler(BaseHTTPRequestHandler):
+    """Serve the json files of a static STAC catalog for GET and POST
+    requests and record the requested paths"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        path = os.path.join(self.server.directory, self.path.strip("/"))
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.json")
+        if not os.path.isfile(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+        with open(path, "rb") as json_file:
+            content = json_file.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stac_catalog(monkeypatch, tmp_path):
+    """A static STAC catalog with a search result of two pages"""
+    directory = str(tmp_path / "catalog")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StaticCatalogHandler)
+    server.directory = directory
+    server.requests = []
+    url = "http://127.0.0.1:%i" % server.server_address[1]
+
+    pages = [
+        [create_feature("S2A_32UPA_20210112", "2021-01-12T10:30:00Z")],
+        [create_feature("S2B_32UPA_20210117", "2021-01-17T10:30:00Z")],
+    ]
+    for num, features in enumerate(pages):
+        page = {"type": "FeatureCollection", "features": features}
+        if num + 1 < len(pages):
+            page["links"] = [
+                {"rel": "next", "href": "%s/search/%i" % (url, num + 1)}
+            ]
+        page_dir = os.path.join(directory, "search", str(num or ""))
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.json"), "w") as page_file:
+            json.dump(page, page_file)
+
+    monkeypatch.setattr(stac_importer_interface, "has_plugin", True)
+    monkeypatch.setattr(
+        STACImporter,
+        "_get_search_root",
+        staticmethod(lambda stac_collection_id: url + "/search"),
+    )
+    monkeypatch.setattr(
+        global_config, "STAC_SEARCH_CACHE_DIR", str(tmp_path / "cache")
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def import_stac(registration_file=None, interval=None):
+    return STACImporter()._stac_import(
+        stac_collection_id=COLLECTION_ID,
+        semantic_label=["red", "nir"],
+        interval=interval or ["2021-01-01T00:00:00Z", "2021-01-31T00:00:00Z"],
+        bbox=[10.0, 50.0, 11.0, 51.0],
+        filter={},
+        strd_name="s2",
+        registration_file=registration_file,
+    )
+
+
+@pytest.mark.unittest
+def test_bulk_stac_import_commands(stac_catalog, tmp_path):
+    registration_file = str(tmp_path / "registration.txt")
+    processes = import_stac(registration_file)
+    assert [p.executable for p in processes] == [
+        "t.create",
+        "parallel",
+        "t.register",
+    ]
+
+    # Each item is imported with its semantic label by its own process list
+    import_process_lists = processes[1].executable_params
+    assert len(import_process_lists) == 4
+    for import_raster, semantic_label in import_process_lists:
+        assert import_raster.executable == "r.import"
+        assert import_raster.env == GDAL_COG_OPTIONS
+        assert semantic_label.executable == "r.support"
+
+    # All maps are registered at once
+    assert "file=%s" % registration_file in processes[2].executable_params
+    with open(registration_file) as reg_file:
+        assert reg_file.read().splitlines() == [
+            "s2_S2A_32UPA_20210112_B04|2021-01-12T10:30:00Z",
+            "s2_S2A_32UPA_20210112_B08|2021-01-12T10:30:00Z",
+            "s2_S2B_32UPA_20210117_B04|2021-01-17T10:30:00Z",
+            "s2_S2B_32UPA_20210117_B08|2021-01-17T10:30:00Z",
+        ]
+
+
+@pytest.mark.unittest
+def test_stac_search_pages_and_cache(stac_catalog, monkeypatch):
+    importer = STACImporter()
+    features = importer._search_features(
+        STACImporter._get_search_root(COLLECTION_ID),
+        "sentinel-s2-l2a-cogs",
+        ["2021-01-01T00:00:00Z", "2021-01-31T00:00:00Z"],
+        [10.0, 50.0, 11.0, 51.0],
+        {},
+    )
+    # The pages are requested while the features are consumed
+    assert next(features)["id"] == "S2A_32UPA_20210112"
+    assert stac_catalog.requests == ["/search"]
+    assert next(features)["id"] == "S2B_32UPA_20210117"
+    assert stac_catalog.requests == ["/search", "/search/1"]
+    assert list(features) == []
+
+    # The consumed search is cached, other searches are not
+    import_stac()
+    assert len(stac_catalog.requests) == 2
+    import_stac(interval=["2021-01-01T00:00:00Z", "2021-01-15T00:00:00Z"])
+    assert len(stac_catalog.requests) == 4
+
+    # Expired searches are requested again
+    monkeypatch.setattr(global_config, "STAC_SEARCH_CACHE_TTL", 0)
+    import_stac()
+    assert len(stac_catalog.requests) == 6
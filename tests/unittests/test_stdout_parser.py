@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tests: Stdout parser unittest case
+"""
+import csv
+import os
+import tempfile
+import pytest
+
+from actinia_core.core.stdout_parser import (
+    convert_column,
+    rows_to_columns,
+    split_rows,
+    write_csv,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "rows,delimiter",
+    [
+        (["a|b", "c| d |e", "", "f||"], "|"),
+        (["1 2  3", "4 5 6"], " "),
+        (['"a"|b', "c|'d'"], "|"),
+        (["a::b::c", "d"], "::"),
+        ([" 1 2 ", "  ", "\t3 4\t"], " "),
+        ([" :: a::b :: "], "::"),
+    ],
+)
+def test_split_rows(rows, delimiter):
+    expected = [
+        [value.strip() for value in row.strip().split(delimiter)]
+        for row in rows
+    ]
+    assert list(split_rows(rows, delimiter)) == expected
+
+
+@pytest.mark.unittest
+def test_split_rows_long_value():
+    # Longer than the default field size limit of the csv module
+    value = "x" * 200000
+    rows = ["1|%s|2" % value, "3"]
+    assert list(split_rows(rows, "|")) == [["1", value, "2"], ["3"]]
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "values,type_name,converted",
+    [
+        (["1", "-2", "*"], "int", [1, -2, None]),
+        (["1", "2.5", ""], "float", [1.0, 2.5, None]),
+        (["1", "a", "*"], "str", ["1", "a", "*"]),
+    ],
+)
+def test_convert_column(values, type_name, converted):
+    assert convert_column(values) == (type_name, converted)
+
+
+@pytest.mark.unittest
+def test_rows_to_columns():
+    value_rows = [["cat", "area", "label"], ["1", "2.5", "forest"], ["2"]]
+    names, types, columns = rows_to_columns(value_rows, header=True)
+    assert names == ["cat", "area", "label"]
+    assert types == ["int", "float", "str"]
+    assert columns == [[1, 2], [2.5, None], ["forest", ""]]
+
+    names, types, columns = rows_to_columns(value_rows[1:])
+    assert names == ["0", "1", "2"]
+
+
+@pytest.mark.unittest
+def test_write_csv():
+    file_path = tempfile.mktemp(suffix=".csv")
+    value_rows = split_rows(("%i|%i" % (i, i * i) for i in range(1000)), "|")
+    assert write_csv(value_rows, file_path) == 1000
+    with open(file_path, newline="") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows[999] == ["999", "998001"]
+    os.remove(file_path)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Storage usage counter unittest case
+"""
+import os
+import pytest
+
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.redis_storage_usage import (
+    DOWNLOAD_CACHE,
+    RedisStorageUsageInterface,
+    get_path_size,
+)
+from actinia_core.core.utils import get_mv_process
+from actinia_core.processing.actinia_processing.ephemeral_processing import (
+    EphemeralProcessing,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+def write_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as out_file:
+        out_file.write(b"x" * size)
+
+
+@pytest.fixture
+def interface(fake_redis):
+    interface = RedisStorageUsageInterface()
+    interface.redis_server = fake_redis
+    return interface
+
+
+@pytest.mark.unittest
+def test_get_path_size(tmp_path):
+    write_file(os.path.join(str(tmp_path), "a.tif"), 100)
+    write_file(os.path.join(str(tmp_path), "unzip", "b.shp"), 50)
+    assert get_path_size(os.path.join(str(tmp_path), "a.tif")) == 100
+    assert get_path_size(str(tmp_path)) == 150
+    assert get_path_size(os.path.join(str(tmp_path), "missing")) == 0
+
+
+@pytest.mark.unittest
+def test_storage_usage_quota(interface, tmp_path):
+    path = str(tmp_path)
+    assert interface.get(DOWNLOAD_CACHE, "user") is None
+    assert interface.add_within_quota(
+        DOWNLOAD_CACHE, "user", 60, 100, path, 60
+    )
+    assert not interface.add_within_quota(
+        DOWNLOAD_CACHE, "user", 60, 100, path, 60
+    )
+    assert interface.get(DOWNLOAD_CACHE, "user") == 60
+
+    # Removed files are always subtracted
+    assert interface.add_within_quota(
+        DOWNLOAD_CACHE, "user", -60, 100, path, 60
+    )
+    assert interface.get(DOWNLOAD_CACHE, "user") == 0
+
+    interface.add(DOWNLOAD_CACHE, "user", 10, path, 60)
+    interface.reset(DOWNLOAD_CACHE, "user")
+    assert interface.get(DOWNLOAD_CACHE, "user") == 0
+
+
+@pytest.mark.unittest
+def test_storage_usage_initialization(interface, fake_redis, tmp_path):
+    write_file(os.path.join(str(tmp_path), "a.tif"), 100)
+
+    # The counter is initialized from the directory before the first add
+    assert not interface.add_within_quota(
+        DOWNLOAD_CACHE, "user", 60, 150, str(tmp_path), 60
+    )
+    assert interface.get(DOWNLOAD_CACHE, "user") == 100
+    assert interface.add(DOWNLOAD_CACHE, "user", -100, str(tmp_path), 60) == 0
+
+    # The reconciliation is started by the writes
+    assert (
+        fake_redis.get(
+            interface.reconciliation_prefix + DOWNLOAD_CACHE + "::user"
+        )
+        is not None
+    )
+
+
+@pytest.mark.unittest
+def test_storage_usage_reconciliation(interface, tmp_path):
+    write_file(os.path.join(str(tmp_path), "a.tif"), 100)
+
+    # The usage is computed from the directory if it was never counted
+    assert (
+        interface.get_usage(DOWNLOAD_CACHE, "user", str(tmp_path), 60) == 100
+    )
+    assert interface.get(DOWNLOAD_CACHE, "user") == 100
+
+    # Files that were written without being counted are reconciled
+    write_file(os.path.join(str(tmp_path), "b.tif"), 20)
+    assert (
+        interface.get_usage(DOWNLOAD_CACHE, "user", str(tmp_path), 60) == 100
+    )
+    assert interface.reconcile(DOWNLOAD_CACHE, "user", str(tmp_path)) == 120
+    assert interface.get(DOWNLOAD_CACHE, "user") == 120
+
+
+class ProcessingStandIn(EphemeralProcessing):
+    """Processing that moves files without running executables"""
+
+    def __init__(self, storage_usage_interface):
+        self.config = global_config
+        self.user_id = "user"
+        self.resource_id = "resource"
+        self.iteration = None
+        self.storage_usage_interface = storage_usage_interface
+        self.resource_logger = self
+
+    def get_termination(self, user_id, resource_id, iteration):
+        return False
+
+    def _run_executable(self, process, poll_time=0.005):
+        source, dest = process.executable_params
+        os.rename(source, dest)
+        return 0, "", ""
+
+
+@pytest.mark.unittest
+def test_download_cache_move(interface, monkeypatch, tmp_path):
+    cache_path = os.path.join(str(tmp_path), "cache")
+    temp_path = os.path.join(str(tmp_path), "temp")
+    write_file(os.path.join(cache_path, "user", "a.tif"), 100)
+    monkeypatch.setattr(global_config, "DOWNLOAD_CACHE", cache_path)
+    monkeypatch.setattr(global_config, "DOWNLOAD_CACHE_QUOTA", 1)
+    processing = ProcessingStandIn(interface)
+
+    # Downloads that are moved into the download cache are counted
+    source = os.path.join(temp_path, "b.tif")
+    write_file(source, 50)
+    processing._run_process(
+        get_mv_process(source, os.path.join(cache_path, "user", "b.tif"))
+    )
+    assert interface.get(DOWNLOAD_CACHE, "user") == 150
+
+    # Downloads that exceed the quota are removed
+    monkeypatch.setattr(global_config, "DOWNLOAD_CACHE_QUOTA", 0)
+    source = os.path.join(temp_path, "c.tif")
+    write_file(source, 50)
+    with pytest.raises(AsyncProcessError):
+        processing._run_process(
+            get_mv_process(source, os.path.join(cache_path, "user", "c.tif"))
+        )
+    assert not os.path.exists(source)
+    assert not os.path.exists(os.path.join(cache_path, "user", "c.tif"))
+    assert interface.get(DOWNLOAD_CACHE, "user") == 150
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+
+"""
+Tests: Temporal database merge unittest case
+"""
+import os
+import sqlite3
+import pytest
+
+from actinia_core.core.tgis_merge import (
+    create_benchmark_db,
+    get_schema,
+    merge_tgis_db,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+@pytest.fixture
+def tgis_dbs(tmp_path):
+    tgis_db_path = os.path.join(str(tmp_path), "source.db")
+    target_tgis_db = os.path.join(str(tmp_path), "target.db")
+    create_benchmark_db(tgis_db_path, "mapset_tmp", 10)
+    create_benchmark_db(target_tgis_db, "target", 10, offset=5)
+
+    con = sqlite3.connect(tgis_db_path)
+    # A map name that contains the mapset name and a registered map of
+    # another mapset
+    con.execute(
+        "INSERT INTO raster_base (id, name, mapset) VALUES "
+        "('map_mapset_tmp@mapset_tmp', 'map_mapset_tmp', 'mapset_tmp'), "
+        "('elevation@PERMANENT', 'elevation', 'PERMANENT')"
+    )
+    con.commit()
+    con.close()
+    return tgis_db_path, target_tgis_db
+
+
+def query(tgis_db_path, sql):
+    con = sqlite3.connect(tgis_db_path)
+    rows = con.execute(sql).fetchall()
+    con.close()
+    return rows
+
+
+@pytest.mark.unittest
+def test_merge_tgis_db(tgis_dbs):
+    tgis_db_path, target_tgis_db = tgis_dbs
+    merge_tgis_db(tgis_db_path, "mapset_tmp", "target", target_tgis_db)
+
+    ids = [row[0] for row in query(tgis_db_path, "SELECT id FROM raster_base")]
+    assert len(ids) == 17
+    assert "map_0@target" in ids and "map_14@target" in ids
+    assert "map_mapset_tmp@target" in ids
+    assert "elevation@PERMANENT" in ids
+    assert not [map_id for map_id in ids if map_id.endswith("@mapset_tmp")]
+    assert query(
+        tgis_db_path,
+        "SELECT count(*) FROM raster_base WHERE mapset = 'target'",
+    ) == [(16,)]
+
+    # The register table of the target STRDS keeps its primary key
+    schema = get_schema(sqlite3.connect(tgis_db_path))
+    assert "PRIMARY KEY" in schema["raster_map_register_target"][2]
+    assert query(
+        tgis_db_path, "SELECT count(*) FROM raster_map_register_target"
+    ) == [(10,)]
+    assert query(
+        tgis_db_path,
+        "SELECT count(*) FROM raster_view_abs_time WHERE mapset = 'target'",
+    ) == [(15,)]
+
+    # The space time datasets in which the maps are registered are renamed
+    assert query(
+        tgis_db_path,
+        "SELECT registered_stds FROM raster_stds_register "
+        "WHERE id = 'map_0@target'",
+    ) == [("strds_all@PERMANENT,strds_mapset_tmp@target",)]
+    assert query(
+        tgis_db_path,
+        "SELECT count(*) FROM raster_stds_register "
+        "WHERE registered_stds LIKE '%@mapset_tmp%'",
+    ) == [(0,)]
+
+
+@pytest.mark.unittest
+def test_merge_tgis_db_without_target(tgis_dbs):
+    tgis_db_path, target_tgis_db = tgis_dbs
+    merge_tgis_db(tgis_db_path, "mapset_tmp", "target")
+
+    assert query(
+        tgis_db_path, "SELECT id FROM strds_base WHERE mapset = 'target'"
+    ) == [("strds_mapset_tmp@target",)]
+    assert query(
+        tgis_db_path,
+        "SELECT count(*) FROM raster_map_register_mapset_tmp "
+        "WHERE id LIKE '%@target'",
+    ) == [(10,)]
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tests: Tile grid and tile cache unittest case
+"""
+import os
+import pytest
+
+from actinia_core.core.tile_cache import (
+    TileCache,
+    WEB_MERCATOR_HALF_WIDTH,
+    get_metatile,
+    get_raster_fingerprint,
+    get_tile_bounds,
+    get_tile_grid,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+CELLHD = """proj:       99
+zone:       0
+north:      228500
+south:      215000
+east:       645000
+west:       630000
+cols:       1500
+rows:       1350
+e-w resol:  10
+n-s resol:  10
+format:     -1
+compressed: 2
+"""
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as out_file:
+        out_file.write(content)
+
+
+@pytest.fixture
+def location_path(tmp_path):
+    location_path = os.path.join(str(tmp_path), "nc_spm_08")
+    mapset_path = os.path.join(location_path, "PERMANENT")
+    write_file(os.path.join(mapset_path, "cellhd", "elevation"), CELLHD)
+    write_file(os.path.join(mapset_path, "fcell", "elevation"), "data")
+    return location_path
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize(
+    "z,x,y,metatile",
+    [(0, 0, 0, (0, 0, 1)), (2, 3, 1, (0, 0, 4)), (5, 13, 30, (8, 24, 8))],
+)
+def test_get_metatile(z, x, y, metatile):
+    assert get_metatile(z, x, y, 8) == metatile
+
+
+@pytest.mark.unittest
+def test_native_tile_grid(location_path):
+    mapset_path = os.path.join(location_path, "PERMANENT")
+    grid = get_tile_grid(location_path, mapset_path, "elevation")
+    assert grid == (630000.0, 228500.0, 15000.0)
+
+    bounds = get_tile_bounds(grid, 1, 1, 0)
+    assert bounds == {"n": 228500.0, "s": 221000.0, "e": 645000.0, "w": 637500}
+    assert get_tile_grid(location_path, mapset_path, "missing") is None
+
+
+@pytest.mark.unittest
+def test_web_mercator_tile_grid(location_path):
+    mapset_path = os.path.join(location_path, "PERMANENT")
+    write_file(os.path.join(mapset_path, "PROJ_EPSG"), "epsg: 3857\n")
+    grid = get_tile_grid(location_path, mapset_path, "elevation")
+
+    bounds = get_tile_bounds(grid, 1, 0, 0, size=2)
+    assert bounds["w"] == -WEB_MERCATOR_HALF_WIDTH
+    assert bounds["n"] == WEB_MERCATOR_HALF_WIDTH
+    assert bounds["e"] == pytest.approx(WEB_MERCATOR_HALF_WIDTH)
+    assert bounds["s"] == pytest.approx(-WEB_MERCATOR_HALF_WIDTH)
+
+
+@pytest.mark.unittest
+def test_raster_fingerprint(location_path):
+    mapset_path = os.path.join(location_path, "PERMANENT")
+    fingerprint = get_raster_fingerprint(mapset_path, "elevation")
+    assert fingerprint == get_raster_fingerprint(mapset_path, "elevation")
+    assert get_raster_fingerprint(mapset_path, "missing") is None
+
+    # A new color table changes the fingerprint
+    write_file(os.path.join(mapset_path, "colr", "elevation"), "% 0 1\n")
+    assert fingerprint != get_raster_fingerprint(mapset_path, "elevation")
+
+
+@pytest.mark.unittest
+def test_tile_cache_lookup_and_eviction(tmp_path):
+    tile_cache = TileCache(str(tmp_path), max_size=800)
+    assert tile_cache.lookup("abcdef", 1, 0, 0) is None
+
+    for x in range(4):
+        path = tile_cache.get_tile_path("abcdef", 2, x, 0)
+        temporary_path = tile_cache.get_temporary_path(path)
+        write_file(temporary_path, "x" * 300)
+        os.replace(temporary_path, path)
+        os.utime(path, (x, x))
+
+    # The lookup marks the oldest tile as recently used
+    assert tile_cache.lookup("abcdef", 2, 0, 0) is not None
+    with tile_cache.metatile_lock("abcdef", 2, 0, 0):
+        assert tile_cache.evict() == 2
+    assert tile_cache.evict() == 0
+
+    assert tile_cache.lookup("abcdef", 2, 0, 0) is not None
+    assert tile_cache.lookup("abcdef", 2, 1, 0) is None
+    assert tile_cache.lookup("abcdef", 2, 2, 0) is None
+    assert tile_cache.lookup("abcdef", 2, 3, 0) is not None
+    # Empty directories are removed by the scan of the cache directory
+    tile_cache.scan()
+    assert not os.path.exists(
+        os.path.dirname(tile_cache.get_tile_path("abcdef", 2, 1, 0))
+    )
+
+
+@pytest.mark.unittest
+def test_tile_cache_index(tmp_path):
+    tile_cache = TileCache(str(tmp_path), max_size=800, eviction_interval=0)
+    assert tile_cache.evict() == 0
+
+    for x in range(4):
+        path = tile_cache.get_tile_path("abcdef", 2, x, 0)
+        temporary_path = tile_cache.get_temporary_path(path)
+        # The temporary file protects the directory from the scan
+        tile_cache.scan()
+        assert os.path.isfile(temporary_path)
+        write_file(temporary_path, "x" * 300)
+        os.replace(temporary_path, path)
+        os.utime(path, (x, x))
+        assert tile_cache.add(path) is True
+
+    # The added tiles are evicted without a scan of the cache directory
+    assert tile_cache.total_size == 1200
+    assert tile_cache.evict() == 2
+    assert tile_cache.total_size == 600
+    assert tile_cache.lookup("abcdef", 2, 1, 0) is None
+    assert tile_cache.lookup("abcdef", 2, 3, 0) is not None
+    assert tile_cache.add(tile_cache.get_tile_path("abcdef", 2, 1, 0)) is False
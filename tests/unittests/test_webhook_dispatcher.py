@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+#######
+# actinia-core - an open source REST API for scalable, distributed, high
+# performance processing of geographical data that uses GRASS GIS for
+# computational tasks. For details, see https://actinia.mundialis.de/
+#
+# Copyright (c) 2022 mundialis GmbH & Co. KG
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#######
+
+"""
+Tests: Webhook dispatcher unittest case
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+import requests
+
+from actinia_core.core.common.config import Configuration
+from actinia_core.core.webhook_dispatcher import (
+    RedisWebhookInterface,
+    WebhookDispatcher,
+    get_backoff_time,
+    get_webhook_target,
+    post_webhook,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis"
+__copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
+__maintainer__ = "mundialis"
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Webhook stand-in that answers /webhook/finished with 200 and
+    /webhook/broken with 503"""
+
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.received.append(json.loads(self.rfile.read(length)))
+        code = 503 if self.path == "/webhook/broken" else 200
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WebhookInterfaceRecorder(object):
+    """Records the calls of the dispatcher to the Redis webhook interface"""
+
+    def __init__(self):
+        self.acknowledged = []
+        self.retries = []
+        self.finished = set()
+
+    def acknowledge(self, entry_id):
+        self.acknowledged.append(entry_id)
+
+    def schedule_retry(self, entry_id, entry, due_time):
+        self.retries.append((entry_id, dict(entry), due_time))
+
+    def is_finished(self, resource_id):
+        return resource_id in self.finished
+
+
+@pytest.fixture(scope="module")
+def webhook_url():
+    server = HTTPServer(("127.0.0.1", 0), WebhookHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:%i/webhook" % server.server_port
+    server.shutdown()
+
+
+@pytest.mark.unittest
+def test_get_backoff_time():
+    assert get_backoff_time(1, 10, 600) == 10
+    assert get_backoff_time(2, 10, 600) == 20
+    assert get_backoff_time(4, 10, 600) == 80
+    assert get_backoff_time(10, 10, 600) == 600
+
+
+@pytest.mark.unittest
+def test_get_webhook_target():
+    assert (
+        get_webhook_target("http://Example.com:8080/webhook/finished")
+        == "example.com:8080"
+    )
+    assert get_webhook_target("https://example.com/a") == get_webhook_target(
+        "https://example.com/b"
+    )
+
+
+@pytest.mark.unittest
+def test_post_webhook(webhook_url):
+    session = requests.Session()
+    payload = json.dumps({"status": "finished"})
+
+    assert post_webhook(session, webhook_url + "/finished", payload) == (
+        True,
+        False,
+    )
+    assert WebhookHandler.received[-1] == payload
+    assert post_webhook(session, webhook_url + "/broken", payload) == (
+        False,
+        True,
+    )
+    assert post_webhook(session, "http://127.0.0.1:1/webhook", payload) == (
+        False,
+        True,
+    )
+
+
+@pytest.mark.unittest
+def test_dispatcher_deliver(webhook_url):
+    recorder = WebhookInterfaceRecorder()
+    dispatcher = WebhookDispatcher(
+        config=Configuration(), consumer="test", webhook_interface=recorder
+    )
+    entry = {
+        "type": "finished",
+        "url": webhook_url + "/finished",
+        "payload": json.dumps({"status": "finished"}),
+        "auth": "user:pass:word",
+        "attempt": 0,
+        "retries": 3,
+    }
+    assert dispatcher.deliver("1-0", dict(entry)) is True
+    assert recorder.acknowledged == ["1-0"]
+
+    entry["url"] = webhook_url + "/broken"
+    assert dispatcher.deliver("2-0", dict(entry)) is False
+    assert recorder.retries[-1][1]["attempt"] == 1
+    assert "2-0" not in recorder.acknowledged
+
+    # The last attempt drops the entry
+    entry["attempt"] = 2
+    assert dispatcher.deliver("3-0", dict(entry)) is False
+    assert recorder.acknowledged == ["1-0", "3-0"]
+
+
+@pytest.mark.unittest
+def test_dispatcher_instant_delivery():
+    dispatcher = WebhookDispatcher(
+        config=Configuration(),
+        consumer="test",
+        webhook_interface=WebhookInterfaceRecorder(),
+    )
+    delivered = []
+    # Deliveries that finish before their done callback is added run the
+    # callback in the dispatching thread
+    dispatcher.deliver = lambda entry_id, entry: delivered.append(entry_id)
+    dispatcher._add_entries(
+        [
+            ("%i-0" % i, {"url": "http://127.0.0.%i/webhook" % (i % 4)})
+            for i in range(2000)
+        ]
+    )
+
+    def dispatch():
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            while dispatcher._num_queued() > 0:
+                dispatcher._dispatch(executor)
+                dispatcher.slot_released.wait(0.01)
+                dispatcher.slot_released.clear()
+
+    thread = threading.Thread(target=dispatch, daemon=True)
+    thread.start()
+    thread.join(30)
+    assert thread.is_alive() is False
+    assert len(delivered) == 2000
+
+
+@pytest.mark.unittest
+def test_dispatcher_drops_updates_of_finished_resources(webhook_url):
+    recorder = WebhookInterfaceRecorder()
+    dispatcher = WebhookDispatcher(
+        config=Configuration(), consumer="test", webhook_interface=recorder
+    )
+    entry = {
+        "type": "update",
+        "url": webhook_url + "/finished",
+        "payload": json.dumps({"status": "running"}),
+        "auth": "",
+        "attempt": 0,
+        "retries": 1,
+        "resource_id": "resource_id-1",
+    }
+    assert dispatcher.deliver("1-0", dict(entry)) is True
+
+    recorder.finished.add("resource_id-1")
+    num_received = len(WebhookHandler.received)
+    assert dispatcher.deliver("2-0", dict(entry)) is False
+    assert recorder.acknowledged == ["1-0", "2-0"]
+    assert len(WebhookHandler.received) == num_received
+
+
+@pytest.mark.unittest
+def test_dispatcher_serializes_resources():
+    dispatcher = WebhookDispatcher(
+        config=Configuration(),
+        consumer="test",
+        webhook_interface=WebhookInterfaceRecorder(),
+    )
+    lock = threading.Lock()
+    active = set()
+    delivered = []
+    overlapping = []
+
+    def deliver(entry_id, entry):
+        with lock:
+            if entry["resource_id"] in active:
+                overlapping.append(entry_id)
+            active.add(entry["resource_id"])
+        threading.Event().wait(0.01)
+        with lock:
+            active.discard(entry["resource_id"])
+            delivered.append(entry_id)
+
+    dispatcher.deliver = deliver
+    dispatcher._add_entries(
+        [
+            (
+                "%i-0" % i,
+                {
+                    "url": "http://127.0.0.1/webhook",
+                    "resource_id": "resource_id-%i" % (i // 5),
+                },
+            )
+            for i in range(20)
+        ]
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        while dispatcher._num_queued() > 0:
+            dispatcher._dispatch(executor)
+            dispatcher.slot_released.wait(0.01)
+            dispatcher.slot_released.clear()
+
+    # The requests of each resource keep their order
+    assert [id for id in delivered if int(id.split("-")[0]) < 5] == [
+        "%i-0" % i for i in range(5)
+    ]
+    assert len(delivered) == 20
+    assert overlapping == []
+
+
+@pytest.mark.unittest
+def test_webhook_interface(fake_redis):
+    interface = RedisWebhookInterface()
+    interface.redis_server = fake_redis
+    interface.enqueue("update", "http://a/update", "{}", resource_id="r1")
+    assert interface.is_finished("r1") is False
+    interface.enqueue("finished", "http://a/finished", "{}", resource_id="r1")
+    assert interface.is_finished("r1") is True
+
+    entry = {
+        "type": "finished",
+        "url": "http://a/finished",
+        "payload": "{}",
+        "auth": "",
+        "attempt": 1,
+        "retries": 3,
+        "resource_id": "r2",
+    }
+    fake_redis.zadd(interface.retry_set_name, {json.dumps(entry): 10})
+    fake_redis.zadd(interface.retry_set_name, {json.dumps({"later": 1}): 30})
+    fake_redis.transactions = 0
+    assert interface.requeue_due_retries(now=20) == 1
+    assert fake_redis.transactions == 1
+    assert fake_redis.zcard(interface.retry_set_name) == 1
+    entries = fake_redis.streams[interface.stream_name]
+    assert len(entries) == 3
+    assert interface._decode(entries[-1][1]) == entry
+    assert interface.requeue_due_retries(now=20) == 0